@@ -1,13 +1,20 @@
-"""CLI entry point for AutoPipeline"""
+"""CLI entry point for AutoPipeline
+
+Commands import the pipeline, bench and plotting modules when they run, so ``--help`` and
+light subcommands do not pay for agents, checkers, jsonschema or LLM providers
+(tools/import_time_bench.py guards this).
+"""
 
 import sys
 from pathlib import Path
 import click
 
-from autopipeline.runner import PipelineRunner
 from autopipeline.llm.types import LLMConfig
-from autopipeline.bench.aggregate import aggregate_runs
-from autopipeline.bench.plots import generate_plots
+
+# Duplicated from run_logging / attempt_policy (used in option declarations; checked by
+# tests/unit/test_cli_imports.py) so defining the CLI imports neither module
+CONSOLE_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "OFF")
+LEDGER_FILE = "attempt_ledger.json"
 
 
 @click.group()
@@ -22,6 +29,8 @@ def cli():
 @click.option('--model', default=None, help='LLM model name')
 @click.option('--temperature', default=0.0, type=float, show_default=True)
 @click.option('--max-tokens', default=None, type=int)
+@click.option('--max-retries', default=0, type=click.IntRange(0, 10), show_default=True,
+              help='Retry failed provider calls with exponential backoff')
 @click.option('--cache-dir', default=".cache/llm", show_default=True)
 @click.option('--no-cache', is_flag=True, default=False, help='Disable LLM cache')
 @click.option('--output-root', default="outputs", show_default=True, help='Output root directory')
@@ -32,21 +41,57 @@ def cli():
 @click.option('--seed', default=0, type=int, show_default=True)
 @click.option('--no-semantic-warnings', is_flag=True, default=False, help='Disable semantic proxy checker (warnings-only)')
 @click.option('--dump-prompts', is_flag=True, default=False, help='Dump resolved prompts to run_dir/prompts_resolved')
-def run(case: str, llm_provider: str, model: str, temperature: float, max_tokens: int,
+@click.option('--compact-prompts', is_flag=True, default=False, help='Compact, relevance-filtered prompt context')
+@click.option('--prompt-layout', default="inline", type=click.Choice(["inline", "prefix_stable"]), show_default=True,
+              help='prefix_stable: shared static prefix first, for provider prompt caching')
+@click.option('--repair-mode', default="full", type=click.Choice(["full", "patch"]), show_default=True,
+              help='patch: repair via JSON patch over failing subtrees (falls back to full)')
+@click.option('--no-fast-validation', is_flag=True, default=False,
+              help='Run every checker (incl. warning-only scans) on every repair attempt')
+@click.option('--speculative', default=1, type=click.IntRange(1, 16), show_default=True,
+              help='Issue K concurrent IR/bindings generations; first valid candidate wins')
+@click.option('--speculative-tiers', default=None,
+              help='Comma-separated prompt tiers assigned round-robin to candidates (e.g. P0,P1,P2)')
+@click.option('--attempt-ledger', default=None, type=click.Path(exists=True),
+              help=f'Learn IR/bindings attempt budgets from a {LEDGER_FILE} or a directory of past runs')
+@click.option('--replay-bundle', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='Serve LLM calls offline from a replay bundle (implies --llm-provider replay)')
+@click.option('--replay-as', default=None, help='Provider name the bundle was recorded with (default: from bundle)')
+@click.option('--replay-strict', is_flag=True, default=False, help='Match by cache key only (no positional fallback)')
+@click.option('--sync-artifacts', is_flag=True, default=False,
+              help='Write run-directory artifacts inline instead of on a background writer thread')
+@click.option('--compress-artifacts', is_flag=True, default=False,
+              help='Gzip debug artifacts (llm_raw dumps, per-attempt bindings drafts, resolved prompts)')
+@click.option('--console-log-level', default="INFO", type=click.Choice(CONSOLE_LEVELS, case_sensitive=False),
+              show_default=True, help='Console verbosity (run.log / run_log.jsonl always get every record)')
+@click.option('--compact-eval', is_flag=True, default=False,
+              help='Write eval.json as compact schema v2 (failures by reference, no indentation)')
+def run(case: str, llm_provider: str, model: str, temperature: float, max_tokens: int, max_retries: int,
         cache_dir: str, no_cache: bool, output_root: str, no_repair: bool, no_catalog: bool, runtime_check: bool,
-        prompt_tier: str, seed: int, no_semantic_warnings: bool, dump_prompts: bool):
+        prompt_tier: str, seed: int, no_semantic_warnings: bool, dump_prompts: bool, compact_prompts: bool,
+        prompt_layout: str, repair_mode: str, no_fast_validation: bool, speculative: int,
+        speculative_tiers: str, attempt_ledger: str, replay_bundle: str, replay_as: str, replay_strict: bool,
+        sync_artifacts: bool, compress_artifacts: bool, console_log_level: str, compact_eval: bool):
     """Run the pipeline for a specific case"""
+    from autopipeline.runner import PipelineRunner
+
     try:
         llm_config = LLMConfig(
-            provider=llm_provider,
+            provider="replay" if replay_bundle else llm_provider,
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
+            max_retries=max_retries,
             cache_dir=cache_dir,
             cache_enabled=not no_cache,
             prompt_tier=prompt_tier,
             seed=seed,
             dump_prompts=dump_prompts,
+            prompt_compaction=compact_prompts,
+            prompt_layout=prompt_layout,
+            replay_bundle=replay_bundle,
+            replay_as=replay_as,
+            replay_strict=replay_strict,
         )
         runner = PipelineRunner(
             case_id=case,
@@ -56,6 +101,15 @@ def run(case: str, llm_provider: str, model: str, temperature: float, max_tokens
             enable_catalog=not no_catalog,
             runtime_check=runtime_check,
             enable_semantic=not no_semantic_warnings,
+            repair_mode=repair_mode,
+            fast_validation=not no_fast_validation,
+            speculative=speculative,
+            speculative_tiers=_parse_tiers(speculative_tiers),
+            attempt_policy=_attempt_policy(attempt_ledger, llm_config),
+            async_artifacts=not sync_artifacts,
+            compress_artifacts=compress_artifacts,
+            console_log_level=console_log_level,
+            compact_eval=compact_eval,
         )
         result = runner.run()
 
@@ -85,6 +139,48 @@ def run(case: str, llm_provider: str, model: str, temperature: float, max_tokens
         sys.exit(1)
 
 
+def _parse_tiers(value):
+    if not value:
+        return None
+    tiers = [t.strip().upper() for t in value.split(",") if t.strip()]
+    unknown = [t for t in tiers if t not in ("P0", "P1", "P2")]
+    if unknown:
+        raise click.BadParameter(f"unknown prompt tier(s): {', '.join(unknown)}", param_hint="--speculative-tiers")
+    return tiers
+
+
+def _attempt_policy(path, llm_config):
+    if not path:
+        return None
+    from autopipeline.repair.attempt_policy import AttemptLedger, AttemptPolicy
+    return AttemptPolicy(AttemptLedger.load(Path(path)), llm_config.model, llm_config.prompt_tier)
+
+
+def _synthetic_cases(sizes, faults, cases_dir, seed):
+    from autopipeline.bench.synthetic import FAULTS, generate_cases
+    # PipelineRunner reads <base_dir>/cases, so cases generated elsewhere could not be run
+    if Path(cases_dir).resolve() != Path("cases").resolve():
+        raise click.BadParameter(f"--synthetic generates into ./cases, which the pipeline reads; got {cases_dir}",
+                                 param_hint="--cases-dir")
+    try:
+        size_list = [int(s) for s in sizes.split(",") if s.strip()]
+    except ValueError:
+        raise click.BadParameter(f"expected comma separated integers, got {sizes}", param_hint="--synthetic")
+    fault_list = [None]
+    if faults and faults.strip().lower() == "all":
+        fault_list += list(FAULTS)
+    elif faults:
+        fault_list += [f.strip() for f in faults.split(",") if f.strip()]
+    unknown = [f for f in fault_list[1:] if f not in FAULTS]
+    if unknown:
+        raise click.BadParameter(f"unknown fault(s): {', '.join(unknown)} (choices: {', '.join(FAULTS)})",
+                                 param_hint="--synthetic-faults")
+    try:
+        return generate_cases(".", size_list, fault_list, seed=seed, cases_dir=cases_dir)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--synthetic")
+
+
 def _discover_cases(cases_dir: Path):
     return sorted([p.name for p in cases_dir.iterdir() if p.is_dir() and (p / "user_problem.json").exists()])
 
@@ -98,6 +194,7 @@ def _discover_cases(cases_dir: Path):
 @click.option('--model', default=None)
 @click.option('--temperature', default=0.0, type=float)
 @click.option('--max-tokens', default=None, type=int)
+@click.option('--max-retries', default=0, type=click.IntRange(0, 10), show_default=True)
 @click.option('--cache-dir', default=".cache/llm")
 @click.option('--no-cache', is_flag=True, default=False)
 @click.option('--no-repair', is_flag=True, default=False)
@@ -108,25 +205,66 @@ def _discover_cases(cases_dir: Path):
 @click.option('--seed', default=0, type=int, show_default=True)
 @click.option('--no-semantic-warnings', is_flag=True, default=False)
 @click.option('--dump-prompts', is_flag=True, default=False)
-def bench(cases_dir, case_ids, out_root, tag, llm_provider, model, temperature, max_tokens,
-          cache_dir, no_cache, no_repair, no_catalog, repeat, runtime_check, prompt_tier, seed, no_semantic_warnings, dump_prompts):
+@click.option('--compact-prompts', is_flag=True, default=False)
+@click.option('--prompt-layout', default="inline", type=click.Choice(["inline", "prefix_stable"]), show_default=True)
+@click.option('--repair-mode', default="full", type=click.Choice(["full", "patch"]), show_default=True)
+@click.option('--no-fast-validation', is_flag=True, default=False)
+@click.option('--speculative', default=1, type=click.IntRange(1, 16), show_default=True)
+@click.option('--speculative-tiers', default=None)
+@click.option('--attempt-ledger', default=None, type=click.Path(exists=True))
+@click.option('--replay-bundle', default=None, type=click.Path(exists=True, dir_okay=False))
+@click.option('--replay-as', default=None)
+@click.option('--replay-strict', is_flag=True, default=False)
+@click.option('--sync-artifacts', is_flag=True, default=False)
+@click.option('--compress-artifacts', is_flag=True, default=False)
+@click.option('--console-log-level', default="INFO", type=click.Choice(CONSOLE_LEVELS, case_sensitive=False),
+              show_default=True)
+@click.option('--compact-eval', is_flag=True, default=False)
+@click.option('--pack-runs', is_flag=True, default=False,
+              help='Pack each finished run dir into an indexed run=<id>.zip archive')
+@click.option('--no-plots', is_flag=True, default=False, help='Skip plots (matplotlib is not imported)')
+@click.option('--synthetic', default=None,
+              help='Generate synthetic cases of these sizes (e.g. 10,100,1000,10000) and bench them instead of --case-ids')
+@click.option('--synthetic-faults', default=None,
+              help="Also generate faulty variants: comma separated mutation ids, or 'all'")
+def bench(cases_dir, case_ids, out_root, tag, llm_provider, model, temperature, max_tokens, max_retries,
+          cache_dir, no_cache, no_repair, no_catalog, repeat, runtime_check, prompt_tier, seed, no_semantic_warnings, dump_prompts,
+          compact_prompts, prompt_layout, repair_mode, no_fast_validation, speculative, speculative_tiers,
+          attempt_ledger, replay_bundle, replay_as, replay_strict, sync_artifacts, compress_artifacts, console_log_level, compact_eval, pack_runs, no_plots,
+          synthetic, synthetic_faults):
     """Batch run multiple cases and aggregate results."""
+    from autopipeline.bench.aggregate import METRICS_FILE, aggregate_runs
+    from autopipeline.bench.dataset import DATASET_DIR
+    from autopipeline.runner import PipelineRunner
+
     base_dir = Path(".")
     cases_dir_path = base_dir / cases_dir
-    selected_cases = _discover_cases(cases_dir_path) if not case_ids else [c.strip() for c in case_ids.split(",")]
+    if synthetic:
+        selected_cases = _synthetic_cases(synthetic, synthetic_faults, cases_dir, seed)
+        click.echo(f"[bench] synthetic cases: {', '.join(selected_cases)}")
+    else:
+        selected_cases = _discover_cases(cases_dir_path) if not case_ids else [c.strip() for c in case_ids.split(",")]
 
     llm_config = LLMConfig(
-        provider=llm_provider,
+        provider="replay" if replay_bundle else llm_provider,
         model=model,
         temperature=temperature,
         max_tokens=max_tokens,
+        max_retries=max_retries,
         cache_dir=cache_dir,
         cache_enabled=not no_cache,
         prompt_tier=prompt_tier,
         seed=seed,
         dump_prompts=dump_prompts,
+        prompt_compaction=compact_prompts,
+        prompt_layout=prompt_layout,
+        replay_bundle=replay_bundle,
+        replay_as=replay_as,
+        replay_strict=replay_strict,
     )
 
+    policy = _attempt_policy(attempt_ledger, llm_config)
+
     run_root = Path(out_root)
     if tag:
         run_root = run_root / tag
@@ -144,17 +282,116 @@ def bench(cases_dir, case_ids, out_root, tag, llm_provider, model, temperature,
                 enable_catalog=not no_catalog,
                 runtime_check=runtime_check,
                 enable_semantic=not no_semantic_warnings,
+                repair_mode=repair_mode,
+                fast_validation=not no_fast_validation,
+                speculative=speculative,
+                speculative_tiers=_parse_tiers(speculative_tiers),
+                attempt_policy=policy,
+                async_artifacts=not sync_artifacts,
+                compress_artifacts=compress_artifacts,
+                console_log_level=console_log_level,
+                compact_eval=compact_eval,
             )
             result = runner.run()
-            eval_paths.append(Path(runner.output_dir) / "eval.json")
+            if pack_runs:
+                from autopipeline.run_archive import pack_run
+                eval_paths.append(pack_run(runner.output_dir))
+            else:
+                eval_paths.append(Path(runner.output_dir) / "eval.json")
             click.echo(f"[bench] finished {cid} rep{rep+1}: {result.get('overall_status')}")
 
-    summary_csv, summary_error_csv = aggregate_runs(eval_paths, run_root)
-    plots_dir = run_root / "plots"
-    generate_plots(summary_csv, summary_error_csv, plots_dir)
+    # One dataset per out-root, partitioned by tag, so tagged benches accumulate
+    dataset_root = Path(out_root) / DATASET_DIR
+    summary_csv, summary_error_csv = aggregate_runs(eval_paths, run_root, dataset_root=dataset_root, tag=tag)
     click.echo(f"[bench] summary: {summary_csv}")
     click.echo(f"[bench] summary_by_error: {summary_error_csv}")
-    click.echo(f"[bench] plots in {plots_dir}")
+    click.echo(f"[bench] dataset: {dataset_root}")
+    if not no_plots:
+        from autopipeline.bench.plots import generate_plots
+        plots_dir = run_root / "plots"
+        generate_plots(summary_csv, summary_error_csv, plots_dir)
+        click.echo(f"[bench] plots in {plots_dir}")
+    click.echo(f"[bench] metrics: {run_root / METRICS_FILE}")
+    click.echo(f"[bench] attempt ledger: {run_root / LEDGER_FILE}")
+    if synthetic:
+        from autopipeline.bench.synthetic import scaling_rows, write_scaling
+        scaling_csv = write_scaling(scaling_rows(eval_paths, str(base_dir), cases_dir), run_root)
+        click.echo(f"[bench] scaling: {scaling_csv}")
+
+
+@cli.group()
+def catalog():
+    """Catalog maintenance commands."""
+    pass
+
+
+@catalog.command("compile")
+@click.option('--base-dir', default=".", show_default=True)
+@click.option('--out', default=None, help="Snapshot path (default: catalog/.compiled/catalog_snapshot.json)")
+def catalog_compile(base_dir, out):
+    """Compile catalog YAML sources into a single snapshot for fast, lazy loading."""
+    from autopipeline.catalog.snapshot import compile_snapshot, load_snapshot
+    path = compile_snapshot(base_dir, out)
+    snapshot = load_snapshot(base_dir, path)
+    click.echo(f"[catalog] snapshot: {path}")
+    click.echo(f"[catalog] types: {len(snapshot.types) if snapshot else 0} source_hash: {snapshot.source_hash[:12] if snapshot else '-'}")
+
+
+@cli.group()
+def replay():
+    """Offline replay of recorded LLM exchanges."""
+    pass
+
+
+@replay.command("bundle")
+@click.argument('sources', nargs=-1, required=True)
+@click.option('--out', required=True, help="Bundle path (e.g. replay.jsonl.gz)")
+@click.option('--cache-dir', default=".cache/llm", show_default=True, help="LLM cache to read responses from")
+def replay_bundle_cmd(sources, out, cache_dir):
+    """Extract LLM exchanges of run dirs, output roots or summary.csv files into a replay bundle."""
+    from autopipeline.llm.replay import build_bundle
+    header = build_bundle(sources, Path(out), cache_dir=cache_dir)
+    click.echo(f"[replay] bundle: {out}")
+    click.echo(f"[replay] runs: {header['runs']} entries: {header['entries']} (keyed: {header['keyed_entries']})")
+
+
+@replay.command("warm")
+@click.argument('bundle', type=click.Path(exists=True, dir_okay=False))
+@click.option('--cache-dir', default=".cache/llm", show_default=True)
+@click.option('--overwrite', is_flag=True, default=False)
+def replay_warm_cmd(bundle, cache_dir, overwrite):
+    """Write a bundle's keyed entries into an LLM cache directory."""
+    from autopipeline.llm.replay import warm_cache
+    counts = warm_cache(Path(bundle), cache_dir, overwrite=overwrite)
+    click.echo(f"[replay] cache {cache_dir}: written {counts['written']}, skipped {counts['skipped']}")
+
+
+@cli.group()
+def runs():
+    """Run-directory archive commands."""
+    pass
+
+
+@runs.command("pack")
+@click.argument('roots', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--keep', is_flag=True, default=False, help="Keep the run directories after packing")
+def runs_pack_cmd(roots, keep):
+    """Pack every run dir under ROOTS into one indexed run=<id>.zip archive each."""
+    from autopipeline.run_archive import pack_tree
+    for root in roots:
+        packed = pack_tree(root, remove=not keep)
+        click.echo(f"[runs] {root}: packed {len(packed)} runs")
+
+
+@runs.command("unpack")
+@click.argument('roots', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--keep', is_flag=True, default=False, help="Keep the archives after unpacking")
+def runs_unpack_cmd(roots, keep):
+    """Restore every packed run under ROOTS to a run directory."""
+    from autopipeline.run_archive import unpack_tree
+    for root in roots:
+        restored = unpack_tree(root, remove=not keep)
+        click.echo(f"[runs] {root}: unpacked {len(restored)} runs")
 
 
 if __name__ == '__main__':
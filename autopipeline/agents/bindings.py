@@ -1,7 +1,8 @@
 """Bindings Agent - maps IR to physical deployment (placements, transports, endpoints)"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
 import yaml
+from autopipeline.llm.decode import LLMOutputFormatError
 from autopipeline.llm.llm_client import LLMClient
 
 
@@ -20,16 +21,45 @@ class BindingsAgent:
         """
 
         ir_yaml = yaml.safe_dump(ir_data, sort_keys=False, allow_unicode=True)
-        bindings_yaml = self.llm.generate_bindings(
+        result = self.llm.generate_bindings(
             case_id=rules_ctx.get("case_id", ""),
             ir_yaml=ir_yaml,
             device_info=device_info,
             rules_ctx=rules_ctx,
             schema_versions=schema_versions,
             prompt_name="binding_agent",
-            attempt=attempt
+            attempt=attempt,
+            ir_data=ir_data
         )
-        return yaml.safe_load(bindings_yaml)
+        return result.value()
+
+    def generate_bindings_candidates(self, ir_data: Dict[str, Any], device_info: Dict[str, Any],
+                                     rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any], k: int,
+                                     tiers: Optional[List[str]] = None, attempt: int = 1) -> Iterator[Dict[str, Any]]:
+        """Speculative generation: yield k parsed candidates ("data" or "error") as they arrive."""
+        ir_yaml = yaml.safe_dump(ir_data, sort_keys=False, allow_unicode=True)
+        arrivals = self.llm.generate_bindings_candidates(
+            case_id=rules_ctx.get("case_id", ""),
+            ir_yaml=ir_yaml,
+            device_info=device_info,
+            rules_ctx=rules_ctx,
+            schema_versions=schema_versions,
+            k=k,
+            tiers=tiers,
+            prompt_name="binding_agent",
+            attempt=attempt,
+            ir_data=ir_data
+        )
+        try:
+            for item in arrivals:
+                if item["error"] is None:
+                    try:
+                        item["data"] = item["result"].value()
+                    except LLMOutputFormatError as e:
+                        item["error"] = e
+                yield item
+        finally:
+            arrivals.close()
 
     def _simulate_bindings_generation(self, ir_data: Dict[str, Any], device_info: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate bindings generation (placeholder for LLM output)"""
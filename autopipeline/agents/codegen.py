@@ -1,19 +1,130 @@
 """CodeGen - generates code skeletons for cloud/edge/device based on bindings"""
 
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from string import Template
+from typing import Dict, Any, List, Optional, Tuple
 import os
 import json
+import time
 
+from autopipeline.llm.hash_utils import stable_hash, text_hash
 
-class CodeGenAgent:
-    """Generate code skeletons for each deployment layer"""
+
+# Layer templates are compiled once per process; per-layer variable parts are
+# rendered into the ${...} slots instead of being concatenated line by line.
+_TEMPLATE_SOURCES = {
+    "main": """#!/usr/bin/env python3
+# bindings_hash: ${bindings_hash}
+${preview_line}# Generated code for ${layer_upper} layer
+# Auto-generated by AutoPipeline CodeGen
+
+import json
+import time
+from typing import Dict, Any, List
+
+
+class ${class_name}:
+    \"\"\"
+    Service running on ${layer} layer
+
+    Components handled:
+${components_doc}    \"\"\"
 
     def __init__(self):
+        self.running = False
+        print(f"[${layer_upper}] Service initialized")
+        self.endpoints = ${endpoints_json}
+        self.bindings_hash = "${bindings_hash}"
+
+    def start(self):
+        \"\"\"Start the service\"\"\"
+        self.running = True
+        print(f"[${layer_upper}] Service started with bindings_hash={self.bindings_hash}")
+        if self.endpoints:
+            print(f"[${layer_upper}] Endpoints preview: {self.endpoints}")
+
+        # TODO: Initialize connections to endpoints
+${connect_todos}
+        self.run()
+
+    def run(self):
+        \"\"\"Main service loop\"\"\"
+        while self.running:
+            # TODO: Implement main logic
+${capability_todos}
+            print(f"[${layer_upper}] heartbeat - running")
+            time.sleep(1)  # Placeholder loop
+
+${communicate_methods}
+if __name__ == "__main__":
+    service = ${class_name}()
+    try:
+        service.start()
+    except KeyboardInterrupt:
+        print(f"[${layer_upper}] Service stopped")
+""",
+    "communicate": """    def communicate_via_${link_id}(self, data: Dict[str, Any]):
+        \"\"\"
+        Send data via ${link_id}
+        Protocol: ${protocol}
+        From: ${from_ep}
+        To: ${to_ep}
+        \"\"\"
+        # TODO: Implement ${protocol} communication
+        print(f"[${layer_upper}] Sending data via ${protocol}: {data}")
+
+        # Placeholder for actual implementation:
+        ${placeholder}
         pass
 
+""",
+    "requirements": "paho-mqtt\nrequests\n",
+    "dockerfile": (
+        "FROM python:3.10-slim\n"
+        "WORKDIR /app\n"
+        "COPY . /app\n"
+        "RUN pip install --no-cache-dir -r requirements.txt\n"
+        "CMD [\"python\", \"main.py\"]\n"
+    ),
+}
+
+_PROTOCOL_PLACEHOLDERS = {
+    "MQTT": "# mqtt_client.publish(topic=\"${to_ep}\", payload=json.dumps(data))",
+    "HTTP": "# requests.post(\"${to_ep}\", json=data)",
+}
+_DEFAULT_PLACEHOLDER = "# Custom protocol implementation for ${protocol}"
+
+# Any change to the templates invalidates every recorded layer hash.
+TEMPLATES_HASH = text_hash(json.dumps([_TEMPLATE_SOURCES, _PROTOCOL_PLACEHOLDERS, _DEFAULT_PLACEHOLDER],
+                                      sort_keys=True))
+
+
+@lru_cache(maxsize=None)
+def _compiled(source: str) -> Template:
+    """Compile a template source once and reuse it across layers and runs."""
+    return Template(source)
+
+
+def _render(name: str, **values: Any) -> str:
+    return _compiled(_TEMPLATE_SOURCES[name]).substitute(values)
+
+
+class CodeGenAgent:
+    """Generate code skeletons for each deployment layer"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        # None -> one worker per non-empty layer
+        self.max_workers = max_workers
+
     def generate_code(self, bindings_data: Dict[str, Any], ir_data: Dict[str, Any],
                      output_dir: str, bindings_hash: str, case_id: str) -> Dict[str, Any]:
-        """Generate code for cloud/edge/device layers with traceability manifest"""
+        """Generate code for cloud/edge/device layers with traceability manifest.
+
+        Each layer is hashed over its slice of bindings/IR; layers whose hash matches
+        the previous manifest in ``output_dir`` are not re-rendered, and files whose
+        content is unchanged are not rewritten (their mtimes are preserved).
+        """
 
         # Group placements by layer
         layers = {'cloud': [], 'edge': [], 'device': []}
@@ -31,35 +142,37 @@ class CodeGenAgent:
         endpoints_preview = endpoints_used[:3]
         components_bound = [cb.get("component") for cb in bindings_data.get("component_bindings", []) if cb.get("component")]
 
-        for layer, placements in layers.items():
-            if placements:
-                code_dir = os.path.join(output_dir, 'generated_code', layer)
-                os.makedirs(code_dir, exist_ok=True)
-
-                # Generate main.py for each layer
-                code_content = self._generate_layer_code(layer, placements, bindings_data, ir_data,
-                                                         bindings_hash, endpoints_preview)
-                code_file = os.path.join(code_dir, 'main.py')
-
-                with open(code_file, 'w', encoding='utf-8') as f:
-                    f.write(code_content)
-
-                # Minimal requirements and Dockerfile placeholders
-                req_path = os.path.join(code_dir, 'requirements.txt')
-                with open(req_path, 'w', encoding='utf-8') as f:
-                    f.write("paho-mqtt\nrequests\n")
-
-                dockerfile_path = os.path.join(code_dir, 'Dockerfile')
-                with open(dockerfile_path, 'w', encoding='utf-8') as f:
-                    f.write(
-                        "FROM python:3.10-slim\n"
-                        "WORKDIR /app\n"
-                        "COPY . /app\n"
-                        "RUN pip install --no-cache-dir -r requirements.txt\n"
-                        "CMD [\"python\", \"main.py\"]\n"
-                    )
-
-                generated_files[layer] = code_file
+        code_root = os.path.join(output_dir, 'generated_code')
+        manifest_path = os.path.join(code_root, 'manifest.json')
+        previous_hashes = self._previous_layer_hashes(manifest_path)
+        layer_hashes: Dict[str, str] = {}
+        regenerated: List[str] = []
+        skipped: List[str] = []
+
+        jobs = [(layer, placements) for layer, placements in layers.items() if placements]
+        for layer, _ in jobs:
+            generated_files[layer] = os.path.join(code_root, layer, 'main.py')
+
+        def build(job):
+            layer, placements = job
+            started = time.perf_counter()
+            layer_hash, written = self._build_layer(layer, placements, bindings_data, ir_data, code_root,
+                                                    bindings_hash, endpoints_preview, previous_hashes.get(layer))
+            return layer, layer_hash, written, round((time.perf_counter() - started) * 1000, 3)
+
+        # Layers are independent: render and write them concurrently
+        workers = min(self.max_workers or len(jobs) or 1, len(jobs) or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(build, jobs))
+        else:
+            results = [build(job) for job in jobs]
+
+        layer_timings: Dict[str, float] = {}
+        for layer, layer_hash, written, duration_ms in results:
+            layer_hashes[layer] = layer_hash
+            layer_timings[layer] = duration_ms
+            (regenerated if written else skipped).append(layer)
 
         # Traceability manifest
         manifest = {
@@ -67,154 +180,161 @@ class CodeGenAgent:
             "bindings_hash": bindings_hash,
             "placements_summary": bindings_data.get("placements", []),
             "endpoints_used": endpoints_used,
-            "components_bound": components_bound
+            "components_bound": components_bound,
+            "templates_hash": TEMPLATES_HASH,
+            "layer_hashes": layer_hashes,
         }
-        manifest_path = os.path.join(output_dir, 'generated_code', 'manifest.json')
-        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.makedirs(code_root, exist_ok=True)
+        self._write_if_changed(manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False))
 
         return {
             "generated_files": generated_files,
             "manifest": manifest_path,
             "bindings_hash": bindings_hash,
+            "layer_hashes": layer_hashes,
+            "regenerated_layers": regenerated,
+            "skipped_layers": skipped,
+            "layer_timings_ms": layer_timings,
             "summary": f"Generated code for {len(generated_files)} layers with manifest"
+                       + (f" ({len(skipped)} unchanged)" if skipped else "")
         }
 
-    def _generate_layer_code(self, layer: str, placements: list, bindings_data: Dict[str, Any],
-                            ir_data: Dict[str, Any], bindings_hash: str, endpoints_preview: List[str]) -> str:
-        """Generate code skeleton for a specific layer with traceability comments"""
-
-        # Extract component IDs for this layer (support both component_id and entity_id)
+    def _build_layer(self, layer: str, placements: list, bindings_data: Dict[str, Any], ir_data: Dict[str, Any],
+                     code_root: str, bindings_hash: str, endpoints_preview: List[str],
+                     previous_hash: Optional[str]) -> Tuple[str, bool]:
+        """Render and write one layer; returns (layer_hash, regenerated)"""
+        code_dir = os.path.join(code_root, layer)
+        files = {
+            'main.py': os.path.join(code_dir, 'main.py'),
+            'requirements.txt': os.path.join(code_dir, 'requirements.txt'),
+            'Dockerfile': os.path.join(code_dir, 'Dockerfile'),
+        }
+        layer_hash = stable_hash({
+            "templates": TEMPLATES_HASH,
+            "layer": layer,
+            "bindings_hash": bindings_hash,
+            "endpoints_preview": endpoints_preview,
+            **self._layer_slice(placements, bindings_data, ir_data),
+        })
+        if previous_hash == layer_hash and all(os.path.exists(p) for p in files.values()):
+            return layer_hash, False
+
+        os.makedirs(code_dir, exist_ok=True)
+        code_content = self._generate_layer_code(layer, placements, bindings_data, ir_data,
+                                                 bindings_hash, endpoints_preview)
+        self._write_if_changed(files['main.py'], code_content)
+        # Minimal requirements and Dockerfile placeholders
+        self._write_if_changed(files['requirements.txt'], _render("requirements"))
+        self._write_if_changed(files['Dockerfile'], _render("dockerfile"))
+        return layer_hash, True
+
+    def _layer_slice(self, placements: list, bindings_data: Dict[str, Any],
+                     ir_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Collect the bindings/IR inputs that a layer's generated files depend on"""
         component_ids = [p.get('component_id', p.get('entity_id', '')) for p in placements]
+        endpoints = self._layer_endpoints(component_ids, bindings_data, ir_data)
+        link_ids = [ep.get('link_id') for ep in endpoints]
+        return {
+            "placements": placements,
+            "components": [self._find_component(cid, ir_data) for cid in component_ids],
+            "endpoints": endpoints,
+            "transports": [self._find_transport(lid, bindings_data) for lid in link_ids],
+        }
 
-        # Find relevant endpoints
+    def _layer_endpoints(self, component_ids: List[str], bindings_data: Dict[str, Any],
+                         ir_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Endpoint mappings whose link touches any component of the layer"""
         endpoints = []
         for endpoint_mapping in bindings_data.get('endpoints', []):
-            # Check if this link involves any component in this layer
-            link_id = endpoint_mapping['link_id']
-            link = self._find_link(link_id, ir_data)
+            link = self._find_link(endpoint_mapping['link_id'], ir_data)
             if link and (link['from'] in component_ids or link['to'] in component_ids):
                 endpoints.append(endpoint_mapping)
+        return endpoints
 
-        # Generate code template
-        preview_line = ""
-        if endpoints_preview:
-            preview_line = f"# endpoints_used_preview: {', '.join(endpoints_preview)}\n"
-
-        code = f"""#!/usr/bin/env python3
-# bindings_hash: {bindings_hash}
-{preview_line}# Generated code for {layer.upper()} layer
-# Auto-generated by AutoPipeline CodeGen
-
-import json
-import time
-from typing import Dict, Any, List
-
-
-class {layer.capitalize()}Service:
-    \"\"\"
-    Service running on {layer} layer
-
-    Components handled:
-"""
-
-        for placement in placements:
-            component_id = placement.get('component_id', placement.get('entity_id', ''))
-            component = self._find_component(component_id, ir_data)
-            if component:
-                code += f"    - {component_id}: {component.get('type', 'unknown')} (capabilities: {', '.join(component.get('capabilities', []))})\n"
-
-        code += f"""    \"\"\"
-
-    def __init__(self):
-        self.running = False
-        print(f"[{layer.upper()}] Service initialized")
-        self.endpoints = {json.dumps(endpoints_preview)}
-        self.bindings_hash = "{bindings_hash}"
-
-    def start(self):
-        \"\"\"Start the service\"\"\"
-        self.running = True
-        print(f"[{layer.upper()}] Service started with bindings_hash={{self.bindings_hash}}")
-        if self.endpoints:
-            print(f"[{layer.upper()}] Endpoints preview: {{{{self.endpoints}}}}")
-
-        # TODO: Initialize connections to endpoints
-"""
-
-        for endpoint_mapping in endpoints:
-            code += f"        # TODO: Connect to endpoint: {endpoint_mapping['from_endpoint']} -> {endpoint_mapping['to_endpoint']}\n"
-
-        code += f"""
-        self.run()
+    def _generate_layer_code(self, layer: str, placements: list, bindings_data: Dict[str, Any],
+                            ir_data: Dict[str, Any], bindings_hash: str, endpoints_preview: List[str]) -> str:
+        """Generate code skeleton for a specific layer with traceability comments"""
 
-    def run(self):
-        \"\"\"Main service loop\"\"\"
-        while self.running:
-            # TODO: Implement main logic
-"""
+        # Extract component IDs for this layer (support both component_id and entity_id)
+        component_ids = [p.get('component_id', p.get('entity_id', '')) for p in placements]
+        endpoints = self._layer_endpoints(component_ids, bindings_data, ir_data)
 
-        for placement in placements:
-            component_id = placement.get('component_id', placement.get('entity_id', ''))
+        components_doc = []
+        capability_todos = []
+        for component_id in component_ids:
             component = self._find_component(component_id, ir_data)
             if component:
-                capabilities = component.get('capabilities', [])
-                code += f"            # TODO: Execute {component_id} capabilities: {', '.join(capabilities)}\n"
+                capabilities = ', '.join(component.get('capabilities', []))
+                components_doc.append(
+                    f"    - {component_id}: {component.get('type', 'unknown')} (capabilities: {capabilities})\n")
+                capability_todos.append(f"            # TODO: Execute {component_id} capabilities: {capabilities}\n")
 
-        code += """
-            print(f\"[{layer.upper()}] heartbeat - running\")\n            time.sleep(1)  # Placeholder loop
-
-"""
+        connect_todos = [
+            f"        # TODO: Connect to endpoint: {ep['from_endpoint']} -> {ep['to_endpoint']}\n"
+            for ep in endpoints
+        ]
 
         # Add endpoint communication functions
+        methods = []
         for endpoint_mapping in endpoints:
-            from_ep = endpoint_mapping['from_endpoint']
-            to_ep = endpoint_mapping['to_endpoint']
             link_id = endpoint_mapping['link_id']
-
-            # Find transport protocol
             transport = self._find_transport(link_id, bindings_data)
             protocol = transport.get('protocol', 'HTTP') if transport else 'HTTP'
+            values = {
+                "link_id": link_id,
+                "protocol": protocol,
+                "from_ep": endpoint_mapping['from_endpoint'],
+                "to_ep": endpoint_mapping['to_endpoint'],
+                "layer_upper": layer.upper(),
+            }
+            placeholder = _compiled(_PROTOCOL_PLACEHOLDERS.get(protocol, _DEFAULT_PLACEHOLDER)).substitute(values)
+            methods.append(_render("communicate", placeholder=placeholder, **values))
 
-            code += f"""    def communicate_via_{link_id}(self, data: Dict[str, Any]):
-        \"\"\"
-        Send data via {link_id}
-        Protocol: {protocol}
-        From: {from_ep}
-        To: {to_ep}
-        \"\"\"
-        # TODO: Implement {protocol} communication
-        print(f"[{layer.upper()}] Sending data via {protocol}: {{data}}")
-
-        # Placeholder for actual implementation:
-"""
-
-            if protocol == 'MQTT':
-                code += f"""        # mqtt_client.publish(topic="{to_ep}", payload=json.dumps(data))
-"""
-            elif protocol == 'HTTP':
-                code += f"""        # requests.post("{to_ep}", json=data)
-"""
-            else:
-                code += f"""        # Custom protocol implementation for {protocol}
-"""
-
-            code += f"""        pass
-
-"""
-
-        # Add main block
-        code += f"""
-if __name__ == "__main__":
-    service = {layer.capitalize()}Service()
-    try:
-        service.start()
-    except KeyboardInterrupt:
-        print(f"[{layer.upper()}] Service stopped")
-"""
+        preview_line = ""
+        if endpoints_preview:
+            preview_line = f"# endpoints_used_preview: {', '.join(endpoints_preview)}\n"
 
-        return code
+        return _render(
+            "main",
+            bindings_hash=bindings_hash,
+            preview_line=preview_line,
+            layer=layer,
+            layer_upper=layer.upper(),
+            class_name=f"{layer.capitalize()}Service",
+            components_doc="".join(components_doc),
+            endpoints_json=json.dumps(endpoints_preview),
+            connect_todos="".join(connect_todos),
+            capability_todos="".join(capability_todos),
+            communicate_methods="".join(methods),
+        )
+
+    def _previous_layer_hashes(self, manifest_path: str) -> Dict[str, str]:
+        """Layer hashes recorded by an earlier generation into the same output dir"""
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if previous.get("templates_hash") != TEMPLATES_HASH:
+            return {}
+        return previous.get("layer_hashes") or {}
+
+    def _write_if_changed(self, path: str, content: str) -> bool:
+        """Write content unless the file already holds exactly it (keeps mtime stable)"""
+        existing: Optional[str] = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    existing = f.read()
+            except OSError:
+                existing = None
+        if existing == content:
+            return False
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return True
 
     def _find_component(self, component_id: str, ir_data: Dict[str, Any]) -> Dict[str, Any]:
         """Find component by ID in IR (supports both 'components' and 'entities')"""
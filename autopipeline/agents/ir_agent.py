@@ -1,10 +1,11 @@
 """IR Agent - generates IR from plan and user problem"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import yaml
 from autopipeline.llm.llm_client import LLMClient
-from autopipeline.llm.decode import decode_payload, minimal_ir_check, LLMOutputFormatError, populate_ir_defaults
+from autopipeline.llm.decode import minimal_ir_check, LLMOutputFormatError, populate_ir_defaults
+from autopipeline.llm.types import LLMResult
 
 
 class IRAgent:
@@ -21,7 +22,7 @@ class IRAgent:
 
         Uses LLM client; returns parsed IR dict.
         """
-        ir_yaml = self.llm.generate_ir(
+        result = self.llm.generate_ir(
             case_id=rules_ctx.get("case_id", ""),
             user_problem=user_problem,
             device_info=device_info,
@@ -30,13 +31,47 @@ class IRAgent:
             prompt_name="ir_agent",
             attempt=attempt
         )
-        ir_obj, _ = decode_payload(ir_yaml, expected="yaml", stage="ir", attempt=attempt,
-                                   output_dir=str(self.llm._raw_dir(rules_ctx.get("case_id", "unknown"))))
-        ir_obj = populate_ir_defaults(ir_obj, case_id=rules_ctx.get("case_id", ""), plan_data=plan_data, user_problem=user_problem)
+        return self._decode_ir(result, plan_data, user_problem, rules_ctx, attempt)
+
+    def generate_ir_candidates(self, plan_data: Dict[str, Any], user_problem: Dict[str, Any],
+                               device_info: Dict[str, Any], rules_ctx: Dict[str, Any],
+                               schema_versions: Dict[str, Any], k: int, tiers: Optional[List[str]] = None,
+                               attempt: int = 1) -> Iterator[Dict[str, Any]]:
+        """Speculative generation: yield k decoded candidates as they arrive.
+
+        Each item carries "candidate", "tier", "latency_ms" and either "data" (parsed IR)
+        or "error" (decode/provider failure). Close the iterator to cancel the rest.
+        """
+        arrivals = self.llm.generate_ir_candidates(
+            case_id=rules_ctx.get("case_id", ""),
+            user_problem=user_problem,
+            device_info=device_info,
+            rules_ctx=rules_ctx,
+            schema_versions=schema_versions,
+            k=k,
+            tiers=tiers,
+            prompt_name="ir_agent",
+            attempt=attempt
+        )
+        try:
+            for item in arrivals:
+                if item["error"] is None:
+                    try:
+                        item["data"] = self._decode_ir(item["result"], plan_data, user_problem, rules_ctx, attempt)
+                    except LLMOutputFormatError as e:
+                        item["error"] = e
+                yield item
+        finally:
+            arrivals.close()
+
+    def _decode_ir(self, result: LLMResult, plan_data: Dict[str, Any], user_problem: Dict[str, Any],
+                   rules_ctx: Dict[str, Any], attempt: int) -> Dict[str, Any]:
+        """Apply IR defaults to the payload the client already parsed (and saved) for this call."""
+        ir_obj = populate_ir_defaults(result.value(), case_id=rules_ctx.get("case_id", ""), plan_data=plan_data,
+                                      user_problem=user_problem)
         if not minimal_ir_check(ir_obj):
             raise LLMOutputFormatError("IR minimal check failed (missing required top-level keys)",
-                                       stage="ir", attempt=attempt,
-                                       raw_path=str(self.llm._raw_dir(rules_ctx.get("case_id", "unknown"))))
+                                       stage="ir", attempt=attempt, raw_path=result.raw_path)
         return ir_obj
 
     def _simulate_ir_generation(self, plan_data: Dict[str, Any], user_problem: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,9 +1,11 @@
 """Repair Agent - delegates IR/Bindings repair to LLMClient"""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import yaml
 from autopipeline.llm.llm_client import LLMClient
-from autopipeline.llm.decode import decode_payload, minimal_ir_check, minimal_bindings_check, LLMOutputFormatError, populate_ir_defaults
+from autopipeline.llm.decode import minimal_ir_check, minimal_bindings_check, LLMOutputFormatError, populate_ir_defaults
+from autopipeline.repair.context_pack import build_patch_context
+from autopipeline.repair.json_patch import JsonPatchError, apply_patch
 
 
 class RepairAgent:
@@ -15,7 +17,7 @@ class RepairAgent:
 
     def repair_ir(self, ir_data: Dict[str, Any], error_message: str, device_info: Dict[str, Any],
                   rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any], attempt: int = 1) -> Dict[str, Any]:
-        repaired_yaml = self.llm.repair_ir(
+        result = self.llm.repair_ir(
             case_id=rules_ctx.get("case_id", ""),
             ir_draft=ir_data,
             verifier_errors={"error": error_message},
@@ -24,19 +26,17 @@ class RepairAgent:
             prompt_name="repair_agent",
             attempt=attempt
         )
-        repaired, _ = decode_payload(repaired_yaml, expected="yaml", stage="repair_ir", attempt=attempt,
-                                     output_dir=str(self.llm._raw_dir(rules_ctx.get("case_id", "unknown"))))
-        repaired = populate_ir_defaults(repaired, case_id=rules_ctx.get("case_id", ""),
+        repaired = populate_ir_defaults(result.value(), case_id=rules_ctx.get("case_id", ""),
                                         plan_data=ir_data, user_problem=None, fallback=ir_data)
         if not minimal_ir_check(repaired):
             raise LLMOutputFormatError("Repaired IR missing required top-level fields",
-                                       stage="repair_ir", attempt=attempt)
+                                       stage="repair_ir", attempt=attempt, raw_path=result.raw_path)
         return repaired
 
     def repair_bindings(self, bindings_data: Dict[str, Any], error_message: str,
                        ir_data: Dict[str, Any], device_info: Dict[str, Any],
                        rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any], attempt: int = 1) -> Dict[str, Any]:
-        repaired_yaml = self.llm.repair_bindings(
+        result = self.llm.repair_bindings(
             case_id=rules_ctx.get("case_id", ""),
             bindings_draft=bindings_data,
             verifier_errors={"error": error_message},
@@ -45,9 +45,44 @@ class RepairAgent:
             prompt_name="repair_agent",
             attempt=attempt
         )
-        repaired, _ = decode_payload(repaired_yaml, expected="yaml", stage="repair_bindings", attempt=attempt,
-                                     output_dir=str(self.llm._raw_dir(rules_ctx.get("case_id", "unknown"))))
+        repaired = result.value()
         if not minimal_bindings_check(repaired):
             raise LLMOutputFormatError("Repaired bindings missing required fields",
-                                       stage="repair_bindings", attempt=attempt)
+                                       stage="repair_bindings", attempt=attempt, raw_path=result.raw_path)
         return repaired
+
+    def patch_artifact(self, artifact_type: str, data: Dict[str, Any], failures: List[Dict[str, Any]],
+                       schema: Dict[str, Any], rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any],
+                       attempt: int = 1) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Repair via JSON patch over failing subtrees; returns (patched artifact, patch info).
+
+        Raises JsonPatchError when no failure is addressable or the patch does not apply,
+        LLMOutputFormatError when the reply is not a JSON array; callers fall back to full repair.
+        """
+        patch_ctx = build_patch_context(data, failures, schema)
+        if not patch_ctx["errors"]:
+            raise JsonPatchError("No failure carries a path; patch repair not applicable")
+        stage = f"repair_{artifact_type}_patch"
+        result = self.llm.repair_patch(
+            case_id=rules_ctx.get("case_id", ""),
+            artifact_type=artifact_type,
+            patch_context=patch_ctx,
+            rules_ctx=rules_ctx,
+            schema_versions=schema_versions,
+            attempt=attempt,
+        )
+        ops = result.value()
+        if not isinstance(ops, list):
+            raise LLMOutputFormatError("Patch reply is not a JSON array", stage=stage, attempt=attempt,
+                                       raw_path=result.raw_path)
+        patched = apply_patch(data, ops)
+        check = minimal_ir_check if artifact_type == "ir" else minimal_bindings_check
+        if not check(patched):
+            raise JsonPatchError(f"Patched {artifact_type} missing required top-level fields")
+        info = {
+            "patch_ops": len(ops),
+            "patch_errors": len(patch_ctx["errors"]),
+            "patch_subtrees": len(patch_ctx["subtrees"]),
+            "patch_unaddressed": patch_ctx["unaddressed"],
+        }
+        return patched, info
@@ -0,0 +1,177 @@
+"""Background writer for run-directory artifacts.
+
+Stages serialize an artifact and hand the text to `ArtifactWriter`; one daemon thread
+does the file I/O in submission order, so the pipeline does not wait on disk. Parent
+directories are created once per path, debug artifacts (per-attempt bindings drafts,
+``llm_raw`` dumps, resolved prompts) can be gzip-compressed to ``<name>.gz``, and
+`flush(fsync=True)` is the barrier taken before eval.json is written. Text still queued
+is served by `read_text`, so code that reads an artifact back never sees a stale file.
+"""
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import yaml
+
+_STOP = object()
+
+
+def read_artifact_text(path: str) -> Optional[str]:
+    """Read an artifact from disk, falling back to its compressed ``.gz`` twin; None if neither exists."""
+    path = str(path)
+    for candidate in (path, path + ".gz"):
+        if not os.path.exists(candidate):
+            continue
+        opener = gzip.open if candidate.endswith(".gz") else open
+        with opener(candidate, "rt", encoding="utf-8") as f:
+            return f.read()
+    return None
+
+
+class ArtifactWriter:
+    """Write-behind artifact sink for one run (``background=False`` writes inline)."""
+
+    def __init__(self, background: bool = True, compress_debug: bool = False, fsync: bool = True):
+        self.background = background
+        self.compress_debug = compress_debug
+        self.fsync = fsync
+        self.errors: List[str] = []
+        self.stats = {
+            "files": 0,
+            "chars": 0,
+            "compressed": 0,
+            "dirs_created": 0,
+            "write_ms": 0.0,
+            "queue_peak": 0,
+            "barriers": 0,
+            "barrier_ms": 0.0,
+            "fsynced": 0,
+        }
+        self._dirs: Set[str] = set()
+        # path -> text submitted but not yet on disk (latest submission wins)
+        self._pending: Dict[str, str] = {}
+        self._unsynced: List[str] = []
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def write_text(self, path: str, text: str, debug: bool = False) -> str:
+        """Queue `text` for `path`; returns the path actually written (``.gz`` for compressed debug artifacts)."""
+        path = str(path)
+        if debug and self.compress_debug:
+            path += ".gz"
+        with self._lock:
+            self._pending[path] = text
+        if not self.background:
+            self._write(path, text)
+            return path
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+            self._thread.start()
+        self._queue.put((path, text))
+        self.stats["queue_peak"] = max(self.stats["queue_peak"], self._queue.qsize())
+        return path
+
+    def write_json(self, path: str, data: Any, debug: bool = False, indent: int = 2) -> str:
+        # Serialized now: callers keep mutating their dicts after handing them over
+        return self.write_text(path, json.dumps(data, indent=indent, ensure_ascii=False), debug=debug)
+
+    def write_yaml(self, path: str, data: Any, debug: bool = False) -> str:
+        return self.write_text(path, yaml.dump(data, default_flow_style=False, allow_unicode=True), debug=debug)
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Latest text for `path` (or its ``.gz`` twin), whether still queued or already on disk."""
+        path = str(path)
+        with self._lock:
+            for candidate in (path, path + ".gz"):
+                if candidate in self._pending:
+                    return self._pending[candidate]
+        return read_artifact_text(path)
+
+    def flush(self, fsync: bool = False) -> List[str]:
+        """Block until every queued artifact is on disk (and fsync'ed if asked); returns write errors so far."""
+        started = time.perf_counter()
+        if self._thread is not None:
+            self._queue.join()
+        if fsync and self.fsync:
+            self._sync()
+        self.stats["barriers"] += 1
+        self.stats["barrier_ms"] = round(self.stats["barrier_ms"] + (time.perf_counter() - started) * 1000, 3)
+        return list(self.errors)
+
+    def close(self):
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: str, text: str):
+        started = time.perf_counter()
+        try:
+            parent = os.path.dirname(path)
+            if parent and parent not in self._dirs:
+                os.makedirs(parent, exist_ok=True)
+                self._dirs.add(parent)
+                self.stats["dirs_created"] += 1
+            if path.endswith(".gz"):
+                with gzip.open(path, "wt", encoding="utf-8") as f:
+                    f.write(text)
+                self.stats["compressed"] += 1
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            self.stats["files"] += 1
+            self.stats["chars"] += len(text)
+            self._unsynced.append(path)
+        except Exception as e:
+            # Not only OSError (e.g. an unencodable lone surrogate): the writer thread must
+            # survive, or items queued after this one are never done and flush() hangs
+            self.errors.append(f"{path}: {e}")
+        finally:
+            with self._lock:
+                if self._pending.get(path) is text:
+                    del self._pending[path]
+            self.stats["write_ms"] = round(self.stats["write_ms"] + (time.perf_counter() - started) * 1000, 3)
+
+    def _sync(self):
+        dirs = set()
+        for path in dict.fromkeys(self._unsynced):
+            try:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                self.stats["fsynced"] += 1
+                dirs.add(os.path.dirname(path))
+            except OSError as e:
+                self.errors.append(f"fsync {path}: {e}")
+        for d in dirs:
+            # New directory entries are durable only once the directory itself is synced (POSIX)
+            try:
+                fd = os.open(d or ".", os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+        self._unsynced = []
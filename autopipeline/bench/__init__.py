@@ -1,6 +1,15 @@
 """Batch benchmarking helpers for AutoPipeline."""
 
-from autopipeline.bench.aggregate import aggregate_runs
-from autopipeline.bench.plots import generate_plots
+
+def __getattr__(name):
+    """Lazy exports: importing a bench submodule does not load aggregation or plotting."""
+    if name == "aggregate_runs":
+        from autopipeline.bench.aggregate import aggregate_runs
+        return aggregate_runs
+    if name == "generate_plots":
+        from autopipeline.bench.plots import generate_plots
+        return generate_plots
+    raise AttributeError(f"module 'autopipeline.bench' has no attribute {name}")
+
 
 __all__ = ["aggregate_runs", "generate_plots"]
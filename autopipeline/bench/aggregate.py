@@ -1,85 +1,177 @@
-"""Aggregate multiple eval.json files into CSV summaries."""
+"""Aggregate multiple eval.json files into CSV summaries, a typed dataset and an OpenMetrics export."""
 
 import csv
-import json
 from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
-
-from autopipeline.utils import load_json, ensure_dir
-
-
-def _summarize_eval(eval_data: Dict[str, Any], eval_path: Path) -> Dict[str, Any]:
-    failures = eval_data.get("failures_flat", []) or []
-    fail_codes = Counter([f.get("code", "E_UNKNOWN") for f in failures])
-    error_code_top1 = (fail_codes.most_common(1)[0][0] if fail_codes else (eval_data.get("error", {}) or {}).get("code", "E_UNKNOWN"))
-    pipeline = eval_data.get("pipeline", {}).get("stages", {})
-    duration_total = sum(stage.get("duration_ms", 0) for stage in pipeline.values())
-    attempts = [stage.get("attempts", 0) for stage in pipeline.values() if stage.get("attempts") is not None]
-    avg_attempts = sum(attempts) / len(attempts) if attempts else 0
-    config = eval_data.get("pipeline", {}).get("config", {})
-    attempts_by_stage = {k: v.get("attempts", 0) for k, v in pipeline.items()}
-    status_static = eval_data.get("overall_static_status") or eval_data.get("overall_status")
-    runtime_status = eval_data.get("overall_runtime_status")
-    if not runtime_status:
-        runtime_status = (eval_data.get("checks", {}).get("runtime_compose", {}) or {}).get("status", "SKIP")
-    sem_warnings = []
-    sem_val = (eval_data.get("validators") or {}).get("semantic_proxy") or {}
-    for w in sem_val.get("warnings", []) or []:
-        if isinstance(w, dict):
-            sem_warnings.append(w.get("code") or "")
-        elif isinstance(w, str):
-            sem_warnings.append("")
-    sem_counter = Counter([c for c in sem_warnings if c])
-
-    row = {
-        "eval_path": str(eval_path),
-        "case_id": eval_data.get("case_id"),
-        "run_id": config.get("run_id"),
-        "output_dir": config.get("output_dir"),
-        "status": eval_data.get("overall_status"),
-        "status_static": status_static,
-        "status_runtime": runtime_status,
-        "pass": 1 if (status_static == "PASS") else 0,
-        "fail_codes": ";".join([code for code, _ in fail_codes.most_common(3)]),
-        "error_code_top1": error_code_top1,
-        "semantic_warning_count": len(sem_warnings),
-        "semantic_warning_codes_top3": ";".join([code for code, _ in sem_counter.most_common(3)]),
-        "duration_ms_total": duration_total,
-        "attempts_avg": avg_attempts,
-        "attempts_total": sum(attempts) if attempts else 0,
-        "attempts_by_stage": json.dumps(attempts_by_stage),
-        "llm_calls": eval_data.get("llm", {}).get("calls_total"),
-        "cache_hits": eval_data.get("llm", {}).get("cache_hits"),
-        "cache_misses": eval_data.get("llm", {}).get("cache_misses"),
-        "tokens_total": eval_data.get("llm", {}).get("usage_tokens_total"),
-        "provider": eval_data.get("llm", {}).get("provider"),
-        "model": eval_data.get("llm", {}).get("model"),
-        "prompt_tier": config.get("prompt_tier"),
-        "temperature": config.get("temperature"),
-        "repair_enabled": config.get("enable_repair"),
-        "ir_attempts": pipeline.get("ir", {}).get("attempts"),
-        "bindings_attempts": pipeline.get("bindings", {}).get("attempts"),
-        "rules_hash": eval_data.get("llm", {}).get("rules_hash"),
-        "catalog_hashes": eval_data.get("catalog_hashes"),
-    }
+from typing import List, Dict, Any, Optional, Tuple
+
+from autopipeline.bench.dataset import DATASET_DIR, write_partition
+from autopipeline.eval.eval_schema import read_summary
+from autopipeline.llm.telemetry import CALLS_FILE, parse_call_records, percentile, read_call_records
+from autopipeline.repair.attempt_policy import LEDGER_FILE, AttemptLedger
+from autopipeline.run_archive import open_run
+from autopipeline.utils import ensure_dir
+
+METRICS_FILE = "metrics.prom"
+# Summary-record keys that are not summary.csv columns
+_RECORD_ONLY = ("error_codes", "attempt_history", "calls_log")
+
+
+def _call_records(record: Dict[str, Any], run) -> List[Dict[str, Any]]:
+    """Per-call telemetry written next to eval.json (empty for runs that predate it)."""
+    if run.exists(CALLS_FILE):
+        return parse_call_records(run.read_text(CALLS_FILE))
+    if record.get("calls_log"):
+        return read_call_records(Path(record["calls_log"]))
+    return []
+
+
+def _model_key(record: Dict[str, Any]) -> Tuple[str, str]:
+    return str(record.get("provider") or "unknown"), str(record.get("model") or "mock-model")
+
+
+def _summarize_eval(record: Dict[str, Any], eval_path: Path,
+                    calls: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """summary.csv row from a run's summary record (see autopipeline.eval.eval_schema)."""
+    # Cache hits measure a disk lookup, not the provider; keep them out of latency percentiles
+    provider_latency = [c["latency_ms"] for c in calls or [] if not c.get("cache_hit")]
+    row = {"eval_path": str(eval_path)}
+    for key, value in record.items():
+        if key in _RECORD_ONLY:
+            continue
+        if key == "provider":
+            row["llm_latency_ms_p50"] = percentile(provider_latency, 50)
+            row["llm_latency_ms_p95"] = percentile(provider_latency, 95)
+        row[key] = value
     return row
 
 
-def aggregate_runs(eval_paths: List[Path], out_root: Path):
-    """Aggregate eval.json files into summary CSVs. Returns tuple of csv paths."""
+def _model_rows(groups: Dict[Tuple[str, str], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rows = []
+    for (provider, model), g in sorted(groups.items()):
+        calls = g["calls"]
+        live = [c for c in calls if not c.get("cache_hit")]
+        cost = round(sum(c.get("cost_usd_est") or 0.0 for c in calls), 8)
+        rows.append({
+            "provider": provider,
+            "model": model,
+            "runs": g["runs"],
+            "passes": g["passes"],
+            "pass_rate": round(g["passes"] / g["runs"], 4) if g["runs"] else 0.0,
+            "llm_calls": len(calls),
+            "llm_calls_uncached": len(live),
+            "llm_errors": sum(1 for c in calls if c.get("error")),
+            "llm_retries": sum(c.get("retries", 0) for c in calls),
+            "latency_ms_p50": percentile((c["latency_ms"] for c in live), 50),
+            "latency_ms_p95": percentile((c["latency_ms"] for c in live), 95),
+            "ttfb_ms_p50": percentile((c.get("ttfb_ms") for c in live), 50),
+            "ttfb_ms_p95": percentile((c.get("ttfb_ms") for c in live), 95),
+            "tokens_input": sum(c.get("input_tokens", 0) for c in live),
+            "tokens_cached": sum(c.get("cached_tokens", 0) for c in live),
+            "tokens_output": sum(c.get("output_tokens", 0) for c in live),
+            "cost_usd_est": cost,
+            "cost_usd_per_pass": round(cost / g["passes"], 8) if g["passes"] else None,
+            "policy_skipped_attempts": g["policy_skipped_attempts"],
+            "policy_saved_calls_est": round(g["policy_saved_calls_est"], 3),
+            "policy_saved_ms_est": round(g["policy_saved_ms_est"], 3),
+        })
+    return rows
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def render_openmetrics(groups: Dict[Tuple[str, str], Dict[str, Any]]) -> str:
+    """OpenMetrics text exposition of per-model bench telemetry (also valid Prometheus text)."""
+    rows = _model_rows(groups)
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help_text}")
+        for suffix, labels, value in samples:
+            if value is None:
+                continue
+            label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{suffix}{{{label_text}}} {value}")
+
+    def base(row):
+        return {"provider": row["provider"], "model": row["model"]}
+
+    family("autopipeline_runs", "counter", "Pipeline runs by static status.",
+           [("_total", {**base(r), "status": status}, n)
+            for r in rows for status, n in (("PASS", r["passes"]), ("FAIL", r["runs"] - r["passes"]))])
+    family("autopipeline_llm_calls", "counter", "LLM calls by cache outcome.",
+           [("_total", {**base(r), "cache": cache}, n) for r in rows
+            for cache, n in (("hit", r["llm_calls"] - r["llm_calls_uncached"]), ("miss", r["llm_calls_uncached"]))])
+    family("autopipeline_llm_errors", "counter", "Provider calls that failed after retries.",
+           [("_total", base(r), r["llm_errors"]) for r in rows])
+    family("autopipeline_llm_retries", "counter", "Provider call retries.",
+           [("_total", base(r), r["llm_retries"]) for r in rows])
+    family("autopipeline_llm_tokens", "counter", "Provider tokens (cache misses only).",
+           [("_total", {**base(r), "kind": kind}, r[f"tokens_{kind}"]) for r in rows
+            for kind in ("input", "cached", "output")])
+    family("autopipeline_llm_cost_usd", "counter", "Estimated provider cost from the local price table.",
+           [("_total", base(r), r["cost_usd_est"]) for r in rows])
+    family("autopipeline_policy_saved_calls", "counter", "LLM calls not made because the attempt policy stopped early (est.).",
+           [("_total", base(r), r["policy_saved_calls_est"]) for r in rows])
+    family("autopipeline_cost_per_pass_usd", "gauge", "Estimated cost divided by PASS runs.",
+           [("", base(r), r["cost_usd_per_pass"]) for r in rows])
+    for metric, help_text in (("latency_ms", "Provider call latency (cache misses)."),
+                              ("ttfb_ms", "Provider time to first byte (cache misses).")):
+        samples = []
+        for (provider, model), g in sorted(groups.items()):
+            values = [c.get(metric) for c in g["calls"] if not c.get("cache_hit") and c.get(metric) is not None]
+            labels = {"provider": provider, "model": model}
+            for q in (0.5, 0.95, 0.99):
+                samples.append(("", {**labels, "quantile": q}, percentile(values, q * 100)))
+            samples.append(("_sum", labels, round(sum(values), 3)))
+            samples.append(("_count", labels, len(values)))
+        family(f"autopipeline_llm_{metric}", "summary", help_text, samples)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def aggregate_runs(eval_paths: List[Path], out_root: Path, dataset_root: Optional[Path] = None,
+                   tag: Optional[str] = None):
+    """Aggregate eval.json files (or packed runs) into summary CSVs. Returns tuple of csv paths.
+
+    Also writes summary_by_model.csv (latency percentiles, cost per PASS, attempts saved by
+    the attempt policy), metrics.prom (OpenMetrics) from the per-call telemetry next to each
+    eval.json, and attempt_ledger.json learned from these runs. The summary rows also go to
+    the ``tag`` partition (default: out_root's name) of the typed dataset at `dataset_root`
+    (default: out_root/dataset; see autopipeline.bench.dataset).
+    """
     ensure_dir(str(out_root))
     summary_rows = []
+    dataset_rows = []
     error_counter = Counter()
+    groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    ledger = AttemptLedger()
     for path in eval_paths:
-        data = load_json(str(path))
-        summary_rows.append(_summarize_eval(data, path))
-        for f in data.get("failures_flat", []) or []:
-            error_counter[f.get("code", "E_UNKNOWN")] += 1
-        # Also include top-level error code if present
-        err_top = (data.get("error", {}) or {}).get("code")
-        if err_top:
-            error_counter[err_top] += 1
+        # eval.json paths or packed run archives (autopipeline.run_archive); only the
+        # per-run summary record is read, falling back to eval.json for older runs
+        with open_run(path) as run:
+            record = read_summary(run)
+            calls = _call_records(record, run)
+            archive = run.path if run.packed else None
+        row = _summarize_eval(record, path, calls)
+        if archive is not None:
+            # The recorded run directory was removed when the run was packed
+            row["output_dir"] = str(archive)
+        summary_rows.append(row)
+        dataset_rows.append({**row, "error_codes": record.get("error_codes")})
+        ledger.add_summary(record)
+        group = groups.setdefault(_model_key(record), {"runs": 0, "passes": 0, "calls": [], "policy_skipped_attempts": 0,
+                                                     "policy_saved_calls_est": 0.0, "policy_saved_ms_est": 0.0})
+        group["runs"] += 1
+        group["passes"] += row["pass"]
+        group["calls"].extend(calls)
+        for key in ("policy_skipped_attempts", "policy_saved_calls_est", "policy_saved_ms_est"):
+            group[key] += row[key]
+        # Failure codes plus the top-level error code, if any
+        error_counter.update(record.get("error_codes") or {})
 
     summary_path = out_root / "summary.csv"
     if summary_rows:
@@ -98,4 +190,15 @@ def aggregate_runs(eval_paths: List[Path], out_root: Path):
         for code, cnt in error_counter.most_common():
             writer.writerow([code, cnt])
 
+    model_rows = _model_rows(groups)
+    if model_rows:
+        with open(out_root / "summary_by_model.csv", 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(model_rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(model_rows)
+    (out_root / METRICS_FILE).write_text(render_openmetrics(groups), encoding="utf-8")
+    write_partition(dataset_rows, dataset_root or out_root / DATASET_DIR, tag or Path(out_root).name)
+    # Feed the next run's --attempt-ledger
+    ledger.save(out_root / LEDGER_FILE)
+
     return summary_path, summary_error_path
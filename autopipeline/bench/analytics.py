@@ -0,0 +1,184 @@
+"""Vectorized bench analytics.
+
+Bench runs (dataset rows from autopipeline.bench.dataset, or a summary.csv) are loaded
+into one pandas DataFrame; every grouped metric is one ``groupby`` over it, and pass-rate
+confidence intervals are bootstrapped for all groups in a single NumPy draw. Plotting
+(weekly_plots) only renders these tables, so reports over tens of thousands of runs do
+not loop over rows in Python. pandas and numpy are imported on use, as elsewhere in the
+bench tooling.
+"""
+
+import ast
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Groupings of `weekly_report` (only those whose columns are present are computed)
+GROUPINGS: Dict[str, Tuple[str, ...]] = {
+    "by_case": ("case_id", "prompt_tier", "repair_flag"),
+    "by_tier_repair": ("prompt_tier", "repair_flag"),
+    "by_model": ("provider", "model"),
+    "by_temperature": ("temperature",),
+}
+# Source column -> mean column of `grouped_metrics`
+_MEANS = {
+    "attempts_total": "attempts_mean",
+    "tokens_total": "tokens_mean",
+    "total_duration_ms": "duration_ms_mean",
+    "semantic_warning_count": "semantic_warnings_mean",
+}
+# Columns summary.csv stores as JSON (attempts_by_stage) or Python repr (catalog_hashes)
+_NESTED = ("attempts_by_stage", "catalog_hashes", "error_codes")
+
+
+def _parse_nested(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value if isinstance(value, dict) else None
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            parsed = parse(value)
+        except (ValueError, SyntaxError):
+            continue
+        return parsed if isinstance(parsed, dict) else None
+    return None
+
+
+def normalize(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Add the derived columns the metrics use (status_static, repair_flag, pass_static, ...)."""
+    import numpy as np
+
+    df = df.copy()
+    # Older summary.csv column names
+    if "status_static" not in df and "status" in df:
+        df["status_static"] = df["status"]
+    if "attempts_total" not in df and "total_attempts" in df:
+        df["attempts_total"] = df["total_attempts"]
+    if "total_duration_ms" not in df and "duration_ms_total" in df:
+        df["total_duration_ms"] = df["duration_ms_total"]
+    repair = df["repair_enabled"] if "repair_enabled" in df else df["repair"] if "repair" in df else None
+    if repair is None:
+        df["repair_flag"] = "on"
+    else:
+        # bools (typed dataset) and "True"/"on"/"yes" strings (CSV) -> on; missing -> off
+        text = repair.astype("string").str.lower()
+        df["repair_flag"] = np.where(text.str.contains("on", na=False) | text.isin(["true", "yes"]).fillna(False),
+                                     "on", "off")
+    status = df["status_static"].astype("string").str.upper() if "status_static" in df else None
+    df["pass_static"] = status.eq("PASS").fillna(False).astype(bool) if status is not None else False
+    return df
+
+
+def load_frame(source: Union[str, Path, Iterable[Dict[str, Any]], "pd.DataFrame"]) -> "pd.DataFrame":
+    """Normalized frame from a summary.csv path, dataset rows (`read_dataset`) or a DataFrame."""
+    import pandas as pd
+
+    if isinstance(source, (str, Path)):
+        df = pd.read_csv(source)
+        for col in _NESTED:
+            if col in df:
+                df[col] = df[col].map(_parse_nested)
+    elif isinstance(source, pd.DataFrame):
+        df = source
+    else:
+        df = pd.DataFrame(list(source))
+    return normalize(df)
+
+
+def bootstrap_ci(passes, runs, n_boot: int = 2000, alpha: float = 0.05,
+                 seed: int = 0) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Percentile-bootstrap interval of each group's pass rate, all groups in one draw.
+
+    Resampling n PASS/FAIL outcomes with replacement and taking the mean is a
+    Binomial(n, passes/n) draw divided by n, so no per-run resampling is needed.
+    """
+    import numpy as np
+
+    n = np.asarray(runs, dtype=np.int64)
+    k = np.asarray(passes, dtype=np.float64)
+    rate = np.divide(k, n, out=np.zeros_like(k), where=n > 0)
+    rng = np.random.default_rng(seed)
+    draws = rng.binomial(n[:, None], rate[:, None], size=(len(n), n_boot)) / np.maximum(n, 1)[:, None]
+    low, high = np.quantile(draws, [alpha / 2, 1 - alpha / 2], axis=1)
+    return low, high
+
+
+def grouped_metrics(df: "pd.DataFrame", by: Sequence[str], n_boot: int = 2000, alpha: float = 0.05,
+                    seed: int = 0) -> "pd.DataFrame":
+    """Per-group runs, passes, pass rate with bootstrap CI, means and attempt percentiles."""
+    by = list(by)
+    spec = {"runs": ("pass_static", "size"), "passes": ("pass_static", "sum")}
+    for col, name in _MEANS.items():
+        if col in df:
+            spec[name] = (col, "mean")
+    if "cost_usd_est" in df:
+        spec["cost_usd_sum"] = ("cost_usd_est", "sum")
+    grouped = df.groupby(by, sort=True)
+    out = grouped.agg(**spec)
+    out["pass_rate"] = out["passes"] / out["runs"]
+    if n_boot:
+        out["pass_rate_ci_low"], out["pass_rate_ci_high"] = bootstrap_ci(out["passes"], out["runs"], n_boot,
+                                                                         alpha, seed)
+    if "attempts_total" in df:
+        out["attempts_p50"] = grouped["attempts_total"].quantile(0.5)
+        out["attempts_p95"] = grouped["attempts_total"].quantile(0.95)
+    return out
+
+
+def distributions(df: "pd.DataFrame", value: str, by: Sequence[str]) -> Dict[Tuple, "np.ndarray"]:
+    """Non-null `value` samples per group (sorted keys), for box plots."""
+    by = list(by)
+    if value not in df:
+        return {}
+    sub = df[by + [value]].dropna()
+    return {key if isinstance(key, tuple) else (key,): samples.to_numpy()
+            for key, samples in sub.groupby(by, sort=True)[value]}
+
+
+def error_histogram(df: "pd.DataFrame", err_df: Optional["pd.DataFrame"] = None,
+                    topk: Optional[int] = None) -> "pd.Series":
+    """Error code -> count, most frequent first.
+
+    From `err_df` (summary_by_error.csv) when given, else the per-run ``error_codes``
+    (dataset rows), else ``error_code_top1`` of static FAIL runs.
+    """
+    import pandas as pd
+
+    if err_df is not None and len(err_df):
+        code_col = "error_code" if "error_code" in err_df else "code"
+        counts = err_df.groupby(code_col)["count"].sum()
+    elif "error_codes" in df and df["error_codes"].notna().any():
+        counts = pd.DataFrame(df["error_codes"].dropna().tolist()).sum().astype(int)
+    elif "error_code_top1" in df:
+        counts = df.loc[~df["pass_static"], "error_code_top1"].value_counts()
+    else:
+        return pd.Series(dtype="int64")
+    counts = counts[counts > 0].sort_values(ascending=False, kind="stable").rename("count")
+    counts.index.name = "error_code"
+    return counts.head(topk) if topk else counts
+
+
+def weekly_report(df: "pd.DataFrame", err_df: Optional["pd.DataFrame"] = None, n_boot: int = 2000,
+                  seed: int = 0) -> Dict[str, Any]:
+    """All tables of the weekly report: `GROUPINGS` metrics plus the error histogram."""
+    report: Dict[str, Any] = {}
+    for name, by in GROUPINGS.items():
+        if all(col in df for col in by):
+            report[name] = grouped_metrics(df, by, n_boot=n_boot, seed=seed)
+    report["errors"] = error_histogram(df, err_df)
+    return report
+
+
+def write_report(report: Dict[str, Any], out_dir: Union[str, Path]) -> List[Path]:
+    """Write each report table as ``metrics_<name>.csv``; returns the paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, table in report.items():
+        path = out_dir / f"metrics_{name}.csv"
+        table.to_csv(path, header=True)
+        paths.append(path)
+    return paths
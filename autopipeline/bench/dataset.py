@@ -0,0 +1,228 @@
+"""Typed, partitioned store of bench summary rows.
+
+summary.csv flattens nested fields into JSON strings and loses types; this dataset keeps
+one typed row per run (`COLUMNS`) with ``attempts_by_stage``, ``catalog_hashes`` and
+``error_codes`` as native maps. Rows are partitioned Hive-style as
+``<root>/date=YYYY-MM-DD/tag=<tag>/part-0.<ext>``: Parquet when pyarrow is installed,
+JSON Lines otherwise (nulls and nesting survive, which CSV would not). Both formats can
+live in one tree.
+
+`read_dataset` takes pyarrow-style filters ``[(column, op, value), ...]`` (ANDed):
+partition directories that cannot match are never opened, and Parquet files apply the
+remaining filters while reading (row-group statistics). Comparisons with nulls never match.
+"""
+
+import json
+import operator
+import shutil
+from datetime import date as _date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+DATASET_DIR = "dataset"
+PARTITION_KEYS = ("date", "tag")
+PART_NAME = "part-0"
+PARQUET_SUFFIX = ".parquet"
+JSONL_SUFFIX = ".jsonl"
+
+# Column -> type; rows are written in this order and other keys are dropped, so new
+# summary columns must be added here
+COLUMNS: Dict[str, str] = {
+    "eval_path": "str",
+    "case_id": "str",
+    "run_id": "str",
+    "output_dir": "str",
+    "status": "str",
+    "status_static": "str",
+    "status_runtime": "str",
+    "pass": "int",
+    "fail_codes": "str",
+    "error_code_top1": "str",
+    "semantic_warning_count": "int",
+    "semantic_warning_codes_top3": "str",
+    "duration_ms_total": "float",
+    "attempts_avg": "float",
+    "attempts_total": "int",
+    "attempts_by_stage": "map<str,int>",
+    "llm_calls": "int",
+    "cache_hits": "int",
+    "cache_misses": "int",
+    "tokens_total": "int",
+    "tokens_input": "int",
+    "tokens_output": "int",
+    "tokens_cached": "int",
+    "cost_usd_est": "float",
+    "llm_retries": "int",
+    "llm_latency_ms_p50": "float",
+    "llm_latency_ms_p95": "float",
+    "provider": "str",
+    "model": "str",
+    "prompt_tier": "str",
+    "temperature": "float",
+    "repair_enabled": "bool",
+    "policy_skipped_attempts": "int",
+    "policy_saved_calls_est": "float",
+    "policy_saved_ms_est": "float",
+    "ir_attempts": "int",
+    "bindings_attempts": "int",
+    "rules_hash": "str",
+    "catalog_hashes": "map<str,str>",
+    "error_codes": "map<str,int>",
+}
+
+_OPS = {
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "in": lambda a, b: a in b, "not in": lambda a, b: a not in b,
+}
+Filter = Tuple[str, str, Any]
+
+
+def _parquet():
+    """(pyarrow, pyarrow.parquet), or None when pyarrow is not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pa, pq
+
+
+def _coerce(kind: str, value: Any) -> Any:
+    if value is None or value == "":
+        return None if kind != "str" else value
+    if kind.startswith("map<"):
+        if isinstance(value, str):
+            # summary rows carry attempts_by_stage as JSON text
+            value = json.loads(value)
+        value_kind = kind[len("map<str,"):-1]
+        return {str(k): _coerce(value_kind, v) for k, v in dict(value).items()}
+    if kind == "int":
+        return int(value)
+    if kind == "float":
+        return float(value)
+    if kind == "bool":
+        return value.lower() in ("1", "true", "yes") if isinstance(value, str) else bool(value)
+    return str(value)
+
+
+def dataset_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed dataset row from a summary row (and/or summary record)."""
+    return {name: _coerce(kind, row.get(name)) for name, kind in COLUMNS.items()}
+
+
+def _arrow_schema(pa):
+    types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+    fields = []
+    for name, kind in COLUMNS.items():
+        if kind.startswith("map<"):
+            fields.append(pa.field(name, pa.map_(pa.string(), types[kind[len("map<str,"):-1]])))
+        else:
+            fields.append(pa.field(name, types[kind]))
+    return pa.schema(fields)
+
+
+def write_partition(rows: Iterable[Dict[str, Any]], root: Union[str, Path], tag: str,
+                    date: Optional[str] = None) -> Path:
+    """Write (replace) the ``date=/tag=`` partition holding `rows`; returns the part file.
+
+    `date` defaults to today, so rerunning a tag on the same day replaces its rows.
+    """
+    part_dir = Path(root) / f"date={date or _date.today().isoformat()}" / f"tag={tag}"
+    if part_dir.exists():
+        shutil.rmtree(part_dir)
+    part_dir.mkdir(parents=True)
+    typed = [dataset_row(r) for r in rows]
+    libs = _parquet()
+    if libs is None:
+        path = part_dir / (PART_NAME + JSONL_SUFFIX)
+        with open(path, "w", encoding="utf-8") as f:
+            for row in typed:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return path
+    pa, pq = libs
+    for row in typed:
+        for name, kind in COLUMNS.items():
+            if kind.startswith("map<") and row[name] is not None:
+                row[name] = list(row[name].items())
+    path = part_dir / (PART_NAME + PARQUET_SUFFIX)
+    pq.write_table(pa.Table.from_pylist(typed, schema=_arrow_schema(pa)), path)
+    return path
+
+
+def _typed_filters(filters: Sequence[Filter]) -> List[Filter]:
+    """Filters with values cast to their column's type (partition keys are strings)."""
+    typed = []
+    for column, op, value in filters:
+        if op not in _OPS:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        kind = COLUMNS.get(column, "str")
+        if op in ("in", "not in"):
+            value = [_coerce(kind, v) for v in value]
+        else:
+            value = _coerce(kind, value)
+        typed.append((column, op, value))
+    return typed
+
+
+def _matches(row: Dict[str, Any], filters: Sequence[Filter]) -> bool:
+    for column, op, value in filters:
+        actual = row.get(column)
+        if actual is None or not _OPS[op](actual, value):
+            return False
+    return True
+
+
+def _partitions(root: Path, filters: Sequence[Filter]) -> List[Tuple[Dict[str, str], Path]]:
+    """Partition directories under `root` whose key values can match `filters` (pruning)."""
+    dirs = [({}, root)]
+    for key in PARTITION_KEYS:
+        key_filters = [f for f in filters if f[0] == key]
+        nested = []
+        for values, parent in dirs:
+            for child in sorted(parent.glob(f"{key}=*")):
+                part = {**values, key: child.name[len(key) + 1:]}
+                if child.is_dir() and _matches(part, key_filters):
+                    nested.append((part, child))
+        dirs = nested
+    return dirs
+
+
+def _read_parquet(path: Path, filters: Sequence[Filter], columns: Optional[List[str]]) -> List[Dict[str, Any]]:
+    libs = _parquet()
+    if libs is None:
+        raise RuntimeError(f"pyarrow is required to read {path}")
+    _, pq = libs
+    table = pq.read_table(path, columns=columns, filters=list(filters) or None)
+    rows = table.to_pylist()
+    maps = [name for name in table.column_names if COLUMNS.get(name, "").startswith("map<")]
+    for row in rows:
+        for name in maps:
+            if row[name] is not None:
+                row[name] = dict(row[name])
+    return rows
+
+
+def read_dataset(root: Union[str, Path], filters: Optional[Sequence[Filter]] = None,
+                 columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Rows of the dataset under `root` matching `filters`, with partition keys as columns."""
+    filters = _typed_filters(filters or [])
+    row_filters = [f for f in filters if f[0] not in PARTITION_KEYS]
+    file_columns = [c for c in columns if c not in PARTITION_KEYS] if columns else None
+    rows: List[Dict[str, Any]] = []
+    for values, part_dir in _partitions(Path(root), filters):
+        for path in sorted(part_dir.iterdir()):
+            if path.suffix == PARQUET_SUFFIX:
+                part_rows = _read_parquet(path, row_filters, file_columns)
+            elif path.suffix == JSONL_SUFFIX:
+                with open(path, "r", encoding="utf-8") as f:
+                    part_rows = [json.loads(line) for line in f if line.strip()]
+                part_rows = [r for r in part_rows if _matches(r, row_filters)]
+                if file_columns is not None:
+                    part_rows = [{c: r.get(c) for c in file_columns} for r in part_rows]
+            else:
+                continue
+            for row in part_rows:
+                row.update({k: v for k, v in values.items() if columns is None or k in columns})
+            rows.extend(part_rows)
+    return rows
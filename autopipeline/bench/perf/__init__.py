@@ -0,0 +1,5 @@
+"""Startup-time benchmarks with a JSON history and regression budget.
+
+Run ``python -m autopipeline.bench.perf``; see `suite` for what is measured and
+`history` for how results are compared.
+"""
@@ -0,0 +1,67 @@
+"""CLI for the startup benchmark suite.
+
+    python -m autopipeline.bench.perf --repeat 5 --threshold 0.25
+
+Appends the results to the history file (unless --no-save) and exits 1 when a benchmark
+regressed against the history baseline (unless --warn-only).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from autopipeline.bench.perf.history import (DEFAULT_MIN_DELTA_MS, DEFAULT_THRESHOLD, HISTORY_FILE, append_history,
+                                             baseline, compare, current_env, load_history, make_entry)
+from autopipeline.bench.perf.suite import DEFAULT_CASES, GROUPS, run_suite
+
+
+def _fmt(value, spec: str, width: int) -> str:
+    return ("-" if value is None else format(value, spec)).rjust(width)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AutoPipeline startup benchmarks")
+    parser.add_argument("--base-dir", default=".", help="Repo root (cases/, catalog/, prompts/)")
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per benchmark (median is compared)")
+    parser.add_argument("--groups", default=",".join(GROUPS), help=f"Comma-separated subset of {','.join(GROUPS)}")
+    parser.add_argument("--cases", default=",".join(DEFAULT_CASES), help="Cases for full mock runs")
+    parser.add_argument("--history", default=str(Path("outputs_perf") / HISTORY_FILE), help="History JSON path")
+    parser.add_argument("--window", type=int, default=5, help="History entries the baseline is taken from")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown counted as a regression (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Ignore slowdowns smaller than this (noise floor)")
+    parser.add_argument("--no-save", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--warn-only", action="store_true", help="Report regressions but exit 0")
+    parser.add_argument("--out", default=None, help="Also write this run's entry and comparison to a JSON file")
+    args = parser.parse_args()
+
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()]
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    results = run_suite(args.base_dir, repeat=args.repeat, groups=groups, cases=cases,
+                        progress=lambda msg: print(f"[perf] {msg}", flush=True))
+
+    history = load_history(args.history)
+    rows = compare(results, baseline(history, current_env(), args.window), args.threshold, args.min_delta_ms)
+    print(f"\n{'benchmark':<44} {'baseline':>10} {'current':>10} {'change':>8}  status")
+    for row in rows:
+        print(f"{row['name']:<44} {_fmt(row['baseline_ms'], '.2f', 10)} {row['current_ms']:>10.2f} "
+              f"{_fmt(row['change'], '+.1%', 8)}  {row['status']}")
+
+    entry = make_entry(results, args.repeat, args.base_dir)
+    if not args.no_save:
+        append_history(args.history, entry)
+        print(f"[perf] history: {args.history}")
+    if args.out:
+        Path(args.out).write_text(json.dumps({"entry": entry, "comparison": rows}, indent=2), encoding="utf-8")
+
+    regressions = [r["name"] for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"[perf] regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        if not args.warn_only:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
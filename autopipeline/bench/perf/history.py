@@ -0,0 +1,101 @@
+"""Perf history: JSON entries of suite results and regression checks against a baseline.
+
+The history file is a JSON list, oldest first. Each entry has timestamp, git_rev, env
+(python/platform/machine), repeat and results (name -> summary from
+`autopipeline.bench.perf.suite.summarize`). The baseline for a benchmark is the median
+of its ``median_ms`` over the last `window` entries recorded on the same env. One noisy
+entry therefore neither hides nor fakes a regression.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+HISTORY_FILE = "perf_history.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 5.0
+
+
+def current_env() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": sys.platform, "machine": platform.machine()}
+
+
+def _git_rev(base_dir: str) -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=base_dir, capture_output=True,
+                              text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() or None if proc.returncode == 0 else None
+
+
+def make_entry(results: Dict[str, Any], repeat: int, base_dir: str = ".") -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": _git_rev(base_dir),
+        "env": current_env(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def load_history(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a JSON list of perf entries")
+    return data
+
+
+def append_history(path: Union[str, Path], entry: Dict[str, Any], keep: int = 200) -> List[Dict[str, Any]]:
+    """Append `entry`, keeping the newest `keep` entries; written atomically."""
+    path = Path(path)
+    history = (load_history(path) + [entry])[-keep:]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(history, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return history
+
+
+def baseline(history: List[Dict[str, Any]], env: Optional[Dict[str, str]] = None, window: int = 5) -> Dict[str, float]:
+    """Benchmark name -> baseline median_ms from the last `window` entries on `env`."""
+    env = env or current_env()
+    same_env = [e for e in history if e.get("env") == env]
+    values: Dict[str, List[float]] = {}
+    for entry in same_env[-window:]:
+        for name, res in (entry.get("results") or {}).items():
+            if res.get("median_ms") is not None:
+                values.setdefault(name, []).append(res["median_ms"])
+    return {name: statistics.median(v) for name, v in values.items()}
+
+
+def compare(results: Dict[str, Any], base: Dict[str, float], threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """One row per benchmark. A regression is slower than baseline by more than `threshold`
+    (relative) and by more than `min_delta_ms` (absolute, to ignore noise on fast benchmarks)."""
+    rows = []
+    for name, res in results.items():
+        current = res["median_ms"]
+        ref = base.get(name)
+        row = {"name": name, "baseline_ms": ref, "current_ms": current, "change": None, "status": "new"}
+        if ref:
+            delta = current - ref
+            row["change"] = round(delta / ref, 4)
+            if delta > ref * threshold and delta > min_delta_ms:
+                row["status"] = "regression"
+            elif -delta > ref * threshold and -delta > min_delta_ms:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
@@ -0,0 +1,127 @@
+"""Startup benchmarks: cold imports, constructor costs and full mock-provider runs.
+
+Every benchmark returns one sample in milliseconds and is repeated by `run_suite`.
+Imports are measured cold, in a fresh interpreter per sample. Constructors are
+measured in-process after their modules are imported, so they time the work done
+(rules, catalog, schemas), not the import. Runs use the mock provider with the LLM
+cache disabled, so every sample does the same work.
+"""
+
+import os
+import pkgutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import autopipeline
+
+GROUPS = ("import", "init", "run")
+DEFAULT_CASES = ("DEMO-MONITORING", "DEMO-SMARTHOME")
+_IMPORT_PROBE = "import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+
+
+def import_targets() -> List[str]:
+    """The package, each subpackage, the CLI module and the runner."""
+    subpackages = sorted(m.name for m in pkgutil.iter_modules(autopipeline.__path__, "autopipeline.") if m.ispkg)
+    return ["autopipeline"] + subpackages + ["autopipeline.__main__", "autopipeline.runner"]
+
+
+def _cold_import(module: str) -> float:
+    env = dict(os.environ)
+    # Import this checkout's autopipeline, whatever the working directory
+    root = os.path.dirname(os.path.dirname(os.path.abspath(autopipeline.__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    proc = subprocess.run([sys.executable, "-c", _IMPORT_PROBE.format(module=module)], env=env,
+                          capture_output=True, text=True, check=True)
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def _mock_config(work_dir: str):
+    from autopipeline.llm.types import LLMConfig
+    return LLMConfig(provider="mock", cache_enabled=False, cache_dir=os.path.join(work_dir, "cache"))
+
+
+def _runner(case_id: str, base_dir: str, work_dir: str):
+    from autopipeline.runner import PipelineRunner
+    return PipelineRunner(case_id=case_id, base_dir=base_dir, llm_config=_mock_config(work_dir),
+                          output_root=os.path.join(work_dir, "outputs"), console_log_level="OFF")
+
+
+def _runner_init(base_dir: str, work_dir: str) -> float:
+    start = time.perf_counter()
+    runner = _runner(DEFAULT_CASES[0], base_dir, work_dir)
+    elapsed = (time.perf_counter() - start) * 1000
+    # Not run: stop the log listener and artifact writer threads started by __init__
+    runner.run_logger.close()
+    runner.artifacts.close()
+    return elapsed
+
+
+def _full_run(case_id: str, base_dir: str, work_dir: str) -> float:
+    runner = _runner(case_id, base_dir, work_dir)
+    start = time.perf_counter()
+    result = runner.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.get("overall_status") is None:
+        raise RuntimeError(f"mock run of {case_id} returned no status")
+    return elapsed
+
+
+def benchmarks(base_dir: str, work_dir: str, groups: Sequence[str] = GROUPS,
+               cases: Sequence[str] = DEFAULT_CASES) -> List[Tuple[str, str, Callable[[], float]]]:
+    """(name, group, sample function) for the selected groups."""
+    out: List[Tuple[str, str, Callable[[], float]]] = []
+    if "import" in groups:
+        for module in import_targets():
+            out.append((f"import:{module}", "import", lambda m=module: _cold_import(m)))
+    if "init" in groups:
+        # Import up front so the samples below exclude import time
+        from autopipeline.eval.validators_registry import build_validators
+        from autopipeline.llm.llm_client import LLMClient
+        import autopipeline.runner  # noqa: F401
+
+        out.append(("init:build_validators", "init", lambda: _timed(lambda: build_validators(base_dir))))
+        out.append(("init:LLMClient", "init", lambda: _timed(
+            lambda: LLMClient(base_dir, _mock_config(work_dir), logger=lambda _: None,
+                              output_root=os.path.join(work_dir, "outputs")))))
+        out.append(("init:PipelineRunner", "init", lambda: _runner_init(base_dir, work_dir)))
+    if "run" in groups:
+        for case_id in cases:
+            out.append((f"run:{case_id}", "run", lambda c=case_id: _full_run(c, base_dir, work_dir)))
+    return out
+
+
+def summarize(samples: Iterable[float]) -> Dict[str, Any]:
+    samples = list(samples)
+    return {
+        "samples": len(samples),
+        "first_ms": round(samples[0], 3),
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def run_suite(base_dir: str = ".", repeat: int = 3, groups: Sequence[str] = GROUPS,
+              cases: Sequence[str] = DEFAULT_CASES, progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks `repeat` times each; returns name -> summary (plus group)."""
+    unknown = [g for g in groups if g not in GROUPS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark group(s): {', '.join(unknown)}")
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="autopipeline_perf_") as work_dir:
+        for name, group, sample in benchmarks(os.path.abspath(base_dir), work_dir, groups, cases):
+            results[name] = {"group": group, **summarize(sample() for _ in range(max(1, repeat)))}
+            if progress:
+                progress(f"{name}: median {results[name]['median_ms']:.2f} ms")
+    return results
@@ -5,11 +5,6 @@ import csv
 from collections import defaultdict
 from typing import Dict, List
 
-try:
-    import matplotlib.pyplot as plt
-except ImportError:  # pragma: no cover - optional dependency
-    plt = None
-
 from autopipeline.utils import ensure_dir
 
 
@@ -23,7 +18,10 @@ def _load_summary(summary_csv: Path) -> List[Dict[str, str]]:
 
 
 def generate_plots(summary_csv: Path, summary_error_csv: Path, out_dir: Path):
-    if plt is None:
+    # Imported here: matplotlib is slow to import and only needed when plots are requested
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:  # pragma: no cover - optional dependency
         print("[plots] matplotlib not installed; skipping plot generation")
         return
     ensure_dir(str(out_dir))
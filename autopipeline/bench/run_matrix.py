@@ -32,6 +32,7 @@ def main():
     no_catalog = cfg.get("no_catalog", False)
     seed = cfg.get("seed", 0)
     no_cache = cfg.get("no_cache", True)
+    prompt_layout = cfg.get("prompt_layout", "inline")
 
     eval_paths = []
     for case_id, model_cfg, prompt_tier, repair, temp in itertools.product(
@@ -48,6 +49,7 @@ def main():
             cache_enabled=not no_cache,
             prompt_tier=prompt_tier,
             seed=seed,
+            prompt_layout=prompt_layout,
         )
         runner = PipelineRunner(
             case_id=case_id,
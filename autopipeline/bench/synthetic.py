@@ -0,0 +1,268 @@
+"""Synthetic cases of any size, for scalability benchmarks with the mock provider.
+
+`generate_case` writes ``cases/SYN-<size>[-<fault>]/`` with user_problem.json,
+device_info.json and mock outputs (ir.yaml, bindings.yaml and their repair_* copies)
+that the mock provider replays. The app is a replicated chain sensor -> logic -> sink,
+with types drawn from catalog/components by kind; ``size`` is the number of components
+(leftovers become extra sensors on the first chain). Every sensor runs on its own device
+with an MQTT publish endpoint, processors on edge gateways (one MQTT subscription per
+sensor, one HTTP call per sink) and sinks on cloud servers or actuator devices, so the
+device info holds about two endpoints per component.
+
+Faults are validity mutations (autopipeline.bench.validity.mutations) applied to the
+first-attempt mock outputs; repair_ir.yaml/repair_bindings.yaml stay valid, so a repair
+run exercises the repair loop at scale. `scaling_rows` turns the runs of a bench over
+these cases into per-stage durations by size (scaling.csv).
+"""
+
+import csv
+import json
+import random
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import yaml
+
+SIZES = (10, 100, 1000, 10000)
+CASE_PREFIX = "SYN"
+META_FILE = "synthetic.json"
+SCALING_FILE = "scaling.csv"
+# Mutations of the mock ir.yaml/bindings.yaml that fail a check under the default (core)
+# gate; the others (unknown type, dropped component_bindings, missing link endpoint) are
+# only warnings there
+FAULTS = (
+    "M01_DROP_IR_TOP_FIELD",
+    "M06_ENDPOINT_ID_NOT_EXIST",
+    "M08_CROSS_ARTIFACT_BAD_REF",
+    "M09_BOUNDARY_URL_IN_CONFIG",
+)
+# Catalog kinds of each chain position
+SOURCE_KINDS = ("sensor",)
+PROCESSOR_KINDS = ("logic",)
+SINK_KINDS = ("storage", "service", "actuator")
+SENSORS_PER_GATEWAY = 50
+SINKS_PER_SERVER = 200
+
+_QOS = {"MQTT": "at_least_once", "HTTP": "best_effort"}
+
+
+def case_id(size: int, fault: Optional[str] = None) -> str:
+    """``SYN-<size>`` or ``SYN-<size>-<mutation number>`` (e.g. SYN-1000-M05)."""
+    return f"{CASE_PREFIX}-{size}" + (f"-{fault.split('_')[0]}" if fault else "")
+
+
+def catalog_types(base_dir: str) -> Dict[str, List[Tuple[str, str]]]:
+    """Catalog kind -> sorted (type_name, first event or service name)."""
+    from autopipeline.catalog.profile_loader import ProfileLoader
+
+    loader = ProfileLoader(base_dir)
+    by_kind: Dict[str, List[Tuple[str, str]]] = {}
+    for type_name in sorted(loader.list_types()):
+        profile = loader.get_profile(type_name)
+        provided = profile.get("provided") or {}
+        names = [item["name"] for section in ("events", "services") for item in provided.get(section) or []
+                 if isinstance(item, dict) and item.get("name")]
+        by_kind.setdefault(profile.get("kind", ""), []).append((type_name, names[0] if names else "data"))
+    return by_kind
+
+
+def _pick(types: Dict[str, List[Tuple[str, str]]], kinds: Sequence[str]) -> List[Tuple[str, str, str]]:
+    """(kind, type_name, data name) choices of `kinds`; fails when the catalog has none."""
+    choices = [(kind, name, data) for kind in kinds for name, data in types.get(kind, [])]
+    if not choices:
+        raise ValueError(f"catalog has no component of kind {', '.join(kinds)}")
+    return choices
+
+
+def _endpoint(ep_id: str, ep_type: str, address: str, topic: Optional[str] = None) -> Dict[str, Any]:
+    ep = {"id": ep_id, "name": ep_id, "type": ep_type}
+    if ep_type == "http":
+        ep.update({"direction": "call", "method": "POST"})
+    else:
+        ep.update({"direction": "publish" if ep_type == "mqtt_pub" else "subscribe", "topic": topic})
+    ep.update({"payload_schema": {"type": "object"}, "address": address})
+    return ep
+
+
+def _write_yaml(data: Dict[str, Any], path: Path):
+    # libyaml when available: a 10k-component ir.yaml takes seconds with the pure-Python dumper
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    path.write_text(yaml.dump(data, Dumper=dumper, sort_keys=False, allow_unicode=True), encoding="utf-8")
+
+
+def _device(dev_id: str, layer: str, dev_type: str, endpoints: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"id": dev_id, "name": dev_id, "layer": layer, "type": dev_type, "capabilities": [],
+            "interfaces": {"endpoints": endpoints}}
+
+
+def build_case(base_dir: str, size: int, seed: int = 0) -> Dict[str, Any]:
+    """user_problem, device_info, ir and bindings of a valid case with `size` components."""
+    if size < 3:
+        raise ValueError(f"synthetic size must be at least 3 (one chain), got {size}")
+    types = catalog_types(base_dir)
+    sources, processors, sinks = (_pick(types, k) for k in (SOURCE_KINDS, PROCESSOR_KINDS, SINK_KINDS))
+    rng = random.Random(seed)
+    chains = size // 3
+    n_sensors = size - 2 * chains
+    app_name = f"synthetic_{size}"
+
+    components: List[Dict[str, Any]] = []
+    links: List[Dict[str, Any]] = []
+    placements: List[Dict[str, Any]] = []
+    transports: List[Dict[str, Any]] = []
+    endpoints: List[Dict[str, Any]] = []
+    devices: Dict[str, Dict[str, Any]] = {}
+
+    def add_component(comp_id, kind, type_name, data, layer, dev_id, dev_type):
+        components.append({"id": comp_id, "type": type_name, "capabilities": [data], "metadata": {"kind": kind}})
+        placements.append({"component_id": comp_id, "layer": layer, "device_ref": dev_id})
+        devices.setdefault(dev_id, _device(dev_id, layer, dev_type, []))
+
+    def add_link(link_id, src, dst, data, protocol, from_ep, to_ep):
+        links.append({"id": link_id, "from": src, "to": dst, "data_type": data,
+                      "frequency": "real-time" if protocol == "MQTT" else "periodic", "contract": {}})
+        transports.append({"link_id": link_id, "protocol": protocol, "qos": _QOS[protocol]})
+        endpoints.append({"link_id": link_id, "from_endpoint": from_ep["address"], "to_endpoint": to_ep["address"]})
+
+    for i in range(chains):
+        gateway = f"edge_gw_{i // SENSORS_PER_GATEWAY:04d}"
+        proc_id, sink_id = f"proc_{i:05d}", f"sink_{i:05d}"
+        kind, type_name, data = rng.choice(processors)
+        add_component(proc_id, kind, type_name, data, "edge", gateway, "gateway")
+        kind, type_name, sink_data = rng.choice(sinks)
+        if kind == "actuator":
+            layer, dev_id, dev_type = "device", f"dev_{sink_id}", "actuator"
+            address = f"https://{dev_id}.syn.local/invoke"
+        else:
+            layer, dev_id, dev_type = "cloud", f"cloud_srv_{i // SINKS_PER_SERVER:04d}", "server"
+            address = f"https://{dev_id}.syn.local/ingest/{sink_id}"
+        add_component(sink_id, kind, type_name, sink_data, layer, dev_id, dev_type)
+        out_ep = _endpoint(f"ep_{proc_id}_out", "http", address)
+        in_ep = _endpoint(f"ep_{sink_id}_in", "http", address)
+        devices[gateway]["interfaces"]["endpoints"].append(out_ep)
+        devices[dev_id]["interfaces"]["endpoints"].append(in_ep)
+        add_link(f"link_{sink_id}", proc_id, sink_id, data, "HTTP", out_ep, in_ep)
+
+    for j in range(n_sensors):
+        # One sensor per chain, leftovers feed the first chain
+        chain = j if j < chains else 0
+        sensor_id, proc_id = f"sensor_{j:05d}", f"proc_{chain:05d}"
+        gateway = placements[2 * chain]["device_ref"]
+        kind, type_name, data = rng.choice(sources)
+        dev_id = f"dev_{sensor_id}"
+        add_component(sensor_id, kind, type_name, data, "device", dev_id, "sensor")
+        topic = f"syn/{sensor_id}/{data}"
+        pub_ep = _endpoint(f"ep_{sensor_id}_pub", "mqtt_pub", f"mqtt://broker/publish/{topic}", topic)
+        sub_ep = _endpoint(f"ep_{sensor_id}_sub", "mqtt_sub", f"mqtt://broker/subscribe/{topic}", topic)
+        devices[dev_id]["interfaces"]["endpoints"].append(pub_ep)
+        devices[gateway]["interfaces"]["endpoints"].append(sub_ep)
+        add_link(f"link_{sensor_id}", sensor_id, proc_id, data, "MQTT", pub_ep, sub_ep)
+
+    description = (f"Synthetic monitoring deployment with {size} components: {n_sensors} sensors feeding "
+                   f"{chains} edge processors that forward to cloud services and actuators")
+    user_problem = {
+        "type": "monitoring",
+        "description": description,
+        "requirements": [
+            "Collect readings from every sensor device",
+            "Process each sensor stream on its edge gateway",
+            "Forward processed data to cloud storage, services and actuators",
+        ],
+        "constraints": {"scale": f"{size} components, {len(devices)} devices"},
+    }
+    ir = {
+        "app_name": app_name, "description": description, "version": "0.1.0", "schemas": [],
+        "components": components, "links": links, "policies": [], "logic": {},
+        "metadata": {"description": description, "version": "0.1.0", "synthetic_seed": seed},
+    }
+    bindings = {
+        "app_name": app_name, "version": "0.1.0", "placements": placements, "transports": transports,
+        "endpoints": endpoints,
+        "component_bindings": [{"component": p["component_id"], "layer": p["layer"], "device_ref": p["device_ref"]}
+                               for p in placements],
+    }
+    return {"user_problem": user_problem, "device_info": {"devices": list(devices.values())},
+            "ir": ir, "bindings": bindings}
+
+
+def generate_case(base_dir: str, size: int, fault: Optional[str] = None, seed: int = 0,
+                  cases_dir: Union[str, Path] = "cases") -> str:
+    """Write (replace) the synthetic case under `cases_dir` (relative to `base_dir`); returns its id."""
+    from autopipeline.bench.validity.mutations import get_mutations
+
+    mutation = None
+    if fault:
+        mutation = {m.id: m for m in get_mutations()}.get(fault)
+        if fault not in FAULTS or mutation is None:
+            raise ValueError(f"Unknown synthetic fault: {fault} (choices: {', '.join(FAULTS)})")
+    case = build_case(base_dir, size, seed)
+    cid = case_id(size, fault)
+    case_dir = Path(base_dir) / cases_dir / cid
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    mock_dir = case_dir / "mock"
+    mock_dir.mkdir(parents=True)
+    for name in ("user_problem", "device_info"):
+        (case_dir / f"{name}.json").write_text(json.dumps(case[name], indent=2, ensure_ascii=False), encoding="utf-8")
+    for name in ("ir", "bindings"):
+        _write_yaml(case[name], mock_dir / f"{name}.yaml")
+        shutil.copyfile(mock_dir / f"{name}.yaml", mock_dir / f"repair_{name}.yaml")
+    if mutation is not None:
+        mutation.apply_fn(mock_dir)
+    devices = case["device_info"]["devices"]
+    meta = {
+        "case_id": cid, "size": size, "fault": fault, "seed": seed,
+        "components": len(case["ir"]["components"]), "links": len(case["ir"]["links"]),
+        "devices": len(devices), "endpoints": sum(len(d["interfaces"]["endpoints"]) for d in devices),
+    }
+    (case_dir / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return cid
+
+
+def generate_cases(base_dir: str, sizes: Iterable[int] = SIZES, faults: Iterable[Optional[str]] = (None,),
+                   seed: int = 0, cases_dir: Union[str, Path] = "cases") -> List[str]:
+    """One case per size and fault (None = valid); returns the case ids, sizes ascending."""
+    faults = list(faults)
+    return [generate_case(base_dir, size, fault, seed, cases_dir) for size in sorted(sizes) for fault in faults]
+
+
+def scaling_rows(eval_paths: Iterable[Path], base_dir: str = ".",
+                 cases_dir: Union[str, Path] = "cases") -> List[Dict[str, Any]]:
+    """Per-run size, counts, status and ``<stage>_ms`` durations of synthetic runs (others skipped)."""
+    from autopipeline.eval.eval_schema import EVAL_FILE, expand_eval
+    from autopipeline.run_archive import open_run
+
+    rows = []
+    for path in eval_paths:
+        with open_run(path) as run:
+            eval_data = expand_eval(run.load_json(EVAL_FILE))
+        meta_path = Path(base_dir) / cases_dir / str(eval_data.get("case_id")) / META_FILE
+        if not meta_path.exists():
+            continue
+        row = {k: v for k, v in json.loads(meta_path.read_text(encoding="utf-8")).items() if k != "seed"}
+        row["status"] = eval_data.get("overall_static_status") or eval_data.get("overall_status")
+        stages = (eval_data.get("pipeline") or {}).get("stages") or {}
+        row["total_duration_ms"] = sum(stage.get("duration_ms", 0) for stage in stages.values())
+        row["checker_ms_total"] = (eval_data.get("metrics") or {}).get("checker_ms_total")
+        for name, stage in stages.items():
+            row[f"{name}_ms"] = stage.get("duration_ms")
+            row[f"{name}_attempts"] = stage.get("attempts")
+        rows.append(row)
+    return sorted(rows, key=lambda r: (r["fault"] or "", r["size"]))
+
+
+def write_scaling(rows: List[Dict[str, Any]], out_root: Union[str, Path]) -> Optional[Path]:
+    """Write `scaling_rows` as scaling.csv under `out_root` (None when there are no rows)."""
+    if not rows:
+        return None
+    fieldnames: List[str] = []
+    for row in rows:
+        fieldnames.extend(k for k in row if k not in fieldnames)
+    path = Path(out_root) / SCALING_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
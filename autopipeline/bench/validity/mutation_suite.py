@@ -10,7 +10,8 @@ from collections import Counter
 
 from autopipeline.eval.evaluate_artifacts import evaluate_run_dir
 from autopipeline.bench.validity.mutations import get_mutations
-from autopipeline.utils import ensure_dir, load_json, save_json
+from autopipeline.run_archive import is_packed_run, iter_runs, open_run
+from autopipeline.utils import ensure_dir, save_json
 
 
 def _find_seed(base_dirs):
@@ -19,13 +20,13 @@ def _find_seed(base_dirs):
         p = Path(base)
         if not p.exists():
             continue
-        for eval_path in p.rglob("eval.json"):
+        for path in iter_runs(p):
             try:
-                data = load_json(eval_path)
+                with open_run(path) as run:
+                    if run.eval_summary().get("overall_status") == "PASS":
+                        candidates.append((run.mtime(), path))
             except Exception:
                 continue
-            if data.get("overall_status") == "PASS":
-                candidates.append((eval_path.stat().st_mtime, eval_path.parent))
     if not candidates:
         return None
     candidates.sort(reverse=True)
@@ -48,9 +49,13 @@ def run_suite(seed_dir: Path, out_root: Path, max_mutations: int = None):
     out_dir = out_root / f"run_{ts}"
     ensure_dir(str(out_dir))
 
-    # copy seed
+    # copy seed (mutations edit files in place, so a packed seed is extracted)
     seed_copy = out_dir / "seed"
-    shutil.copytree(seed_dir, seed_copy)
+    if is_packed_run(seed_dir):
+        with open_run(seed_dir) as run:
+            run.extract(seed_copy)
+    else:
+        shutil.copytree(seed_dir, seed_copy)
     # ensure user_problem/device_info present in seed_copy/inputs (self-contained)
     case_id = seed_dir.parent.name
     case_dir = Path("cases") / case_id
@@ -157,13 +162,13 @@ def run_suite(seed_dir: Path, out_root: Path, max_mutations: int = None):
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--run-dir", default=None, help="Seed PASS run dir (contains eval.json)")
+    parser.add_argument("--run-dir", default=None, help="Seed PASS run dir (contains eval.json) or packed run")
     parser.add_argument("--out-dir", default="mutation_out", help="Output root for mutations")
     parser.add_argument("--max-mutations", type=int, default=None)
     args = parser.parse_args()
 
     seed = Path(args.run_dir) if args.run_dir else _find_seed(["outputs_pr2_runs", "outputs_runs", "outputs", "outputs_matrix"])
-    if not seed or not (seed / "eval.json").exists():
+    if not seed or not (is_packed_run(seed) or (seed / "eval.json").exists()):
         raise SystemExit("No seed run_dir found; please specify --run-dir")
     run_suite(seed, Path(args.out_dir), args.max_mutations)
 
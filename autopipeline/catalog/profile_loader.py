@@ -2,20 +2,30 @@
 
 import os
 import yaml
-from typing import Dict, Any, Set, Tuple
+from typing import Dict, Any, FrozenSet, Mapping, Set
+
+from autopipeline.catalog.snapshot import load_snapshot
 
 
 class ProfileLoader:
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
+        self._interfaces: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        self.snapshot = load_snapshot(base_dir)
+        self.profiles: Mapping[str, Dict[str, Any]]
+        if self.snapshot is not None:
+            # Compiled catalog: profiles decode lazily, interface sets come precomputed
+            self.profiles = self.snapshot.profiles
+            return
         index_path = os.path.join(base_dir, "catalog", "components", "index.yaml")
         with open(index_path, "r", encoding="utf-8") as f:
             index = yaml.safe_load(f)
-        self.profiles: Dict[str, Dict[str, Any]] = {}
+        profiles: Dict[str, Dict[str, Any]] = {}
         for item in index.get("components", []):
             path = os.path.join(base_dir, item["path"])
             with open(path, "r", encoding="utf-8") as pf:
-                self.profiles[item["type_name"]] = yaml.safe_load(pf)
+                profiles[item["type_name"]] = yaml.safe_load(pf)
+        self.profiles = profiles
 
     def list_types(self) -> Set[str]:
         return set(self.profiles.keys())
@@ -25,33 +35,42 @@ class ProfileLoader:
             raise KeyError(f"Component type '{type_name}' not found in catalog")
         return self.profiles[type_name]
 
-    def get_interfaces(self, type_name: str) -> Dict[str, Set[str]]:
-        prof = self.get_profile(type_name)
-        provided = prof.get("provided", {})
-        required = prof.get("required", {})
-        if isinstance(required, list):
-            required = {"events": [], "properties": [], "services": []}
-        def collect(section):
-            items = section if isinstance(section, list) else []
-            names = set()
-            for item in items:
-                if isinstance(item, dict) and "name" in item:
-                    names.add(item["name"])
-                elif isinstance(item, str):
-                    names.add(item)
-            return names
-        provided_events = collect(provided.get("events", []))
-        provided_props = collect(provided.get("properties", []))
-        provided_services = collect(provided.get("services", []))
-        required_events = collect(required.get("events", []))
-        required_props = collect(required.get("properties", []))
-        required_services = collect(required.get("services", []))
-        return {
-            "provided_events": provided_events,
-            "provided_properties": provided_props,
-            "provided_services": provided_services,
-            "required_events": required_events,
-            "required_properties": required_props,
-            "required_services": required_services,
-            "all_interfaces": provided_events | provided_props | provided_services | required_events | required_props | required_services,
-        }
+    def get_interfaces(self, type_name: str) -> Dict[str, FrozenSet[str]]:
+        """Interface name sets of a profile, computed once per type and then reused."""
+        cached = self._interfaces.get(type_name)
+        if cached is None:
+            if self.snapshot is not None and type_name in self.profiles:
+                cached = self.snapshot.interfaces(type_name)
+            else:
+                cached = build_interfaces(self.get_profile(type_name))
+            self._interfaces[type_name] = cached
+        return cached
+
+
+def _collect_names(section) -> FrozenSet[str]:
+    items = section if isinstance(section, list) else []
+    names = set()
+    for item in items:
+        if isinstance(item, dict) and "name" in item:
+            names.add(item["name"])
+        elif isinstance(item, str):
+            names.add(item)
+    return frozenset(names)
+
+
+def build_interfaces(prof: Dict[str, Any]) -> Dict[str, FrozenSet[str]]:
+    """Derive provided/required interface name sets (and their union) from a profile."""
+    provided = prof.get("provided", {}) or {}
+    required = prof.get("required", {}) or {}
+    if isinstance(required, list):
+        required = {"events": [], "properties": [], "services": []}
+    result = {
+        "provided_events": _collect_names(provided.get("events", [])),
+        "provided_properties": _collect_names(provided.get("properties", [])),
+        "provided_services": _collect_names(provided.get("services", [])),
+        "required_events": _collect_names(required.get("events", [])),
+        "required_properties": _collect_names(required.get("properties", [])),
+        "required_services": _collect_names(required.get("services", [])),
+    }
+    result["all_interfaces"] = frozenset().union(*result.values())
+    return result
@@ -1,7 +1,9 @@
 import os
 import yaml
+from itertools import islice
 from typing import Dict, Any, List
 from autopipeline.llm.hash_utils import stable_hash, text_hash
+from autopipeline.catalog.snapshot import load_snapshot
 
 
 def _read_yaml(path: str) -> Any:
@@ -11,6 +13,10 @@ def _read_yaml(path: str) -> Any:
 
 def load_component_profiles(base_dir: str) -> Dict[str, Any]:
     index_path = os.path.join(base_dir, "catalog", "components", "index.yaml")
+    snapshot = load_snapshot(base_dir)
+    if snapshot is not None:
+        # profiles are decoded lazily, per type, on first access
+        return {"index": snapshot.index, "profiles": snapshot.profiles, "index_path": index_path}
     index = _read_yaml(index_path)
     profiles = {}
     for item in index.get("components", []):
@@ -21,13 +27,14 @@ def load_component_profiles(base_dir: str) -> Dict[str, Any]:
 
 def load_endpoint_types(base_dir: str) -> Dict[str, Any]:
     path = os.path.join(base_dir, "catalog", "endpoint_types.yaml")
-    data = _read_yaml(path)
+    snapshot = load_snapshot(base_dir)
+    data = snapshot.endpoint_types if snapshot is not None else _read_yaml(path)
     return {"data": data, "path": path}
 
 
 def component_types_summary(profiles: Dict[str, Any], limit: int = 10) -> str:
     lines: List[str] = []
-    items = list(profiles.items())[:limit]
+    items = list(islice(profiles.items(), limit))
     for name, prof in items:
         kind = prof.get("kind", "")
         provided = prof.get("provided", {})
@@ -51,7 +58,10 @@ def endpoint_types_summary(data: Dict[str, Any], limit: int = 5) -> str:
     return "\n".join(lines)
 
 
-def catalog_hashes(base_dir: str) -> Dict[str, str]:
+def catalog_hashes(base_dir: str, use_snapshot: bool = True) -> Dict[str, str]:
+    snapshot = load_snapshot(base_dir) if use_snapshot else None
+    if snapshot is not None:
+        return dict(snapshot.hashes)
     comp_index = os.path.join(base_dir, "catalog", "components", "index.yaml")
     endpoint_path = os.path.join(base_dir, "catalog", "endpoint_types.yaml")
     with open(comp_index, "r", encoding="utf-8") as f:
@@ -0,0 +1,187 @@
+"""Compiled catalog snapshot: one JSON file instead of parsing every catalog YAML at startup.
+
+`compile_snapshot` parses index.yaml, all component profiles, endpoint_types.yaml and
+type_aliases.yaml once and writes them, together with interface sets and catalog hashes,
+to ``catalog/.compiled/catalog_snapshot.json``. `load_snapshot` returns it only while it
+is fresh (source files unchanged); callers fall back to the YAML sources otherwise.
+Individual profiles are stored as embedded JSON strings and parsed on first access.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import yaml
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_RELPATH = os.path.join("catalog", ".compiled", "catalog_snapshot.json")
+INDEX_RELPATH = os.path.join("catalog", "components", "index.yaml")
+ENDPOINT_TYPES_RELPATH = os.path.join("catalog", "endpoint_types.yaml")
+ALIASES_RELPATH = os.path.join("catalog", "type_aliases.yaml")
+
+# abs snapshot path -> (snapshot file stat, snapshot, source relpaths, accepted source stats)
+_LOADED: Dict[str, Tuple[str, "CatalogSnapshot", List[str], str]] = {}
+
+
+class LazyProfiles(Mapping):
+    """Read-only type_name -> profile mapping that decodes each profile on first access."""
+
+    def __init__(self, encoded: Dict[str, str]):
+        self._encoded = encoded
+        self._decoded: Dict[str, Any] = {}
+
+    def __getitem__(self, type_name: str) -> Any:
+        if type_name not in self._decoded:
+            self._decoded[type_name] = json.loads(self._encoded[type_name])
+        return self._decoded[type_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._encoded)
+
+    def __len__(self) -> int:
+        return len(self._encoded)
+
+    def __contains__(self, type_name: object) -> bool:
+        return type_name in self._encoded
+
+
+class CatalogSnapshot:
+    """Loaded snapshot contents; profiles and interface sets are materialized lazily."""
+
+    def __init__(self, data: Dict[str, Any], path: str):
+        self.path = path
+        self.source_hash: str = data["source_hash"]
+        self.index: Dict[str, Any] = data["index"]
+        self.profile_paths: Dict[str, str] = data["profile_paths"]
+        self.profiles = LazyProfiles(data["profiles"])
+        self.types: List[str] = data["types"]
+        self.aliases: Dict[str, str] = data.get("aliases") or {}
+        self.endpoint_types: Any = data["endpoint_types"]
+        self.hashes: Dict[str, str] = data["hashes"]
+        self._interfaces_raw: Dict[str, Dict[str, List[str]]] = data["interfaces"]
+
+    def interfaces(self, type_name: str) -> Dict[str, FrozenSet[str]]:
+        raw = self._interfaces_raw[type_name]
+        return {k: frozenset(v) for k, v in raw.items()}
+
+
+def _abs(base_dir: str, rel: str) -> str:
+    return os.path.join(base_dir, rel)
+
+
+def _source_relpaths(base_dir: str, profile_paths: List[str]) -> List[str]:
+    rels = [INDEX_RELPATH, ENDPOINT_TYPES_RELPATH]
+    if os.path.exists(_abs(base_dir, ALIASES_RELPATH)):
+        rels.append(ALIASES_RELPATH)
+    return rels + sorted(profile_paths)
+
+
+def _stats_fingerprint(base_dir: str, rels: List[str]) -> Optional[str]:
+    parts = []
+    for rel in rels:
+        try:
+            st = os.stat(_abs(base_dir, rel))
+        except OSError:
+            return None
+        parts.append(f"{rel}:{st.st_size}:{st.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _content_hash(base_dir: str, rels: List[str]) -> Optional[str]:
+    h = hashlib.sha256()
+    for rel in rels:
+        try:
+            with open(_abs(base_dir, rel), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        h.update(rel.replace(os.sep, "/").encode("utf-8") + b"\0" + content + b"\0")
+    return h.hexdigest()
+
+
+def default_snapshot_path(base_dir: str) -> str:
+    return _abs(base_dir, SNAPSHOT_RELPATH)
+
+
+def compile_snapshot(base_dir: str = ".", out_path: Optional[str] = None) -> str:
+    """Parse the catalog YAML sources once and write the snapshot file; returns its path."""
+    # Imported here: render/profile_loader import this module for their fast path.
+    from autopipeline.catalog.profile_loader import build_interfaces
+    from autopipeline.catalog.render import catalog_hashes
+
+    with open(_abs(base_dir, INDEX_RELPATH), "r", encoding="utf-8") as f:
+        index = yaml.safe_load(f) or {}
+    profiles: Dict[str, str] = {}
+    interfaces: Dict[str, Dict[str, List[str]]] = {}
+    profile_paths: Dict[str, str] = {}
+    for item in index.get("components", []):
+        rel = item["path"]
+        with open(_abs(base_dir, rel), "r", encoding="utf-8") as pf:
+            prof = yaml.safe_load(pf)
+        profiles[item["type_name"]] = json.dumps(prof, ensure_ascii=False, sort_keys=True)
+        interfaces[item["type_name"]] = {k: sorted(v) for k, v in build_interfaces(prof).items()}
+        profile_paths[item["type_name"]] = rel
+    with open(_abs(base_dir, ENDPOINT_TYPES_RELPATH), "r", encoding="utf-8") as f:
+        endpoint_types = yaml.safe_load(f)
+    aliases: Dict[str, str] = {}
+    if os.path.exists(_abs(base_dir, ALIASES_RELPATH)):
+        with open(_abs(base_dir, ALIASES_RELPATH), "r", encoding="utf-8") as f:
+            aliases = yaml.safe_load(f) or {}
+
+    rels = _source_relpaths(base_dir, list(profile_paths.values()))
+    data = {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "source_hash": _content_hash(base_dir, rels),
+        "source_stats": _stats_fingerprint(base_dir, rels),
+        "index": index,
+        "profile_paths": profile_paths,
+        "profiles": profiles,
+        "interfaces": interfaces,
+        "types": sorted(profiles.keys()),
+        "aliases": aliases,
+        "endpoint_types": endpoint_types,
+        "hashes": catalog_hashes(base_dir, use_snapshot=False),
+    }
+    out_path = out_path or default_snapshot_path(base_dir)
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def load_snapshot(base_dir: str = ".", path: Optional[str] = None) -> Optional[CatalogSnapshot]:
+    """Return the compiled snapshot if present and fresh, else None (use YAML sources)."""
+    path = os.path.abspath(path or default_snapshot_path(base_dir))
+    if os.environ.get("AUTOPIPELINE_NO_CATALOG_SNAPSHOT"):
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    file_key = f"{st.st_size}:{st.st_mtime_ns}"
+    cached = _LOADED.get(path)
+    if cached is not None and cached[0] == file_key:
+        _, snapshot, rels, stats = cached
+        if _stats_fingerprint(base_dir, rels) == stats:
+            return snapshot
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("snapshot_version") != SNAPSHOT_VERSION:
+        return None
+    rels = _source_relpaths(base_dir, list((data.get("profile_paths") or {}).values()))
+    stats = _stats_fingerprint(base_dir, rels)
+    if stats is None:
+        return None
+    # mtimes differ (e.g. fresh checkout): fall back to comparing source content
+    if stats != data.get("source_stats") and _content_hash(base_dir, rels) != data.get("source_hash"):
+        return None
+    snapshot = CatalogSnapshot(data, path)
+    _LOADED[path] = (file_key, snapshot, rels, stats)
+    return snapshot
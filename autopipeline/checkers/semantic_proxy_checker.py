@@ -6,6 +6,8 @@ from pathlib import Path
 import yaml
 import json
 
+from autopipeline.verifier.ir_graph import IRGraph
+
 
 @dataclass
 class WarningRecord:
@@ -78,11 +80,6 @@ def _extract_up_terms(up: Dict[str, Any]) -> Set[str]:
     return terms
 
 
-def _extract_ir_components(ir: Dict[str, Any]) -> List[Dict[str, Any]]:
-    comps = ir.get("components") or ir.get("entities") or []
-    return comps if isinstance(comps, list) else []
-
-
 def _component_identifier(comp: Dict[str, Any]) -> str:
     return str(comp.get("id") or comp.get("name") or comp.get("component") or "").lower()
 
@@ -114,6 +111,8 @@ class SemanticProxyChecker:
         bindings = artifacts["bindings"] or {}
         compose = artifacts.get("compose") or {}
         attempts_by_stage = artifacts.get("attempts_by_stage") or {}
+        graph = IRGraph.ensure(artifacts.get("ir_graph"), ir)
+        ir_nodes = [n.raw for n in graph.nodes]
 
         di_devices = _extract_devices(di)
         di_endpoints = _extract_endpoints(di)
@@ -162,7 +161,7 @@ class SemanticProxyChecker:
                             plan_refs.add(str(v[k]).lower())
                 elif isinstance(v, str):
                     plan_refs.add(v.lower())
-        ir_components = [_component_identifier(c) for c in _extract_ir_components(ir)]
+        ir_components = [_component_identifier(c) for c in ir_nodes]
         missing_in_ir = sorted(list(plan_refs - set(ir_components)))
         unused_in_plan = sorted(list(set(ir_components) - plan_refs))
         if (missing_in_ir or len(unused_in_plan) > len(ir_components) * 0.5) and (plan_refs or ir_components):
@@ -177,7 +176,7 @@ class SemanticProxyChecker:
         needs_binding = []
         bound_components = set([str(cb.get("component") or cb.get("component_id") or "").lower()
                                 for cb in bindings.get("component_bindings", []) if isinstance(cb, dict)])
-        for comp in _extract_ir_components(ir):
+        for comp in ir_nodes:
             ctype = str(comp.get("type") or "").lower()
             cid = _component_identifier(comp)
             if not cid:
@@ -217,7 +216,7 @@ class SemanticProxyChecker:
         if di_devices and any("cloud" in d or "edge" in d for d in di_devices):
             hint_sources.append("di")
         observed_layers = set()
-        for comp in _extract_ir_components(ir):
+        for comp in ir_nodes:
             layer = comp.get("layer") or comp.get("placement") or comp.get("deploy")
             if layer:
                 observed_layers.add(str(layer).lower())
@@ -227,20 +226,9 @@ class SemanticProxyChecker:
                                        {"hint_sources": hint_sources, "observed_layers": list(observed_layers)}))
 
         # W_UNUSED_COMPONENTS
-        link_refs = set()
-        for l in ir.get("links", []) or []:
-            if isinstance(l, dict):
-                for k in ["from", "to", "source", "target"]:
-                    v = l.get(k)
-                    if isinstance(v, dict):
-                        link_refs.add(str(v.get("component") or v.get("id") or v.get("name") or "").lower())
-                    elif v:
-                        link_refs.add(str(v).lower())
-                for k in ["from_component", "to_component"]:
-                    if l.get(k):
-                        link_refs.add(str(l[k]).lower())
+        link_refs = {cid.lower() for cid in graph.linked_component_ids}
         unused = []
-        for comp in _extract_ir_components(ir):
+        for comp in ir_nodes:
             cid = _component_identifier(comp)
             if not cid:
                 continue
@@ -1,22 +1,23 @@
 """Placement checker: ensure coverage and node validity."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from autopipeline.eval.error_codes import ErrorCode, failure
+from autopipeline.verifier.ir_graph import IRGraph
 
 
 class PlacementChecker:
     def __init__(self):
         pass
 
-    def check(self, placement: Dict[str, Any], ir: Dict[str, Any]) -> Dict[str, Any]:
+    def check(self, placement: Dict[str, Any], ir: Dict[str, Any], graph: Optional[IRGraph] = None) -> Dict[str, Any]:
+        graph = IRGraph.ensure(graph, ir)
         failures = []
         warnings: List[str] = []
         nodes = placement.get("nodes") or []
         node_ids = {n.get("node_id") for n in nodes if isinstance(n, dict)}
         comp_places = placement.get("component_placements") or []
-        ir_comps = ir.get("components", []) or ir.get("entities", []) or []
-        ir_comp_ids = {c.get("id") or c.get("name") for c in ir_comps}
+        ir_comp_ids = set(graph.component_ids)
 
         # coverage
         placed_ids = {p.get("component_id") for p in comp_places if isinstance(p, dict)}
@@ -36,7 +37,7 @@ class PlacementChecker:
                                         {"component_id": cid, "target_node_id": node}))
 
         # link placements validity if present
-        ir_links = {l.get("id") for l in ir.get("links", []) if isinstance(l, dict)}
+        ir_links = graph.link_ids
         for lp in placement.get("link_placements", []) or []:
             lid = lp.get("link_id")
             if lid and ir_links and lid not in ir_links:
@@ -0,0 +1,201 @@
+"""eval.json schema versions and the per-run summary record.
+
+Version 1 (default) is the full, indented eval.json. Version 2 (``--compact-eval``) is
+written without indentation and drops what can be rebuilt:
+
+* failures are stored once in ``failures``; ``validators.<name>.failures`` and
+  ``failures_flat`` hold indexes into it;
+* ``checks`` is rebuilt from the validators (``check_names`` keeps the order);
+* ``pipeline.config`` omits the keys already recorded under ``llm``.
+
+`load_eval` reads either version and returns the version-1 shape, so readers never
+branch on the schema. Every run also writes ``eval_summary.json``: one flat record with
+the columns bench aggregation and the attempt ledger need (`summary_record`), so
+aggregation does not parse full evals.
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+EVAL_FILE = "eval.json"
+SUMMARY_FILE = "eval_summary.json"
+COMPACT_SCHEMA_VERSION = 2
+# pipeline.config keys duplicated in the llm section (same values)
+_CONFIG_FROM_LLM = ("provider", "model", "temperature", "cache_enabled", "cache_dir")
+
+
+def _check_entry(validator: Dict[str, Any], failures: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Same derivation as PipelineRunner._run_evaluation; absent validators count as PASS
+    status = validator.get("status", "PASS") if validator.get("pass", True) else "FAIL"
+    return {"status": status, "message": failures[0]["message"] if failures else "OK"}
+
+
+def compact_eval(eval_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Version-2 form of a full eval result (the input is not modified)."""
+    data = dict(eval_result)
+    failures: List[Dict[str, Any]] = []
+    refs: Dict[str, int] = {}
+
+    def ref(failure: Dict[str, Any]) -> int:
+        key = json.dumps(failure, sort_keys=True, ensure_ascii=False, default=str)
+        if key not in refs:
+            refs[key] = len(failures)
+            failures.append(failure)
+        return refs[key]
+
+    validators = {}
+    for name, res in (eval_result.get("validators") or {}).items():
+        validators[name] = {**res, "failures": [ref(f) for f in res.get("failures") or []]}
+    data["validators"] = validators
+    data["failures_flat"] = [ref(f) for f in eval_result.get("failures_flat") or []]
+    data["failures"] = failures
+
+    checks = eval_result.get("checks") or {}
+    rebuilt = _rebuild_checks(list(checks), validators, failures)
+    if rebuilt == checks:
+        data["check_names"] = list(checks)
+        del data["checks"]
+
+    pipeline = eval_result.get("pipeline")
+    llm = eval_result.get("llm") or {}
+    if pipeline and pipeline.get("config"):
+        config = {k: v for k, v in pipeline["config"].items()
+                  if not (k in _CONFIG_FROM_LLM and k in llm and llm[k] == v)}
+        data["pipeline"] = {**pipeline, "config": config}
+    data["schema_version"] = COMPACT_SCHEMA_VERSION
+    return data
+
+
+def _rebuild_checks(names: List[str], validators: Dict[str, Any], failures: List[Dict[str, Any]]) -> Dict[str, Any]:
+    checks = {}
+    for name in names:
+        res = validators.get(name) or {}
+        checks[name] = _check_entry(res, [failures[i] if isinstance(i, int) else i for i in res.get("failures") or []])
+    return checks
+
+
+def expand_eval(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Version-1 form of an eval of any version (version 1 is returned as is)."""
+    if data.get("schema_version") != COMPACT_SCHEMA_VERSION:
+        return data
+    data = dict(data)
+    failures = data.pop("failures", [])
+    data.pop("schema_version")
+    validators = {name: {**res, "failures": [failures[i] for i in res.get("failures") or []]}
+                  for name, res in (data.get("validators") or {}).items()}
+    data["validators"] = validators
+    data["failures_flat"] = [failures[i] for i in data.get("failures_flat") or []]
+    if "check_names" in data:
+        data["checks"] = _rebuild_checks(data.pop("check_names"), validators, failures)
+    pipeline = data.get("pipeline")
+    llm = data.get("llm") or {}
+    if pipeline and "config" in pipeline:
+        config = dict(pipeline["config"])
+        for key in _CONFIG_FROM_LLM:
+            if key not in config and key in llm:
+                config[key] = llm[key]
+        data["pipeline"] = {**pipeline, "config": config}
+    return data
+
+
+def load_eval(path) -> Dict[str, Any]:
+    """Load an eval.json of any schema version as the full (version-1) dict."""
+    with open(path, "r", encoding="utf-8") as f:
+        return expand_eval(json.load(f))
+
+
+def summary_record(eval_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flat per-run record of an eval (any version): the aggregation columns plus ledger inputs."""
+    eval_data = expand_eval(eval_data)
+    failures = eval_data.get("failures_flat", []) or []
+    fail_codes: Dict[str, int] = {}
+    for f in failures:
+        code = f.get("code", "E_UNKNOWN")
+        fail_codes[code] = fail_codes.get(code, 0) + 1
+    ranked = sorted(fail_codes, key=lambda c: -fail_codes[c])
+    top_error = (eval_data.get("error", {}) or {}).get("code")
+    error_code_top1 = ranked[0] if ranked else (eval_data.get("error", {}) or {}).get("code", "E_UNKNOWN")
+    pipeline = eval_data.get("pipeline", {}).get("stages", {})
+    duration_total = sum(stage.get("duration_ms", 0) for stage in pipeline.values())
+    attempts = [stage.get("attempts", 0) for stage in pipeline.values() if stage.get("attempts") is not None]
+    config = eval_data.get("pipeline", {}).get("config", {})
+    status_static = eval_data.get("overall_static_status") or eval_data.get("overall_status")
+    runtime_status = eval_data.get("overall_runtime_status")
+    if not runtime_status:
+        runtime_status = (eval_data.get("checks", {}).get("runtime_compose", {}) or {}).get("status", "SKIP")
+    sem_val = (eval_data.get("validators") or {}).get("semantic_proxy") or {}
+    sem_warnings = [(w.get("code") or "") if isinstance(w, dict) else "" for w in sem_val.get("warnings", []) or []
+                    if isinstance(w, (dict, str))]
+    sem_codes: Dict[str, int] = {}
+    for c in sem_warnings:
+        if c:
+            sem_codes[c] = sem_codes.get(c, 0) + 1
+    policy = [stage.get("attempt_policy") or {} for stage in pipeline.values()]
+    llm = eval_data.get("llm", {}) or {}
+    error_codes = dict(fail_codes)
+    if top_error:
+        error_codes[top_error] = error_codes.get(top_error, 0) + 1
+    return {
+        "case_id": eval_data.get("case_id"),
+        "run_id": config.get("run_id"),
+        "output_dir": config.get("output_dir"),
+        "status": eval_data.get("overall_status"),
+        "status_static": status_static,
+        "status_runtime": runtime_status,
+        "pass": 1 if (status_static == "PASS") else 0,
+        "fail_codes": ";".join(ranked[:3]),
+        "error_code_top1": error_code_top1,
+        "semantic_warning_count": len(sem_warnings),
+        "semantic_warning_codes_top3": ";".join(sorted(sem_codes, key=lambda c: -sem_codes[c])[:3]),
+        "duration_ms_total": duration_total,
+        "attempts_avg": sum(attempts) / len(attempts) if attempts else 0,
+        "attempts_total": sum(attempts) if attempts else 0,
+        "attempts_by_stage": json.dumps({k: v.get("attempts", 0) for k, v in pipeline.items()}),
+        "llm_calls": llm.get("calls_total"),
+        "cache_hits": llm.get("cache_hits"),
+        "cache_misses": llm.get("cache_misses"),
+        "tokens_total": llm.get("usage_tokens_total"),
+        "tokens_input": llm.get("usage_tokens_input"),
+        "tokens_output": llm.get("usage_tokens_output"),
+        "tokens_cached": (llm.get("usage_tokens_breakdown") or {}).get("input_cached"),
+        "cost_usd_est": llm.get("cost_usd_est_total"),
+        "llm_retries": llm.get("retries_total"),
+        "provider": llm.get("provider"),
+        "model": llm.get("model"),
+        "prompt_tier": config.get("prompt_tier"),
+        "temperature": config.get("temperature"),
+        "repair_enabled": config.get("enable_repair"),
+        "policy_skipped_attempts": sum(p.get("skipped_attempts", 0) for p in policy),
+        "policy_saved_calls_est": round(sum(p.get("saved_calls_est", 0.0) for p in policy), 3),
+        "policy_saved_ms_est": round(sum(p.get("saved_ms_est", 0.0) for p in policy), 3),
+        "ir_attempts": pipeline.get("ir", {}).get("attempts"),
+        "bindings_attempts": pipeline.get("bindings", {}).get("attempts"),
+        "rules_hash": llm.get("rules_hash"),
+        "catalog_hashes": eval_data.get("catalog_hashes"),
+        # Not CSV columns: error counts (failures + top-level error), ledger input, telemetry location
+        "error_codes": error_codes,
+        "attempt_history": {k: v["attempt_history"] for k, v in pipeline.items() if v.get("attempt_history")},
+        "calls_log": llm.get("calls_log"),
+    }
+
+
+def read_summary(run) -> Dict[str, Any]:
+    """Summary record of a run view (autopipeline.run_archive); computed from eval.json for older runs."""
+    if run.exists(SUMMARY_FILE):
+        return run.load_json(SUMMARY_FILE)
+    return summary_record(run.load_json(EVAL_FILE))
+
+
+def write_eval(eval_result: Dict[str, Any], output_dir: str, compact: bool = False) -> str:
+    """Write eval_summary.json, then eval.json (full or version 2); returns the eval.json path."""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, SUMMARY_FILE), "w", encoding="utf-8") as f:
+        json.dump(summary_record(eval_result), f, ensure_ascii=False, separators=(",", ":"), default=str)
+    eval_path = os.path.join(output_dir, EVAL_FILE)
+    with open(eval_path, "w", encoding="utf-8") as f:
+        if compact:
+            json.dump(compact_eval(eval_result), f, ensure_ascii=False, separators=(",", ":"), default=str)
+        else:
+            json.dump(eval_result, f, indent=2, ensure_ascii=False)
+    return eval_path
@@ -3,11 +3,12 @@
 import os
 from pathlib import Path
 from typing import Dict, Any, List
-import yaml
 
-from autopipeline.utils import load_json, save_json, save_yaml, sha256_of_file
+from autopipeline.utils import load_json, save_json, save_yaml, sha256_of_text
 from autopipeline.eval.validators_registry import build_validators
 from autopipeline.eval.error_codes import FailureRecord, ErrorCode
+from autopipeline.verifier.ir_graph import IRGraph
+from autopipeline.run_archive import open_run
 
 
 class ArtifactEvaluator:
@@ -66,26 +67,26 @@ class ArtifactEvaluator:
             self.failures_flat.extend(self.validator_results[name]["failures"])
 
     def evaluate(self, run_dir: Path) -> Dict[str, Any]:
+        """Evaluate a run directory or a packed run archive (``run=<id>.zip``)."""
+        with open_run(run_dir) as run:
+            return self._evaluate(run)
+
+    def _evaluate(self, run) -> Dict[str, Any]:
         # Load artifacts
-        plan = load_json(run_dir / "plan.json")
-        ir = yaml.safe_load((run_dir / "ir.yaml").read_text(encoding="utf-8"))
+        plan = run.load_json("plan.json")
+        ir = run.load_yaml("ir.yaml")
         placement = {}
-        placement_path = run_dir / "placement_plan.yaml"
-        if placement_path.exists():
+        if run.exists("placement_plan.yaml"):
             try:
-                placement = yaml.safe_load(placement_path.read_text(encoding="utf-8")) or {}
+                placement = run.load_yaml("placement_plan.yaml") or {}
             except Exception:
                 placement = {}
         # prefer normalized/official bindings
         bindings = None
         for name in ["bindings.yaml", "bindings_norm.yaml", "bindings_raw.yaml", "bindings_raw.txt"]:
-            p = run_dir / name
-            if p.exists():
+            if run.exists(name):
                 try:
-                    if name.endswith(".txt"):
-                        bindings = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
-                    else:
-                        bindings = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+                    bindings = run.load_yaml(name) or {}
                     break
                 except Exception:
                     bindings = {}
@@ -93,28 +94,28 @@ class ArtifactEvaluator:
         if bindings is None:
             bindings = {}
         # Prefer inputs/ paths if present
-        up_path = run_dir / "inputs" / "user_problem.json"
-        di_path = run_dir / "inputs" / "device_info.json"
+        up_name = "inputs/user_problem.json"
+        di_name = "inputs/device_info.json"
         # Fallback to legacy run layout or cases/<case_id> for backward compatibility
-        legacy_up = run_dir / "user_problem.json"
-        legacy_di = run_dir / "device_info.json"
-        case_id = run_dir.parent.name
+        legacy_up = "user_problem.json"
+        legacy_di = "device_info.json"
+        case_id = run.case_id
         case_dir = Path(self.base_dir) / "cases" / case_id
         user_problem = {}
         device_info = {}
-        if up_path.exists():
-            user_problem = load_json(up_path)
-        elif legacy_up.exists():
-            user_problem = load_json(legacy_up)
+        if run.exists(up_name):
+            user_problem = run.load_json(up_name)
+        elif run.exists(legacy_up):
+            user_problem = run.load_json(legacy_up)
         elif case_dir.exists():
             cand = case_dir / "user_problem.json"
             if cand.exists():
                 user_problem = load_json(cand)
 
-        if di_path.exists():
-            device_info = load_json(di_path)
-        elif legacy_di.exists():
-            device_info = load_json(legacy_di)
+        if run.exists(di_name):
+            device_info = run.load_json(di_name)
+        elif run.exists(legacy_di):
+            device_info = run.load_json(legacy_di)
         elif case_dir.exists():
             cand = case_dir / "device_info.json"
             if cand.exists():
@@ -138,23 +139,26 @@ class ArtifactEvaluator:
         self._check_and_record("ir_schema", ir_res)
         boundary_res = self.boundary_checker.check_ir(ir)
         self._check_and_record("ir_boundary", boundary_res)
+        graph = IRGraph.from_ir(ir)
         if self.enable_catalog:
-            comp_res = self.component_catalog_checker.check_ir(ir)
+            comp_res = self.component_catalog_checker.check_ir(ir, graph=graph)
             self._check_and_record("ir_component_catalog", comp_res)
-            iface_res = self.ir_interface_checker.check(ir)
+            iface_res = self.ir_interface_checker.check(ir, graph=graph)
             self._check_and_record("ir_interface", iface_res)
+            # Catalog checks normalize type aliases in place: re-index the normalized IR
+            graph = IRGraph.from_ir(ir)
         else:
             self._record_validator("ir_component_catalog", {"pass": True, "failures": [], "warnings": ["catalog skipped"], "status": "SKIP", "skipped": True})
             self._record_validator("ir_interface", {"pass": True, "failures": [], "warnings": ["catalog skipped"], "status": "SKIP", "skipped": True})
 
         place_res = self.schema_checker.validate_placement(placement)
         self._check_and_record("placement_schema", place_res)
-        place_check_res = self.placement_checker.check(placement, ir)
+        place_check_res = self.placement_checker.check(placement, ir, graph=graph)
         self._check_and_record("placement_checker", place_check_res)
 
         bind_res = self.schema_checker.validate_bindings(bindings, gate_mode=self.gate_mode)
         self._check_and_record("bindings_schema", bind_res)
-        cov_res = self.coverage_checker.check_coverage(ir, bindings, gate_mode=self.gate_mode)
+        cov_res = self.coverage_checker.check_coverage(ir, bindings, gate_mode=self.gate_mode, graph=graph)
         self._check_and_record("coverage", cov_res)
         ep_res = self.endpoint_checker.check_endpoints(bindings, device_info)
         self._check_and_record("endpoint_legality", ep_res)
@@ -164,11 +168,11 @@ class ArtifactEvaluator:
         else:
             self._record_validator("endpoint_matching", {"pass": True, "failures": [], "warnings": ["catalog skipped"], "status": "SKIP", "skipped": True})
 
-        cross_res = self.cross_artifact_checker.check(ir, bindings)
+        cross_res = self.cross_artifact_checker.check(ir, bindings, graph=graph)
         self._check_and_record("cross_artifact_consistency", cross_res)
 
-        bindings_hash = sha256_of_file(run_dir / "bindings.yaml")
-        gen_checker = self.gen_checker_cls(bindings_hash, str(run_dir))
+        bindings_hash = sha256_of_text(run.read_text("bindings.yaml"))
+        gen_checker = self.gen_checker_cls(bindings_hash, str(run.path), run=run)
         gen_res = gen_checker.check()
         self._check_and_record("generation_consistency", gen_res)
 
@@ -179,6 +183,7 @@ class ArtifactEvaluator:
                 "device_info": device_info,
                 "plan": plan,
                 "ir": ir,
+                "ir_graph": graph,
                 "bindings": bindings,
                 "compose": None,
                 "attempts_by_stage": {k: v.get("attempts") for k, v in self.pipeline_stats.items()},
@@ -221,7 +226,7 @@ class ArtifactEvaluator:
         runtime_status = checks.get("runtime_compose", {}).get("status", "SKIP")
         overall_runtime = runtime_status
         eval_result = {
-            "case_id": run_dir.name,
+            "case_id": run.run_id,
             "overall_status": overall,
             "overall_static_status": overall,  # backward compat
             "overall_core_status": overall_core,
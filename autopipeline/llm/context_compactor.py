@@ -0,0 +1,138 @@
+"""Compact prompt context: canonical single-encoded sections and token estimates.
+
+The default prompt context embeds YAML dumps as strings and then YAML-dumps the whole
+context again, so every nested structure is escaped inside a block scalar. In compact
+mode each section is written once as canonical JSON (which is also valid YAML flow
+syntax) on its own ``KEY: value`` line, and device endpoints are filtered against the
+IR vocabulary before encoding.
+"""
+
+import json
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+# Pre-tokenizer in the style of BPE tokenizers: words, punctuation runs, whitespace runs
+_PIECE_RE = re.compile(r" ?[A-Za-z0-9_]+| ?[^\sA-Za-z0-9_]+|\s+")
+_VOCAB_RE = re.compile(r"[a-z0-9]+")
+# Generic tokens that would make every endpoint look relevant
+_STOPWORDS = frozenset({"ep", "id", "to", "from", "link", "the", "and", "of", "in", "out", "input",
+                        "output", "data", "device", "service", "http", "https", "mqtt", "ha", "local"})
+_ENDPOINT_TEXT_FIELDS = ("id", "name", "topic", "entity_id", "service", "address", "description")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count without a tokenizer.
+
+    ASCII words cost ~1 token per 4 chars, ASCII punctuation runs ~1 per 3, a whitespace
+    run (newline + indentation) 1, and each non-ASCII char 1.
+    """
+    total = 0
+    for m in _PIECE_RE.finditer(text or ""):
+        piece = m.group(0).strip()
+        if not piece:
+            total += 1
+        elif piece[0].isascii() and (piece[0].isalnum() or piece[0] == "_"):
+            total += math.ceil(len(piece) / 4)
+        else:
+            ascii_chars = sum(1 for ch in piece if ch.isascii())
+            total += (len(piece) - ascii_chars) + math.ceil(ascii_chars / 3)
+    return total
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _as_structure(value: Any) -> Any:
+    """Decode YAML/JSON text into a structure so it is encoded only once; other values pass through."""
+    if isinstance(value, str):
+        try:
+            parsed = yaml.safe_load(value)
+        except yaml.YAMLError:
+            return value
+        if isinstance(parsed, (dict, list)):
+            return parsed
+    return value
+
+
+def _vocab(values: Iterable[Any]) -> Set[str]:
+    words: Set[str] = set()
+    for v in values:
+        if v is None:
+            continue
+        for w in _VOCAB_RE.findall(str(v).lower()):
+            if len(w) > 2 and w not in _STOPWORDS and not w.isdigit():
+                words.add(w)
+    return words
+
+
+def ir_vocabulary(ir_data: Dict[str, Any]) -> Set[str]:
+    """Words from IR component ids/types/capabilities and link ids/data types."""
+    values: List[Any] = []
+    for comp in ir_data.get("components", ir_data.get("entities", [])) or []:
+        if isinstance(comp, dict):
+            values += [comp.get("id"), comp.get("name"), comp.get("type")] + list(comp.get("capabilities") or [])
+    for link in ir_data.get("links", []) or []:
+        if isinstance(link, dict):
+            values += [link.get("id"), link.get("data_type")]
+    return _vocab(values)
+
+
+def filter_device_endpoints(device_info: Dict[str, Any], ir_data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+    """Drop endpoints that share no vocabulary with the IR.
+
+    Devices are always kept (placements need them). A device whose endpoints all miss
+    keeps every endpoint, since there is no evidence to choose between them.
+    Returns (filtered device_info, number of endpoints dropped).
+    """
+    if not isinstance(device_info, dict) or not isinstance(ir_data, dict):
+        return device_info, 0
+    vocab = ir_vocabulary(ir_data)
+    if not vocab:
+        return device_info, 0
+    dropped = 0
+    devices = []
+    for dev in device_info.get("devices", []) or []:
+        endpoints = ((dev.get("interfaces") or {}).get("endpoints") if isinstance(dev, dict) else None) or []
+        if not endpoints:
+            devices.append(dev)
+            continue
+        dev_words = _vocab([dev.get("id"), dev.get("name"), dev.get("type")] + list(dev.get("capabilities") or []))
+        keep = [ep for ep in endpoints if isinstance(ep, dict) and
+                (_vocab(ep.get(f) for f in _ENDPOINT_TEXT_FIELDS) | dev_words) & vocab]
+        if not keep or len(keep) == len(endpoints):
+            devices.append(dev)
+            continue
+        dropped += len(endpoints) - len(keep)
+        devices.append({**dev, "interfaces": {**dev["interfaces"], "endpoints": keep}})
+    return {**device_info, "devices": devices}, dropped
+
+
+def compact_context(sections: Dict[str, Any], case_id: Optional[str],
+                    ir_data: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+    """Encode context sections as ``KEY: <canonical json>`` lines.
+
+    `ir_data`, when given, relevance-filters the DEVICE_INFO section.
+    Returns (context text, report with per-section token estimates and endpoints dropped).
+    """
+    lines = []
+    tokens: Dict[str, int] = {}
+    dropped = 0
+    for key, value in sections.items():
+        value = _as_structure(value)
+        if key == "DEVICE_INFO" and ir_data is not None:
+            value, dropped = filter_device_endpoints(value, ir_data)
+        line = f"{key}: {canonical_json(value)}"
+        tokens[key] = estimate_tokens(line)
+        lines.append(line)
+    lines.append(f"case_id: {canonical_json(case_id)}")
+    return "\n".join(lines) + "\n", {"sections": tokens, "endpoints_dropped": dropped}
+
+
+def section_tokens(context: Dict[str, Any]) -> Dict[str, int]:
+    """Token estimates for a default context, per section as it appears in the rendered prompt."""
+    return {k: estimate_tokens(yaml.safe_dump({k: v}, sort_keys=False, allow_unicode=True))
+            for k, v in context.items() if k != "case_id"}
@@ -2,10 +2,11 @@
 
 import json
 import os
-from typing import Any, Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
 
 import yaml
 
+from autopipeline.artifact_writer import ArtifactWriter
 from autopipeline.utils import ensure_dir
 from autopipeline.eval.error_codes import ErrorCode
 
@@ -21,32 +22,53 @@ class LLMOutputFormatError(Exception):
         self.code = ErrorCode.E_LLM_OUTPUT_FORMAT
 
 
-def _save_raw(text: str, output_dir: Optional[str], stage: str, attempt: int, as_json: Optional[Any] = None) -> str:
+def _save_raw(text: str, output_dir: Optional[str], stage: str, attempt: int,
+              writer: Optional[ArtifactWriter] = None) -> str:
     if not output_dir:
         return ""
-    ensure_dir(output_dir)
     raw_path = os.path.join(output_dir, f"{stage}_attempt{attempt}.txt")
+    if writer is not None:
+        return writer.write_text(raw_path, text, debug=True)
+    ensure_dir(output_dir)
     with open(raw_path, "w", encoding="utf-8") as f:
         f.write(text)
-    if as_json is not None:
-        json_path = os.path.join(output_dir, f"{stage}_attempt{attempt}.json")
-        with open(json_path, "w", encoding="utf-8") as jf:
-            json.dump(as_json, jf, ensure_ascii=False, indent=2)
     return raw_path
 
 
-def decode_payload(text: str, expected: str, stage: str, attempt: int, output_dir: Optional[str] = None) -> Tuple[Any, Optional[str]]:
+def _save_raw_json(obj: Any, output_dir: Optional[str], stage: str, attempt: int,
+                   writer: Optional[ArtifactWriter] = None) -> None:
+    if not output_dir:
+        return
+    json_path = os.path.join(output_dir, f"{stage}_attempt{attempt}.json")
+    if writer is not None:
+        writer.write_json(json_path, obj, debug=True)
+        return
+    with open(json_path, "w", encoding="utf-8") as jf:
+        json.dump(obj, jf, ensure_ascii=False, indent=2)
+
+
+def _strip_fence(text: str) -> str:
+    """Drop a surrounding ```lang ... ``` markdown fence some models wrap payloads in."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`").split("\n", 1)[-1]
+    return text
+
+
+def decode_payload(text: str, expected: str, stage: str, attempt: int, output_dir: Optional[str] = None,
+                   writer: Optional[ArtifactWriter] = None) -> Tuple[Any, Optional[str]]:
     """
     Decode LLM payload safely.
     - expected: "yaml", "json", or "text"
-    - returns (obj, raw_path)
+    - returns (obj, raw_path); the raw file keeps the text as received
+    - writer: queue raw files on an ArtifactWriter instead of writing them inline
     """
-    raw_path = _save_raw(text, output_dir, stage, attempt)
+    raw_path = _save_raw(text, output_dir, stage, attempt, writer=writer)
     try:
         if expected == "json":
-            obj = json.loads(text)
+            obj = json.loads(_strip_fence(text))
         elif expected == "yaml":
-            obj = yaml.safe_load(text)
+            obj = yaml.safe_load(_strip_fence(text))
         else:
             obj = text
     except Exception as e:
@@ -54,7 +76,7 @@ def decode_payload(text: str, expected: str, stage: str, attempt: int, output_di
 
     # If we decoded into a mapping, also save JSON for quick inspection
     if isinstance(obj, dict):
-        _save_raw(text, output_dir, stage, attempt, as_json=obj)
+        _save_raw_json(obj, output_dir, stage, attempt, writer=writer)
 
     return obj, raw_path
 
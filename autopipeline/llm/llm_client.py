@@ -1,30 +1,45 @@
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 
 import yaml
 
+from autopipeline.artifact_writer import ArtifactWriter
 from autopipeline.llm.cache import LLMDiskCache
 from autopipeline.llm.hash_utils import stable_hash, text_hash
 from autopipeline.llm.prompt_loader import PromptLoader
-from autopipeline.llm.types import LLMConfig, LLMResponse
+from autopipeline.llm.types import LLMConfig, LLMResult
 from autopipeline.llm import providers as provider_module
 from autopipeline.catalog.render import load_component_profiles, load_endpoint_types, component_types_summary, endpoint_types_summary
 from autopipeline.llm.prompt_injector import build_prompt_injections
 from autopipeline.verifier.rules_loader import load_rules_bundle
 from autopipeline.llm.decode import decode_payload, LLMOutputFormatError
+from autopipeline.llm.context_compactor import compact_context, estimate_tokens, section_tokens
+from autopipeline.llm.telemetry import CALLS_FILE, CallLog, call_record, usage_breakdown
+from autopipeline.utils import save_text
+
+# Static prompt prefixes (cumulative, per cache breakpoint) already sent by this process:
+# a provider-side prompt cache would serve these again. hash -> estimated tokens.
+_SENT_PREFIXES: Dict[str, int] = {}
 
 
 class LLMClient:
     """Unified LLM client with caching and provider abstraction."""
 
-    def __init__(self, base_dir: str, config: LLMConfig, logger: Callable[[str], None], output_root: Optional[str] = "outputs"):
+    # Context sections passed through as-is in default mode (already YAML text)
+    _RAW_TEXT_SECTIONS = frozenset({"IR_YAML"})
+
+    def __init__(self, base_dir: str, config: LLMConfig, logger: Callable[[str], None], output_root: Optional[str] = "outputs",
+                 artifacts: Optional[ArtifactWriter] = None):
         self.base_dir = base_dir
         self.config = config
         self.logger = logger
-        self.cache = LLMDiskCache(config.cache_dir, enabled=config.cache_enabled)
-        self.prompt_loader = PromptLoader(Path(base_dir) / "prompts", tier=config.prompt_tier)
+        # Raw dumps and resolved prompts go through the run's artifact writer when given (else written inline)
+        self.artifacts = artifacts
+        # Replay serves every call from its bundle (positional fallback counts calls), so skip the disk cache
+        self.cache = LLMDiskCache(config.cache_dir, enabled=config.cache_enabled and config.provider != "replay")
         self.rules_bundle = load_rules_bundle()
         comp = load_component_profiles(base_dir)
         ep = load_endpoint_types(base_dir)
@@ -33,6 +48,11 @@ class LLMClient:
             "endpoint_types": endpoint_types_summary(ep["data"]),
         }
         self.prompt_injections, self.prompt_injection_hashes = build_prompt_injections(Path(base_dir), self.rules_bundle)
+        # Injections are fixed for the client's lifetime; bind them so each template is filled once.
+        self.prompt_loader = PromptLoader(Path(base_dir) / "prompts", tier=config.prompt_tier,
+                                          injections=self.prompt_injections, layout=config.prompt_layout)
+        # Extra tiers are loaded on demand (speculative candidates across P0/P1/P2)
+        self._prompt_loaders: Dict[str, PromptLoader] = {config.prompt_tier: self.prompt_loader}
         self.output_root = output_root or "outputs"
         self.stats = {
             "provider": config.provider,
@@ -45,13 +65,33 @@ class LLMClient:
             "cache_hits": 0,
             "cache_misses": 0,
             "usage_tokens_total": 0,
+            "usage_tokens_breakdown": {"input_cached": 0, "input_uncached": 0, "cache_write": 0, "output": 0},
             "prompt_template_hashes": {},
             "prompt_resolved_hashes": {},
             "prompt_injections": self.prompt_injection_hashes,
             "raw_paths": {},
+            "prompt_compaction": config.prompt_compaction,
+            "prompt_tokens_est": {},
+            "prompt_tokens_est_total": 0,
+            "prompt_layout": config.prompt_layout,
+            "prompt_prefix_hashes": {},
+            "prefix_tokens_est_total": 0,
+            "prefix_reused_tokens_est_total": 0,
+            "usage_tokens_input": 0,
+            "usage_tokens_output": 0,
+            "cost_usd_est_total": 0.0,
+            "cost_unpriced_calls": 0,
+            "latency_ms_total": 0.0,
+            "retries_total": 0,
+            "provider_errors": 0,
+            "calls_log": None,
         }
+        # One telemetry record per call, next to eval.json
+        self.call_log = CallLog(Path(base_dir) / self.output_root / CALLS_FILE)
         # Track attempts per stage for raw naming
         self._stage_attempt_counters: Dict[str, int] = {}
+        # The replay provider indexes its bundle once and counts calls per stage across the run
+        self._replay_provider = None
 
     def _raw_dir(self, case_id: str) -> Path:
         return Path(self.base_dir) / self.output_root / case_id / "llm_raw"
@@ -65,15 +105,18 @@ class LLMClient:
 
     def _get_provider(self):
         name = self.config.provider.lower()
+        provider_cls = provider_module.get_provider_class(name)
         if name == "mock":
-            return provider_module.MockProvider(self.base_dir)
-        if name == "anthropic":
-            return provider_module.AnthropicProvider()
-        if name == "deepseek":
-            return provider_module.DeepseekProvider()
-        if name == "openai":
-            return provider_module.OpenAIProvider()
-        raise ValueError(f"Unsupported provider: {name}")
+            return provider_cls(self.base_dir)
+        if name == "replay":
+            if self._replay_provider is None:
+                if not self.config.replay_bundle:
+                    raise ValueError("replay provider requires a replay bundle (--replay-bundle)")
+                self._replay_provider = provider_cls(
+                    self.config.replay_bundle, as_provider=self.config.replay_as, strict=self.config.replay_strict)
+                self.stats["replay"] = self._replay_provider.stats
+            return self._replay_provider
+        return provider_cls()
 
     def _compute_cache_key(self, stage: str, provider_name: str, model: str, params: Dict[str, Any],
                            prompt_hash: str, rendered_hash: str, rules_hash: str,
@@ -91,31 +134,87 @@ class LLMClient:
         }
         return stable_hash(key_obj)
 
-    def _render_prompt(self, prompt_name: str, context: Dict[str, Any]) -> Dict[str, str]:
-        rendered = self.prompt_loader.render(prompt_name, context, injections=self.prompt_injections)
+    def _build_context(self, stage: str, sections: Dict[str, Any], case_id: str,
+                       ir_data: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return (context, context_text). context_text is set only in compaction mode.
+
+        Default mode keeps the historical YAML-string context so rendered prompts and
+        cache keys are unchanged.
+        """
+        if not self.config.prompt_compaction:
+            context = {k: v if k in self._RAW_TEXT_SECTIONS else yaml.safe_dump(v, sort_keys=False, allow_unicode=True)
+                       for k, v in sections.items()}
+            context["case_id"] = case_id
+            self.stats["prompt_tokens_est"][stage] = {"sections": section_tokens(context)}
+            return context, None
+        context_text, report = compact_context(sections, case_id, ir_data=ir_data)
+        self.stats["prompt_tokens_est"][stage] = report
+        return {"case_id": case_id}, context_text
+
+    def _loader_for(self, tier: Optional[str]) -> PromptLoader:
+        tier = tier or self.config.prompt_tier
+        if tier not in self._prompt_loaders:
+            self._prompt_loaders[tier] = PromptLoader(Path(self.base_dir) / "prompts", tier=tier,
+                                                      injections=self.prompt_injections,
+                                                      layout=self.config.prompt_layout)
+        return self._prompt_loaders[tier]
+
+    def _render_prompt(self, prompt_name: str, context: Dict[str, Any],
+                       context_text: Optional[str] = None, tier: Optional[str] = None) -> Dict[str, str]:
+        rendered = self._loader_for(tier).render(prompt_name, context, context_text=context_text)
         # Track hashes
-        self.stats["prompt_template_hashes"][prompt_name] = rendered["template_hash"]
-        self.stats["prompt_resolved_hashes"][prompt_name] = rendered["rendered_hash"]
+        key = prompt_name if not tier or tier == self.config.prompt_tier else f"{prompt_name}@{tier}"
+        self.stats["prompt_template_hashes"][key] = rendered["template_hash"]
+        self.stats["prompt_resolved_hashes"][key] = rendered["rendered_hash"]
+        self.stats["prompt_prefix_hashes"][key] = rendered["prefix_hash"]
         return rendered
 
+    def _track_prefix_reuse(self, prompt_obj: Dict[str, Any]):
+        """Estimate how much of the static prefix a provider prompt cache could serve."""
+        prefix = ""
+        prefix_tokens = reused = 0
+        for seg in prompt_obj["segments"]:
+            if not seg["cache"]:
+                break
+            prefix += seg["text"]
+            key = text_hash(prefix)
+            if key in _SENT_PREFIXES:
+                reused = _SENT_PREFIXES[key]
+            else:
+                _SENT_PREFIXES[key] = estimate_tokens(prefix)
+            prefix_tokens = _SENT_PREFIXES[key]
+        self.stats["prefix_tokens_est_total"] += prefix_tokens
+        self.stats["prefix_reused_tokens_est_total"] += reused
+
     def _register_raw_path(self, stage: str, path: Optional[str]):
         if not path:
             return
         paths = self.stats["raw_paths"].setdefault(stage, [])
         paths.append(path)
 
-    def _invoke(self, stage: str, prompt_name: str, context: Dict[str, Any], rules_hash: str,
-                schema_versions: Dict[str, Any], inputs_hash: str, attempt: int = 1, expected_format: str = "yaml") -> str:
+    def _prepare_call(self, stage: str, prompt_name: str, context: Dict[str, Any], rules_hash: str,
+                      schema_versions: Dict[str, Any], inputs_hash: str, context_text: Optional[str] = None,
+                      candidate: int = 0, tier: Optional[str] = None) -> Dict[str, Any]:
+        """Render, key and look up one call. Runs on the caller's thread (it updates stats)."""
         provider = self._get_provider()
         model = self.config.model or "mock-model"
         params = {
             "temperature": self.config.temperature,
             "max_tokens": self.config.max_tokens,
         }
-        prompt_obj = self._render_prompt(prompt_name, context)
+        if candidate:
+            # Speculative candidates are distinct requests; candidate 0 keeps the sequential key
+            params["candidate"] = candidate
+        if tier and tier != self.config.prompt_tier:
+            params["prompt_tier"] = tier
+        prompt_obj = self._render_prompt(prompt_name, context, context_text, tier=tier)
+        prompt_tokens = estimate_tokens(prompt_obj["rendered"])
+        self.stats["prompt_tokens_est"].setdefault(stage, {})["total"] = prompt_tokens
+        self.stats["prompt_tokens_est_total"] += prompt_tokens
         cache_key = self._compute_cache_key(
             stage=stage,
-            provider_name=provider.name,
+            # Replay keys requests as the recorded provider did
+            provider_name=getattr(provider, "key_name", provider.name),
             model=model,
             params=params,
             prompt_hash=prompt_obj["template_hash"],
@@ -124,128 +223,318 @@ class LLMClient:
             schema_versions=schema_versions,
             inputs_hash=inputs_hash,
         )
-
-        cache_hit = False
-        cached_text = None
-        cached_usage = None
-        start = time.time()
+        plan = {
+            "stage": stage,
+            "provider": provider,
+            "model": model,
+            "params": params,
+            "prompt_obj": prompt_obj,
+            "cache_key": cache_key,
+            "request_meta": {
+                "stage": stage,
+                "provider": provider.name,
+                "model": model,
+                "params": params,
+                "prompt_template_hash": prompt_obj["template_hash"],
+                "rendered_prompt_hash": prompt_obj["rendered_hash"],
+                "rules_hash": rules_hash,
+                "schema_versions": schema_versions,
+                "inputs_hash": inputs_hash,
+            },
+            "case_id": context.get("case_id"),
+            "candidate": candidate,
+            "tier": tier or self.config.prompt_tier,
+            "cache_hit": False,
+            "text": None,
+            "usage": None,
+            "start": time.time(),
+        }
 
         hit, cache_payload = self.cache.get(cache_key)
         if hit:
-            cache_hit = True
-            cached_text = cache_payload.get("response_text")
-            cached_usage = cache_payload.get("usage")
+            plan["cache_hit"] = True
+            plan["text"] = cache_payload.get("response_text")
+            plan["usage"] = cache_payload.get("usage")
             self.stats["cache_hits"] += 1
         else:
             self.stats["cache_misses"] += 1
+        if plan["text"] is None:
+            self._track_prefix_reuse(prompt_obj)
+        return plan
+
+    def _call_provider(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """The provider request of a prepared call; touches no shared state, so it may run in a worker.
+
+        Retries up to `max_retries` times with exponential backoff; latency, time to first
+        byte (when the provider reports it) and the retry count are stored on the plan.
+        """
+        call_kwargs = {}
+        if self.config.prompt_layout == "prefix_stable":
+            call_kwargs["prompt_segments"] = plan["prompt_obj"]["segments"]
+        if plan["candidate"]:
+            call_kwargs["candidate"] = plan["candidate"]
+        started = time.perf_counter()
+        retries = 0
+        try:
+            while True:
+                try:
+                    resp = plan["provider"].call(
+                        prompt=plan["prompt_obj"]["rendered"],
+                        stage=plan["stage"],
+                        model=plan["model"],
+                        temperature=self.config.temperature,
+                        max_tokens=self.config.max_tokens,
+                        case_id=plan["case_id"],
+                        cache_key=plan["cache_key"],
+                        **call_kwargs,
+                    )
+                    plan["ttfb_ms"] = resp.get("ttfb_ms")
+                    return resp
+                except Exception:
+                    if retries >= self.config.max_retries:
+                        raise
+                    time.sleep(self.config.retry_backoff_s * (2 ** retries))
+                    retries += 1
+        finally:
+            plan["retries"] = retries
+            plan["latency_ms"] = (time.perf_counter() - started) * 1000
 
-        if cached_text is None:
-            resp = provider.call(
-                prompt=prompt_obj["rendered"],
-                stage=stage,
-                model=model,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-                case_id=context.get("case_id"),
-            )
-            cached_text = resp["text"]
-            cached_usage = resp.get("usage")
-            cache_payload = {
-                "request_meta": {
-                    "stage": stage,
-                    "provider": provider.name,
-                    "model": model,
-                    "params": params,
-                    "prompt_template_hash": prompt_obj["template_hash"],
-                    "rendered_prompt_hash": prompt_obj["rendered_hash"],
-                    "rules_hash": rules_hash,
-                    "schema_versions": schema_versions,
-                    "inputs_hash": inputs_hash,
-                },
-                "response_text": cached_text,
-                "usage": cached_usage,
-            }
-            self.cache.set(cache_key, cache_payload)
-
-        elapsed = time.time() - start
-        self._log_call(stage, cache_hit, cache_key, elapsed, cached_usage)
-        # Save raw output for debugging
-        raw_dir = self._raw_dir(context.get("case_id", "unknown"))
+    def _record_call(self, plan: Dict[str, Any], attempt: int, error: Optional[BaseException] = None):
+        """Account one call in the totals and append its telemetry record. Caller's thread."""
+        latency_ms = plan.get("latency_ms")
+        if latency_ms is None:
+            latency_ms = (time.time() - plan["start"]) * 1000
+        record = call_record(
+            case_id=plan["case_id"], stage=plan["stage"], attempt=attempt, candidate=plan["candidate"],
+            tier=plan["tier"], provider=plan["provider"].name, model=plan["model"],
+            cache_key=plan["cache_key"], cache_hit=plan["cache_hit"],
+            usage=None if error else plan["usage"], latency_ms=latency_ms, ttfb_ms=plan.get("ttfb_ms"),
+            retries=plan.get("retries", 0), error=f"{type(error).__name__}: {error}" if error else None,
+            ts=plan["start"],
+        )
+        self.stats["latency_ms_total"] += record["latency_ms"]
+        self.stats["retries_total"] += record["retries"]
+        if error:
+            self.stats["provider_errors"] += 1
+        if record["cost_usd_est"] is None:
+            self.stats["cost_unpriced_calls"] += 1
+        else:
+            self.stats["cost_usd_est_total"] = round(self.stats["cost_usd_est_total"] + record["cost_usd_est"], 8)
         try:
-            _, raw_path = decode_payload(cached_text, expected_format, stage, attempt, str(raw_dir))
-            self._register_raw_path(stage, raw_path)
+            self.call_log.write(record)
+            self.stats["calls_log"] = str(self.call_log.path)
+        except OSError as e:
+            self.logger(f"[LLM] telemetry write failed: {e}")
+        return record
+
+    def _finish_call(self, plan: Dict[str, Any], resp: Optional[Dict[str, Any]], attempt: int,
+                     expected_format: str) -> LLMResult:
+        """Cache, log, decode and persist raw output once, and account usage for a call. Caller's thread."""
+        stage = plan["stage"]
+        if resp is not None:
+            plan["text"] = resp["text"]
+            plan["usage"] = resp.get("usage")
+            self.cache.set(plan["cache_key"], {
+                "request_meta": plan["request_meta"],
+                "response_text": plan["text"],
+                "usage": plan["usage"],
+            })
+        cached_text, cached_usage = plan["text"], plan["usage"]
+
+        elapsed = time.time() - plan["start"]
+        self._log_call(stage, plan["cache_hit"], plan["cache_key"], elapsed, cached_usage)
+        # Save raw output for debugging; candidates get their own raw files
+        raw_stage = f"{stage}_c{plan['candidate']}" if plan["candidate"] else stage
+        raw_dir = self._raw_dir(plan["case_id"] or "unknown")
+        result = LLMResult(text=cached_text, cache_hit=plan["cache_hit"], cache_key=plan["cache_key"])
+        try:
+            result.parsed, result.raw_path = decode_payload(cached_text, expected_format, raw_stage, attempt,
+                                                            str(raw_dir), writer=self.artifacts)
         except LLMOutputFormatError as e:
-            # Even if decode failed, raw already saved by decode_payload
-            self._register_raw_path(stage, e.raw_path)
+            # Even if decode failed, raw already saved by decode_payload; the caller decides what to raise
+            result.parse_error, result.raw_path = e, e.raw_path
+        self._register_raw_path(stage, result.raw_path)
 
         # Optionally dump rendered prompt
         if self.config.dump_prompts:
             cnt = self._stage_attempt_counters.get(stage, 0) + 1
             self._stage_attempt_counters[stage] = cnt
-            prompt_dir = Path(self.base_dir) / self.output_root / (context.get("case_id") or "unknown") / "prompts_resolved"
-            prompt_dir.mkdir(parents=True, exist_ok=True)
-            fname = prompt_dir / f"{stage}_attempt{cnt}.txt"
-            fname.write_text(prompt_obj["rendered"], encoding="utf-8")
-            self._register_raw_path(f"{stage}_prompt", str(fname))
+            prompt_dir = Path(self.base_dir) / self.output_root / (plan["case_id"] or "unknown") / "prompts_resolved"
+            fname = str(prompt_dir / f"{stage}_attempt{cnt}.txt")
+            if self.artifacts is not None:
+                fname = self.artifacts.write_text(fname, plan["prompt_obj"]["rendered"], debug=True)
+            else:
+                save_text(plan["prompt_obj"]["rendered"], fname)
+            self._register_raw_path(f"{stage}_prompt", fname)
 
         # Stats
         self.stats["calls_total"] += 1
         self.stats["calls_by_stage"][stage] = self.stats["calls_by_stage"].get(stage, 0) + 1
         if cached_usage and isinstance(cached_usage, dict):
             # Handle different provider usage formats
-            total = 0
-            if "input_tokens" in cached_usage or "output_tokens" in cached_usage:
-                total = cached_usage.get("input_tokens", 0) + cached_usage.get("output_tokens", 0)
-            elif "prompt_tokens" in cached_usage or "completion_tokens" in cached_usage:
-                total = cached_usage.get("prompt_tokens", 0) + cached_usage.get("completion_tokens", 0)
-            self.stats["usage_tokens_total"] += total
+            breakdown = usage_breakdown(cached_usage)
+            for key, val in breakdown.items():
+                self.stats["usage_tokens_breakdown"][key] += val
+            self.stats["usage_tokens_input"] += breakdown["input_cached"] + breakdown["input_uncached"]
+            self.stats["usage_tokens_output"] += breakdown["output"]
+            self.stats["usage_tokens_total"] += breakdown["input_cached"] + breakdown["input_uncached"] + breakdown["output"]
+        self._record_call(plan, attempt)
 
-        return cached_text
+        return result
+
+    def _invoke(self, stage: str, prompt_name: str, context: Dict[str, Any], rules_hash: str,
+                schema_versions: Dict[str, Any], inputs_hash: str, attempt: int = 1, expected_format: str = "yaml",
+                context_text: Optional[str] = None) -> LLMResult:
+        plan = self._prepare_call(stage, prompt_name, context, rules_hash, schema_versions, inputs_hash,
+                                  context_text=context_text)
+        resp = None
+        if plan["text"] is None:
+            try:
+                resp = self._call_provider(plan)
+            except Exception as e:
+                self._record_call(plan, attempt, error=e)
+                raise
+        return self._finish_call(plan, resp, attempt, expected_format)
+
+    def _invoke_candidates(self, stage: str, prompt_name: str, context: Dict[str, Any], rules_hash: str,
+                           schema_versions: Dict[str, Any], inputs_hash: str, k: int, attempt: int = 1,
+                           expected_format: str = "yaml", context_text: Optional[str] = None,
+                           tiers: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Issue k candidate requests concurrently and yield each as it arrives.
+
+        Yields {"candidate", "tier", "result", "text", "error", "latency_ms", "cache_hit"}, where
+        `result` is the decoded LLMResult (None on provider error); cache hits come
+        first. Closing the generator early cancels candidates that have not started yet; requests
+        already in flight finish in the background and are discarded (not cached).
+        """
+        plans = [self._prepare_call(stage, prompt_name, context, rules_hash, schema_versions, inputs_hash,
+                                    context_text=context_text, candidate=i,
+                                    tier=tiers[i % len(tiers)] if tiers else None)
+                 for i in range(k)]
+
+        def _result(plan, result=None, error=None, latency_ms=0.0):
+            return {"candidate": plan["candidate"], "tier": plan["tier"], "result": result,
+                    "text": result.text if result is not None else None, "error": error,
+                    "latency_ms": round(latency_ms, 3), "cache_hit": plan["cache_hit"]}
+
+        def _timed_call(plan):
+            try:
+                return self._call_provider(plan), None, plan["latency_ms"]
+            except Exception as e:  # surfaced per candidate; other candidates keep going
+                return None, e, plan["latency_ms"]
+
+        for plan in plans:
+            if plan["text"] is not None:
+                yield _result(plan, result=self._finish_call(plan, None, attempt, expected_format))
+        live = [plan for plan in plans if plan["text"] is None]
+        if not live:
+            return
+        pool = ThreadPoolExecutor(max_workers=len(live))
+        try:
+            futures = {pool.submit(_timed_call, plan): plan for plan in live}
+            for fut in as_completed(futures):
+                plan = futures[fut]
+                resp, error, latency_ms = fut.result()
+                if error is not None:
+                    self._record_call(plan, attempt, error=error)
+                    yield _result(plan, error=error, latency_ms=latency_ms)
+                    continue
+                yield _result(plan, result=self._finish_call(plan, resp, attempt, expected_format),
+                              latency_ms=latency_ms)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ir_request(self, case_id: str, user_problem: Dict[str, Any], device_info: Dict[str, Any]):
+        inputs_hash = stable_hash({"user_problem": user_problem, "device_info": device_info})
+        context, context_text = self._build_context(
+            "generate_ir", {"USER_PROBLEM": user_problem, "DEVICE_INFO": device_info}, case_id)
+        return context, context_text, inputs_hash
+
+    def _bindings_request(self, case_id: str, ir_yaml: str, device_info: Dict[str, Any],
+                          ir_data: Optional[Dict[str, Any]] = None):
+        inputs_hash = stable_hash({"ir_yaml": ir_yaml, "device_info": device_info})
+        if ir_data is None and self.config.prompt_compaction:
+            try:
+                ir_data = yaml.safe_load(ir_yaml)
+            except yaml.YAMLError:
+                ir_data = None
+        context, context_text = self._build_context(
+            "generate_bindings", {"IR_YAML": ir_yaml, "DEVICE_INFO": device_info}, case_id,
+            ir_data=ir_data if isinstance(ir_data, dict) else None)
+        return context, context_text, inputs_hash
 
     def generate_ir(self, case_id: str, user_problem: Dict[str, Any], device_info: Dict[str, Any],
                     rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any],
-                    prompt_name: str = "ir_agent", attempt: int = 1) -> str:
-        inputs_hash = stable_hash({"user_problem": user_problem, "device_info": device_info})
-        context = {
-            "USER_PROBLEM": yaml.safe_dump(user_problem, sort_keys=False, allow_unicode=True),
-            "DEVICE_INFO": yaml.safe_dump(device_info, sort_keys=False, allow_unicode=True),
-            "case_id": case_id,
-        }
+                    prompt_name: str = "ir_agent", attempt: int = 1) -> LLMResult:
+        context, context_text, inputs_hash = self._ir_request(case_id, user_problem, device_info)
         return self._invoke("generate_ir", prompt_name, context, rules_ctx["rules_hash"],
-                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml")
+                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml",
+                            context_text=context_text)
+
+    def generate_ir_candidates(self, case_id: str, user_problem: Dict[str, Any], device_info: Dict[str, Any],
+                               rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any], k: int,
+                               tiers: Optional[List[str]] = None, prompt_name: str = "ir_agent",
+                               attempt: int = 1) -> Iterator[Dict[str, Any]]:
+        """k concurrent IR generations, yielded as they arrive (see _invoke_candidates)."""
+        context, context_text, inputs_hash = self._ir_request(case_id, user_problem, device_info)
+        return self._invoke_candidates("generate_ir", prompt_name, context, rules_ctx["rules_hash"],
+                                       schema_versions, inputs_hash, k, attempt=attempt, expected_format="yaml",
+                                       context_text=context_text, tiers=tiers)
 
     def generate_bindings(self, case_id: str, ir_yaml: str, device_info: Dict[str, Any],
                           rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any],
-                          prompt_name: str = "binding_agent", attempt: int = 1) -> str:
-        inputs_hash = stable_hash({"ir_yaml": ir_yaml, "device_info": device_info})
-        context = {
-            "IR_YAML": ir_yaml,
-            "DEVICE_INFO": yaml.safe_dump(device_info, sort_keys=False, allow_unicode=True),
-            "case_id": case_id,
-        }
+                          prompt_name: str = "binding_agent", attempt: int = 1,
+                          ir_data: Optional[Dict[str, Any]] = None) -> LLMResult:
+        """`ir_data`: the already-parsed IR, so compaction does not re-parse `ir_yaml`."""
+        context, context_text, inputs_hash = self._bindings_request(case_id, ir_yaml, device_info, ir_data)
         return self._invoke("generate_bindings", prompt_name, context, rules_ctx["rules_hash"],
-                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml")
+                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml",
+                            context_text=context_text)
+
+    def generate_bindings_candidates(self, case_id: str, ir_yaml: str, device_info: Dict[str, Any],
+                                     rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any], k: int,
+                                     tiers: Optional[List[str]] = None, prompt_name: str = "binding_agent",
+                                     attempt: int = 1, ir_data: Optional[Dict[str, Any]] = None
+                                     ) -> Iterator[Dict[str, Any]]:
+        """k concurrent bindings generations, yielded as they arrive (see _invoke_candidates)."""
+        context, context_text, inputs_hash = self._bindings_request(case_id, ir_yaml, device_info, ir_data)
+        return self._invoke_candidates("generate_bindings", prompt_name, context, rules_ctx["rules_hash"],
+                                       schema_versions, inputs_hash, k, attempt=attempt, expected_format="yaml",
+                                       context_text=context_text, tiers=tiers)
 
     def repair_ir(self, case_id: str, ir_draft: Dict[str, Any], verifier_errors: Any,
                   rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any],
-                  prompt_name: str = "repair_agent", attempt: int = 1) -> str:
+                  prompt_name: str = "repair_agent", attempt: int = 1) -> LLMResult:
         inputs_hash = stable_hash({"ir_draft": ir_draft, "verifier_errors": verifier_errors})
-        context = {
-            "IR_DRAFT": yaml.safe_dump(ir_draft, sort_keys=False, allow_unicode=True),
-            "ERRORS": yaml.safe_dump(verifier_errors, sort_keys=False, allow_unicode=True),
-            "case_id": case_id,
-        }
+        context, context_text = self._build_context(
+            "repair_ir", {"IR_DRAFT": ir_draft, "ERRORS": verifier_errors}, case_id)
         return self._invoke("repair_ir", prompt_name, context, rules_ctx["rules_hash"],
-                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml")
+                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml",
+                            context_text=context_text)
 
     def repair_bindings(self, case_id: str, bindings_draft: Dict[str, Any], verifier_errors: Any,
                         rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any],
-                        prompt_name: str = "repair_agent", attempt: int = 1) -> str:
+                        prompt_name: str = "repair_agent", attempt: int = 1) -> LLMResult:
         inputs_hash = stable_hash({"bindings_draft": bindings_draft, "verifier_errors": verifier_errors})
-        context = {
-            "BINDINGS_DRAFT": yaml.safe_dump(bindings_draft, sort_keys=False, allow_unicode=True),
-            "ERRORS": yaml.safe_dump(verifier_errors, sort_keys=False, allow_unicode=True),
-            "case_id": case_id,
-        }
+        context, context_text = self._build_context(
+            "repair_bindings", {"BINDINGS_DRAFT": bindings_draft, "ERRORS": verifier_errors}, case_id)
         return self._invoke("repair_bindings", prompt_name, context, rules_ctx["rules_hash"],
-                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml")
+                            schema_versions, inputs_hash, attempt=attempt, expected_format="yaml",
+                            context_text=context_text)
+
+    def repair_patch(self, case_id: str, artifact_type: str, patch_context: Dict[str, Any],
+                     rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any],
+                     prompt_name: str = "repair_patch", attempt: int = 1) -> LLMResult:
+        """Ask for an RFC 6902 patch given only failing subtrees (see repair.context_pack.build_patch_context)."""
+        stage = f"repair_{artifact_type}_patch"
+        sections = {
+            "ARTIFACT_TYPE": artifact_type,
+            "ERRORS": patch_context["errors"],
+            "SUBTREES": patch_context["subtrees"],
+            "SCHEMA_SLICE": patch_context["schema_slice"],
+        }
+        inputs_hash = stable_hash(sections)
+        context, context_text = self._build_context(stage, sections, case_id)
+        return self._invoke(stage, prompt_name, context, rules_ctx["rules_hash"],
+                            schema_versions, inputs_hash, attempt=attempt, expected_format="json",
+                            context_text=context_text)
@@ -1,39 +1,153 @@
+import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Union
 import yaml
-from autopipeline.llm.hash_utils import text_hash
+from autopipeline.llm.hash_utils import stable_hash, text_hash
+
+PLACEHOLDER_RE = re.compile(r"\{\{([A-Za-z0-9_]+)\}\}")
+LAYOUTS = ("inline", "prefix_stable")
+# Order of the shared reference block in the prefix_stable layout
+REFERENCE_ORDER = ("CATALOG_TYPES", "ENDPOINT_TYPES_SUMMARY", "RULES_REQUIRED_FIELDS", "RULES_FORBIDDEN",
+                   "SCHEMA_REQUIRED_FIELDS")
+
+
+class _Slot:
+    __slots__ = ("name", "literal")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.literal = f"{{{{{name}}}}}"
+
+
+class CompiledTemplate:
+    """Template text split into literal segments and `{{NAME}}` slots, hashed once."""
+
+    __slots__ = ("name", "path", "text", "template_hash", "segments", "slot_names")
+
+    def __init__(self, name: str, path: Path, text: str):
+        self.name = name
+        self.path = path
+        self.text = text
+        self.template_hash = text_hash(text)
+        segments = []
+        pos = 0
+        for m in PLACEHOLDER_RE.finditer(text):
+            if m.start() > pos:
+                segments.append(text[pos:m.start()])
+            segments.append(_Slot(m.group(1)))
+            pos = m.end()
+        if pos < len(text):
+            segments.append(text[pos:])
+        self.segments: Tuple[Union[str, _Slot], ...] = tuple(segments)
+        self.slot_names = frozenset(seg.name for seg in segments if isinstance(seg, _Slot))
+
+    def apply(self, injections: Optional[Dict[str, str]]) -> str:
+        """Fill known slots; unknown placeholders are kept verbatim."""
+        if not injections:
+            return self.text
+        return "".join(seg if isinstance(seg, str) else injections.get(seg.name, seg.literal)
+                       for seg in self.segments)
 
 
 class PromptLoader:
-    """Load prompt templates from prompts/ and render with a simple format map."""
+    """Load prompt templates from prompts/ and render with a simple format map.
+
+    Templates are resolved and compiled once per name for the loader's tier. Injections
+    bound at construction are applied once per template, and rendered prompts are
+    memoized by context hash.
 
-    def __init__(self, base_dir: Path, tier: str = "P0"):
+    Layouts:
+      - inline: injections are substituted where the template references them.
+      - prefix_stable: the injections a template references are hoisted into a leading
+        ``# Reference`` block in REFERENCE_ORDER, followed by the template text (slots point
+        at the reference) and then the per-case context. The reference block is
+        byte-identical across prompts and cases, so providers can serve it from cache.
+    """
+
+    RENDER_CACHE_SIZE = 64
+
+    def __init__(self, base_dir: Path, tier: str = "P0", injections: Optional[Dict[str, str]] = None,
+                 layout: str = "inline"):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown prompt layout '{layout}', expected one of {LAYOUTS}")
         self.base_dir = base_dir
         self.tier = tier
+        self.injections = injections
+        self.layout = layout
+        self._compiled: Dict[str, CompiledTemplate] = {}
+        self._injected: Dict[str, Tuple[str, ...]] = {}
+        self._rendered: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
 
-    def load(self, prompt_name: str) -> str:
+    def _resolve(self, prompt_name: str) -> Path:
         tier_path = self.base_dir / self.tier / f"{prompt_name}.txt"
         fallback_path = self.base_dir / "P0" / f"{prompt_name}.txt"
         legacy_path = self.base_dir / f"{prompt_name}.txt"
-        if tier_path.exists():
-            return tier_path.read_text(encoding="utf-8")
-        if fallback_path.exists():
-            return fallback_path.read_text(encoding="utf-8")
-        if legacy_path.exists():
-            return legacy_path.read_text(encoding="utf-8")
+        for path in (tier_path, fallback_path, legacy_path):
+            if path.exists():
+                return path
         raise FileNotFoundError(f"Prompt template not found for tier {self.tier}: {tier_path}")
 
-    def render(self, prompt_name: str, context: Dict[str, Any], injections: Optional[Dict[str, str]] = None) -> Dict[str, str]:
-        template = self.load(prompt_name)
-        rendered_template = template
-        if injections:
-            for key, val in injections.items():
-                rendered_template = rendered_template.replace(f"{{{{{key}}}}}", val)
-        rendered_context = yaml.safe_dump(context, sort_keys=False, allow_unicode=True)
-        rendered = f"{rendered_template}\n\n# Context\n{rendered_context}"
-        return {
-            "template": template,
-            "template_hash": text_hash(template),
+    def compile(self, prompt_name: str) -> CompiledTemplate:
+        compiled = self._compiled.get(prompt_name)
+        if compiled is None:
+            path = self._resolve(prompt_name)
+            compiled = CompiledTemplate(prompt_name, path, path.read_text(encoding="utf-8"))
+            self._compiled[prompt_name] = compiled
+        return compiled
+
+    def load(self, prompt_name: str) -> str:
+        return self.compile(prompt_name).text
+
+    def _static_segments(self, compiled: CompiledTemplate, injections: Optional[Dict[str, str]]) -> Tuple[str, ...]:
+        if self.layout == "inline":
+            return (compiled.apply(injections),)
+        injections = injections or {}
+        keys = [k for k in REFERENCE_ORDER if k in injections and k in compiled.slot_names]
+        keys += sorted(k for k in compiled.slot_names & injections.keys() if k not in REFERENCE_ORDER)
+        instructions = compiled.apply({k: f"(see # Reference: {k})" for k in keys})
+        if not keys:
+            return (instructions,)
+        reference = "# Reference\n\n" + "\n\n".join(injections[k] for k in keys) + "\n\n# Instructions\n\n"
+        return (reference, instructions)
+
+    def _apply_injections(self, compiled: CompiledTemplate, injections: Optional[Dict[str, str]]) -> Tuple[str, ...]:
+        if injections is None or injections is self.injections:
+            static = self._injected.get(compiled.name)
+            if static is None:
+                static = self._static_segments(compiled, self.injections)
+                self._injected[compiled.name] = static
+            return static
+        return self._static_segments(compiled, injections)
+
+    def render(self, prompt_name: str, context: Dict[str, Any], injections: Optional[Dict[str, str]] = None,
+               context_text: Optional[str] = None) -> Dict[str, Any]:
+        """Render template + context; `context_text` replaces the YAML dump of `context` when given."""
+        compiled = self.compile(prompt_name)
+        bound = injections is None or injections is self.injections
+        memo_key = (prompt_name, stable_hash(context if context_text is None else context_text)) if bound else None
+        if memo_key is not None and memo_key in self._rendered:
+            self._rendered.move_to_end(memo_key)
+            return dict(self._rendered[memo_key])
+
+        static = self._apply_injections(compiled, injections)
+        if context_text is None:
+            rendered_context = yaml.safe_dump(context, sort_keys=False, allow_unicode=True)
+        else:
+            rendered_context = context_text
+        suffix = f"\n\n# Context\n{rendered_context}"
+        rendered = "".join(static) + suffix
+        result = {
+            "template": compiled.text,
+            "template_hash": compiled.template_hash,
             "rendered": rendered,
             "rendered_hash": text_hash(rendered),
+            # Static segments end at cache breakpoints; the context suffix is per case
+            "segments": [{"text": t, "cache": True} for t in static] + [{"text": suffix, "cache": False}],
+            "prefix_hash": text_hash("".join(static)),
         }
+        if memo_key is not None:
+            self._rendered[memo_key] = result
+            if len(self._rendered) > self.RENDER_CACHE_SIZE:
+                self._rendered.popitem(last=False)
+        return dict(result)
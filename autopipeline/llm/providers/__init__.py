@@ -1,4 +1,36 @@
-from .mock_provider import MockProvider  # noqa: F401
-from .anthropic_provider import AnthropicProvider  # noqa: F401
-from .deepseek_provider import DeepseekProvider  # noqa: F401
-from .openai_provider import OpenAIProvider  # noqa: F401
+"""LLM providers, resolved by name.
+
+No provider module is imported until its provider is requested, so a run does not load
+the anthropic SDK or urllib unless it uses them. `get_provider_class` resolves a
+registered name; the classes are also importable as attributes (``providers.MockProvider``).
+"""
+
+import importlib
+
+# Provider name -> (module in this package, class)
+PROVIDERS = {
+    "mock": ("mock_provider", "MockProvider"),
+    "replay": ("replay_provider", "ReplayProvider"),
+    "anthropic": ("anthropic_provider", "AnthropicProvider"),
+    "deepseek": ("deepseek_provider", "DeepseekProvider"),
+    "openai": ("openai_provider", "OpenAIProvider"),
+}
+
+
+def get_provider_class(name: str):
+    """Provider class registered as `name` (case-insensitive); imports its module on first use."""
+    try:
+        module_name, class_name = PROVIDERS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported provider: {name}") from None
+    return getattr(importlib.import_module(f"{__name__}.{module_name}"), class_name)
+
+
+def __getattr__(name):
+    for module_name, class_name in PROVIDERS.values():
+        if class_name == name:
+            return getattr(importlib.import_module(f"{__name__}.{module_name}"), class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name}")
+
+
+__all__ = ["PROVIDERS", "get_provider_class"] + [class_name for _, class_name in PROVIDERS.values()]
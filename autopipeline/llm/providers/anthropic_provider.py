@@ -1,5 +1,5 @@
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 try:
     import anthropic
@@ -21,12 +21,22 @@ class AnthropicProvider:
         self.client = anthropic.Anthropic(api_key=self.api_key)
 
     def call(self, *, prompt: str, model: str, temperature: float = 0.0,
-             max_tokens: Optional[int] = None, **_) -> Dict[str, Any]:
+             max_tokens: Optional[int] = None, prompt_segments: Optional[List[Dict[str, Any]]] = None,
+             **_) -> Dict[str, Any]:
+        content: Any = prompt
+        if prompt_segments:
+            # One text block per segment; cache breakpoints after the static prefix blocks
+            content = []
+            for seg in prompt_segments:
+                block = {"type": "text", "text": seg["text"]}
+                if seg.get("cache"):
+                    block["cache_control"] = {"type": "ephemeral"}
+                content.append(block)
         kwargs = {
             "model": model,
             "max_tokens": max_tokens or 2048,
             "temperature": temperature,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": [{"role": "user", "content": content}],
         }
         resp = self.client.messages.create(**kwargs)
         text_parts = []
@@ -35,4 +45,7 @@ class AnthropicProvider:
                 text_parts.append(c.text)
         text = "\n".join(text_parts)
         usage = getattr(resp, "usage", None)
+        if usage is not None and not isinstance(usage, dict):
+            # SDK Usage object -> plain dict so it can be cached and accounted
+            usage = usage.model_dump() if hasattr(usage, "model_dump") else dict(vars(usage))
         return {"text": text, "usage": usage}
@@ -1,5 +1,6 @@
 import json
 import os
+import time
 from typing import Optional, Dict, Any
 from urllib import request
 
@@ -31,8 +32,11 @@ class DeepseekProvider:
             "Authorization": f"Bearer {self.api_key}",
         }
         req = request.Request(self.base_url, data=data, headers=headers, method="POST")
+        started = time.perf_counter()
         try:
             with request.urlopen(req) as resp:
+                # urlopen returns once the status line and headers have arrived
+                ttfb_ms = (time.perf_counter() - started) * 1000
                 resp_text = resp.read().decode("utf-8")
         except Exception as e:
             raise RuntimeError(f"DeepSeek API request failed: {e}")
@@ -51,4 +55,4 @@ class DeepseekProvider:
         # Ensure plain text without fences
         if text.strip().startswith("```"):
             text = text.strip().strip("`")
-        return {"text": text, "usage": usage}
+        return {"text": text, "usage": usage, "ttfb_ms": ttfb_ms}
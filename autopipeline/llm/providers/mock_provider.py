@@ -12,12 +12,15 @@ class MockProvider:
         self.base_dir = Path(base_dir)
 
     def call(self, *, case_id: str, stage: str, model: Optional[str], prompt: str,
-             temperature: float = 0.0, max_tokens: Optional[int] = None, **_) -> Dict[str, Any]:
+             temperature: float = 0.0, max_tokens: Optional[int] = None, candidate: int = 0,
+             **_) -> Dict[str, Any]:
         stage_to_file = {
             "generate_ir": "ir.yaml",
             "generate_bindings": "bindings.yaml",
             "repair_ir": "repair_ir.yaml",
             "repair_bindings": "repair_bindings.yaml",
+            "repair_ir_patch": "repair_ir_patch.json",
+            "repair_bindings_patch": "repair_bindings_patch.json",
         }
         filename = stage_to_file.get(stage)
         if not filename:
@@ -27,6 +30,11 @@ class MockProvider:
             self.base_dir / "cases" / case_id / "mock" / filename,
             self.base_dir / "cases" / case_id / "gold" / filename,
         ]
+        if candidate:
+            # Speculative candidate n reads <stem>__c<n><suffix> when present (e.g. ir__c1.yaml)
+            stem, suffix = os.path.splitext(filename)
+            variant = self.base_dir / "cases" / case_id / "mock" / f"{stem}__c{candidate}{suffix}"
+            search_paths.insert(0, variant)
         for path in search_paths:
             if path.exists():
                 return {"text": path.read_text(encoding="utf-8"), "usage": None}
@@ -0,0 +1,51 @@
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from autopipeline.llm.replay import ReplayMiss, load_bundle
+
+
+class ReplayProvider:
+    """Replay provider: serves recorded responses from a replay bundle (see llm/replay.py).
+
+    Requests are matched by the cache key they would have had under the recorded
+    provider (`key_name`); unless `strict`, a miss falls back to the n-th recorded call of
+    the same case/stage/candidate, so runs whose prompts drifted still replay.
+    """
+
+    name = "replay"
+
+    def __init__(self, bundle_path: str, as_provider: Optional[str] = None, strict: bool = False):
+        header, entries = load_bundle(bundle_path)
+        providers = header.get("providers") or []
+        # Cache keys embed the provider name; compute them as the recorded provider did
+        self.key_name = as_provider or (providers[0] if len(providers) == 1 else "mock")
+        self.strict = strict
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._by_slot: Dict[Tuple[str, str, int, int], Dict[str, Any]] = {}
+        for entry in entries:
+            if entry.get("cache_key"):
+                self._by_key.setdefault(entry["cache_key"], entry)
+            slot = (entry["case_id"], entry["stage"], entry.get("candidate", 0), entry["ordinal"])
+            self._by_slot.setdefault(slot, entry)
+        self._ordinals: Counter = Counter()
+        self._lock = threading.Lock()
+        self.stats = {"by_key": 0, "by_position": 0, "misses": 0}
+
+    def call(self, *, case_id: str, stage: str, cache_key: Optional[str] = None, candidate: int = 0,
+             **_) -> Dict[str, Any]:
+        with self._lock:
+            self._ordinals[(case_id, stage, candidate)] += 1
+            ordinal = self._ordinals[(case_id, stage, candidate)]
+            entry = self._by_key.get(cache_key) if cache_key else None
+            if entry is not None:
+                self.stats["by_key"] += 1
+            elif not self.strict:
+                entry = self._by_slot.get((case_id, stage, candidate, ordinal))
+                if entry is not None:
+                    self.stats["by_position"] += 1
+            if entry is None:
+                self.stats["misses"] += 1
+                raise ReplayMiss(f"No recorded response for case={case_id} stage={stage} "
+                                 f"candidate={candidate} call={ordinal} key={(cache_key or '-')[:12]}")
+        return {"text": entry["response_text"], "usage": entry.get("usage")}
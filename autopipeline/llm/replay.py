@@ -0,0 +1,201 @@
+"""Portable replay bundles of recorded LLM exchanges.
+
+A bundle is one gzip'ed JSONL file: a header line followed by one entry per distinct
+exchange::
+
+    {"cache_key", "case_id", "stage", "candidate", "ordinal", "attempt",
+     "provider", "model", "response_text", "usage", "source_run"}
+
+`build_bundle` extracts entries from run directories. Runs with ``llm_calls.jsonl``
+(per-call telemetry) give exact cache keys; response texts come from the LLM cache when
+present, else from the ``llm_raw`` dump of the call. Older runs only have
+``eval.json["llm"]["raw_paths"]`` and yield key-less entries that replay by position.
+`ReplayProvider` serves a bundle; `warm_cache` writes it into an LLM disk cache.
+"""
+
+import csv
+import gzip
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from autopipeline.artifact_writer import read_artifact_text
+from autopipeline.llm.cache import LLMDiskCache
+from autopipeline.llm.telemetry import CALLS_FILE, parse_call_records
+from autopipeline.run_archive import iter_runs, open_run, run_path
+
+BUNDLE_FORMAT = "autopipeline-replay"
+BUNDLE_VERSION = 1
+_RAW_NAME_RE = re.compile(r"^(?P<stage>.+)_attempt(?P<attempt>\d+)\.txt(\.gz)?$")
+
+
+class ReplayMiss(LookupError):
+    """The bundle holds no recorded response for a request."""
+
+
+def run_dirs_from(sources: Iterable[str]) -> List[Path]:
+    """Expand run dirs, packed runs, parent dirs (searched for runs) and summary.csv files into runs."""
+    runs: List[Path] = []
+    for src in sources:
+        path = Path(src)
+        if path.is_file() and path.suffix == ".csv":
+            with open(path, newline="", encoding="utf-8") as f:
+                runs.extend(run_path(row["eval_path"]) for row in csv.DictReader(f) if row.get("eval_path"))
+        elif (path / "eval.json").exists():
+            runs.append(path)
+        else:
+            runs.extend(iter_runs(path))
+    seen, unique = set(), []
+    for run in runs:
+        if run.resolve() not in seen:
+            seen.add(run.resolve())
+            unique.append(run)
+    return unique
+
+
+def _raw_name(case_id: str, stage: str, attempt: int, candidate: int) -> str:
+    raw_stage = f"{stage}_c{candidate}" if candidate else stage
+    return f"{case_id}/llm_raw/{raw_stage}_attempt{attempt}.txt"
+
+
+def _read_run_text(run, name: str) -> Optional[str]:
+    try:
+        return run.read_text(name)
+    except FileNotFoundError:
+        return None
+
+
+def _entries_from_calls(run, eval_data: Dict[str, Any], cache: Optional[LLMDiskCache]) -> Iterator[Dict[str, Any]]:
+    ordinals: Dict[Tuple[str, int], int] = {}
+    for rec in parse_call_records(run.read_text(CALLS_FILE)):
+        if rec.get("error"):
+            continue
+        slot = (rec["stage"], rec.get("candidate", 0))
+        ordinals[slot] = ordinals.get(slot, 0) + 1
+        case_id = rec.get("case_id") or eval_data.get("case_id")
+        text, usage = None, None
+        if cache is not None:
+            hit, payload = cache.get(rec["cache_key"])
+            if hit:
+                text, usage = payload.get("response_text"), payload.get("usage")
+        if text is None:
+            raw = _raw_name(case_id, rec["stage"], rec.get("attempt", 1), rec.get("candidate", 0))
+            text = _read_run_text(run, raw)
+            if text is None:
+                continue
+        yield {
+            "cache_key": rec["cache_key"],
+            "case_id": case_id,
+            "stage": rec["stage"],
+            "candidate": rec.get("candidate", 0),
+            "ordinal": ordinals[slot],
+            "attempt": rec.get("attempt"),
+            "provider": rec.get("provider"),
+            "model": rec.get("model"),
+            "response_text": text,
+            "usage": usage,
+            "source_run": str(run.path),
+        }
+
+
+def _entries_from_raw_paths(run, eval_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    llm = eval_data.get("llm") or {}
+    for stage, paths in (llm.get("raw_paths") or {}).items():
+        if stage.endswith("_prompt"):
+            continue
+        for ordinal, raw in enumerate(paths or [], start=1):
+            raw_path = Path(raw)
+            match = _RAW_NAME_RE.match(raw_path.name)
+            if not match:
+                continue
+            # Recorded absolute path first, then the same dump inside this run (moved or packed)
+            text = read_artifact_text(str(raw_path))
+            if text is None:
+                text = _read_run_text(run, f"{eval_data.get('case_id', '')}/llm_raw/{raw_path.name}")
+            if text is None:
+                continue
+            yield {
+                "cache_key": None,
+                "case_id": eval_data.get("case_id"),
+                "stage": stage,
+                "candidate": 0,
+                "ordinal": ordinal,
+                "attempt": int(match.group("attempt")),
+                "provider": llm.get("provider"),
+                "model": llm.get("model"),
+                "response_text": text,
+                "usage": None,
+                "source_run": str(run.path),
+            }
+
+
+def _run_entries(run, cache: Optional[LLMDiskCache]) -> Iterator[Dict[str, Any]]:
+    eval_data = run.load_json("eval.json")
+    if run.exists(CALLS_FILE):
+        return _entries_from_calls(run, eval_data, cache)
+    return _entries_from_raw_paths(run, eval_data)
+
+
+def build_bundle(sources: Iterable[str], out_path: Path, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Extract every recorded exchange of the given runs into a bundle; returns its header."""
+    cache = LLMDiskCache(cache_dir, enabled=True) if cache_dir and Path(cache_dir).exists() else None
+    runs = run_dirs_from(sources)
+    entries: List[Dict[str, Any]] = []
+    keyed, positional = set(), set()
+    for path in runs:
+        with open_run(path) as run:
+            found = list(_run_entries(run, cache))
+        for entry in found:
+            slot = (entry["case_id"], entry["stage"], entry["candidate"], entry["ordinal"])
+            if entry["cache_key"] in keyed or (entry["cache_key"] is None and slot in positional):
+                continue
+            if entry["cache_key"]:
+                keyed.add(entry["cache_key"])
+            positional.add(slot)
+            entries.append(entry)
+    header = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "runs": len(runs),
+        "entries": len(entries),
+        "keyed_entries": len(keyed),
+        "providers": sorted({e["provider"] for e in entries if e["provider"]}),
+    }
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(out_path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+    return header
+
+
+def load_bundle(path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    with gzip.open(Path(path), "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Not a replay bundle: {path}")
+    return lines[0], lines[1:]
+
+
+def warm_cache(bundle_path: Path, cache_dir: str, overwrite: bool = False) -> Dict[str, int]:
+    """Write keyed bundle entries into an LLM disk cache so ordinary runs hit it."""
+    _, entries = load_bundle(bundle_path)
+    cache = LLMDiskCache(cache_dir, enabled=True)
+    written = skipped = 0
+    for entry in entries:
+        key = entry.get("cache_key")
+        if not key or (not overwrite and cache.get(key)[0]):
+            skipped += 1
+            continue
+        cache.set(key, {
+            "request_meta": {"stage": entry["stage"], "provider": entry["provider"], "model": entry["model"],
+                             "replayed_from": entry["source_run"]},
+            "response_text": entry["response_text"],
+            "usage": entry["usage"],
+        })
+        written += 1
+    return {"written": written, "skipped": skipped}
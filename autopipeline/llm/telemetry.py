@@ -0,0 +1,155 @@
+"""Per-call LLM telemetry: token normalization, cost estimation and JSONL call records.
+
+Every finished (or failed) provider call produces one record that `LLMClient` appends to
+``<run output>/llm_calls.jsonl``; bench aggregation reads those files back for latency
+percentiles, cost per PASS and the OpenMetrics export.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+# USD per 1M tokens. "cached_input" is the prompt-cache read rate, "cache_write" the
+# cache-creation rate (Anthropic). Override/extend with a YAML file of the same shape
+# named by AUTOPIPELINE_PRICE_TABLE.
+PRICE_TABLE: Dict[str, Dict[str, float]] = {
+    "mock-model": {"input": 0.0, "cached_input": 0.0, "cache_write": 0.0, "output": 0.0},
+    "claude-3-5-sonnet": {"input": 3.0, "cached_input": 0.3, "cache_write": 3.75, "output": 15.0},
+    "claude-3-5-haiku": {"input": 0.8, "cached_input": 0.08, "cache_write": 1.0, "output": 4.0},
+    "claude-3-haiku": {"input": 0.25, "cached_input": 0.03, "cache_write": 0.3, "output": 1.25},
+    "claude-3-opus": {"input": 15.0, "cached_input": 1.5, "cache_write": 18.75, "output": 75.0},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "cache_write": 0.0, "output": 0.6},
+    "gpt-4o": {"input": 2.5, "cached_input": 1.25, "cache_write": 0.0, "output": 10.0},
+    "deepseek-chat": {"input": 0.27, "cached_input": 0.07, "cache_write": 0.0, "output": 1.1},
+    "deepseek-reasoner": {"input": 0.55, "cached_input": 0.14, "cache_write": 0.0, "output": 2.19},
+}
+
+CALLS_FILE = "llm_calls.jsonl"
+
+_price_overrides: Optional[Dict[str, Dict[str, float]]] = None
+
+
+def usage_breakdown(usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Split provider usage into input (cached/uncached), cache-write and output tokens.
+
+    Anthropic reports cache reads/writes separately from `input_tokens`; OpenAI nests
+    `cached_tokens` inside `prompt_tokens`; DeepSeek reports hit/miss counts.
+    """
+    if not isinstance(usage, dict):
+        return {"input_cached": 0, "input_uncached": 0, "cache_write": 0, "output": 0}
+    if "input_tokens" in usage or "output_tokens" in usage:
+        cached = usage.get("cache_read_input_tokens") or 0
+        written = usage.get("cache_creation_input_tokens") or 0
+        return {"input_cached": cached, "input_uncached": (usage.get("input_tokens") or 0) + written,
+                "cache_write": written, "output": usage.get("output_tokens") or 0}
+    prompt = usage.get("prompt_tokens") or 0
+    if "prompt_cache_hit_tokens" in usage:
+        cached = usage.get("prompt_cache_hit_tokens") or 0
+    else:
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+    return {"input_cached": cached, "input_uncached": max(prompt - cached, 0),
+            "cache_write": 0, "output": usage.get("completion_tokens") or 0}
+
+
+def _prices() -> Dict[str, Dict[str, float]]:
+    global _price_overrides
+    if _price_overrides is None:
+        _price_overrides = {}
+        path = os.getenv("AUTOPIPELINE_PRICE_TABLE")
+        if path and Path(path).exists():
+            _price_overrides = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    return {**PRICE_TABLE, **_price_overrides}
+
+
+def price_for(model: Optional[str]) -> Optional[Dict[str, float]]:
+    """Price row for `model`: exact match, else the longest table key it starts with."""
+    table = _prices()
+    name = (model or "mock-model").lower()
+    if name in table:
+        return table[name]
+    matches = [k for k in table if name.startswith(k)]
+    return table[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: Optional[str], breakdown: Dict[str, int]) -> Optional[float]:
+    """Estimated USD for one call's token breakdown; None when the model has no price row."""
+    row = price_for(model)
+    if row is None:
+        return None
+    # input_uncached already includes cache writes (see usage_breakdown); bill those at the write rate
+    written = breakdown.get("cache_write", 0)
+    usd = ((breakdown.get("input_uncached", 0) - written) * row.get("input", 0.0)
+           + written * row.get("cache_write", row.get("input", 0.0))
+           + breakdown.get("input_cached", 0) * row.get("cached_input", row.get("input", 0.0))
+           + breakdown.get("output", 0) * row.get("output", 0.0))
+    return round(usd / 1_000_000, 8)
+
+
+def call_record(*, case_id: Optional[str], stage: str, attempt: int, candidate: int, tier: str,
+                provider: str, model: Optional[str], cache_key: str, cache_hit: bool,
+                usage: Optional[Dict[str, Any]], latency_ms: float, ttfb_ms: Optional[float],
+                retries: int, error: Optional[str] = None, ts: Optional[float] = None) -> Dict[str, Any]:
+    """One telemetry row. Cache hits and replays cost nothing; their usage is that of the original call."""
+    breakdown = usage_breakdown(usage)
+    return {
+        "ts": ts,
+        "case_id": case_id,
+        "stage": stage,
+        "attempt": attempt,
+        "candidate": candidate,
+        "tier": tier,
+        "provider": provider,
+        "model": model,
+        "cache_key": cache_key,
+        "cache_hit": cache_hit,
+        "input_tokens": breakdown["input_uncached"],
+        "cached_tokens": breakdown["input_cached"],
+        "cache_write_tokens": breakdown["cache_write"],
+        "output_tokens": breakdown["output"],
+        "ttfb_ms": None if ttfb_ms is None else round(ttfb_ms, 3),
+        "latency_ms": round(latency_ms, 3),
+        "retries": retries,
+        "cost_usd_est": 0.0 if cache_hit or provider == "replay" else estimate_cost(model, breakdown),
+        "error": error,
+    }
+
+
+class CallLog:
+    """Append-only JSONL sink for call records (one line per call, flushed per write)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def read_call_records(path: Path) -> List[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    return parse_call_records(path.read_text(encoding="utf-8"))
+
+
+def parse_call_records(text: str) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def percentile(values: Iterable[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (q in [0, 100]); None for no values."""
+    data = sorted(v for v in values if v is not None)
+    if not data:
+        return None
+    pos = (len(data) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(data) - 1)
+    return round(data[lo] + (data[hi] - data[lo]) * (pos - lo), 3)
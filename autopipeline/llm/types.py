@@ -13,6 +13,14 @@ class LLMConfig:
     prompt_tier: str = "P0"
     seed: int = 0
     dump_prompts: bool = False
+    prompt_compaction: bool = False
+    prompt_layout: str = "inline"
+    max_retries: int = 0
+    retry_backoff_s: float = 1.0
+    # provider="replay": serve recorded responses from this bundle (see llm/replay.py)
+    replay_bundle: Optional[str] = None
+    replay_as: Optional[str] = None
+    replay_strict: bool = False
 
 
 @dataclass
@@ -34,3 +42,20 @@ class LLMRequest:
 class LLMResponse:
     text: str
     usage: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class LLMResult:
+    """One finished LLM call: raw text, decoded once (parsed or parse_error) and persisted once."""
+    text: str
+    parsed: Any = None
+    parse_error: Optional[Exception] = None
+    raw_path: Optional[str] = None
+    cache_hit: bool = False
+    cache_key: str = ""
+
+    def value(self) -> Any:
+        """The parsed payload; raises the decode error (LLMOutputFormatError) if parsing failed."""
+        if self.parse_error is not None:
+            raise self.parse_error
+        return self.parsed
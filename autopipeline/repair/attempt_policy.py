@@ -0,0 +1,174 @@
+"""Adaptive attempt budgets learned from past runs.
+
+Each eval.json records, per generation stage, an ``attempt_history``: one entry per attempt
+with the strategy used and the blocking error code it ended with (None = passed).
+`AttemptLedger` folds those histories into recovery statistics keyed by
+(model, prompt_tier, stage, error_code); `AttemptPolicy` turns them into per-stage attempt
+budgets, early stops for error codes that never recovered, and a repair strategy order.
+Without enough history for a key the policy falls back to the fixed defaults.
+"""
+
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from autopipeline.eval.eval_schema import read_summary
+from autopipeline.run_archive import iter_runs, open_run
+from autopipeline.utils import load_json, save_json
+
+LEDGER_VERSION = 1
+LEDGER_FILE = "attempt_ledger.json"
+# Observations needed before history overrides the defaults
+MIN_TRIALS = 3
+DEFAULT_MAX_ATTEMPTS = 3
+POLICY_STAGES = ("ir", "bindings")
+
+
+def _key(*parts: Any) -> str:
+    return "|".join(str(p) for p in parts)
+
+
+class AttemptLedger:
+    """Recovery statistics per (model, prompt_tier, stage[, error_code]); JSON-serializable."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.runs: int = data.get("runs", 0)
+        # model|tier|stage|code -> {"trials", "recoveries", "by_strategy": {strategy: [trials, recoveries]}}
+        self.codes: Dict[str, Dict[str, Any]] = data.get("codes", {})
+        # model|tier|stage -> {"runs", "failed_first", "max_recovery_attempt", "attempts", "duration_ms", "llm_calls"}
+        self.stages: Dict[str, Dict[str, Any]] = data.get("stages", {})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": LEDGER_VERSION, "runs": self.runs, "codes": self.codes, "stages": self.stages}
+
+    def save(self, path: Path) -> Path:
+        save_json(self.to_dict(), str(path))
+        return Path(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "AttemptLedger":
+        """Load a saved ledger file, or learn one from every run (directory or packed) under a directory."""
+        path = Path(path)
+        if path.is_dir():
+            return cls.from_evals(iter_runs(path))
+        return cls(load_json(str(path)))
+
+    @classmethod
+    def from_evals(cls, eval_paths: Iterable[Path]) -> "AttemptLedger":
+        ledger = cls()
+        for path in eval_paths:
+            try:
+                with open_run(path) as run:
+                    ledger.add_summary(read_summary(run))
+            except (OSError, ValueError, zipfile.BadZipFile):
+                continue
+        return ledger
+
+    def add_eval(self, eval_data: Dict[str, Any]):
+        config = (eval_data.get("pipeline") or {}).get("config") or {}
+        llm = eval_data.get("llm") or {}
+        stages = (eval_data.get("pipeline") or {}).get("stages") or {}
+        self._add_run(llm.get("model"), config.get("prompt_tier"),
+                      {stage: (stages.get(stage) or {}).get("attempt_history") for stage in POLICY_STAGES})
+
+    def add_summary(self, record: Dict[str, Any]):
+        """Same as `add_eval`, from a per-run summary record (autopipeline.eval.eval_schema)."""
+        self._add_run(record.get("model"), record.get("prompt_tier"), record.get("attempt_history") or {})
+
+    def _add_run(self, model: Optional[str], tier: Optional[str], histories: Dict[str, Any]):
+        model = model or "mock-model"
+        tier = tier or "P0"
+        counted = False
+        for stage in POLICY_STAGES:
+            history = histories.get(stage)
+            if not history:
+                continue
+            counted = True
+            self._add_history(model, tier, stage, history)
+        if counted:
+            self.runs += 1
+
+    def _add_history(self, model: str, tier: str, stage: str, history: List[Dict[str, Any]]):
+        history = sorted(history, key=lambda h: h.get("attempt", 0))
+        passed_at = next((h["attempt"] for h in history if h.get("error_code") is None), None)
+        st = self.stages.setdefault(_key(model, tier, stage), {
+            "runs": 0, "failed_first": 0, "max_recovery_attempt": 0,
+            "attempts": 0, "duration_ms": 0, "llm_calls": 0,
+        })
+        st["runs"] += 1
+        st["attempts"] += len(history)
+        st["duration_ms"] += sum(h.get("duration_ms", 0) for h in history)
+        st["llm_calls"] += sum(h.get("llm_calls", 0) for h in history)
+        if history[0].get("error_code") is not None:
+            st["failed_first"] += 1
+            if passed_at is not None:
+                st["max_recovery_attempt"] = max(st["max_recovery_attempt"], passed_at)
+        for entry, nxt in zip(history, history[1:]):
+            code = entry.get("error_code")
+            if code is None:
+                break
+            stats = self.codes.setdefault(_key(model, tier, stage, code),
+                                          {"trials": 0, "recoveries": 0, "by_strategy": {}})
+            stats["trials"] += 1
+            stats["recoveries"] += int(passed_at is not None)
+            by_strategy = stats["by_strategy"].setdefault(nxt.get("strategy") or "unknown", [0, 0])
+            by_strategy[0] += 1
+            by_strategy[1] += int(nxt.get("error_code") is None)
+
+
+class AttemptPolicy:
+    """Per-run view of a ledger for one (model, prompt_tier)."""
+
+    def __init__(self, ledger: AttemptLedger, model: Optional[str], prompt_tier: str,
+                 default_max_attempts: int = DEFAULT_MAX_ATTEMPTS, min_trials: int = MIN_TRIALS):
+        self.ledger = ledger
+        self.model = model or "mock-model"
+        self.prompt_tier = prompt_tier or "P0"
+        self.default_max_attempts = default_max_attempts
+        self.min_trials = min_trials
+
+    def _stage(self, stage: str) -> Optional[Dict[str, Any]]:
+        return self.ledger.stages.get(_key(self.model, self.prompt_tier, stage))
+
+    def _code(self, stage: str, error_code: str) -> Optional[Dict[str, Any]]:
+        return self.ledger.codes.get(_key(self.model, self.prompt_tier, stage, error_code))
+
+    def budget(self, stage: str) -> int:
+        """Attempts worth spending on `stage`: the latest attempt that ever recovered a failed start."""
+        st = self._stage(stage)
+        if not st or st["failed_first"] < self.min_trials:
+            return self.default_max_attempts
+        return max(1, min(self.default_max_attempts, st["max_recovery_attempt"] or 1))
+
+    def should_retry(self, stage: str, attempt: int, error_code: str) -> Tuple[bool, str]:
+        """Whether `attempt` (>= 2) is worth making after the previous one failed with `error_code`."""
+        budget = self.budget(stage)
+        if attempt > budget:
+            return False, f"budget_{budget}"
+        stats = self._code(stage, error_code)
+        if stats and stats["trials"] >= self.min_trials and stats["recoveries"] == 0:
+            return False, f"no_recovery_{error_code}_in_{stats['trials']}"
+        return True, ""
+
+    def strategy_order(self, stage: str, error_code: str, default: List[str]) -> List[str]:
+        """`default` reordered by past success rate after `error_code` (keys without enough trials keep their place)."""
+        by_strategy = (self._code(stage, error_code) or {}).get("by_strategy", {})
+
+        def rate(strategy: str) -> float:
+            trials, wins = by_strategy.get(strategy, (0, 0))
+            return wins / trials if trials >= self.min_trials else -1.0
+
+        known = sorted((s for s in default if rate(s) >= 0), key=rate, reverse=True)
+        it = iter(known)
+        return [next(it) if rate(s) >= 0 else s for s in default]
+
+    def savings(self, stage: str, skipped_attempts: int) -> Dict[str, float]:
+        """Estimated LLM calls and wall time not spent by stopping `skipped_attempts` early."""
+        st = self._stage(stage)
+        if not st or not st["attempts"] or skipped_attempts <= 0:
+            return {"saved_calls_est": float(max(skipped_attempts, 0)), "saved_ms_est": 0.0}
+        return {
+            "saved_calls_est": round(skipped_attempts * max(st["llm_calls"] / st["attempts"], 1.0), 3),
+            "saved_ms_est": round(skipped_attempts * st["duration_ms"] / st["attempts"], 3),
+        }
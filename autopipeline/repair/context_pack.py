@@ -1,15 +1,35 @@
 """Build repair context for bindings based on raw/norm artifacts and failures."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import yaml
 import json
 
+from autopipeline.artifact_writer import read_artifact_text
+from autopipeline.repair.json_patch import failing_subtrees, schema_slice, to_pointer
 
-def build_bindings_repair_context(run_dir: str, failures: List[Dict[str, Any]]) -> Dict[str, Any]:
+# Bound on the previous bindings embedded in an llm_patch prompt; larger drafts are what
+# patch mode (build_patch_context) is for
+PREVIOUS_BINDINGS_MAX_CHARS = 8000
+
+
+def _cut_at_line(text: str, max_chars: int) -> str:
+    """At most `max_chars` of `text`, cut at a line boundary so the YAML prefix stays parseable."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars + 1)
+    head = text[:cut + 1] if cut >= 0 else ""
+    return head + f"# ... truncated: {len(head)} of {len(text)} chars\n"
+
+
+def build_bindings_repair_context(run_dir: str, failures: List[Dict[str, Any]],
+                                  max_chars: Optional[int] = PREVIOUS_BINDINGS_MAX_CHARS) -> Dict[str, Any]:
+    """`previous_bindings_chars` is the full draft length; the text is cut at `max_chars` (None: no bound)."""
     run_path = Path(run_dir)
     ctx: Dict[str, Any] = {
         "previous_bindings_text": "",
+        "previous_bindings_chars": 0,
+        "previous_bindings_truncated": False,
         "failure_hints": [],
         "skeleton": {},
         "ir": {},
@@ -17,13 +37,17 @@ def build_bindings_repair_context(run_dir: str, failures: List[Dict[str, Any]])
     }
     # Load previous bindings text if exists
     for name in ["bindings.yaml", "bindings_norm.yaml", "bindings_raw.yaml", "bindings_raw.txt"]:
-        p = run_path / name
-        if p.exists():
-            try:
-                ctx["previous_bindings_text"] = p.read_text(encoding="utf-8")[:8000]
-                break
-            except Exception:
-                continue
+        try:
+            # Debug drafts may be gzip-compressed (--compress-artifacts)
+            text = read_artifact_text(str(run_path / name))
+        except Exception:
+            continue
+        if text is not None:
+            bounded = text if max_chars is None else _cut_at_line(text, max_chars)
+            ctx["previous_bindings_text"] = bounded
+            ctx["previous_bindings_chars"] = len(text)
+            ctx["previous_bindings_truncated"] = bounded != text
+            break
     # Load ir/device_info if present
     ir_path = run_path / "ir.yaml"
     if ir_path.exists():
@@ -63,3 +87,32 @@ def build_bindings_repair_context(run_dir: str, failures: List[Dict[str, Any]])
         "component_bindings": [],
     }
     return ctx
+
+
+def build_patch_context(doc: Dict[str, Any], failures: List[Dict[str, Any]],
+                        schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Failing subtrees + schema slices for a JSON-patch repair prompt.
+
+    Only failures whose details carry a `path` are addressable; `unaddressed` counts the rest.
+    """
+    errors = []
+    unaddressed = 0
+    for f in failures or []:
+        if hasattr(f, "to_dict"):
+            f = f.to_dict()
+        details = f.get("details", {}) or {}
+        if "path" not in details:
+            unaddressed += 1
+            continue
+        errors.append({
+            "pointer": to_pointer(details.get("path")),
+            "code": f.get("code"),
+            "message": (f.get("message") or "").split("\n")[0],
+        })
+    subtrees = failing_subtrees(doc, [e["pointer"] for e in errors]) if errors else {}
+    slices = {}
+    for pointer in subtrees:
+        node = schema_slice(schema, pointer)
+        if node:
+            slices[pointer] = node
+    return {"errors": errors, "subtrees": subtrees, "schema_slice": slices, "unaddressed": unaddressed}
@@ -1,20 +1,35 @@
 """Deterministic patch for bindings based on schema hints."""
 
 from copy import deepcopy
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from autopipeline.normalize.bindings_normalizer import normalize_bindings
+from autopipeline.repair.rule_engine import RuleEngine
 
 
 def apply_deterministic_patch(bindings: Dict[str, Any], ir: Dict[str, Any],
-                              failure_hints: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+                              failure_hints: List[Dict[str, Any]], failures: List[Any] = None,
+                              schema: Dict[str, Any] = None, engine: RuleEngine = None,
+                              rule_plan: Optional[Tuple[List[Dict[str, Any]], List[str], List[Any]]] = None
+                              ) -> Tuple[Dict[str, Any], List[str]]:
     """
     Make minimal structural fixes without calling LLM.
+    - With schema failures + schema: apply every rule-engine fix in one pass
+      (`rule_plan`: the engine's plan for these failures, when the caller already made it).
     - Ensure transports list exists.
     - Ensure component_bindings exists (stubbed) when missing.
     """
     actions: List[str] = []
-    patched = deepcopy(bindings) if bindings is not None else {}
+    doc = bindings if bindings is not None else {}
+    if failures and schema is not None:
+        engine = engine or RuleEngine(ir)
+        if rule_plan is None:
+            rule_plan = engine.plan(doc, failures, schema)
+        # apply_plan returns a copy: no need to copy the bindings first
+        patched, rule_actions, _ = engine.apply_plan(doc, rule_plan, failures)
+        actions.extend(rule_actions)
+    else:
+        patched = deepcopy(doc)
     need_stub = False
     for h in failure_hints or []:
         path = str(h.get("path") or "")
@@ -0,0 +1,236 @@
+"""JSON Pointer / JSON Patch (RFC 6901 / RFC 6902) helpers for diff-based repair.
+
+Checkers report failure locations in ``details.path`` either as a jsonschema path list
+(``["placements", 0, "layer"]``) or as a dotted string (``components[0].name``).
+`to_pointer` normalizes both; `failing_subtrees` extracts only the parts of an artifact
+a repair prompt needs, and `apply_patch` applies the model's patch locally.
+"""
+
+import json
+import re
+from copy import deepcopy
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+PathLike = Union[str, Sequence[Union[str, int]], None]
+
+_DOTTED_TOKEN_RE = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+# Subtrees whose canonical JSON exceeds this are summarized (explicitly marked), not sent whole
+SUBTREE_CHAR_BUDGET = 4000
+SUMMARY_DEPTH = 3
+SUMMARY_LIST_ITEMS = 3
+
+
+class JsonPatchError(ValueError):
+    """Patch cannot be applied (bad op, missing path, failed test)."""
+
+
+def _escape(token: Union[str, int]) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def to_pointer(path: PathLike) -> str:
+    """Normalize a checker path (list, dotted string or pointer) to a JSON Pointer."""
+    if path is None or path == "" or path == []:
+        return ""
+    if isinstance(path, str):
+        if path.startswith("/"):
+            return path
+        tokens: List[Union[str, int]] = []
+        for name, index in _DOTTED_TOKEN_RE.findall(path):
+            tokens.append(int(index) if index else name)
+        path = tokens
+    return "".join("/" + _escape(t) for t in path)
+
+
+def split_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [_unescape(t) for t in pointer[1:].split("/")]
+
+
+def _child(container: Any, token: str) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise KeyError(token)
+        return container[token]
+    if isinstance(container, list):
+        if not token.isdigit() or int(token) >= len(container):
+            raise KeyError(token)
+        return container[int(token)]
+    raise KeyError(token)
+
+
+def resolve(doc: Any, pointer: str) -> Any:
+    cur = doc
+    for token in split_pointer(pointer):
+        try:
+            cur = _child(cur, token)
+        except KeyError:
+            raise JsonPatchError(f"Path not found: {pointer}")
+    return cur
+
+
+def nearest_existing(doc: Any, pointer: str) -> str:
+    """Longest prefix of `pointer` that exists in `doc` (the object missing a field, etc.)."""
+    tokens = split_pointer(pointer)
+    cur = doc
+    found: List[str] = []
+    for token in tokens:
+        try:
+            cur = _child(cur, token)
+        except KeyError:
+            break
+        found.append(token)
+    return "".join("/" + _escape(t) for t in found)
+
+
+def _parent_and_key(doc: Any, pointer: str):
+    tokens = split_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("Operation on the document root is not allowed")
+    parent = resolve(doc, "".join("/" + _escape(t) for t in tokens[:-1]))
+    return parent, tokens[-1]
+
+
+def _add(doc: Any, pointer: str, value: Any):
+    parent, key = _parent_and_key(doc, pointer)
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        if key == "-":
+            parent.append(value)
+        elif key.isdigit() and int(key) <= len(parent):
+            parent.insert(int(key), value)
+        else:
+            raise JsonPatchError(f"Invalid list index for add: {pointer}")
+    else:
+        raise JsonPatchError(f"Cannot add into non-container at {pointer}")
+
+
+def _remove(doc: Any, pointer: str) -> Any:
+    parent, key = _parent_and_key(doc, pointer)
+    try:
+        _child(parent, key)
+    except KeyError:
+        raise JsonPatchError(f"Path not found: {pointer}")
+    return parent.pop(int(key) if isinstance(parent, list) else key)
+
+
+def apply_patch(doc: Any, ops: Iterable[Dict[str, Any]]) -> Any:
+    """Apply an RFC 6902 patch to a copy of `doc` and return the result (atomic)."""
+    if not isinstance(ops, list):
+        raise JsonPatchError("Patch must be a list of operations")
+    result = deepcopy(doc)
+    for i, op in enumerate(ops):
+        if not isinstance(op, dict) or "op" not in op or "path" not in op:
+            raise JsonPatchError(f"Operation {i} must have 'op' and 'path'")
+        kind, path = op["op"], to_pointer(op["path"])
+        if kind in ("add", "replace", "test") and "value" not in op:
+            raise JsonPatchError(f"Operation {i} ({kind}) is missing 'value'")
+        if kind == "add":
+            _add(result, path, deepcopy(op["value"]))
+        elif kind == "remove":
+            _remove(result, path)
+        elif kind == "replace":
+            _remove(result, path)
+            _add(result, path, deepcopy(op["value"]))
+        elif kind in ("move", "copy"):
+            src = to_pointer(op.get("from"))
+            value = _remove(result, src) if kind == "move" else deepcopy(resolve(result, src))
+            _add(result, path, value)
+        elif kind == "test":
+            if resolve(result, path) != op["value"]:
+                raise JsonPatchError(f"Test failed at {path}")
+        else:
+            raise JsonPatchError(f"Unsupported op '{kind}'")
+    return result
+
+
+def summarize(value: Any, depth: int = SUMMARY_DEPTH) -> Any:
+    """Depth/width-limited view; omitted content is replaced by explicit '<...>' markers."""
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f"<object keys={sorted(value)[:20]}>"
+        return {k: summarize(v, depth - 1) for k, v in value.items()}
+    if isinstance(value, list):
+        if depth <= 0:
+            return f"<list len={len(value)}>"
+        head = [summarize(v, depth - 1) for v in value[:SUMMARY_LIST_ITEMS]]
+        if len(value) > SUMMARY_LIST_ITEMS:
+            head.append(f"<{len(value) - SUMMARY_LIST_ITEMS} more items omitted>")
+        return head
+    return value
+
+
+def failing_subtrees(doc: Any, pointers: Iterable[str],
+                     char_budget: int = SUBTREE_CHAR_BUDGET) -> Dict[str, Dict[str, Any]]:
+    """pointer -> {"value", "summarized"} for the nearest existing node of each failing path.
+
+    Nested pointers collapse into their ancestor. The root and oversized subtrees are
+    summarized so the prompt scales with the number of errors, not the artifact size.
+    """
+    anchors = sorted({nearest_existing(doc, p) for p in pointers}, key=lambda p: (p.count("/"), p))
+    kept: List[str] = []
+    for p in anchors:
+        if not any(p == a or p.startswith(a + "/") for a in kept if a):
+            kept.append(p)
+    out: Dict[str, Dict[str, Any]] = {}
+    for p in kept:
+        value = resolve(doc, p)
+        encoded = json.dumps(value, ensure_ascii=False, default=str)
+        summarized = p == "" or len(encoded) > char_budget
+        out[p] = {"value": summarize(value, 1 if p == "" else SUMMARY_DEPTH) if summarized else value,
+                  "summarized": summarized}
+    return out
+
+
+def schema_node(schema: Dict[str, Any], pointer: str) -> Optional[Dict[str, Any]]:
+    """Raw (dereferenced) schema node describing the value at `pointer`, or None."""
+    node: Any = schema
+    for token in split_pointer(pointer):
+        node = _deref(schema, node)
+        if not isinstance(node, dict):
+            return None
+        if token.isdigit() and "items" in node:
+            node = node["items"]
+        elif token in (node.get("properties") or {}):
+            node = node["properties"][token]
+        elif isinstance(node.get("additionalProperties"), dict):
+            node = node["additionalProperties"]
+        else:
+            return None
+    node = _deref(schema, node)
+    return node if isinstance(node, dict) else None
+
+
+def schema_slice(schema: Dict[str, Any], pointer: str) -> Optional[Dict[str, Any]]:
+    """Compact schema node for the object at `pointer` (type/required/enum/property types)."""
+    node = schema_node(schema, pointer)
+    if node is None:
+        return None
+    out: Dict[str, Any] = {k: node[k] for k in ("type", "required", "enum") if k in node}
+    props = node.get("properties")
+    if isinstance(props, dict):
+        out["properties"] = {k: _deref(schema, v).get("type", "any") if isinstance(_deref(schema, v), dict) else "any"
+                             for k, v in props.items()}
+    items = _deref(schema, node.get("items"))
+    if isinstance(items, dict):
+        out["items"] = {k: items[k] for k in ("type", "required") if k in items}
+    return out
+
+
+def _deref(root: Dict[str, Any], node: Any) -> Any:
+    seen = 0
+    while isinstance(node, dict) and isinstance(node.get("$ref"), str) and node["$ref"].startswith("#") and seen < 16:
+        try:
+            node = resolve(root, node["$ref"][1:])
+        except JsonPatchError:
+            return None
+        seen += 1
+    return node
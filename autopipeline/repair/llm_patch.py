@@ -3,12 +3,16 @@
 from typing import List, Dict, Any
 import textwrap
 
+from autopipeline.llm.types import LLMResult
+
 
 def llm_patch_bindings(llm_client, previous_text: str, failure_hints: List[Dict[str, Any]],
                        skeleton: Dict[str, Any], case_id: str, rules_ctx: Dict[str, Any], schema_versions: Dict[str, Any],
-                       attempt: int = 1) -> str:
+                       attempt: int = 1) -> LLMResult:
     """
     Build a repair prompt and call LLM provider to patch bindings.
+
+    Returns the client's LLMResult: the reply text plus the YAML it was already decoded into.
     """
     hints_lines = []
     for h in failure_hints or []:
@@ -29,12 +33,12 @@ def llm_patch_bindings(llm_client, previous_text: str, failure_hints: List[Dict[
     {skeleton}
     """)
     # Use repair_bindings interface if available; fallback to generate_bindings with repair prompt
-    repaired_text = llm_client.repair_bindings(
+    return llm_client.repair_bindings(
         case_id=case_id,
         bindings_draft=previous_text,
         verifier_errors=hints_lines,
         rules_ctx=rules_ctx,
         schema_versions=schema_versions,
         prompt_name="repair_agent",
+        attempt=attempt,
     )
-    return repaired_text
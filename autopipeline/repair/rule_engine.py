@@ -0,0 +1,359 @@
+"""Rule-based local repair driven by the full list of schema errors.
+
+Each schema failure carries the violated keyword (``details.validator``) and its location
+(``details.path``). The engine maps every (keyword, location) pair to a local fix derived
+from the IR, the placement plan and device info, and applies all fixes in one pass as a
+JSON patch. Failures without a confident fix are returned unresolved; the runner uses
+that count to decide whether an LLM call is needed at all.
+"""
+
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from autopipeline.repair.json_patch import apply_patch, resolve, schema_node, to_pointer, JsonPatchError
+
+# Keys models commonly emit in place of the schema name, per target field
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "component_id": ("component", "component_name", "entity_id"),
+    "component": ("component_id", "component_name", "entity_id"),
+    "link_id": ("link", "link_name"),
+    "device_ref": ("device", "device_id", "node_id", "target_node_id", "placement_node_id"),
+    "layer": ("tier", "node_class"),
+    "protocol": ("transport", "transport_protocol"),
+    "from_endpoint": ("from", "source", "source_endpoint"),
+    "to_endpoint": ("to", "target", "target_endpoint"),
+    "endpoint_id": ("endpoint",),
+}
+
+_OUT_DIRECTIONS = {"publish", "pub", "out", "output", "write", "send", "request", "produce"}
+_IN_DIRECTIONS = {"subscribe", "sub", "in", "input", "read", "receive", "consume"}
+
+
+def _as_dict(f: Any) -> Dict[str, Any]:
+    return f.to_dict() if hasattr(f, "to_dict") else (f if isinstance(f, dict) else {})
+
+
+def _link_end(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        return value.get("component") or value.get("component_id")
+    return value
+
+
+def _component_ref(obj: Dict[str, Any]) -> Optional[str]:
+    return obj.get("component_id") or obj.get("component")
+
+
+def _norm_token(value: Any) -> str:
+    return str(value).strip().lower().replace("-", "_").replace(" ", "_")
+
+
+class RuleEngine:
+    """Schema-error -> local fix rules over IR / placement / device_info indexes."""
+
+    def __init__(self, ir: Dict[str, Any], placement: Dict[str, Any] = None, device_info: Dict[str, Any] = None):
+        ir = ir or {}
+        self.ir = ir
+        self.components = [c.get("id") or c.get("name") for c in ir.get("components", []) or [] if isinstance(c, dict)]
+        self.links: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for link in ir.get("links", []) or []:
+            if isinstance(link, dict) and link.get("id"):
+                self.links[link["id"]] = (_link_end(link.get("from")), _link_end(link.get("to")))
+        placement = placement or {}
+        self.node_class = {n.get("node_id"): n.get("class") for n in placement.get("nodes", []) or []}
+        self.component_node = {p.get("component_id"): p.get("target_node_id")
+                               for p in placement.get("component_placements", []) or []}
+        self.transport_hint = {lp.get("link_id"): lp.get("transport_hint")
+                               for lp in placement.get("link_placements", []) or []}
+        self.device_layer: Dict[str, str] = {}
+        self.device_endpoints: Dict[str, List[Dict[str, Any]]] = {}
+        for dev in (device_info or {}).get("devices", []) or []:
+            did = dev.get("id") or dev.get("name")
+            self.device_layer[did] = dev.get("layer")
+            self.device_endpoints[did] = list(((dev.get("interfaces") or {}).get("endpoints")) or [])
+        self._resolvers: Dict[Tuple[str, str], Callable[[Dict[str, Any], List[Dict[str, Any]]], Any]] = {
+            ("", "app_name"): lambda obj, coll: self.ir.get("app_name"),
+            ("", "version"): lambda obj, coll: self.ir.get("version"),
+            ("", "placements"): lambda obj, coll: self.derive("placements"),
+            ("", "transports"): lambda obj, coll: self.derive("transports"),
+            ("", "endpoints"): lambda obj, coll: self.derive("endpoints"),
+            ("", "component_bindings"): lambda obj, coll: self.derive("component_bindings"),
+            ("placements", "component_id"): lambda obj, coll: self._uncovered(coll, "component_id", self.components),
+            ("placements", "layer"): lambda obj, coll: self.component_layer(_component_ref(obj)),
+            ("placements", "device_ref"): lambda obj, coll: self.component_device(_component_ref(obj)),
+            ("component_bindings", "component"): lambda obj, coll: self._uncovered(coll, "component", self.components),
+            ("component_bindings", "layer"): lambda obj, coll: self.component_layer(_component_ref(obj)),
+            ("component_bindings", "device_ref"): lambda obj, coll: self.component_device(_component_ref(obj)),
+            ("component_bindings", "endpoint_id"): lambda obj, coll: self._component_endpoint_id(_component_ref(obj)),
+            ("transports", "link_id"): lambda obj, coll: self._uncovered(coll, "link_id", list(self.links)),
+            ("transports", "protocol"): lambda obj, coll: self.link_protocol(obj.get("link_id")),
+            ("transports", "qos"): lambda obj, coll: self._qos(obj.get("protocol")
+                                                               or self.link_protocol(obj.get("link_id"))),
+            ("endpoints", "link_id"): lambda obj, coll: self._uncovered(coll, "link_id", list(self.links)),
+            ("endpoints", "from_endpoint"): lambda obj, coll: self.link_endpoint(obj.get("link_id"), "from"),
+            ("endpoints", "to_endpoint"): lambda obj, coll: self.link_endpoint(obj.get("link_id"), "to"),
+        }
+
+    # ---- index lookups -------------------------------------------------
+    def component_device(self, component: Optional[str]) -> Optional[str]:
+        return self.component_node.get(component)
+
+    def component_layer(self, component: Optional[str]) -> Optional[str]:
+        node = self.component_node.get(component)
+        if node is None:
+            return None
+        return self.node_class.get(node) or self.device_layer.get(node)
+
+    def link_protocol(self, link_id: Optional[str]) -> Optional[str]:
+        hint = str(self.transport_hint.get(link_id) or "").lower()
+        if hint in ("mqtt", "http"):
+            return hint.upper()
+        ends = self.links.get(link_id)
+        if not ends:
+            return None
+        layers = {self.component_layer(c) for c in ends}
+        if None in layers:
+            return None
+        return "MQTT" if "device" in layers else "HTTP"
+
+    @staticmethod
+    def _qos(protocol: Optional[str]) -> Optional[str]:
+        if not protocol:
+            return None
+        return "at_least_once" if str(protocol).upper() == "MQTT" else "best_effort"
+
+    def _device_endpoint(self, device: Optional[str], directions=None) -> Optional[Dict[str, Any]]:
+        endpoints = self.device_endpoints.get(device) or []
+        if directions:
+            for ep in endpoints:
+                if _norm_token(ep.get("direction", "")) in directions:
+                    return ep
+        return endpoints[0] if endpoints else None
+
+    def link_endpoint(self, link_id: Optional[str], side: str) -> Optional[str]:
+        ends = self.links.get(link_id)
+        if not ends:
+            return None
+        component = ends[0] if side == "from" else ends[1]
+        ep = self._device_endpoint(self.component_device(component),
+                                   _OUT_DIRECTIONS if side == "from" else _IN_DIRECTIONS)
+        return (ep.get("address") or ep.get("id")) if ep else None
+
+    def _component_endpoint_id(self, component: Optional[str]) -> Optional[str]:
+        ep = self._device_endpoint(self.component_device(component))
+        return ep.get("id") if ep else None
+
+    @staticmethod
+    def _uncovered(collection: List[Dict[str, Any]], key: str, universe: List[str]) -> Optional[str]:
+        """The single id of `universe` no sibling item covers yet; ambiguous -> None."""
+        covered = {item.get(key) for item in collection or [] if isinstance(item, dict)}
+        left = [u for u in universe if u and u not in covered]
+        return left[0] if len(left) == 1 else None
+
+    def derive(self, collection: str) -> Optional[List[Dict[str, Any]]]:
+        """Whole collection from the indexes; None when the indexes cannot supply one."""
+        if collection == "placements":
+            items = [{"component_id": c, "layer": self.component_layer(c), "device_ref": self.component_device(c)}
+                     for c in self.components]
+            return items if items and all(i["layer"] and i["device_ref"] for i in items) else None
+        if collection == "component_bindings":
+            items = []
+            for c in self.components:
+                item = {"component": c, "layer": self.component_layer(c), "device_ref": self.component_device(c)}
+                endpoint_id = self._component_endpoint_id(c)
+                if endpoint_id:
+                    item["endpoint_id"] = endpoint_id
+                items.append({k: v for k, v in item.items() if v is not None})
+            return items or None
+        if collection == "transports":
+            items = [{"link_id": lid, "protocol": self.link_protocol(lid), "qos": self._qos(self.link_protocol(lid))}
+                     for lid in self.links]
+            return items if items and all(i["protocol"] for i in items) else None
+        if collection == "endpoints":
+            items = [{"link_id": lid, "from_endpoint": self.link_endpoint(lid, "from"),
+                      "to_endpoint": self.link_endpoint(lid, "to")} for lid in self.links]
+            return items if items and all(i["from_endpoint"] and i["to_endpoint"] for i in items) else None
+        return None
+
+    # ---- rules -----------------------------------------------------------
+    def _field_value(self, doc: Any, path: List[Any], obj: Dict[str, Any], field: str,
+                     schema: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        """(value, source) for a missing field of the object at `path`; (None, None) if unknown."""
+        for alias in FIELD_ALIASES.get(field, ()):
+            if obj.get(alias) not in (None, "", [], {}) and isinstance(obj.get(alias), str):
+                return obj[alias], f"alias:{alias}"
+        if not path:
+            key, collection = ("", field), None
+        elif len(path) == 2 and isinstance(path[1], int):
+            key, collection = (str(path[0]), field), resolve(doc, to_pointer(path[:1]))
+        else:
+            key, collection = None, None
+        resolver = self._resolvers.get(key) if key else None
+        if resolver is not None:
+            value = resolver(obj, collection)
+            if value not in (None, "", []):
+                return value, "index"
+        node = schema_node(schema, to_pointer(list(path) + [field])) or {}
+        if "default" in node:
+            return deepcopy(node["default"]), "schema_default"
+        kind = node.get("type")
+        kinds = kind if isinstance(kind, list) else [kind]
+        if "array" in kinds:
+            return [], "schema_type"
+        if "object" in kinds:
+            return {}, "schema_type"
+        return None, None
+
+    def _rule_required(self, doc, path, details, schema, ops, actions) -> bool:
+        obj = resolve(doc, to_pointer(path))
+        if not isinstance(obj, dict):
+            return False
+        missing = details.get("missing") or []
+        resolved = True
+        view = dict(obj)  # later fields may be derived from earlier ones (link_id -> protocol)
+        for field in missing:
+            value, source = self._field_value(doc, path, view, field, schema)
+            if source is None:
+                resolved = False
+                continue
+            view[field] = value
+            ops.append({"op": "add", "path": to_pointer(list(path) + [field]), "value": value})
+            actions.append(f"required:{to_pointer(list(path) + [field]) or '/'}<-{source}")
+        return resolved and bool(missing)
+
+    def _rule_min_items(self, doc, path, details, schema, ops, actions) -> bool:
+        if len(path) != 1:
+            return False
+        value = self.derive(str(path[0]))
+        if not value or len(value) < int(details.get("expected") or 0):
+            return False
+        ops.append({"op": "replace", "path": to_pointer(path), "value": value})
+        actions.append(f"minItems:{to_pointer(path)}<-index")
+        return True
+
+    def _rule_type(self, doc, path, details, schema, ops, actions) -> bool:
+        if not path:
+            return False
+        value = resolve(doc, to_pointer(path))
+        expected = details.get("expected")
+        for kind in (expected if isinstance(expected, list) else [expected]):
+            coerced = _coerce(value, kind)
+            if coerced is not _UNSET:
+                ops.append({"op": "replace", "path": to_pointer(path), "value": coerced})
+                actions.append(f"type:{to_pointer(path)}->{kind}")
+                return True
+        return False
+
+    def _rule_enum(self, doc, path, details, schema, ops, actions) -> bool:
+        if not path:
+            return False
+        value = resolve(doc, to_pointer(path))
+        options = [o for o in details.get("expected") or [] if _norm_token(o) == _norm_token(value)]
+        if len(options) != 1:
+            return False
+        ops.append({"op": "replace", "path": to_pointer(path), "value": options[0]})
+        actions.append(f"enum:{to_pointer(path)}->{options[0]}")
+        return True
+
+    def _rule_additional_properties(self, doc, path, details, schema, ops, actions) -> bool:
+        obj = resolve(doc, to_pointer(path))
+        node = schema_node(schema, to_pointer(path)) or {}
+        known = set((node.get("properties") or {}).keys())
+        for key in details.get("unexpected") or []:
+            target = next((f for f, aliases in FIELD_ALIASES.items()
+                           if key in aliases and f in known and f not in obj), None)
+            if target:
+                ops.append({"op": "move", "from": to_pointer(list(path) + [key]),
+                            "path": to_pointer(list(path) + [target])})
+                actions.append(f"rename:{to_pointer(list(path) + [key])}->{target}")
+            else:
+                ops.append({"op": "remove", "path": to_pointer(list(path) + [key])})
+                actions.append(f"drop:{to_pointer(list(path) + [key])}")
+        return bool(details.get("unexpected"))
+
+    _RULES = {
+        "required": _rule_required,
+        "minItems": _rule_min_items,
+        "type": _rule_type,
+        "enum": _rule_enum,
+        "additionalProperties": _rule_additional_properties,
+    }
+
+    def plan(self, doc: Any, failures: List[Any], schema: Dict[str, Any]
+             ) -> Tuple[List[Dict[str, Any]], List[str], List[Any]]:
+        """(patch ops, actions, unresolved failures) for all schema failures at once."""
+        ops: List[Dict[str, Any]] = []
+        actions: List[str] = []
+        unresolved: List[Any] = []
+        for f in failures or []:
+            details = _as_dict(f).get("details") or {}
+            rule = self._RULES.get(details.get("validator"))
+            path = details.get("path")
+            if rule is None or not isinstance(path, list):
+                unresolved.append(f)
+                continue
+            try:
+                fixed = rule(self, doc, path, details, schema, ops, actions)
+            except JsonPatchError:
+                fixed = False
+            if not fixed:
+                unresolved.append(f)
+        # one op per target path; later rules never override earlier ones
+        seen, unique = set(), []
+        for op in ops:
+            if op["path"] not in seen:
+                seen.add(op["path"])
+                unique.append(op)
+        return unique, actions, unresolved
+
+    def apply(self, doc: Any, failures: List[Any], schema: Dict[str, Any]) -> Tuple[Any, List[str], List[Any]]:
+        """Apply every resolvable fix in one pass; returns (patched copy, actions, unresolved)."""
+        return self.apply_plan(doc, self.plan(doc, failures, schema), failures)
+
+    @staticmethod
+    def apply_plan(doc: Any, plan: Tuple[List[Dict[str, Any]], List[str], List[Any]],
+                   failures: List[Any]) -> Tuple[Any, List[str], List[Any]]:
+        """`apply` with a `plan` already made for `doc` and `failures` (e.g. to route on its unresolved count)."""
+        ops, actions, unresolved = plan
+        if not ops:
+            return deepcopy(doc), actions, unresolved
+        try:
+            return apply_patch(doc, ops), actions, unresolved
+        except JsonPatchError as e:
+            return deepcopy(doc), [f"rule_patch_failed:{e}"], list(failures)
+
+
+_UNSET = object()
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Lossless-enough conversion of `value` to JSON-schema type `kind`, else _UNSET."""
+    if kind == "string":
+        if isinstance(value, bool):
+            return str(value).lower()
+        if isinstance(value, (int, float)):
+            return str(value)
+        if isinstance(value, dict) and isinstance(value.get("id"), str):
+            return value["id"]
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], str):
+            return value[0]
+    elif kind == "array":
+        if value is None:
+            return []
+        if isinstance(value, (dict, str, int, float)):
+            return [value]
+    elif kind == "object":
+        if value is None:
+            return {}
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], dict):
+            return value[0]
+    elif kind in ("number", "integer") and isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return _UNSET
+        if kind == "integer":
+            return int(number) if number.is_integer() else _UNSET
+        return int(number) if number.is_integer() and "." not in value else number
+    elif kind == "boolean" and isinstance(value, str) and value.strip().lower() in ("true", "false", "yes", "no"):
+        return value.strip().lower() in ("true", "yes")
+    return _UNSET
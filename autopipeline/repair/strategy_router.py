@@ -2,16 +2,30 @@
 
 from typing import List, Dict, Any
 
+# Deterministic rule rounds per attempt before escalating to the LLM
+MAX_DETERMINISTIC_ROUNDS = 2
+# Beyond this many errors no rule can fix, a local LLM patch is unlikely to converge
+REGENERATE_UNRESOLVED = 20
+
 
 def choose_strategy(failure_hints: List[Dict[str, Any]], prev_parse_ok: bool, attempt_idx: int,
-                    last_top_error: str = None, stagnation_count: int = 0) -> Dict[str, str]:
+                    last_top_error: str = None, stagnation_count: int = 0,
+                    rule_fixable: int = None, deterministic_rounds: int = 0) -> Dict[str, str]:
     """
     Return {"strategy": "...", "reason": "..."}.
     Strategies: deterministic, llm_patch, regenerate, stop.
+    rule_fixable: failures the rule engine can fix locally (None = unknown, legacy routing).
     """
     top_error = failure_hints[0]["code"] if failure_hints else last_top_error
     if not prev_parse_ok:
         return {"strategy": "regenerate", "reason": "parse_failed"}
+    if top_error == "E_SCHEMA_BIND" and rule_fixable is not None:
+        unresolved = len(failure_hints) - rule_fixable
+        if rule_fixable > 0 and deterministic_rounds < MAX_DETERMINISTIC_ROUNDS:
+            return {"strategy": "deterministic", "reason": f"rules_fix_{rule_fixable}_of_{len(failure_hints)}"}
+        if unresolved > REGENERATE_UNRESOLVED:
+            return {"strategy": "regenerate", "reason": "too_many_unresolved"}
+        return {"strategy": "llm_patch", "reason": f"unresolved_by_rules_{max(unresolved, 0)}"}
     if top_error == "E_SCHEMA_BIND":
         if stagnation_count >= 1:
             return {"strategy": "llm_patch", "reason": "schema_bind_stagnation"}
@@ -0,0 +1,301 @@
+"""Packed run directories: one indexed zip archive per run.
+
+`pack_run` turns ``<case>/run=<id>/`` into ``<case>/run=<id>.zip`` in place. The first
+member, ``index.json``, lists every artifact (size, CRC) plus a short eval summary, so
+scans can pick runs without inflating eval.json; artifacts are then read one at a time
+through the zip central directory.
+
+Readers take either layout through `open_run`, which returns a `RunDir` or a
+`PackedRun` with the same read API, and find runs with `iter_runs` (one pruned walk that
+yields run directories and archives, instead of ``rglob("eval.json")``).
+"""
+
+import gzip
+import io
+import json
+import os
+import shutil
+import zipfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import yaml
+
+from autopipeline.artifact_writer import read_artifact_text
+
+ARCHIVE_FORMAT = "autopipeline-run"
+ARCHIVE_VERSION = 1
+INDEX_NAME = "index.json"
+PACK_SUFFIX = ".zip"
+# Members that are already compressed are stored as-is
+_STORED_SUFFIXES = (".gz", ".zip", ".png")
+
+
+class _RunView:
+    """Read API shared by unpacked and packed runs; artifact names are run-relative POSIX paths."""
+
+    path: Path
+    packed = False
+
+    @property
+    def run_id(self) -> str:
+        return self.path.name[:-len(PACK_SUFFIX)] if self.packed else self.path.name
+
+    @property
+    def case_id(self) -> str:
+        return self.path.parent.name
+
+    def exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def read_bytes(self, name: str) -> bytes:
+        raise NotImplementedError
+
+    def names(self) -> List[str]:
+        raise NotImplementedError
+
+    def eval_summary(self) -> Dict[str, Any]:
+        """case_id, overall_status, timestamp, provider and model from eval.json ({} if absent)."""
+        raise NotImplementedError
+
+    def read_text(self, name: str) -> str:
+        """Artifact text; compressed debug artifacts (``<name>.gz``) are inflated transparently."""
+        if not self.exists(name) and self.exists(name + ".gz"):
+            return gzip.decompress(self.read_bytes(name + ".gz")).decode("utf-8")
+        # Universal newlines, like reading the file in text mode
+        return io.TextIOWrapper(io.BytesIO(self.read_bytes(name)), encoding="utf-8").read()
+
+    def load_json(self, name: str) -> Any:
+        return json.loads(self.read_text(name))
+
+    def load_yaml(self, name: str) -> Any:
+        return yaml.safe_load(self.read_text(name))
+
+    def extract(self, dest: Path, names: Optional[Iterable[str]] = None) -> List[Path]:
+        """Copy artifacts (default: all) under `dest`, keeping their relative paths."""
+        written = []
+        for name in names if names is not None else self.names():
+            if not self.exists(name):
+                continue
+            target = Path(dest) / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self.read_bytes(name))
+            written.append(target)
+        return written
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RunDir(_RunView):
+    """An unpacked run directory."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def exists(self, name: str) -> bool:
+        return (self.path / name).is_file()
+
+    def read_bytes(self, name: str) -> bytes:
+        return (self.path / name).read_bytes()
+
+    def read_text(self, name: str) -> str:
+        text = read_artifact_text(str(self.path / name))
+        if text is None:
+            raise FileNotFoundError(str(self.path / name))
+        return text
+
+    def names(self) -> List[str]:
+        return sorted(p.relative_to(self.path).as_posix() for p in self.path.rglob("*") if p.is_file())
+
+    def mtime(self) -> float:
+        eval_path = self.path / "eval.json"
+        return (eval_path if eval_path.exists() else self.path).stat().st_mtime
+
+    def eval_summary(self) -> Dict[str, Any]:
+        return _eval_summary(self.path)
+
+
+class PackedRun(_RunView):
+    """A run archive written by `pack_run`."""
+
+    packed = True
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        try:
+            self.index: Dict[str, Any] = json.loads(self._zip.read(INDEX_NAME))
+        except KeyError:
+            self._zip.close()
+            raise ValueError(f"Not a packed run (no {INDEX_NAME}): {path}")
+
+    def exists(self, name: str) -> bool:
+        return name in self.index["files"]
+
+    def read_bytes(self, name: str) -> bytes:
+        if name not in self.index["files"]:
+            raise FileNotFoundError(f"{self.path}::{name}")
+        return self._zip.read(name)
+
+    def names(self) -> List[str]:
+        return list(self.index["files"])
+
+    def mtime(self) -> float:
+        return self.path.stat().st_mtime
+
+    def eval_summary(self) -> Dict[str, Any]:
+        # Recorded in the index at pack time: no member is inflated
+        return self.index.get("eval") or {}
+
+    def close(self):
+        self._zip.close()
+
+
+def _archive_path(run_dir: Path) -> Path:
+    # Not with_suffix(): run ids may contain dots
+    return run_dir.with_name(run_dir.name + PACK_SUFFIX)
+
+
+def is_packed_run(path: Union[str, Path]) -> bool:
+    path = Path(path)
+    if path.suffix != PACK_SUFFIX or not path.is_file():
+        return False
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return INDEX_NAME in zf.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def run_path(path: Union[str, Path]) -> Path:
+    """The run directory or archive for a run, its archive, or its eval.json path (as recorded before packing)."""
+    path = Path(path)
+    if path.name != "eval.json":
+        return path
+    if not path.exists() and _archive_path(path.parent).exists():
+        return _archive_path(path.parent)
+    return path.parent
+
+
+def open_run(path: Union[str, Path]) -> _RunView:
+    """Open a run given its directory, its archive, or its eval.json path (in either layout)."""
+    path = run_path(path)
+    if path.suffix == PACK_SUFFIX:
+        return PackedRun(path)
+    return RunDir(path)
+
+
+def iter_runs(root: Union[str, Path], marker: str = "eval.json") -> Iterator[Path]:
+    """Run directories (those holding `marker`) and run archives under `root`, in sorted order.
+
+    Run directories are not descended into, so scans skip generated_code/llm_raw trees.
+    """
+    root = Path(root)
+    if not root.exists():
+        return
+    if root.is_file():
+        if is_packed_run(root):
+            yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if marker in filenames:
+            dirnames[:] = []
+            yield Path(dirpath)
+            continue
+        for name in sorted(filenames):
+            # A run kept in both layouts (pack/unpack --keep) is listed once, as its directory
+            if name.endswith(PACK_SUFFIX) and name[:-len(PACK_SUFFIX)] not in dirnames \
+                    and is_packed_run(Path(dirpath) / name):
+                yield Path(dirpath) / name
+
+
+def find_files(root: Union[str, Path], name: str) -> List[Path]:
+    """Files called `name` under `root`, without descending into run directories or archives."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if "eval.json" in filenames:
+            dirnames[:] = []
+        if name in filenames:
+            found.append(Path(dirpath) / name)
+    return found
+
+
+def _eval_summary(run_dir: Path) -> Dict[str, Any]:
+    eval_path = run_dir / "eval.json"
+    if not eval_path.exists():
+        return {}
+    try:
+        data = json.loads(eval_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    llm = data.get("llm") or {}
+    return {
+        "case_id": data.get("case_id"),
+        "overall_status": data.get("overall_status"),
+        "timestamp": data.get("timestamp"),
+        "provider": llm.get("provider"),
+        "model": llm.get("model"),
+    }
+
+
+def pack_run(run_dir: Union[str, Path], remove: bool = True) -> Path:
+    """Pack a run directory into ``<run_dir>.zip`` (index first); removes the directory unless told not to."""
+    run_dir = Path(run_dir)
+    archive = _archive_path(run_dir)
+    if archive.exists():
+        raise FileExistsError(f"Archive already exists: {archive}")
+    members = {p.relative_to(run_dir).as_posix(): p.read_bytes() for p in sorted(run_dir.rglob("*")) if p.is_file()}
+    index = {
+        "format": ARCHIVE_FORMAT,
+        "version": ARCHIVE_VERSION,
+        "case_id": run_dir.parent.name,
+        "run_id": run_dir.name,
+        "packed_at": datetime.now().isoformat(),
+        "eval": _eval_summary(run_dir),
+        "files": {name: {"size": len(data), "crc32": zlib.crc32(data)} for name, data in members.items()},
+    }
+    tmp = archive.with_name(archive.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w") as zf:
+        # Index first and stored, so it can be read without scanning or inflating anything else
+        zf.writestr(INDEX_NAME, json.dumps(index, indent=2, ensure_ascii=False), compress_type=zipfile.ZIP_STORED)
+        for name, data in members.items():
+            compress = zipfile.ZIP_STORED if name.endswith(_STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+            zf.writestr(name, data, compress_type=compress)
+    os.replace(tmp, archive)
+    if remove:
+        shutil.rmtree(run_dir)
+    return archive
+
+
+def unpack_run(archive: Union[str, Path], remove: bool = True) -> Path:
+    """Restore ``run=<id>.zip`` to ``run=<id>/``; removes the archive unless told not to."""
+    archive = Path(archive)
+    run_dir = archive.with_name(archive.name[:-len(PACK_SUFFIX)])
+    if run_dir.exists():
+        raise FileExistsError(f"Run directory already exists: {run_dir}")
+    with PackedRun(archive) as run:
+        run.extract(run_dir)
+    if remove:
+        archive.unlink()
+    return run_dir
+
+
+def pack_tree(root: Union[str, Path], remove: bool = True) -> List[Path]:
+    """Pack every unpacked run directory under `root`; returns the archives written."""
+    return [pack_run(path, remove=remove) for path in list(iter_runs(root))
+            if path.is_dir() and not _archive_path(path).exists()]
+
+
+def unpack_tree(root: Union[str, Path], remove: bool = True) -> List[Path]:
+    """Unpack every run archive under `root`; returns the restored run directories."""
+    return [unpack_run(path, remove=remove) for path in list(iter_runs(root)) if path.is_file()]
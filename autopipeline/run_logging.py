@@ -0,0 +1,144 @@
+"""Per-run structured logging.
+
+`RunLogger` replaces print-and-accumulate: callers enqueue records through a
+`QueueHandler`, and one listener thread per run streams them to ``run.log`` (the
+familiar ``[ts] [LEVEL] message`` text), ``run_log.jsonl`` (one JSON object per record)
+and the console. File handlers buffer writes and flush on WARNING and above, at most
+every `flush_interval` seconds otherwise, and on `close`; nothing is held in memory
+beyond the queue. Every record carries the run's correlation fields (run_id, case_id)
+plus the current stage/attempt set with `bind`, or per-call fields.
+"""
+
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+
+RUN_LOG = "run.log"
+RUN_LOG_JSONL = "run_log.jsonl"
+CONSOLE_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "OFF")
+# Correlation fields copied onto every record (None when unset)
+CONTEXT_FIELDS = ("run_id", "case_id", "stage", "attempt")
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        ts = datetime.fromtimestamp(record.created).isoformat()
+        return f"[{ts}] [{record.levelname}] {record.getMessage()}"
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            entry[name] = getattr(record, name, None)
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """File handler that creates its directory on first write and flushes in batches."""
+
+    def __init__(self, path: str, flush_interval: float):
+        super().__init__(path, mode="a", encoding="utf-8", delay=True)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            now = time.monotonic()
+            if record.levelno >= logging.WARNING or now - self._last_flush >= self.flush_interval:
+                self.stream.flush()
+                self._last_flush = now
+        except Exception:
+            self.handleError(record)
+
+
+class RunLogger:
+    """Structured, streamed log of one pipeline run (see module docstring)."""
+
+    def __init__(self, output_dir: str, run_id: str, case_id: str, console_level: str = "INFO",
+                 flush_interval: float = 1.0, stream=None):
+        self.path = os.path.join(output_dir, RUN_LOG)
+        self.jsonl_path = os.path.join(output_dir, RUN_LOG_JSONL)
+        self.context: Dict[str, Any] = {"run_id": run_id, "case_id": case_id, "stage": None, "attempt": None}
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Not registered with logging.getLogger: one logger per run must not outlive it
+        self._logger = logging.Logger(f"autopipeline.run.{run_id}", logging.DEBUG)
+        self._logger.propagate = False
+        self._queue: "queue.Queue" = queue.Queue()
+        self._logger.addHandler(QueueHandler(self._queue))
+
+        text = _BufferedFileHandler(self.path, flush_interval)
+        text.setFormatter(_TextFormatter())
+        jsonl = _BufferedFileHandler(self.jsonl_path, flush_interval)
+        jsonl.setFormatter(_JsonFormatter())
+        handlers = [text, jsonl]
+        self.console_level = console_level = (console_level or "INFO").upper()
+        # Console stream, also used for late calls after close()
+        self._console_stream = stream or sys.stdout
+        if console_level != "OFF":
+            console = logging.StreamHandler(self._console_stream)
+            console.setLevel(console_level)
+            console.setFormatter(_TextFormatter())
+            handlers.append(console)
+        self._handlers = handlers
+        self._listener = QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        self._closed = False
+
+    def bind(self, **fields):
+        """Set correlation fields (e.g. stage, attempt) for subsequent records of this run."""
+        with self._lock:
+            self.context.update(fields)
+
+    def log(self, message: str, level: str = "INFO", **fields):
+        level = level.upper()
+        levelno = logging.getLevelName(level)
+        if not isinstance(levelno, int):
+            level, levelno = "INFO", logging.INFO
+        if self._closed:
+            # Late call (e.g. from a worker thread) after the files were closed: console only
+            if self.console_level != "OFF" and levelno >= logging.getLevelName(self.console_level):
+                self._console_stream.write(f"[{datetime.now().isoformat()}] [{level}] {message}\n")
+                self._console_stream.flush()
+            return
+        with self._lock:
+            extra = dict(self.context)
+            self.counts[level] = self.counts.get(level, 0) + 1
+        extra["fields"] = fields
+        self._logger.log(levelno, message, extra=extra)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"records": sum(self.counts.values()), "by_level": dict(self.counts)}
+
+    def close(self):
+        """Drain the queue, flush and close the run's log files."""
+        if self._closed:
+            return
+        self._closed = True
+        self._listener.stop()
+        for handler in self._handlers:
+            if isinstance(handler, _BufferedFileHandler):
+                handler.close()
+            else:
+                handler.flush()
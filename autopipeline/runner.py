@@ -3,12 +3,13 @@
 import os
 import time
 import subprocess
-import py_compile
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 
-from autopipeline.utils import load_json, save_json, save_yaml, ensure_dir, sha256_of_file
+from autopipeline.artifact_writer import ArtifactWriter
+from autopipeline.utils import load_json, ensure_dir, sha256_of_file, sha256_of_text
 from autopipeline.agents.planner import PlannerAgent
 from autopipeline.agents.ir_agent import IRAgent
 from autopipeline.agents.bindings import BindingsAgent
@@ -16,15 +17,19 @@ from autopipeline.agents.repair import RepairAgent
 from autopipeline.agents.codegen import CodeGenAgent
 from autopipeline.agents.deploy import DeployAgent
 from autopipeline.catalog.render import catalog_hashes, component_types_summary, endpoint_types_summary, load_component_profiles, load_endpoint_types
+from autopipeline.eval.eval_schema import write_eval
 from autopipeline.eval.validators_registry import build_validators
 from autopipeline.verifier.generation_checker import GenerationConsistencyChecker
 from autopipeline.verifier.cross_artifact_checker import CrossArtifactChecker
+from autopipeline.verifier.ir_graph import IRGraph
 from autopipeline.placement.placement_agent import PlacementAgent
 from autopipeline.llm.llm_client import LLMClient
 from autopipeline.llm.decode import LLMOutputFormatError
 from autopipeline.llm.types import LLMConfig
 from autopipeline.llm.hash_utils import stable_hash
 from autopipeline.eval.error_codes import FailureRecord, ErrorCode
+from autopipeline.repair.attempt_policy import DEFAULT_MAX_ATTEMPTS, AttemptPolicy
+from autopipeline.run_logging import RunLogger
 
 
 class StageError(Exception):
@@ -42,7 +47,11 @@ class PipelineRunner:
 
     def __init__(self, case_id: str, base_dir: str = ".", llm_config: LLMConfig = None,
                  output_root: str = "outputs", enable_repair: bool = True, enable_catalog: bool = True,
-                 runtime_check: bool = False, enable_semantic: bool = True, gate_mode: str = "core"):
+                 runtime_check: bool = False, enable_semantic: bool = True, gate_mode: str = "core",
+                 repair_mode: str = "full", fast_validation: bool = True, speculative: int = 1,
+                 speculative_tiers: Optional[List[str]] = None, attempt_policy: Optional[AttemptPolicy] = None,
+                 async_artifacts: bool = True, compress_artifacts: bool = False, console_log_level: str = "INFO",
+                 compact_eval: bool = False):
         self.case_id = case_id
         self.base_dir = base_dir
         self.case_dir = os.path.join(base_dir, "cases", case_id)
@@ -59,9 +68,24 @@ class PipelineRunner:
         self.runtime_check = runtime_check
         self.enable_semantic = enable_semantic
         self.gate_mode = gate_mode or "core"
-
-        # Logs and stage tracking
-        self.logs: List[str] = []
+        # "full": resend the whole draft; "patch": JSON patch over failing subtrees, full as fallback
+        self.repair_mode = repair_mode or "full"
+        # Inside repair loops run blocking checks only; warning-only work runs once on the accepted artifact
+        self.fast_validation = fast_validation
+        # K > 1: first generation of IR/bindings issues K concurrent candidates, first valid wins
+        self.speculative = max(1, int(speculative or 1))
+        self.speculative_tiers = list(speculative_tiers or [])
+        # Learned budgets/strategy order for IR and bindings repair (None = fixed 3 attempts)
+        self.attempt_policy = attempt_policy
+        # Run-directory files are written by a background thread; eval.json waits on a flush/fsync barrier
+        self.artifacts = ArtifactWriter(background=async_artifacts, compress_debug=compress_artifacts)
+        # Write eval.json as schema version 2 (see autopipeline.eval.eval_schema); eval_summary.json always
+        self.compact_eval = compact_eval
+
+        # Streamed to run.log / run_log.jsonl by a listener thread, tagged with run_id/stage/attempt
+        self.run_logger = RunLogger(self.output_dir, self.run_id, case_id, console_level=console_log_level)
+
+        # Stage tracking
         self.stages_passed: List[str] = []
         self.input_validation: List[str] = []
         self.validator_results: Dict[str, Dict[str, Any]] = {}
@@ -69,12 +93,23 @@ class PipelineRunner:
         self.pipeline_stats: Dict[str, Dict[str, Any]] = {}
         self.inputs_paths: Dict[str, str] = {}
         self.repair_trace: List[Dict[str, Any]] = []
+        # stage -> checker wall time / deferred / deduplicated checks (see _timed_check)
+        self.validation_stats: Dict[str, Dict[str, Any]] = {}
+        # stage -> speculative candidate outcome (see _speculate)
+        self.speculative_stats: Dict[str, Dict[str, Any]] = {}
+        # stage -> one entry per attempt (strategy, blocking error code or None) for the attempt ledger
+        self.attempt_history: Dict[str, List[Dict[str, Any]]] = {}
+        # stage -> early stop decided by the attempt policy
+        self.policy_stats: Dict[str, Dict[str, Any]] = {}
+        # Indexed view of the accepted IR, shared by downstream checkers
+        self.ir_graph: IRGraph = None
 
         # Initialize agents
         self.planner = PlannerAgent()
         # Pass run-specific output root to LLM client for raw dumps
         self.llm_client = LLMClient(base_dir=base_dir, config=self.llm_config, logger=self.log,
-                                    output_root=os.path.join(output_root, case_id, self.run_id))
+                                    output_root=os.path.join(output_root, case_id, self.run_id),
+                                    artifacts=self.artifacts)
         self.ir_agent = IRAgent(self.llm_client)
         self.bindings_agent = BindingsAgent(self.llm_client)
         self.repair_agent = RepairAgent(self.llm_client)
@@ -116,12 +151,12 @@ class PipelineRunner:
         }
         self.catalog_hash = catalog_hashes(base_dir)
 
-    def log(self, message: str, level: str = "INFO"):
-        """Log a message"""
-        timestamp = datetime.now().isoformat()
-        log_entry = f"[{timestamp}] [{level}] {message}"
-        self.logs.append(log_entry)
-        print(log_entry)
+    def log(self, message: str, level: str = "INFO", **fields):
+        """Log a message (extra keyword fields go to run_log.jsonl)"""
+        self.run_logger.log(message, level, **fields)
+
+    def _enter_stage(self, stage: str):
+        self.run_logger.bind(stage=stage, attempt=None)
 
     def _record_validator(self, name: str, result: Dict[str, Any]):
         failures = []
@@ -147,6 +182,53 @@ class PipelineRunner:
             "duration_ms": duration_ms,
             "attempts": attempts
         }
+        vstats = self.validation_stats.get(name)
+        if vstats:
+            self.pipeline_stats[name]["validation"] = {
+                "mode": "fast" if self.fast_validation else "full",
+                "checker_ms": round(vstats["checker_ms"], 3),
+                "saved_ms_est": round(vstats["saved_ms_est"], 3),
+                "runs": dict(vstats["runs"]),
+                "deferred": dict(vstats["deferred"]),
+                "deduplicated": dict(vstats["deduplicated"]),
+            }
+        if name in self.speculative_stats:
+            self.pipeline_stats[name]["speculative"] = self.speculative_stats[name]
+        if name in self.attempt_history:
+            self.pipeline_stats[name]["attempt_history"] = self.attempt_history[name]
+        if self.attempt_policy is not None and name in self.attempt_history:
+            self.pipeline_stats[name]["attempt_policy"] = self.policy_stats.get(name) or {
+                "budget": self.attempt_policy.budget(name), "skipped_attempts": 0,
+                "saved_calls_est": 0.0, "saved_ms_est": 0.0,
+            }
+
+    def _vstats(self, stage: str) -> Dict[str, Any]:
+        return self.validation_stats.setdefault(stage, {"checker_ms": 0.0, "saved_ms_est": 0.0, "runs": {},
+                                                        "last_ms": {}, "deferred": {}, "deduplicated": {}})
+
+    def _timed_check(self, stage: str, name: str, fn, *args, **kwargs) -> Dict[str, Any]:
+        """Run one checker and account its wall time under pipeline_stats[stage]["validation"]."""
+        start = time.perf_counter()
+        res = fn(*args, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats = self._vstats(stage)
+        stats["checker_ms"] += elapsed_ms
+        stats["runs"][name] = stats["runs"].get(name, 0) + 1
+        stats["last_ms"][name] = elapsed_ms
+        return res
+
+    def _defer_check(self, stage: str, name: str):
+        stats = self._vstats(stage)
+        stats["deferred"][name] = stats["deferred"].get(name, 0) + 1
+
+    def _run_deferred(self, stage: str, name: str, fn, *args, **kwargs) -> Dict[str, Any]:
+        """Run a deferred check once on the accepted artifact; the skipped earlier runs count as saved."""
+        res = self._timed_check(stage, name, fn, *args, **kwargs)
+        stats = self._vstats(stage)
+        skipped = stats["deferred"].get(name, 0) - 1
+        if skipped > 0:
+            stats["saved_ms_est"] += skipped * stats["last_ms"][name]
+        return res
 
     def _skip_validator(self, name: str, warning: str):
         self._record_validator(name, {
@@ -218,28 +300,45 @@ class PipelineRunner:
         subprocess.run(["docker", "compose", "-f", deploy_file, "down"], capture_output=True, text=True, check=False)
         return {"pass": True, "failures": [], "warnings": warnings, "metrics": {}}
 
+    @staticmethod
+    def _compile_check(layer: str, path: str) -> Dict[str, Any]:
+        """Syntax-check one generated file in memory (no .pyc is written)"""
+        started = time.perf_counter()
+        entry: Dict[str, Any] = {"path": path, "pass": True}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                compile(f.read(), path, "exec", dont_inherit=True)
+        except FileNotFoundError:
+            entry.update({"pass": False, "error": f"{layer} main.py missing"})
+        except SyntaxError as e:
+            entry.update({"pass": False, "line": e.lineno, "error": f"{layer} main.py compile failed: {e}"})
+        except (OSError, ValueError) as e:
+            # Unreadable (permissions, a directory) or undecodable: a failed file, not a failed stage
+            entry.update({"pass": False, "error": f"{layer} main.py compile failed: {e}"})
+        entry["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return entry
+
     def _validate_codegen(self, codegen_result: Dict[str, Any]) -> Dict[str, Any]:
         failures = []
         warnings = []
         generated = codegen_result.get("generated_files", {})
-        for layer, path in generated.items():
-            if not os.path.exists(path):
+        started = time.perf_counter()
+        layers = list(generated.items())
+        if len(layers) > 1:
+            with ThreadPoolExecutor(max_workers=len(layers)) as pool:
+                results = list(pool.map(lambda item: self._compile_check(*item), layers))
+        else:
+            results = [self._compile_check(layer, path) for layer, path in layers]
+        files = {}
+        for (layer, _), entry in zip(layers, results):
+            files[layer] = entry
+            if not entry["pass"]:
                 failures.append({
                     "code": ErrorCode.E_UNKNOWN,
                     "stage": "codegen",
                     "checker": "CodeGenValidator",
-                    "message": f"{layer} main.py missing"
+                    "message": entry["error"]
                 })
-                continue
-            try:
-                py_compile.compile(path, doraise=True)
-            except Exception as e:
-                failures.append({
-                    "code": ErrorCode.E_UNKNOWN,
-                    "stage": "codegen",
-                    "checker": "CodeGenValidator",
-                    "message": f"{layer} main.py py_compile failed: {e}"
-            })
         if not generated:
             failures.append({
                 "code": ErrorCode.E_UNKNOWN,
@@ -247,7 +346,12 @@ class PipelineRunner:
                 "checker": "CodeGenValidator",
                 "message": "No code generated"
             })
-        return {"pass": len(failures) == 0, "failures": failures, "warnings": warnings, "metrics": {}}
+        metrics = {
+            "files": files,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "layer_timings_ms": codegen_result.get("layer_timings_ms", {}),
+        }
+        return {"pass": len(failures) == 0, "failures": failures, "warnings": warnings, "metrics": metrics}
 
     def _pipeline_config(self) -> Dict[str, Any]:
         return {
@@ -267,6 +371,14 @@ class PipelineRunner:
             "inputs": self.inputs_paths or {},
             "semantic_warnings": self.enable_semantic,
             "gate_mode": self.gate_mode,
+            "repair_mode": self.repair_mode,
+            "fast_validation": self.fast_validation,
+            "speculative": self.speculative,
+            "speculative_tiers": self.speculative_tiers,
+            "attempt_policy": self.attempt_policy is not None,
+            "async_artifacts": self.artifacts.background,
+            "compress_artifacts": self.artifacts.compress_debug,
+            "compact_eval": self.compact_eval,
         }
 
     def _llm_summary(self) -> Dict[str, Any]:
@@ -282,13 +394,30 @@ class PipelineRunner:
             "cache_hits": stats.get("cache_hits", 0),
             "cache_misses": stats.get("cache_misses", 0),
             "usage_tokens_total": stats.get("usage_tokens_total", 0),
+            "usage_tokens_breakdown": stats.get("usage_tokens_breakdown", {}),
+            "usage_tokens_input": stats.get("usage_tokens_input", 0),
+            "usage_tokens_output": stats.get("usage_tokens_output", 0),
+            "cost_usd_est_total": stats.get("cost_usd_est_total", 0.0),
+            "cost_unpriced_calls": stats.get("cost_unpriced_calls", 0),
+            "latency_ms_total": round(stats.get("latency_ms_total", 0.0), 3),
+            "retries_total": stats.get("retries_total", 0),
+            "provider_errors": stats.get("provider_errors", 0),
+            "calls_log": stats.get("calls_log"),
             "prompt_template_hashes": stats.get("prompt_template_hashes", {}),
             "prompt_resolved_hashes": stats.get("prompt_resolved_hashes", {}),
             "prompt_injections": stats.get("prompt_injections", {}),
             "rules_hash": self.rules_ctx["rules_hash"],
             "schema_hashes": self.schema_versions,
             "raw_paths": stats.get("raw_paths", {}),
+            "prompt_compaction": stats.get("prompt_compaction", False),
+            "prompt_tokens_est": stats.get("prompt_tokens_est", {}),
+            "prompt_tokens_est_total": stats.get("prompt_tokens_est_total", 0),
+            "prompt_layout": stats.get("prompt_layout", "inline"),
+            "prompt_prefix_hashes": stats.get("prompt_prefix_hashes", {}),
+            "prefix_tokens_est_total": stats.get("prefix_tokens_est_total", 0),
+            "prefix_reused_tokens_est_total": stats.get("prefix_reused_tokens_est_total", 0),
             "rules_source": self.rules_ctx.get("rules_source", "md_fallback"),
+            "replay": stats.get("replay"),
         }
 
     def _rules_version(self) -> Dict[str, Any]:
@@ -345,8 +474,8 @@ class PipelineRunner:
                 "code": (error_info or {}).get("code", ErrorCode.E_UNKNOWN),
             },
         }
-        eval_file = os.path.join(self.output_dir, "eval.json")
-        save_json(eval_result, eval_file)
+        self._artifact_barrier(eval_result)
+        eval_file = write_eval(eval_result, self.output_dir, compact=self.compact_eval)
         self.log(f"Saved failure evaluation to {eval_file}")
         return eval_result
 
@@ -363,6 +492,7 @@ class PipelineRunner:
 
         try:
             # Step 1: Load inputs
+            self._enter_stage("inputs")
             self.log("Step 1: Loading user problem and device info")
             inputs_start = time.time()
             try:
@@ -373,6 +503,7 @@ class PipelineRunner:
                 raise StageError(str(e), stage="inputs", attempts=1, code=ErrorCode.E_INPUT_INVALID) from e
 
             # Step 2: Generate Plan
+            self._enter_stage("plan")
             self.log("Step 2: Generating Plan (Planner Agent)")
             plan_start = time.time()
             try:
@@ -383,6 +514,7 @@ class PipelineRunner:
                 raise StageError(str(e), stage="plan", attempts=1) from e
 
             # Step 3: Generate IR
+            self._enter_stage("ir")
             self.log("Step 3: Generating IR (IR Agent)")
             ir_start = time.time()
             try:
@@ -396,6 +528,7 @@ class PipelineRunner:
                 raise StageError(str(e), stage="ir", attempts=1) from e
 
             # Step 4: Generate Placement Plan
+            self._enter_stage("placement")
             self.log("Step 4: Generating Placement Plan")
             place_start = time.time()
             try:
@@ -409,6 +542,7 @@ class PipelineRunner:
                 raise StageError(str(e), stage="placement", attempts=1) from e
 
             # Step 5: Generate Bindings
+            self._enter_stage("bindings")
             self.log("Step 5: Generating Bindings (Bindings Agent)")
             bind_start = time.time()
             try:
@@ -421,9 +555,10 @@ class PipelineRunner:
                 self._record_stage("bindings", bind_start, attempts=1, passed=False)
                 raise StageError(str(e), stage="bindings", attempts=1) from e
             bindings_file = os.path.join(self.output_dir, "bindings.yaml")
-            bindings_hash = sha256_of_file(bindings_file)
+            bindings_hash = sha256_of_text(self.artifacts.read_text(bindings_file))
 
             # Step 6: Generate Code
+            self._enter_stage("codegen")
             self.log("Step 6: Generating code skeletons (CodeGen)")
             codegen_start = time.time()
             codegen_result = self.codegen.generate_code(bindings_data, ir_data, self.output_dir,
@@ -434,6 +569,7 @@ class PipelineRunner:
             self._record_validator("code_generated", codegen_validator)
 
             # Step 7: Generate Deployment
+            self._enter_stage("deploy")
             self.log("Step 7: Generating docker-compose.yml (Deploy)")
             deploy_start = time.time()
             deploy_file = self.deploy.generate_deployment(bindings_data, self.output_dir, bindings_hash)
@@ -441,6 +577,7 @@ class PipelineRunner:
             self._record_stage("deploy", deploy_start, attempts=1, passed=True)
 
             # Step 8: Run evaluation
+            self._enter_stage("eval")
             self.log("Step 8: Running evaluation")
             eval_start = time.time()
             eval_result = self._run_evaluation(plan_data, ir_data, placement_data, device_info, bindings_data, codegen_result, deploy_file, bindings_hash, eval_start, user_problem)
@@ -467,8 +604,10 @@ class PipelineRunner:
         finally:
             if eval_result is None:
                 eval_result = self._build_failure_eval(start_time, error_info)
+            self.run_logger.bind(stage=None, attempt=None)
             self.log("Step 9: Saving run log")
             self._save_run_log()
+            self.artifacts.close()
 
         return eval_result
 
@@ -480,11 +619,10 @@ class PipelineRunner:
             self.log("Successfully loaded input files")
             # Persist a self-contained copy under run_dir/inputs for downstream tools
             inputs_dir = os.path.join(self.output_dir, "inputs")
-            ensure_dir(inputs_dir)
             up_path = os.path.join(inputs_dir, "user_problem.json")
             di_path = os.path.join(inputs_dir, "device_info.json")
-            save_json(user_problem, up_path)
-            save_json(device_info, di_path)
+            self.artifacts.write_json(up_path, user_problem)
+            self.artifacts.write_json(di_path, device_info)
             self.inputs_paths = {
                 "user_problem_path": os.path.relpath(up_path, self.output_dir),
                 "device_info_path": os.path.relpath(di_path, self.output_dir),
@@ -529,66 +667,264 @@ class PipelineRunner:
             raise ValueError("Failed to generate valid plan")
 
         plan_file = os.path.join(self.output_dir, "plan.json")
-        save_json(plan_data, plan_file)
+        self.artifacts.write_json(plan_file, plan_data)
         self.log(f"Saved Plan to {plan_file}")
         self.stages_passed.append("plan")
         return plan_data
 
+    def _bindings_schema(self) -> Dict[str, Any]:
+        core = str(self.gate_mode).lower() == "core"
+        return self.schema_checker.bindings_schema_core if core else self.schema_checker.bindings_schema_full
+
+    def _max_attempts(self) -> int:
+        return DEFAULT_MAX_ATTEMPTS if self.enable_repair else 1
+
+    def _note_attempt(self, stage: str, attempt: int, strategy: str, started: float, calls_before: int,
+                      error_code: Optional[str]):
+        """Record how an attempt ended (error_code None = accepted) for the attempt ledger."""
+        self.attempt_history.setdefault(stage, []).append({
+            "attempt": attempt,
+            "strategy": strategy,
+            "error_code": error_code,
+            "duration_ms": int((time.time() - started) * 1000),
+            "llm_calls": self.llm_client.stats["calls_total"] - calls_before,
+        })
+
+    def _policy_allows(self, stage: str, attempt: int, error_code: str) -> bool:
+        """Ask the attempt policy whether another attempt after `error_code` is worth it."""
+        if self.attempt_policy is None:
+            return True
+        ok, reason = self.attempt_policy.should_retry(stage, attempt, str(error_code))
+        if not ok:
+            skipped = self._max_attempts() - attempt + 1
+            self.policy_stats[stage] = {
+                "budget": self.attempt_policy.budget(stage),
+                "stopped_before_attempt": attempt,
+                "reason": reason,
+                "skipped_attempts": skipped,
+                **self.attempt_policy.savings(stage, skipped),
+            }
+            self.log(f"{stage} attempt {attempt} skipped by attempt policy ({reason})", "WARNING")
+        return ok
+
+    def _try_patch_repair(self, artifact_type: str, data: Any, failures: List[Dict[str, Any]],
+                          schema: Dict[str, Any], attempt: int, error_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """JSON-patch repair over failing subtrees (--repair-mode patch).
+
+        Returns None when patch mode is off, not applicable or fails, or when the attempt
+        policy ranks full repair higher after `error_code`; the caller then falls back to
+        full-artifact repair.
+        """
+        if self.repair_mode != "patch" or not isinstance(data, dict):
+            return None
+        if self.attempt_policy is not None and error_code is not None:
+            full = "full_repair" if artifact_type == "ir" else "regenerate"
+            order = self.attempt_policy.strategy_order(artifact_type, str(error_code), ["json_patch", full])
+            if order[0] != "json_patch":
+                self.repair_trace.append({"attempt": attempt, "artifact": artifact_type, "strategy": "json_patch",
+                                          "applied": False, "reason": "attempt_policy_order"})
+                return None
+        try:
+            patched, info = self.repair_agent.patch_artifact(artifact_type, data, failures, schema,
+                                                             self.rules_ctx, self.schema_versions, attempt=attempt)
+        except Exception as e:
+            self.log(f"{artifact_type} patch repair not applied, falling back to full repair: {e}", "WARNING")
+            self.repair_trace.append({"attempt": attempt, "artifact": artifact_type, "strategy": "json_patch",
+                                      "applied": False, "reason": str(e).split("\n")[0][:200]})
+            return None
+        self.log(f"{artifact_type} patch repair applied ({info['patch_ops']} ops)")
+        self.repair_trace.append({"attempt": attempt, "artifact": artifact_type, "strategy": "json_patch",
+                                  "applied": True, **info})
+        return patched
+
+    @staticmethod
+    def _first_blocking(checks: List[Tuple[str, Any]]) -> Tuple[int, int, Optional[str]]:
+        """(rank, failures, check) of the first failing check; rank is higher the earlier it fails, 0 = valid."""
+        for idx, (name, run_check) in enumerate(checks):
+            res = run_check()
+            if not res["pass"]:
+                return len(checks) - idx, len(res.get("failures", [])), name
+        return 0, 0, None
+
+    def _blocking_ir_failures(self, ir_data: Dict[str, Any]) -> Tuple[int, int, Optional[str]]:
+        checks = [
+            ("ir_schema", lambda: self.schema_checker.validate_ir(ir_data)),
+            ("ir_boundary", lambda: self.boundary_checker.check_ir(ir_data, keywords=False)),
+        ]
+        if self.enable_catalog:
+            checks.append(("ir_component_catalog",
+                           lambda: self.component_catalog_checker.check_ir(ir_data, graph=IRGraph.from_ir(ir_data))))
+        return self._first_blocking(checks)
+
+    def _blocking_bindings_failures(self, raw: Dict[str, Any], ir_data: Dict[str, Any], device_info: Dict[str, Any],
+                                    placement_data: Dict[str, Any]) -> Tuple[int, int, Optional[str]]:
+        from copy import deepcopy
+        from autopipeline.normalize.bindings_normalizer import normalize_bindings
+        data, _ = normalize_bindings(deepcopy(raw), ir_data, device_info, gate_mode=self.gate_mode,
+                                     placement=placement_data)
+        self._align_bindings_with_ir(data, ir_data)
+        checks = [
+            ("bindings_schema", lambda: self.schema_checker.validate_bindings(data, gate_mode=self.gate_mode)),
+            ("coverage", lambda: self.coverage_checker.check_coverage(ir_data, data, gate_mode=self.gate_mode,
+                                                                      graph=self.ir_graph)),
+            ("endpoint_legality", lambda: self.endpoint_checker.check_endpoints(data, device_info)),
+        ]
+        if self.enable_catalog and str(self.gate_mode).lower() != "core":
+            checks.append(("endpoint_matching",
+                           lambda: self.endpoint_matching_checker.check(data, device_info, gate_mode=self.gate_mode)))
+        checks.append(("cross_artifact_consistency",
+                       lambda: self.cross_artifact_checker.check(ir_data, data, graph=self.ir_graph)))
+        return self._first_blocking(checks)
+
+    def _speculate(self, stage: str, arrivals, blocking_failures) -> Dict[str, Any]:
+        """Validate speculative candidates as they arrive; the first valid one wins and the rest
+        are cancelled. If none is valid, the least broken one goes on to the regular repair loop.
+        """
+        started = time.perf_counter()
+        seen: List[Dict[str, Any]] = []
+        chosen, chosen_score, winner, first_error = None, None, None, None
+        try:
+            for item in arrivals:
+                entry = {"candidate": item["candidate"], "tier": item["tier"], "latency_ms": item["latency_ms"],
+                         "cache_hit": item["cache_hit"],
+                         "arrival_ms": round((time.perf_counter() - started) * 1000, 3)}
+                seen.append(entry)
+                if item.get("error") is not None:
+                    entry["error"] = str(item["error"])[:200]
+                    first_error = first_error or item["error"]
+                    continue
+                rank, count, check = blocking_failures(item["data"])
+                entry["blocking_failures"] = count
+                entry["failed_check"] = check
+                if chosen_score is None or (rank, count) < chosen_score:
+                    chosen, chosen_score = item, (rank, count)
+                if rank == 0:
+                    winner = item
+                    break
+        finally:
+            arrivals.close()
+        wall_ms = (time.perf_counter() - started) * 1000
+        stats = {
+            "k": self.speculative,
+            "tiers": self.speculative_tiers,
+            "winner": winner["candidate"] if winner else None,
+            "chosen": chosen["candidate"] if chosen else None,
+            "arrivals": seen,
+            "cancelled_or_discarded": self.speculative - len(seen),
+            "wall_ms": round(wall_ms, 3),
+        }
+        if winner is not None:
+            # Provider time only (prompt rendering and validation cost the same either way).
+            # Sequential baseline: one call per candidate in index order up to the winner; a
+            # lower-index candidate still in flight took at least as long as the winner.
+            latency = {e["candidate"]: e["latency_ms"] for e in seen}
+            sequential_ms = sum(latency.get(i, winner["latency_ms"]) for i in range(winner["candidate"] + 1))
+            stats["sequential_est_ms"] = round(sequential_ms, 3)
+            stats["latency_saved_ms_est"] = round(sequential_ms - winner["latency_ms"], 3)
+        self.speculative_stats[stage] = stats
+        self.log(f"[speculative] stage={stage} k={self.speculative} winner={stats['winner']} "
+                 f"chosen={stats['chosen']} arrived={len(seen)} wall={wall_ms:.1f}ms")
+        if chosen is None:
+            raise first_error
+        return chosen
+
     def _generate_and_validate_ir(self, plan_data: Dict[str, Any], user_problem: Dict[str, Any],
                                   device_info: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         """Generate IR with auto-repair loop (max 3 attempts)"""
 
         ir_data = None
         last_error = ""
+        last_failures: List[Dict[str, Any]] = []
         last_error_code = ErrorCode.E_UNKNOWN
         attempts_used = 0
-        max_attempts = 1 if not self.enable_repair else 3
+        max_attempts = self._max_attempts()
+        strategy, started, calls_before = "generate", time.time(), 0
         for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                self._note_attempt("ir", attempt - 1, strategy, started, calls_before, last_error_code)
+                if not self._policy_allows("ir", attempt, last_error_code):
+                    raise StageError(last_error or "Failed to generate valid IR", stage="ir",
+                                     attempts=attempts_used, code=last_error_code)
             attempts_used = attempt
-            self.log(f"IR generation attempt {attempt}/3")
+            started, calls_before = time.time(), self.llm_client.stats["calls_total"]
+            self.run_logger.bind(attempt=attempt)
+            self.log(f"IR generation attempt {attempt}/{max_attempts}")
 
             try:
-                if attempt == 1:
+                if attempt == 1 and self.speculative > 1:
+                    strategy = "speculative"
+                    candidates = self.ir_agent.generate_ir_candidates(plan_data, user_problem, device_info,
+                                                                      self.rules_ctx, self.schema_versions,
+                                                                      k=self.speculative,
+                                                                      tiers=self.speculative_tiers or None,
+                                                                      attempt=attempt)
+                    ir_data = self._speculate("ir", candidates, self._blocking_ir_failures)["data"]
+                elif attempt == 1:
+                    strategy = "generate"
                     ir_data = self.ir_agent.generate_ir(plan_data, user_problem, device_info,
                                                         self.rules_ctx, self.schema_versions, attempt=attempt)
                 else:
-                    ir_data = self.repair_agent.repair_ir(ir_data, last_error, device_info,
-                                                          self.rules_ctx, self.schema_versions, attempt=attempt)
+                    patched = self._try_patch_repair("ir", ir_data, last_failures, self.schema_checker.ir_schema, attempt,
+                                                     error_code=last_error_code)
+                    strategy = "json_patch" if patched is not None else "full_repair"
+                    ir_data = patched if patched is not None else \
+                        self.repair_agent.repair_ir(ir_data, last_error, device_info,
+                                                    self.rules_ctx, self.schema_versions, attempt=attempt)
             except LLMOutputFormatError as e:
                 last_error = str(e)
                 last_error_code = e.code
                 self.log(f"IR decode failed: {last_error}", "WARNING")
                 continue
 
-            schema_res = self.schema_checker.validate_ir(ir_data)
+            schema_res = self._timed_check("ir", "ir_schema", self.schema_checker.validate_ir, ir_data)
             self._record_validator("ir_schema", schema_res)
             if not schema_res["pass"]:
                 last_error = self._failure_message(schema_res) or "IR schema failed"
+                last_failures = schema_res.get("failures", [])
                 last_error_code = ErrorCode.E_SCHEMA_IR
                 self.log(f"IR schema validation failed: {last_error}", "WARNING")
                 continue
 
-            boundary_res = self.boundary_checker.check_ir(ir_data)
+            if self.fast_validation:
+                # Keyword hits are warnings only: scan once, on the accepted IR
+                boundary_res = self._timed_check("ir", "ir_boundary", self.boundary_checker.check_ir, ir_data,
+                                                 keywords=False)
+                self._defer_check("ir", "ir_boundary_keywords")
+            else:
+                boundary_res = self._timed_check("ir", "ir_boundary", self.boundary_checker.check_ir, ir_data)
             self._record_validator("ir_boundary", boundary_res)
             if not boundary_res["pass"]:
                 last_error = self._failure_message(boundary_res) or "IR boundary failed"
+                last_failures = boundary_res.get("failures", [])
                 last_error_code = ErrorCode.E_BOUNDARY
                 self.log(f"IR boundary check failed: {last_error}", "WARNING")
                 continue
 
             if self.enable_catalog:
-                comp_res = self.component_catalog_checker.check_ir(ir_data)
+                graph = IRGraph.from_ir(ir_data)
+                comp_res = self._timed_check("ir", "ir_component_catalog", self.component_catalog_checker.check_ir,
+                                             ir_data, graph=graph)
                 self._record_validator("ir_component_catalog", comp_res)
                 if not comp_res["pass"]:
                     last_error = self._failure_message(comp_res) or "IR catalog failed"
+                    last_failures = comp_res.get("failures", [])
                     last_error_code = ErrorCode.E_CATALOG_COMPONENT
                     self.log(f"IR component catalog check failed: {last_error}", "WARNING")
                     continue
 
-                iface_res = self.ir_interface_checker.check(ir_data)
+                if self.fast_validation and self.ir_interface_checker.catalog_checker is self.component_catalog_checker:
+                    # The interface checker delegates to the same catalog check on the same IR
+                    iface_res = comp_res
+                    stats = self._vstats("ir")
+                    stats["deduplicated"]["ir_interface"] = stats["deduplicated"].get("ir_interface", 0) + 1
+                    stats["saved_ms_est"] += stats["last_ms"]["ir_component_catalog"]
+                else:
+                    iface_res = self._timed_check("ir", "ir_interface", self.ir_interface_checker.check, ir_data,
+                                                  graph=graph)
                 self._record_validator("ir_interface", iface_res)
                 if not iface_res["pass"]:
                     last_error = self._failure_message(iface_res) or "IR interface failed"
+                    last_failures = iface_res.get("failures", [])
                     last_error_code = ErrorCode.E_CHECKER_FAIL
                     self.log(f"IR interface check failed: {last_error}", "WARNING")
                     continue
@@ -596,15 +932,23 @@ class PipelineRunner:
                 self._skip_validator("ir_component_catalog", "Skipped catalog validation (--no-catalog)")
                 self._skip_validator("ir_interface", "Skipped catalog validation (--no-catalog)")
 
+            if self.fast_validation:
+                kw_res = self._run_deferred("ir", "ir_boundary_keywords", self.boundary_checker.check_ir, ir_data,
+                                            patterns=False)
+                self.validator_results["ir_boundary"]["warnings"].extend(kw_res.get("warnings", []))
             self.log("IR validation passed")
+            self._note_attempt("ir", attempt, strategy, started, calls_before, None)
             break
 
         else:
-            self.log("IR generation failed after 3 attempts", "ERROR")
+            self._note_attempt("ir", attempts_used, strategy, started, calls_before, last_error_code)
+            self.log(f"IR generation failed after {attempts_used} attempts", "ERROR")
             raise StageError(last_error or "Failed to generate valid IR", stage="ir", attempts=attempts_used, code=last_error_code)
 
+        # Build once for the accepted IR version (after catalog alias normalization)
+        self.ir_graph = IRGraph.from_ir(ir_data)
         ir_file = os.path.join(self.output_dir, "ir.yaml")
-        save_yaml(ir_data, ir_file)
+        self.artifacts.write_yaml(ir_file, ir_data)
         self.log(f"Saved IR to {ir_file}")
         self.stages_passed.append("ir")
 
@@ -624,7 +968,7 @@ class PipelineRunner:
         """Generate placement plan using deterministic heuristic and validate."""
         placement = self.placement_agent.generate_placement_plan(plan_data, ir_data, device_info)
         placement_path = os.path.join(self.output_dir, "placement_plan.yaml")
-        save_yaml(placement, placement_path)
+        self.artifacts.write_yaml(placement_path, placement)
         self.log(f"Saved Placement plan to {placement_path}")
 
         # schema check
@@ -635,7 +979,7 @@ class PipelineRunner:
             raise StageError(msg, stage="placement", attempts=1, code=ErrorCode.E_SCHEMA_PLACE)
 
         # placement checker
-        place_check_res = self.placement_checker.check(placement, ir_data)
+        place_check_res = self.placement_checker.check(placement, ir_data, graph=self.ir_graph)
         self._record_validator("placement_checker", place_check_res)
         if not place_check_res["pass"]:
             msg = self._failure_message(place_check_res) or "Placement check failed"
@@ -650,16 +994,18 @@ class PipelineRunner:
 
         bindings_data = None
         last_error = ""
+        last_failures: List[Dict[str, Any]] = []
         last_error_code = ErrorCode.E_UNKNOWN
         attempts_used = 0
-        max_attempts = 1 if not self.enable_repair else 3
+        max_attempts = self._max_attempts()
         stagnation_error = None
         stagnation_count = 0
-        self.repair_trace = []
 
         def _failure_hints_from(res: Dict[str, Any]) -> List[Dict[str, Any]]:
             hints = []
             for f in res.get("failures", []) or []:
+                if isinstance(f, FailureRecord):
+                    f = f.to_dict()
                 hints.append({
                     "code": f.get("code"),
                     "checker": f.get("checker"),
@@ -669,28 +1015,53 @@ class PipelineRunner:
                 })
             return hints
 
+        from autopipeline.repair.rule_engine import RuleEngine
+        from autopipeline.repair.strategy_router import choose_strategy
+        rule_engine = RuleEngine(ir_data, placement_data, device_info)
+
+        current_strategy, started, calls_before = "generate", time.time(), 0
         for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                self._note_attempt("bindings", attempt - 1, current_strategy, started, calls_before, last_error_code)
+                if not self._policy_allows("bindings", attempt, last_error_code):
+                    raise StageError(last_error or "Failed to generate valid Bindings", stage="bindings",
+                                     attempts=attempts_used, code=last_error_code)
             attempts_used = attempt
+            started, calls_before = time.time(), self.llm_client.stats["calls_total"]
+            self.run_logger.bind(attempt=attempt)
             self.log(f"Bindings generation attempt {attempt}/{max_attempts}")
 
             try:
-                if attempt == 1:
+                if attempt == 1 and self.speculative > 1:
+                    current_strategy = "speculative"
+                    candidates = self.bindings_agent.generate_bindings_candidates(
+                        ir_data, device_info, self.rules_ctx, self.schema_versions, k=self.speculative,
+                        tiers=self.speculative_tiers or None, attempt=attempt)
+                    bindings_data = self._speculate(
+                        "bindings", candidates,
+                        lambda raw: self._blocking_bindings_failures(raw, ir_data, device_info, placement_data))["data"]
+                elif attempt == 1:
+                    current_strategy = "generate"
                     bindings_data = self.bindings_agent.generate_bindings(ir_data, device_info,
                                                                           self.rules_ctx, self.schema_versions, attempt=attempt)
-                    current_strategy = "generate"
                 else:
-                    bindings_data = self.repair_agent.repair_bindings(bindings_data, last_error,
-                                                                      ir_data, device_info,
-                                                                      self.rules_ctx, self.schema_versions, attempt=attempt)
-                    current_strategy = "regenerate"
+                    patched = self._try_patch_repair("bindings", bindings_data, last_failures,
+                                                     self._bindings_schema(), attempt, error_code=last_error_code)
+                    if patched is not None:
+                        bindings_data = patched
+                        current_strategy = "json_patch"
+                    else:
+                        current_strategy = "regenerate"
+                        bindings_data = self.repair_agent.repair_bindings(bindings_data, last_error,
+                                                                          ir_data, device_info,
+                                                                          self.rules_ctx, self.schema_versions, attempt=attempt)
             except LLMOutputFormatError as e:
                 last_error = str(e)
                 last_error_code = e.code
                 self.log(f"Bindings decode failed: {last_error}", "WARNING")
                 if getattr(e, "raw_text", None):
-                    raw_path = os.path.join(self.output_dir, "bindings_raw.txt")
-                    with open(raw_path, "w", encoding="utf-8") as f:
-                        f.write(e.raw_text)
+                    self.artifacts.write_text(os.path.join(self.output_dir, "bindings_raw.txt"), e.raw_text,
+                                              debug=True)
                 continue
             except Exception as e:
                 last_error = str(e)
@@ -699,86 +1070,94 @@ class PipelineRunner:
                 continue
 
             # Always persist raw bindings before validation
-            raw_path_yaml = os.path.join(self.output_dir, "bindings_raw.yaml")
-            try:
-                save_yaml(bindings_data, raw_path_yaml)
-            except Exception:
-                pass
+            self.artifacts.write_yaml(os.path.join(self.output_dir, "bindings_raw.yaml"), bindings_data, debug=True)
 
             # Normalize and persist raw/norm
             from autopipeline.normalize.bindings_normalizer import normalize_bindings
             bindings_norm, norm_actions = normalize_bindings(bindings_data, ir_data, device_info, gate_mode=self.gate_mode, placement=placement_data)
-            norm_path = os.path.join(self.output_dir, "bindings_norm.yaml")
-            try:
-                save_yaml(bindings_norm, norm_path)
-            except Exception:
-                pass
+            self.artifacts.write_yaml(os.path.join(self.output_dir, "bindings_norm.yaml"), bindings_norm, debug=True)
             bindings_data = bindings_norm
 
             # Align with IR to avoid trivial mismatches
             self._align_bindings_with_ir(bindings_data, ir_data)
 
-            tried_det_patch = False
+            deterministic_rounds = 0
             tried_llm_patch = False
             inner_round = 0
             while True:
                 inner_round += 1
-                schema_res = self.schema_checker.validate_bindings(bindings_data, gate_mode=self.gate_mode)
+                schema_res = self._timed_check("bindings", "bindings_schema", self.schema_checker.validate_bindings,
+                                               bindings_data, gate_mode=self.gate_mode)
                 self._record_validator("bindings_schema", schema_res)
                 if schema_res["pass"]:
                     last_error = ""
+                    last_failures = []
                     last_error_code = ErrorCode.E_UNKNOWN
                     stagnation_count = 0
                     stagnation_error = None
                     break
 
                 failure_hints = _failure_hints_from(schema_res)
-                top_error = schema_res.get("failures", [{}])[0].get("code") if schema_res.get("failures") else ErrorCode.E_SCHEMA_BIND
+                top_error = failure_hints[0].get("code") if failure_hints else ErrorCode.E_SCHEMA_BIND
                 if top_error == stagnation_error:
                     stagnation_count += 1
                 else:
                     stagnation_error = top_error
                     stagnation_count = 0
 
-                # Deterministic patch first
-                if not tried_det_patch:
+                # Route on how many failures the rule engine can fix without an LLM call
+                schema_failures = schema_res.get("failures", [])
+                rule_plan = rule_engine.plan(bindings_data, schema_failures, self._bindings_schema())
+                unresolved = rule_plan[2]
+                decision = choose_strategy(failure_hints, True, attempt, top_error, stagnation_count,
+                                           rule_fixable=len(schema_failures) - len(unresolved),
+                                           deterministic_rounds=deterministic_rounds)
+
+                if decision["strategy"] == "deterministic":
                     from autopipeline.repair.deterministic_patch import apply_deterministic_patch
-                    patched, patch_actions = apply_deterministic_patch(bindings_data, ir_data, failure_hints)
-                    patched_path = os.path.join(self.output_dir, f"bindings_patched_attempt{attempt}.yaml")
-                    try:
-                        save_yaml(patched, patched_path)
-                    except Exception:
-                        pass
+                    patched, patch_actions = apply_deterministic_patch(bindings_data, ir_data, failure_hints,
+                                                                       failures=schema_failures,
+                                                                       schema=self._bindings_schema(),
+                                                                       engine=rule_engine, rule_plan=rule_plan)
+                    patched_path = self.artifacts.write_yaml(
+                        os.path.join(self.output_dir, f"bindings_patched_attempt{attempt}.yaml"), patched, debug=True)
                     self.repair_trace.append({
                         "attempt": attempt,
                         "strategy": "deterministic_patch",
+                        "reason": decision["reason"],
                         "top_error_before": top_error,
                         "patch_actions_count": len(patch_actions),
                         "used_hints_count": len(failure_hints),
+                        "unresolved_count": len(unresolved),
                         "artifact_written": os.path.relpath(patched_path, self.output_dir),
                     })
                     bindings_data = patched
-                    tried_det_patch = True
+                    deterministic_rounds += 1
                     continue
 
                 # LLM patch if still failing and repair enabled
-                if self.enable_repair and not tried_llm_patch:
+                llm_allowed = decision["strategy"] == "llm_patch"
+                if llm_allowed and self.enable_repair and not tried_llm_patch and self.repair_mode == "patch":
+                    patched = self._try_patch_repair("bindings", bindings_data, schema_res.get("failures", []),
+                                                     self._bindings_schema(), attempt)
+                    if patched is not None:
+                        bindings_data = patched
+                        tried_llm_patch = True
+                        continue
+                if llm_allowed and self.enable_repair and not tried_llm_patch:
                     from autopipeline.repair.context_pack import build_bindings_repair_context
                     from autopipeline.repair.llm_patch import llm_patch_bindings
+                    # The repair context reads the drafts back from the run dir
+                    self.artifacts.flush()
                     ctx = build_bindings_repair_context(self.output_dir, schema_res.get("failures", []))
-                    repaired_text = llm_patch_bindings(self.llm_client, ctx.get("previous_bindings_text", ""), ctx.get("failure_hints", []),
+                    repaired = llm_patch_bindings(self.llm_client, ctx.get("previous_bindings_text", ""), ctx.get("failure_hints", []),
                                                        ctx.get("skeleton", {}), self.case_id, self.rules_ctx, self.schema_versions,
                                                        attempt=attempt)
-                    repaired_path = os.path.join(self.output_dir, f"bindings_repaired_attempt{attempt}.txt")
+                    repaired_path = self.artifacts.write_text(
+                        os.path.join(self.output_dir, f"bindings_repaired_attempt{attempt}.txt"), repaired.text, debug=True)
                     try:
-                        with open(repaired_path, "w", encoding="utf-8") as f:
-                            f.write(repaired_text)
-                    except Exception:
-                        pass
-                    try:
-                        import yaml
-                        bindings_data = yaml.safe_load(repaired_text) or {}
-                    except Exception as e:
+                        bindings_data = repaired.value() or {}
+                    except LLMOutputFormatError as e:
                         last_error = f"LLM patch parse failed: {e}"
                         last_error_code = ErrorCode.E_SCHEMA_BIND
                         tried_llm_patch = True
@@ -789,6 +1168,8 @@ class PipelineRunner:
                             "used_hints_count": len(failure_hints),
                             "artifact_written": os.path.relpath(repaired_path, self.output_dir),
                             "parse_failed": True,
+                            "previous_bindings_chars": ctx["previous_bindings_chars"],
+                            "previous_bindings_truncated": ctx["previous_bindings_truncated"],
                         })
                         break
 
@@ -800,61 +1181,89 @@ class PipelineRunner:
                         "used_hints_count": len(failure_hints),
                         "artifact_written": os.path.relpath(repaired_path, self.output_dir),
                         "parse_failed": False,
+                        "previous_bindings_chars": ctx["previous_bindings_chars"],
+                        "previous_bindings_truncated": ctx["previous_bindings_truncated"],
                     })
                     # After LLM patch, loop to revalidate
                     continue
 
-                # Give up this attempt; move to next
+                # Give up this attempt; move to next (the router may ask for a regeneration directly)
+                self.repair_trace.append({
+                    "attempt": attempt,
+                    "strategy": "give_up_attempt",
+                    "reason": decision["reason"] if not llm_allowed else "llm_patch_exhausted",
+                    "top_error_before": top_error,
+                    "unresolved_count": len(unresolved),
+                })
                 last_error = self._failure_message(schema_res) or "Bindings schema failed"
+                last_failures = schema_res.get("failures", [])
                 last_error_code = ErrorCode.E_SCHEMA_BIND
                 self.log(f"Bindings schema validation failed: {last_error}", "WARNING")
                 break
 
             if schema_res.get("pass"):
-                coverage_res = self.coverage_checker.check_coverage(ir_data, bindings_data, gate_mode=self.gate_mode)
+                coverage_res = self._timed_check("bindings", "coverage", self.coverage_checker.check_coverage,
+                                                 ir_data, bindings_data, gate_mode=self.gate_mode, graph=self.ir_graph)
                 self._record_validator("coverage", coverage_res)
                 if not coverage_res["pass"]:
                     last_error = self._failure_message(coverage_res) or "Coverage failed"
+                    last_failures = coverage_res.get("failures", [])
                     last_error_code = ErrorCode.E_COVERAGE
                     self.log(f"Coverage check failed: {last_error}", "WARNING")
                     continue
 
-                endpoint_res = self.endpoint_checker.check_endpoints(bindings_data, device_info)
+                endpoint_res = self._timed_check("bindings", "endpoint_legality", self.endpoint_checker.check_endpoints,
+                                                 bindings_data, device_info)
                 self._record_validator("endpoint_legality", endpoint_res)
                 if not endpoint_res["pass"]:
                     last_error = self._failure_message(endpoint_res) or "Endpoint legality failed"
+                    last_failures = endpoint_res.get("failures", [])
                     last_error_code = ErrorCode.E_ENDPOINT_CHECK
                     self.log(f"Endpoint legality check failed: {last_error}", "WARNING")
                     continue
 
-                if self.enable_catalog:
-                    ep_match_res = self.endpoint_matching_checker.check(bindings_data, device_info, gate_mode=self.gate_mode)
+                # In core gate mode endpoint matching only warns: defer it to the accepted bindings
+                defer_matching = self.fast_validation and str(self.gate_mode).lower() == "core"
+                if self.enable_catalog and defer_matching:
+                    self._defer_check("bindings", "endpoint_matching")
+                elif self.enable_catalog:
+                    ep_match_res = self._timed_check("bindings", "endpoint_matching", self.endpoint_matching_checker.check,
+                                                     bindings_data, device_info, gate_mode=self.gate_mode)
                     self._record_validator("endpoint_matching", ep_match_res)
                     if not ep_match_res["pass"]:
                         last_error = self._failure_message(ep_match_res) or "Endpoint matching failed"
+                        last_failures = ep_match_res.get("failures", [])
                         last_error_code = ErrorCode.E_ENDPOINT_CHECK
                         self.log(f"Endpoint matching check failed: {last_error}", "WARNING")
                         continue
                 else:
                     self._skip_validator("endpoint_matching", "Skipped catalog validation (--no-catalog)")
 
-                cross_res = self.cross_artifact_checker.check(ir_data, bindings_data)
+                cross_res = self._timed_check("bindings", "cross_artifact_consistency", self.cross_artifact_checker.check,
+                                              ir_data, bindings_data, graph=self.ir_graph)
                 self._record_validator("cross_artifact_consistency", cross_res)
                 if not cross_res["pass"]:
                     last_error = self._failure_message(cross_res) or "Cross artifact consistency failed"
+                    last_failures = cross_res.get("failures", [])
                     last_error_code = ErrorCode.E_CHECKER_FAIL
                     self.log(f"Cross-artifact check failed: {last_error}", "WARNING")
                     continue
 
+                if self.enable_catalog and defer_matching:
+                    ep_match_res = self._run_deferred("bindings", "endpoint_matching", self.endpoint_matching_checker.check,
+                                                      bindings_data, device_info, gate_mode=self.gate_mode)
+                    self._record_validator("endpoint_matching", ep_match_res)
                 self.log("Bindings validation passed")
+                self._note_attempt("bindings", attempt, current_strategy, started, calls_before, None)
                 break
 
         else:
+            self._note_attempt("bindings", attempts_used, current_strategy, started, calls_before, last_error_code)
             self.log("Bindings generation failed after max attempts", "ERROR")
             raise StageError(last_error or "Failed to generate valid Bindings", stage="bindings", attempts=attempts_used, code=last_error_code)
 
         bindings_file = os.path.join(self.output_dir, "bindings.yaml")
-        save_yaml(bindings_data, bindings_file)
+        self.artifacts.write_yaml(bindings_file, bindings_data)
         self.log(f"Saved Bindings to {bindings_file}")
         self.stages_passed.append("bindings")
 
@@ -894,11 +1303,13 @@ class PipelineRunner:
 
         # Code/deploy presence as simple validators
         def add_simple_validator(name: str, passed: bool, message: str, failures: List[Dict[str, Any]] = None):
+            # Keep failures/metrics already recorded for this validator (e.g. compile checks)
+            previous = self.validator_results.get(name, {})
             result = {
-                "pass": passed,
-                "failures": failures or [],
-                "warnings": [],
-                "metrics": {}
+                "pass": passed and previous.get("pass", True),
+                "failures": previous.get("failures", []) + (failures or []),
+                "warnings": previous.get("warnings", []),
+                "metrics": previous.get("metrics", {})
             }
             self._record_validator(name, result)
 
@@ -928,6 +1339,7 @@ class PipelineRunner:
                 "device_info": device_info,
                 "plan": plan_data,
                 "ir": ir_data,
+                "ir_graph": self.ir_graph,
                 "bindings": bindings_data,
                 "compose": None,
                 "attempts_by_stage": {k: v.get("attempts") for k, v in self.pipeline_stats.items()},
@@ -957,6 +1369,8 @@ class PipelineRunner:
         eval_result["metrics"]["total_duration_ms"] = total_duration_ms
         eval_result["metrics"]["total_attempts"] = total_attempts
         eval_result["metrics"]["attempts_by_stage"] = attempts_by_stage
+        eval_result["metrics"]["checker_ms_total"] = round(sum(v["checker_ms"] for v in self.validation_stats.values()), 3)
+        eval_result["metrics"]["checker_ms_saved_est"] = round(sum(v["saved_ms_est"] for v in self.validation_stats.values()), 3)
 
         # Simplified checks (backward compatibility)
         for name in ["user_problem_schema", "device_info_schema", "device_info_catalog",
@@ -1019,15 +1433,21 @@ class PipelineRunner:
             if "unknown_types" in cat_metrics:
                 eval_result["unknown_component_types"] = cat_metrics.get("unknown_types", [])
 
-        eval_file = os.path.join(self.output_dir, "eval.json")
-        save_json(eval_result, eval_file)
+        self._artifact_barrier(eval_result)
+        eval_file = write_eval(eval_result, self.output_dir, compact=self.compact_eval)
         self.log(f"Saved evaluation to {eval_file}")
 
         return eval_result
 
+    def _artifact_barrier(self, eval_result: Dict[str, Any]):
+        """Wait until every queued artifact is durable, then record writer stats in the eval."""
+        errors = self.artifacts.flush(fsync=True)
+        for err in errors:
+            self.log(f"Artifact write failed: {err}", "WARNING")
+        eval_result.setdefault("pipeline", {})["artifacts"] = {**self.artifacts.stats, "errors": errors}
+        eval_result["pipeline"]["logging"] = {**self.run_logger.stats(), "console_level": self.run_logger.console_level}
+
     def _save_run_log(self):
-        """Save run log to file"""
-        log_file = os.path.join(self.output_dir, "run.log")
-        with open(log_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(self.logs))
-        self.log(f"Saved run log to {log_file}")
+        """Flush and close the streamed run log"""
+        self.log(f"Saved run log to {self.run_logger.path}")
+        self.run_logger.close()
@@ -12,14 +12,18 @@ class BoundaryChecker:
     def __init__(self, forbidden_keywords: List[str], forbidden_regex: List[str] = None):
         self.forbidden_keywords = sorted(set([kw.lower() for kw in forbidden_keywords]))
         self.forbidden_regex = forbidden_regex or []
+        self._keyword_patterns = [(kw, re.compile(r'\b' + re.escape(kw) + r'\b')) for kw in self.forbidden_keywords]
 
-    def _check_value(self, value: str, path: str, failures: List[Dict[str, Any]], warnings: List[str]):
-        val_lower = value.lower()
+    def _check_value(self, value: str, path: str, failures: List[Dict[str, Any]], warnings: List[str],
+                     keywords: bool = True, patterns: bool = True):
         # Keywords仅给 warning，避免概念性描述误杀
-        for keyword in self.forbidden_keywords:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, val_lower):
-                warnings.append(f"Concept keyword '{keyword}' found at {path}")
+        if keywords:
+            val_lower = value.lower()
+            for keyword, pattern in self._keyword_patterns:
+                if pattern.search(val_lower):
+                    warnings.append(f"Concept keyword '{keyword}' found at {path}")
+        if not patterns:
+            return
         # 具体形态（regex）仍然 ERROR
         for reg in self.forbidden_regex:
             try:
@@ -33,36 +37,44 @@ class BoundaryChecker:
                     {"path": path, "match": m.group(0), "rule": "forbidden_regex"}
                 ))
 
-    def _walk(self, obj: Any, path: str, failures: List[Dict[str, Any]], warnings: List[str], skip_desc: bool = False):
+    def _walk(self, obj: Any, path: str, failures: List[Dict[str, Any]], warnings: List[str], skip_desc: bool = False,
+              keywords: bool = True, patterns: bool = True):
         if isinstance(obj, dict):
             for k, v in obj.items():
                 if skip_desc and k == "description":
                     continue
                 new_path = f"{path}.{k}" if path else k
-                self._walk(v, new_path, failures, warnings, skip_desc=skip_desc and k != "description")
+                self._walk(v, new_path, failures, warnings, skip_desc=skip_desc and k != "description",
+                           keywords=keywords, patterns=patterns)
         elif isinstance(obj, list):
             for idx, item in enumerate(obj):
                 new_path = f"{path}[{idx}]"
-                self._walk(item, new_path, failures, warnings, skip_desc=skip_desc)
+                self._walk(item, new_path, failures, warnings, skip_desc=skip_desc,
+                           keywords=keywords, patterns=patterns)
         elif isinstance(obj, str):
-            self._check_value(obj, path, failures, warnings)
+            self._check_value(obj, path, failures, warnings, keywords=keywords, patterns=patterns)
 
-    def check_ir(self, ir_data: Dict[str, Any]):
-        """Check if IR contains forbidden implementation details"""
+    def check_ir(self, ir_data: Dict[str, Any], keywords: bool = True, patterns: bool = True):
+        """Check if IR contains forbidden implementation details.
+
+        keywords=False skips the warning-only keyword scan (fast validation inside repair
+        loops); patterns=False runs only that scan, for the finally accepted IR.
+        """
         failures: List[Dict[str, Any]] = []
         warnings: List[str] = []
+        scan = {"keywords": keywords, "patterns": patterns}
         # components: skip description fields
         components = ir_data.get("components", ir_data.get("entities", []))
         for idx, comp in enumerate(components):
-            self._walk(comp, f"components[{idx}]", failures, warnings, skip_desc=True)
+            self._walk(comp, f"components[{idx}]", failures, warnings, skip_desc=True, **scan)
         # links
         for idx, link in enumerate(ir_data.get("links", [])):
-            self._walk(link, f"links[{idx}]", failures, warnings, skip_desc=False)
+            self._walk(link, f"links[{idx}]", failures, warnings, skip_desc=False, **scan)
         # schemas / policies if present
         if "schemas" in ir_data:
-            self._walk(ir_data.get("schemas"), "schemas", failures, warnings, skip_desc=False)
+            self._walk(ir_data.get("schemas"), "schemas", failures, warnings, skip_desc=False, **scan)
         if "policies" in ir_data:
-            self._walk(ir_data.get("policies"), "policies", failures, warnings, skip_desc=False)
+            self._walk(ir_data.get("policies"), "policies", failures, warnings, skip_desc=False, **scan)
 
         if failures:
             return {
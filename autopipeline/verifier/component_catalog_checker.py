@@ -1,53 +1,61 @@
 """Component catalog checker - ensures IR component types and interface usage are from catalog"""
 
-from typing import Dict, Any, Set, List
-from pathlib import Path
+from typing import Dict, Any, Iterable, Set, List, Optional
 
 from autopipeline.catalog.profile_loader import ProfileLoader
-from autopipeline.catalog.catalog_utils import load_catalog_types
 from autopipeline.eval.error_codes import ErrorCode, failure
+from autopipeline.verifier.ir_graph import IRGraph
 import yaml
 import os
 import re
 
 
+def type_variants(name: str) -> Set[str]:
+    """Spelling variants used to match alias targets against catalog type names."""
+    variants = set()
+    lower = name.lower()
+    variants.add(lower)
+    variants.add(lower.replace("_", ""))
+    variants.add(lower.replace("-", ""))
+    # camel to snake-ish
+    s = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+    variants.add(s)
+    variants.add(s.replace("_", ""))
+    return variants
+
+
+def build_variant_index(types: Iterable[str]) -> Dict[str, Set[str]]:
+    """Map every spelling variant to the catalog types that produce it."""
+    index: Dict[str, Set[str]] = {}
+    for t in types:
+        for var in type_variants(t):
+            index.setdefault(var, set()).add(t)
+    return index
+
+
 class ComponentCatalogChecker:
     def __init__(self, base_dir: str, strict: bool = False):
         self.loader = ProfileLoader(base_dir)
         self.types: Set[str] = self.loader.list_types()
         self.strict = strict
         alias_path = os.path.join(base_dir, "catalog", "type_aliases.yaml")
-        if os.path.exists(alias_path):
+        if self.loader.snapshot is not None:
+            self.aliases = dict(self.loader.snapshot.aliases)
+        elif os.path.exists(alias_path):
             self.aliases = yaml.safe_load(open(alias_path, "r", encoding="utf-8")) or {}
         else:
             self.aliases = {}
-        # Normalize alias targets to valid catalog types
-        valid_types = load_catalog_types(Path(base_dir) / "catalog" / "components" / "index.yaml")
+        # Normalize alias targets to valid catalog types via a precomputed variant index
+        self.variant_index = build_variant_index(self.types)
         self.alias_warnings: List[str] = []
 
-        def _variants(name: str):
-            variants = set()
-            lower = name.lower()
-            variants.add(lower)
-            variants.add(lower.replace("_", ""))
-            variants.add(lower.replace("-", ""))
-            # camel to snake-ish
-            s = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
-            variants.add(s)
-            variants.add(s.replace("_", ""))
-            return variants
-
         fixed_aliases = {}
         for k, v in self.aliases.items():
             target = v
-            if target in valid_types:
+            if target in self.types:
                 fixed_aliases[k] = target
                 continue
-            candidates = []
-            target_variants = _variants(target)
-            for vt in valid_types:
-                if _variants(vt) & target_variants:
-                    candidates.append(vt)
+            candidates = sorted(set().union(*(self.variant_index.get(var, ()) for var in type_variants(target))))
             if len(candidates) == 1:
                 fixed_aliases[k] = candidates[0]
                 if candidates[0] != target:
@@ -57,9 +65,11 @@ class ComponentCatalogChecker:
                 self.alias_warnings.append(f"alias target not resolved: {target} (candidates={candidates})")
         self.aliases = fixed_aliases
 
-    def check_ir(self, ir_data: Dict[str, Any]):
+    def check_ir(self, ir_data: Dict[str, Any], graph: Optional[IRGraph] = None):
         """Returns structured result with failures/warnings."""
-        components = ir_data.get("components", ir_data.get("entities", []))
+        graph = IRGraph.ensure(graph, ir_data)
+        # Types are read from the raw dicts: alias normalization below rewrites them in place
+        components = [node.raw for node in graph.nodes]
         failures: List = []
         warnings: List[str] = []
         metrics: Dict[str, Any] = {}
@@ -94,7 +104,7 @@ class ComponentCatalogChecker:
             else:
                 warnings.append(f"{msg} (open mode: treated as warning)")
 
-        comp_map = {c.get("id"): c for c in components}
+        comp_map = {cid: node.raw for cid, node in graph.components.items()}
 
         for comp in components:
             cid = comp.get("id")
@@ -115,23 +125,12 @@ class ComponentCatalogChecker:
             if not any(k in comp for k in ["uses", "inputs", "outputs", "ports"]):
                 warnings.append(f"component {cid} has no explicit ports; skipping port validation")
 
-        for link in ir_data.get("links", []):
-            from_id = link.get("from")
-            to_id = link.get("to")
-            from_port = link.get("from_port") or (link.get("from") if isinstance(link.get("from"), dict) else None)
-            to_port = link.get("to_port") or (link.get("to") if isinstance(link.get("to"), dict) else None)
-            if isinstance(link.get("from"), dict):
-                from_port = link["from"].get("port")
-                from_id = link["from"].get("component") or link["from"].get("id")
-            if isinstance(link.get("to"), dict):
-                to_port = link["to"].get("port")
-                to_id = link["to"].get("component") or link["to"].get("id")
-
-            if not from_port or not to_port:
-                warnings.append(f"link {link.get('id')} missing explicit ports; skipping port validation")
+        for edge in graph.edges:
+            if not edge.source.port or not edge.target.port:
+                warnings.append(f"link {edge.id} missing explicit ports; skipping port validation")
                 continue
 
-            for cid, port in [(from_id, from_port), (to_id, to_port)]:
+            for cid, port in [(edge.source.component, edge.source.port), (edge.target.component, edge.target.port)]:
                 comp = comp_map.get(cid, {})
                 ctype = comp.get("type")
                 if ctype not in self.types:
@@ -139,10 +138,10 @@ class ComponentCatalogChecker:
                 interfaces = self.loader.get_interfaces(ctype)
                 if port not in interfaces["all_interfaces"]:
                     failures.append(failure(ErrorCode.E_CATALOG_COMPONENT, "ir", "ComponentCatalogChecker",
-                                            f"link {link.get('id')}: port '{port}' not in profile of component {cid} ({ctype})",
-                                            {"component": cid, "port": port, "type": ctype, "link": link.get("id")}))
+                                            f"link {edge.id}: port '{port}' not in profile of component {cid} ({ctype})",
+                                            {"component": cid, "port": port, "type": ctype, "link": edge.id}))
 
-        for pol in ir_data.get("policies", []):
+        for pol in graph.policies:
             actions = pol.get("actions", [])
             for act in actions:
                 target = act.get("target") or act.get("component")
@@ -1,17 +1,19 @@
 """Coverage checker - ensures all IR links are mapped in bindings"""
 
-from typing import Dict, Any, Set
+from typing import Dict, Any, Set, Optional
 
 from autopipeline.eval.error_codes import ErrorCode, failure
+from autopipeline.verifier.ir_graph import IRGraph
 
 
 class CoverageChecker:
     """Check that all IR links are covered in bindings"""
 
-    def check_coverage(self, ir_data: Dict[str, Any], bindings_data: Dict[str, Any], gate_mode: str = "core"):
+    def check_coverage(self, ir_data: Dict[str, Any], bindings_data: Dict[str, Any], gate_mode: str = "core",
+                       graph: Optional[IRGraph] = None):
         """Check if all IR links are mapped in bindings"""
 
-        ir_links: Set[str] = {link['id'] for link in ir_data.get('links', [])}
+        ir_links: Set[str] = set(IRGraph.ensure(graph, ir_data).link_ids)
 
         bindings_links: Set[str] = set()
         for transport in bindings_data.get('transports', []):
@@ -1,11 +1,14 @@
 """Cross-artifact consistency checker between IR and Bindings."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from autopipeline.eval.error_codes import ErrorCode, failure
+from autopipeline.verifier.ir_graph import IRGraph
 
 
 class CrossArtifactChecker:
-    def check(self, ir_data: Dict[str, Any], bindings_data: Dict[str, Any]) -> Dict[str, Any]:
+    def check(self, ir_data: Dict[str, Any], bindings_data: Dict[str, Any],
+              graph: Optional[IRGraph] = None) -> Dict[str, Any]:
+        graph = IRGraph.ensure(graph, ir_data)
         failures: List[Dict[str, Any]] = []
         warnings: List[str] = []
 
@@ -20,7 +23,7 @@ class CrossArtifactChecker:
                                     {"ir_version": ir_data.get("version"), "bindings_version": bindings_data.get("version")}).to_dict())
 
         # components referenced in bindings exist in IR
-        ir_components = {c.get("id") for c in ir_data.get("components", ir_data.get("entities", []))}
+        ir_components = graph.component_ids
         for cb in bindings_data.get("component_bindings", []):
             comp = cb.get("component") or cb.get("component_id")
             if comp and comp not in ir_components:
@@ -37,7 +40,7 @@ class CrossArtifactChecker:
                                         {"component": comp}).to_dict())
 
         # endpoints link_id exist in IR
-        ir_links = {l.get("id") for l in ir_data.get("links", [])}
+        ir_links = graph.link_ids
         for ep in bindings_data.get("endpoints", []):
             lid = ep.get("link_id")
             if lid and lid not in ir_links:
@@ -9,27 +9,36 @@ from autopipeline.eval.error_codes import ErrorCode, failure
 class GenerationConsistencyChecker:
     """Check manifest/main.py/docker-compose traceability against bindings hash"""
 
-    def __init__(self, bindings_hash: str, output_dir: str):
+    def __init__(self, bindings_hash: str, output_dir: str, run=None):
         self.bindings_hash = bindings_hash
         self.output_dir = output_dir
+        # Optional run view (autopipeline.run_archive) for packed runs; plain files otherwise
+        self.run = run
+
+    def _exists(self, name: str) -> bool:
+        if self.run is not None:
+            return self.run.exists(name)
+        return os.path.exists(os.path.join(self.output_dir, name))
+
+    def _read(self, name: str) -> str:
+        if self.run is not None:
+            return self.run.read_text(name)
+        with open(os.path.join(self.output_dir, name), 'r', encoding='utf-8') as f:
+            return f.read()
 
     def check(self):
         failures = []
-        manifest_path = os.path.join(self.output_dir, "generated_code", "manifest.json")
-        compose_path = os.path.join(self.output_dir, "docker-compose.yml")
-        main_paths = [
-            os.path.join(self.output_dir, "generated_code", layer, "main.py")
-            for layer in ("cloud", "edge", "device")
-        ]
+        manifest_name = "generated_code/manifest.json"
+        compose_name = "docker-compose.yml"
+        main_names = [f"generated_code/{layer}/main.py" for layer in ("cloud", "edge", "device")]
 
-        if not os.path.exists(manifest_path):
+        if not self._exists(manifest_name):
             failures.append(failure(ErrorCode.E_UNKNOWN, "codegen", "GenerationConsistencyChecker",
                                     "Manifest file missing"))
             return {"pass": False, "failures": failures, "warnings": [], "metrics": {}}
 
         try:
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                manifest = json.load(f)
+            manifest = json.loads(self._read(manifest_name))
         except Exception as e:
             failures.append(failure(ErrorCode.E_UNKNOWN, "codegen", "GenerationConsistencyChecker",
                                     f"Failed to read manifest: {str(e)}"))
@@ -42,25 +51,20 @@ class GenerationConsistencyChecker:
                                      "expected": self.bindings_hash}))
 
         main_has_hash = False
-        for path in main_paths:
-            if not os.path.exists(path):
+        for name in main_names:
+            if not self._exists(name):
                 continue
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if self.bindings_hash in content:
-                    main_has_hash = True
+            if self.bindings_hash in self._read(name):
+                main_has_hash = True
         if not main_has_hash:
             failures.append(failure(ErrorCode.E_UNKNOWN, "codegen", "GenerationConsistencyChecker",
                                     "bindings_hash not found in any main.py"))
 
-        if not os.path.exists(compose_path):
+        if not self._exists(compose_name):
             failures.append(failure(ErrorCode.E_RUNTIME_COMPOSE_CONFIG, "deploy", "GenerationConsistencyChecker",
                                     "docker-compose.yml missing"))
-        else:
-            with open(compose_path, 'r', encoding='utf-8') as f:
-                compose_content = f.read()
-                if self.bindings_hash not in compose_content:
-                    failures.append(failure(ErrorCode.E_RUNTIME_COMPOSE_CONFIG, "deploy", "GenerationConsistencyChecker",
-                                            "bindings_hash not found in docker-compose.yml"))
+        elif self.bindings_hash not in self._read(compose_name):
+            failures.append(failure(ErrorCode.E_RUNTIME_COMPOSE_CONFIG, "deploy", "GenerationConsistencyChecker",
+                                    "bindings_hash not found in docker-compose.yml"))
 
         return {"pass": len(failures) == 0, "failures": failures, "warnings": [], "metrics": {}}
@@ -0,0 +1,245 @@
+"""Immutable, indexed view of an IR artifact shared by checkers.
+
+Build it once per IR version with ``IRGraph.from_ir(ir_data)`` and pass it to the
+checkers instead of letting each one re-derive component/link sets from the raw dict.
+"""
+
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+PORT_FIELDS = ("uses", "inputs", "outputs", "ports")
+
+
+class _Frozen:
+    """Slots base that rejects attribute assignment after construction."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _init(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+
+class PortRef(_Frozen):
+    """Normalized link end: component id plus optional port name."""
+
+    __slots__ = ("component", "port")
+
+    def __init__(self, component: Optional[str], port: Optional[str] = None):
+        self._init(component=component, port=port)
+
+    @classmethod
+    def from_link(cls, link: Dict[str, Any], side: str) -> "PortRef":
+        """Accept `from: id`, `from: {component|id|name, port}`, `source`, `from_component` and `from_port`."""
+        alt = {"from": ("source", "from_component"), "to": ("target", "to_component")}[side]
+        value = link.get(side)
+        if value is None:
+            value = link.get(alt[0]) or link.get(alt[1])
+        port = link.get(f"{side}_port")
+        if isinstance(value, dict):
+            port = value.get("port") or port
+            value = value.get("component") or value.get("id") or value.get("name")
+        return cls(str(value) if value is not None else None, port)
+
+    def __eq__(self, other):
+        return isinstance(other, PortRef) and (self.component, self.port) == (other.component, other.port)
+
+    def __hash__(self):
+        return hash((self.component, self.port))
+
+    def __repr__(self):
+        return f"PortRef({self.component!r}, {self.port!r})"
+
+
+class ComponentNode(_Frozen):
+    """IR component with its declared ports grouped by field."""
+
+    __slots__ = ("id", "type", "capabilities", "ports", "raw")
+
+    def __init__(self, raw: Dict[str, Any]):
+        ports = {f: tuple(raw.get(f) or []) for f in PORT_FIELDS if f in raw}
+        self._init(
+            id=raw.get("id") or raw.get("name"),
+            type=raw.get("type"),
+            capabilities=tuple(raw.get("capabilities") or []),
+            ports=MappingProxyType(ports),
+            raw=raw,
+        )
+
+    def __repr__(self):
+        return f"ComponentNode({self.id!r}, {self.type!r})"
+
+
+class LinkEdge(_Frozen):
+    """IR link with normalized source/target port references."""
+
+    __slots__ = ("id", "source", "target", "raw")
+
+    def __init__(self, raw: Dict[str, Any]):
+        self._init(id=raw.get("id"), source=PortRef.from_link(raw, "from"),
+                   target=PortRef.from_link(raw, "to"), raw=raw)
+
+    def __repr__(self):
+        return f"LinkEdge({self.id!r}, {self.source.component!r} -> {self.target.component!r})"
+
+
+class IRGraph(_Frozen):
+    """Component/link indexes, adjacency lists and graph queries over one IR."""
+
+    __slots__ = ("nodes", "edges", "components", "links", "component_ids", "link_ids",
+                 "app_name", "version", "policies", "_out", "_in", "_memo")
+
+    def __init__(self, nodes: Iterable[ComponentNode], edges: Iterable[LinkEdge],
+                 app_name: Optional[str] = None, version: Optional[str] = None,
+                 policies: Iterable[Dict[str, Any]] = ()):
+        nodes = tuple(nodes)
+        edges = tuple(edges)
+        out_adj: Dict[str, List[LinkEdge]] = {}
+        in_adj: Dict[str, List[LinkEdge]] = {}
+        for edge in edges:
+            out_adj.setdefault(edge.source.component, []).append(edge)
+            in_adj.setdefault(edge.target.component, []).append(edge)
+        self._init(
+            nodes=nodes,
+            edges=edges,
+            components=MappingProxyType({n.id: n for n in nodes}),
+            links=MappingProxyType({e.id: e for e in edges}),
+            component_ids=frozenset(n.id for n in nodes),
+            link_ids=frozenset(e.id for e in edges),
+            app_name=app_name,
+            version=version,
+            policies=tuple(p for p in policies if isinstance(p, dict)),
+            _out=MappingProxyType({k: tuple(v) for k, v in out_adj.items()}),
+            _in=MappingProxyType({k: tuple(v) for k, v in in_adj.items()}),
+            _memo={},
+        )
+
+    @classmethod
+    def from_ir(cls, ir_data: Dict[str, Any]) -> "IRGraph":
+        ir_data = ir_data or {}
+        comps = ir_data.get("components", ir_data.get("entities", [])) or []
+        links = ir_data.get("links", []) or []
+        return cls(
+            (ComponentNode(c) for c in comps if isinstance(c, dict)),
+            (LinkEdge(l) for l in links if isinstance(l, dict)),
+            app_name=ir_data.get("app_name"),
+            version=ir_data.get("version"),
+            policies=ir_data.get("policies", []) or [],
+        )
+
+    @classmethod
+    def ensure(cls, graph: Optional["IRGraph"], ir_data: Dict[str, Any]) -> "IRGraph":
+        """Return `graph` if given, else build one (for callers without a shared graph)."""
+        return graph if graph is not None else cls.from_ir(ir_data)
+
+    # --- adjacency -----------------------------------------------------
+
+    def out_links(self, component_id: str) -> Tuple[LinkEdge, ...]:
+        return self._out.get(component_id, ())
+
+    def in_links(self, component_id: str) -> Tuple[LinkEdge, ...]:
+        return self._in.get(component_id, ())
+
+    def fan_in(self, component_id: str) -> int:
+        return len(self.in_links(component_id))
+
+    def fan_out(self, component_id: str) -> int:
+        return len(self.out_links(component_id))
+
+    def successors(self, component_id: str) -> Tuple[str, ...]:
+        return tuple(e.target.component for e in self.out_links(component_id))
+
+    def predecessors(self, component_id: str) -> Tuple[str, ...]:
+        return tuple(e.source.component for e in self.in_links(component_id))
+
+    # --- derived sets (memoized) ---------------------------------------
+
+    def _cached(self, key: str, fn):
+        if key not in self._memo:
+            self._memo[key] = fn()
+        return self._memo[key]
+
+    @property
+    def linked_component_ids(self) -> FrozenSet[str]:
+        """Component ids referenced by at least one link end."""
+        return self._cached("linked", lambda: frozenset(
+            ref.component for e in self.edges for ref in (e.source, e.target) if ref.component))
+
+    @property
+    def dangling_refs(self) -> Tuple[Tuple[str, str], ...]:
+        """(link_id, component_id) pairs whose component is not declared."""
+        return self._cached("dangling", lambda: tuple(
+            (e.id, ref.component) for e in self.edges for ref in (e.source, e.target)
+            if ref.component and ref.component not in self.component_ids))
+
+    def isolated_components(self) -> Tuple[str, ...]:
+        linked = self.linked_component_ids
+        return tuple(n.id for n in self.nodes if n.id not in linked)
+
+    # --- graph queries (O(V+E)) ----------------------------------------
+
+    def reachable_from(self, component_id: str) -> FrozenSet[str]:
+        """All components reachable from `component_id` following link direction."""
+        key = f"reach:{component_id}"
+        if key in self._memo:
+            return self._memo[key]
+        seen = {component_id}
+        queue = deque([component_id])
+        while queue:
+            cur = queue.popleft()
+            for nxt in self.successors(cur):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        seen.discard(component_id)
+        result = frozenset(seen)
+        self._memo[key] = result
+        return result
+
+    def find_cycle(self) -> Optional[Tuple[str, ...]]:
+        """Return one directed cycle as a component path, or None if the graph is acyclic."""
+        return self._cached("cycle", self._find_cycle)
+
+    def has_cycle(self) -> bool:
+        return self.find_cycle() is not None
+
+    def _find_cycle(self) -> Optional[Tuple[str, ...]]:
+        white, grey, black = 0, 1, 2
+        color: Dict[str, int] = {}
+        vertices = list(dict.fromkeys([n.id for n in self.nodes] + list(self._out.keys())))
+        for root in vertices:
+            if color.get(root, white) != white:
+                continue
+            path = [root]
+            color[root] = grey
+            stack = [iter(self.successors(root))]
+            while stack:
+                nxt = next(stack[-1], None)
+                if nxt is None:
+                    stack.pop()
+                    color[path.pop()] = black
+                    continue
+                state = color.get(nxt, white)
+                if state == grey:
+                    return tuple(path[path.index(nxt):]) + (nxt,)
+                if state == white:
+                    color[nxt] = grey
+                    path.append(nxt)
+                    stack.append(iter(self.successors(nxt)))
+        return None
+
+    def summary(self) -> Mapping[str, Any]:
+        return {
+            "components": len(self.nodes),
+            "links": len(self.edges),
+            "isolated_components": len(self.isolated_components()),
+            "dangling_refs": len(self.dangling_refs),
+            "has_cycle": self.has_cycle(),
+        }
@@ -7,5 +7,5 @@ class IRInterfaceChecker:
     def __init__(self, catalog_checker: ComponentCatalogChecker):
         self.catalog_checker = catalog_checker
 
-    def check(self, ir_data):
-        return self.catalog_checker.check_ir(ir_data)
+    def check(self, ir_data, graph=None):
+        return self.catalog_checker.check_ir(ir_data, graph=graph)
@@ -1,6 +1,7 @@
 """Schema validation for plan/IR/Bindings/UserProblem/DeviceInfo with structured failures."""
 
 import json
+import re
 import jsonschema
 from pathlib import Path
 from typing import Dict, Any, List
@@ -8,6 +9,21 @@ from typing import Dict, Any, List
 from autopipeline.eval.error_codes import ErrorCode, FailureRecord, failure
 
 
+def _error_details(e: jsonschema.ValidationError) -> Dict[str, Any]:
+    """Location plus the violated keyword, so repairs can act on each error locally."""
+    details: Dict[str, Any] = {"path": list(e.path), "validator": e.validator}
+    if e.validator == "required" and isinstance(e.instance, dict):
+        details["missing"] = [f for f in e.validator_value if f not in e.instance]
+    elif e.validator in ("type", "enum", "minItems"):
+        details["expected"] = e.validator_value
+    elif e.validator == "additionalProperties" and isinstance(e.instance, dict):
+        known = set((e.schema.get("properties") or {}).keys())
+        patterns = list((e.schema.get("patternProperties") or {}).keys())
+        details["unexpected"] = sorted(k for k in e.instance
+                                       if k not in known and not any(re.search(p, k) for p in patterns))
+    return details
+
+
 class SchemaChecker:
     """Validate data against JSON schemas and required fields."""
 
@@ -31,6 +47,27 @@ class SchemaChecker:
         self.ir_required_fields = ir_required_fields
         self.bindings_required_fields = bindings_required_fields
         self.plan_required_fields = plan_required_fields
+        self._validators: Dict[int, Any] = {}
+
+    def _validator(self, schema: Dict[str, Any]):
+        validator = self._validators.get(id(schema))
+        if validator is None:
+            cls = jsonschema.validators.validator_for(schema)
+            cls.check_schema(schema)
+            validator = self._validators[id(schema)] = cls(schema)
+        return validator
+
+    def _schema_failures(self, instance: Any, schema: Dict[str, Any], code: str, stage: str,
+                         name: str) -> List[FailureRecord]:
+        """All schema errors at once; the best match (what jsonschema.validate raises) comes first."""
+        errors = list(self._validator(schema).iter_errors(instance))
+        if not errors:
+            return []
+        best = jsonschema.exceptions.best_match(errors)
+        rest = sorted((e for e in errors if e is not best), key=lambda e: [str(p) for p in e.path])
+        return [failure(code, stage, "SchemaChecker", f"{name} schema validation failed: {e.message}",
+                        _error_details(e))
+                for e in [best] + rest]
 
     def _result(self, ok: bool, failures: List[FailureRecord], warnings: List[str] = None):
         return {
@@ -53,13 +90,11 @@ class SchemaChecker:
         failures: List[FailureRecord] = []
         warnings: List[str] = []
         try:
-            jsonschema.validate(instance=plan_data, schema=self.plan_schema)
-            failures.extend(self._check_required_fields(plan_data, self.plan_required_fields, "Plan",
-                                                        ErrorCode.E_SCHEMA_UP, "plan", "SchemaChecker"))
-        except jsonschema.ValidationError as e:
-            failures.append(failure(ErrorCode.E_SCHEMA_UP, "plan", "SchemaChecker",
-                                    f"Plan schema validation failed: {e.message}",
-                                    {"path": list(e.path)}))
+            schema_failures = self._schema_failures(plan_data, self.plan_schema, ErrorCode.E_SCHEMA_UP, "plan", "Plan")
+            failures.extend(schema_failures)
+            if not schema_failures:
+                failures.extend(self._check_required_fields(plan_data, self.plan_required_fields, "Plan",
+                                                            ErrorCode.E_SCHEMA_UP, "plan", "SchemaChecker"))
         except Exception as e:
             failures.append(failure(ErrorCode.E_SCHEMA_UP, "plan", "SchemaChecker",
                                     f"Plan schema validation error: {str(e)}"))
@@ -69,13 +104,11 @@ class SchemaChecker:
         """Validate IR against schema"""
         failures: List[FailureRecord] = []
         try:
-            jsonschema.validate(instance=ir_data, schema=self.ir_schema)
-            failures.extend(self._check_required_fields(ir_data, self.ir_required_fields, "IR",
-                                                        ErrorCode.E_SCHEMA_IR, "ir", "SchemaChecker"))
-        except jsonschema.ValidationError as e:
-            failures.append(failure(ErrorCode.E_SCHEMA_IR, "ir", "SchemaChecker",
-                                    f"IR schema validation failed: {e.message}",
-                                    {"path": list(e.path)}))
+            schema_failures = self._schema_failures(ir_data, self.ir_schema, ErrorCode.E_SCHEMA_IR, "ir", "IR")
+            failures.extend(schema_failures)
+            if not schema_failures:
+                failures.extend(self._check_required_fields(ir_data, self.ir_required_fields, "IR",
+                                                            ErrorCode.E_SCHEMA_IR, "ir", "SchemaChecker"))
         except Exception as e:
             failures.append(failure(ErrorCode.E_SCHEMA_IR, "ir", "SchemaChecker",
                                     f"IR schema validation error: {str(e)}"))
@@ -86,13 +119,11 @@ class SchemaChecker:
         failures: List[FailureRecord] = []
         try:
             schema = self.bindings_schema_core if str(gate_mode).lower() == "core" else self.bindings_schema_full
-            jsonschema.validate(instance=bindings_data, schema=schema)
-            failures.extend(self._check_required_fields(bindings_data, self.bindings_required_fields, "Bindings",
-                                                        ErrorCode.E_SCHEMA_BIND, "bindings", "SchemaChecker"))
-        except jsonschema.ValidationError as e:
-            failures.append(failure(ErrorCode.E_SCHEMA_BIND, "bindings", "SchemaChecker",
-                                    f"Bindings schema validation failed: {e.message}",
-                                    {"path": list(e.path)}))
+            schema_failures = self._schema_failures(bindings_data, schema, ErrorCode.E_SCHEMA_BIND, "bindings", "Bindings")
+            failures.extend(schema_failures)
+            if not schema_failures:
+                failures.extend(self._check_required_fields(bindings_data, self.bindings_required_fields, "Bindings",
+                                                            ErrorCode.E_SCHEMA_BIND, "bindings", "SchemaChecker"))
         except Exception as e:
             failures.append(failure(ErrorCode.E_SCHEMA_BIND, "bindings", "SchemaChecker",
                                     f"Bindings schema validation error: {str(e)}"))
@@ -102,11 +133,9 @@ class SchemaChecker:
         """Validate Placement plan against schema"""
         failures: List[FailureRecord] = []
         try:
-            jsonschema.validate(instance=placement_data, schema=self.placement_schema)
-        except jsonschema.ValidationError as e:
-            failures.append(failure(ErrorCode.E_SCHEMA_PLACE, "placement", "SchemaChecker",
-                                    f"Placement schema validation failed: {e.message}",
-                                    {"path": list(e.path)}))
+            schema_failures = self._schema_failures(placement_data, self.placement_schema, ErrorCode.E_SCHEMA_PLACE,
+                                                    "placement", "Placement")
+            failures.extend(schema_failures)
         except Exception as e:
             failures.append(failure(ErrorCode.E_SCHEMA_PLACE, "placement", "SchemaChecker",
                                     f"Placement schema validation error: {str(e)}"))
@@ -116,14 +145,13 @@ class SchemaChecker:
         failures: List[FailureRecord] = []
         warnings: List[str] = []
         try:
-            jsonschema.validate(instance=user_problem, schema=self.user_problem_schema)
-            missing_soft = [fld for fld in ["id", "title", "target"] if fld not in user_problem]
-            if missing_soft:
-                warnings.append(f"UserProblem soft-missing fields: {', '.join(missing_soft)}")
-        except jsonschema.ValidationError as e:
-            failures.append(failure(ErrorCode.E_SCHEMA_UP, "inputs", "SchemaChecker",
-                                    f"UserProblem schema validation failed: {e.message}",
-                                    {"path": list(e.path)}))
+            schema_failures = self._schema_failures(user_problem, self.user_problem_schema, ErrorCode.E_SCHEMA_UP,
+                                                    "inputs", "UserProblem")
+            failures.extend(schema_failures)
+            if not schema_failures:
+                missing_soft = [fld for fld in ["id", "title", "target"] if fld not in user_problem]
+                if missing_soft:
+                    warnings.append(f"UserProblem soft-missing fields: {', '.join(missing_soft)}")
         except Exception as e:
             failures.append(failure(ErrorCode.E_SCHEMA_UP, "inputs", "SchemaChecker",
                                     f"UserProblem schema validation error: {str(e)}"))
@@ -132,11 +160,9 @@ class SchemaChecker:
     def validate_device_info(self, device_info: Dict[str, Any]):
         failures: List[FailureRecord] = []
         try:
-            jsonschema.validate(instance=device_info, schema=self.device_info_schema)
-        except jsonschema.ValidationError as e:
-            failures.append(failure(ErrorCode.E_SCHEMA_DI, "inputs", "SchemaChecker",
-                                    f"DeviceInfo schema validation failed: {e.message}",
-                                    {"path": list(e.path)}))
+            schema_failures = self._schema_failures(device_info, self.device_info_schema, ErrorCode.E_SCHEMA_DI,
+                                                    "inputs", "DeviceInfo")
+            failures.extend(schema_failures)
         except Exception as e:
             failures.append(failure(ErrorCode.E_SCHEMA_DI, "inputs", "SchemaChecker",
                                     f"DeviceInfo schema validation error: {str(e)}"))
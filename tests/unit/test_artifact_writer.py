@@ -0,0 +1,46 @@
+import gzip
+
+from autopipeline.artifact_writer import ArtifactWriter, read_artifact_text
+
+
+def test_background_writes_are_readable_before_and_after_the_barrier(tmp_path):
+    writer = ArtifactWriter(compress_debug=True)
+    run = tmp_path / "run"
+    writer.write_yaml(run / "bindings_raw.yaml", {"placements": [1]}, debug=True)
+    writer.write_yaml(run / "bindings_raw.yaml", {"placements": [2]}, debug=True)
+    plan = {"app_name": "a"}
+    writer.write_json(run / "plan.json", plan)
+    plan["app_name"] = "mutated after submit"
+
+    # Latest submission wins, whether or not the writer thread got to it yet
+    assert writer.read_text(str(run / "bindings_raw.yaml")) == "placements:\n- 2\n"
+    assert writer.flush(fsync=True) == []
+    writer.close()
+
+    assert (run / "plan.json").read_text(encoding="utf-8") == '{\n  "app_name": "a"\n}'
+    assert not (run / "bindings_raw.yaml").exists()
+    with gzip.open(run / "bindings_raw.yaml.gz", "rt", encoding="utf-8") as f:
+        assert f.read() == "placements:\n- 2\n"
+    assert read_artifact_text(str(run / "bindings_raw.yaml")) == "placements:\n- 2\n"
+    assert (writer.stats["files"], writer.stats["compressed"], writer.stats["dirs_created"]) == (3, 2, 1)
+    assert writer.stats["fsynced"] == 2
+
+
+def test_write_errors_are_reported_at_the_barrier(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("x", encoding="utf-8")
+    writer = ArtifactWriter(background=False)
+    writer.write_text(str(blocker / "child.txt"), "y")
+    errors = writer.flush(fsync=True)
+    assert len(errors) == 1 and "child.txt" in errors[0]
+    assert read_artifact_text(str(tmp_path / "missing.txt")) is None
+
+
+def test_unencodable_text_is_reported_and_later_writes_still_land(tmp_path):
+    writer = ArtifactWriter()
+    writer.write_text(str(tmp_path / "bad.txt"), "bad \ud800")
+    writer.write_text(str(tmp_path / "good.txt"), "ok")
+    errors = writer.flush()
+    writer.close()
+    assert len(errors) == 1 and "bad.txt" in errors[0]
+    assert (tmp_path / "good.txt").read_text(encoding="utf-8") == "ok"
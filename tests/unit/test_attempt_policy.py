@@ -0,0 +1,44 @@
+from autopipeline.repair.attempt_policy import AttemptLedger, AttemptPolicy
+
+
+def _eval(history, model="m1", tier="P0", stage="bindings"):
+    return {"llm": {"model": model}, "pipeline": {"config": {"prompt_tier": tier},
+                                                  "stages": {stage: {"attempt_history": history}}}}
+
+
+def _attempt(n, strategy, code, ms=100):
+    return {"attempt": n, "strategy": strategy, "error_code": code, "duration_ms": ms, "llm_calls": 1}
+
+
+def test_policy_stops_hopeless_codes_and_reorders_strategies():
+    ledger = AttemptLedger()
+    for _ in range(3):
+        # E_COVERAGE never recovers; E_SCHEMA_BIND recovers via regenerate but not json_patch
+        ledger.add_eval(_eval([_attempt(1, "generate", "E_COVERAGE"), _attempt(2, "regenerate", "E_COVERAGE"),
+                               _attempt(3, "regenerate", "E_COVERAGE")]))
+        ledger.add_eval(_eval([_attempt(1, "generate", "E_SCHEMA_BIND"), _attempt(2, "json_patch", "E_SCHEMA_BIND"),
+                               _attempt(3, "regenerate", None)]))
+    ledger = AttemptLedger(ledger.to_dict())
+
+    policy = AttemptPolicy(ledger, "m1", "P0")
+    assert policy.budget("bindings") == 3
+    assert policy.should_retry("bindings", 2, "E_COVERAGE") == (False, "no_recovery_E_COVERAGE_in_6")
+    assert policy.should_retry("bindings", 2, "E_SCHEMA_BIND") == (True, "")
+    assert policy.strategy_order("bindings", "E_SCHEMA_BIND", ["json_patch", "regenerate"]) == \
+        ["regenerate", "json_patch"]
+    assert policy.savings("bindings", 2) == {"saved_calls_est": 2.0, "saved_ms_est": 200.0}
+
+    # Other models/tiers and the IR stage have no history: fixed defaults
+    other = AttemptPolicy(ledger, "m2", "P0")
+    assert other.budget("bindings") == 3 and other.should_retry("bindings", 2, "E_COVERAGE")[0]
+    assert other.strategy_order("bindings", "E_SCHEMA_BIND", ["json_patch", "regenerate"]) == \
+        ["json_patch", "regenerate"]
+
+
+def test_budget_shrinks_to_latest_recovering_attempt():
+    ledger = AttemptLedger()
+    for _ in range(3):
+        ledger.add_eval(_eval([_attempt(1, "generate", "E_SCHEMA_IR"), _attempt(2, "full_repair", None)], stage="ir"))
+    policy = AttemptPolicy(ledger, "m1", "P0")
+    assert policy.budget("ir") == 2
+    assert policy.should_retry("ir", 3, "E_BOUNDARY") == (False, "budget_2")
@@ -0,0 +1,35 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from autopipeline.bench.analytics import bootstrap_ci, distributions, load_frame, weekly_report  # noqa: E402
+
+
+def _rows():
+    rows = []
+    for i in range(40):
+        tier, repair = ("P0", True) if i % 2 else ("P1", False)
+        passed = i % 4 != 0 if tier == "P0" else i % 4 == 0
+        rows.append({"case_id": "C1" if i < 20 else "C2", "prompt_tier": tier, "repair_enabled": repair,
+                     "status_static": "PASS" if passed else "FAIL", "attempts_total": 1 + i % 3,
+                     "provider": "mock", "model": "m1", "temperature": 0.0,
+                     "error_codes": {} if passed else {"E_SCHEMA_BIND": 1, "E_COVERAGE": i % 2}})
+    return rows
+
+
+def test_weekly_report_groups_runs_and_bounds_pass_rates():
+    df = load_frame(_rows())
+    report = weekly_report(df, n_boot=500)
+    by_tier = report["by_tier_repair"]
+    assert list(by_tier.index) == [("P0", "on"), ("P1", "off")]
+    assert by_tier["runs"].tolist() == [20, 20] and by_tier["pass_rate"].tolist() == [1.0, 0.5]
+    assert (by_tier["pass_rate_ci_low"] <= by_tier["pass_rate"]).all()
+    assert (by_tier["pass_rate_ci_high"] >= by_tier["pass_rate"]).all()
+    assert report["by_case"]["runs"].sum() == 40 and report["by_model"]["runs"].tolist() == [40]
+    assert report["errors"].to_dict() == {"E_SCHEMA_BIND": 10}
+    assert sorted(distributions(df, "attempts_total", ["prompt_tier", "repair_flag"])) == [("P0", "on"), ("P1", "off")]
+
+
+def test_bootstrap_interval_narrows_with_more_runs():
+    low, high = bootstrap_ci([5, 500], [10, 1000], n_boot=2000)
+    assert low[0] < 0.5 < high[0] and high[1] - low[1] < high[0] - low[0]
@@ -0,0 +1,40 @@
+from autopipeline.bench.aggregate import aggregate_runs
+from autopipeline.bench.dataset import read_dataset, write_partition
+from autopipeline.eval.eval_schema import write_eval
+
+
+def _eval(case_id, status, provider):
+    return {
+        "case_id": case_id,
+        "overall_status": status,
+        "failures_flat": [] if status == "PASS" else [{"code": "E_SCHEMA_BIND", "message": "missing 'to'"}],
+        "pipeline": {"stages": {"ir": {"attempts": 1, "duration_ms": 3}, "bindings": {"attempts": 2, "duration_ms": 7}},
+                     "config": {"run_id": f"run={case_id}", "enable_repair": True, "temperature": 0.2}},
+        "llm": {"provider": provider, "model": "m1", "calls_total": 3},
+        "catalog_hashes": {"components": "abc"},
+    }
+
+
+def test_bench_rows_land_typed_and_partitioned_and_filter_with_pruning(tmp_path):
+    paths = []
+    for case_id, status, provider in (("C1", "PASS", "openai"), ("C2", "FAIL", "mock")):
+        write_eval(_eval(case_id, status, provider), str(tmp_path / case_id))
+        paths.append(tmp_path / case_id / "eval.json")
+    dataset = tmp_path / "dataset"
+    aggregate_runs(paths, tmp_path / "weekly", dataset_root=dataset, tag="weekly")
+    aggregate_runs(paths[:1], tmp_path / "smoke", dataset_root=dataset, tag="smoke")
+
+    rows = read_dataset(dataset, filters=[("tag", "==", "weekly")])
+    assert [r["case_id"] for r in rows] == ["C1", "C2"] and {r["tag"] for r in rows} == {"weekly"}
+    failed = rows[1]
+    assert failed["attempts_by_stage"] == {"ir": 1, "bindings": 2} and failed["error_codes"] == {"E_SCHEMA_BIND": 1}
+    assert failed["catalog_hashes"] == {"components": "abc"} and failed["repair_enabled"] is True
+    assert failed["attempts_total"] == 3 and failed["temperature"] == 0.2
+
+    real = read_dataset(dataset, filters=[("provider", "!=", "mock"), ("pass", "==", "1")], columns=["eval_path", "tag"])
+    assert sorted(r["tag"] for r in real) == ["smoke", "weekly"] and set(real[0]) == {"eval_path", "tag"}
+    assert read_dataset(dataset, filters=[("date", "<", "2000-01-01")]) == []
+
+    # Rewriting a partition replaces it
+    write_partition([], dataset, "smoke", date=rows[0]["date"])
+    assert read_dataset(dataset, filters=[("tag", "==", "smoke")]) == []
@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+
+from autopipeline.__main__ import cli
+from autopipeline.bench.synthetic import build_case, generate_case, scaling_rows, write_scaling
+from autopipeline.eval.eval_schema import write_eval
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def test_synthetic_case_is_consistent_at_the_requested_size():
+    case = build_case(str(REPO), 100, seed=1)
+    ir, bindings, devices = case["ir"], case["bindings"], case["device_info"]["devices"]
+    ids = {c["id"] for c in ir["components"]}
+    assert len(ids) == len(ir["components"]) == 100
+    assert all(link["from"] in ids and link["to"] in ids for link in ir["links"])
+    assert {p["component_id"] for p in bindings["placements"]} == ids
+    assert {t["link_id"] for t in bindings["transports"]} == {link["id"] for link in ir["links"]}
+    addresses = {ep["address"] for d in devices for ep in d["interfaces"]["endpoints"]}
+    assert all(e["from_endpoint"] in addresses and e["to_endpoint"] in addresses for e in bindings["endpoints"])
+    # Same seed, same case
+    assert build_case(str(REPO), 100, seed=1) == case
+
+
+def test_faulty_case_keeps_valid_repair_outputs_and_scaling_reads_its_runs(tmp_path):
+    cid = generate_case(str(REPO), 10, "M08_CROSS_ARTIFACT_BAD_REF", cases_dir=tmp_path)
+    assert cid == "SYN-10-M08"
+    mock = tmp_path / cid / "mock"
+    broken = yaml.safe_load((mock / "bindings.yaml").read_text(encoding="utf-8"))
+    repaired = yaml.safe_load((mock / "repair_bindings.yaml").read_text(encoding="utf-8"))
+    assert broken["component_bindings"][0]["component"] == "nonexistent_component"
+    assert repaired["component_bindings"][0]["component"] != "nonexistent_component"
+    meta = json.loads((tmp_path / cid / "synthetic.json").read_text(encoding="utf-8"))
+    assert meta["components"] == 10 and meta["fault"] == "M08_CROSS_ARTIFACT_BAD_REF"
+
+    stages = {"ir": {"attempts": 1, "duration_ms": 4}, "bindings": {"attempts": 2, "duration_ms": 9}}
+    write_eval({"case_id": cid, "overall_status": "PASS", "pipeline": {"stages": stages}}, str(tmp_path / "run"))
+    write_eval({"case_id": "DEMO", "overall_status": "PASS", "pipeline": {"stages": stages}}, str(tmp_path / "demo"))
+    rows = scaling_rows([tmp_path / "run" / "eval.json", tmp_path / "demo" / "eval.json"], cases_dir=tmp_path)
+    assert len(rows) == 1
+    assert rows[0]["size"] == 10 and rows[0]["bindings_ms"] == 9 and rows[0]["total_duration_ms"] == 13
+    assert write_scaling(rows, tmp_path / "out").read_text(encoding="utf-8").startswith("case_id,size,fault")
+
+
+def test_synthetic_bench_rejects_a_cases_dir_the_runner_does_not_read(tmp_path):
+    result = CliRunner().invoke(cli, ["bench", "--cases-dir", str(tmp_path / "syncases"), "--synthetic", "10",
+                                      "--out-root", str(tmp_path / "out"), "--no-plots"])
+    assert result.exit_code == 2 and "--cases-dir" in result.output
+    assert not (tmp_path / "syncases").exists() and not (tmp_path / "out").exists()
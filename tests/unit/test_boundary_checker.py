@@ -0,0 +1,16 @@
+from autopipeline.verifier.boundary_checker import BoundaryChecker
+
+
+def test_split_scans_match_full_check():
+    checker = BoundaryChecker(["mqtt", "docker"], [r"\b\d{1,3}(\.\d{1,3}){3}\b"])
+    ir = {
+        "components": [{"id": "a", "type": "Sensor", "notes": "talks mqtt", "description": "docker inside"}],
+        "links": [{"id": "l1", "from": "a", "to": "b", "contract": {"host": "10.0.0.1", "via": "docker"}}],
+    }
+    full = checker.check_ir(ir)
+    blocking = checker.check_ir(ir, keywords=False)
+    keywords = checker.check_ir(ir, patterns=False)
+
+    assert [f.message for f in blocking["failures"]] == [f.message for f in full["failures"]]
+    assert not blocking["warnings"] and not keywords["failures"] and keywords["pass"]
+    assert sorted(keywords["warnings"]) == sorted(full["warnings"]) and len(full["warnings"]) == 2
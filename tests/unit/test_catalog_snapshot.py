@@ -0,0 +1,48 @@
+import shutil
+from pathlib import Path
+
+import yaml
+
+from autopipeline.catalog.profile_loader import ProfileLoader
+from autopipeline.catalog.render import catalog_hashes
+from autopipeline.catalog.snapshot import compile_snapshot, load_snapshot
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def _catalog(tmp_path):
+    shutil.copytree(REPO / "catalog", tmp_path / "catalog", ignore=shutil.ignore_patterns(".compiled"))
+    return str(tmp_path)
+
+
+def test_compiled_snapshot_round_trips_hashes_and_profiles(tmp_path):
+    base = _catalog(tmp_path)
+    assert load_snapshot(base) is None
+    compile_snapshot(base)
+    snapshot = load_snapshot(base)
+    assert snapshot is not None and snapshot.hashes == catalog_hashes(base, use_snapshot=False)
+    profile_path = tmp_path / snapshot.profile_paths["TemperatureSensor"]
+    assert snapshot.profiles._decoded == {}
+    assert snapshot.profiles["TemperatureSensor"] == yaml.safe_load(profile_path.read_text(encoding="utf-8"))
+    assert list(snapshot.profiles._decoded) == ["TemperatureSensor"]
+    assert ProfileLoader(base).snapshot is snapshot
+
+
+def test_edited_profile_makes_the_snapshot_stale(tmp_path):
+    base = _catalog(tmp_path)
+    compile_snapshot(base)
+    path = tmp_path / load_snapshot(base).profile_paths["Light"]
+    profile = yaml.safe_load(path.read_text(encoding="utf-8"))
+    profile["kind"] = "edited"
+    path.write_text(yaml.safe_dump(profile), encoding="utf-8")
+
+    assert load_snapshot(base) is None
+    loader = ProfileLoader(base)
+    assert loader.snapshot is None and loader.get_profile("Light")["kind"] == "edited"
+
+
+def test_env_var_disables_the_snapshot(tmp_path, monkeypatch):
+    base = _catalog(tmp_path)
+    compile_snapshot(base)
+    monkeypatch.setenv("AUTOPIPELINE_NO_CATALOG_SNAPSHOT", "1")
+    assert load_snapshot(base) is None and ProfileLoader(base).snapshot is None
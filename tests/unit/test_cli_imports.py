@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+from autopipeline import __main__ as cli
+from autopipeline.llm import providers
+from autopipeline.repair.attempt_policy import LEDGER_FILE
+from autopipeline.run_logging import CONSOLE_LEVELS
+
+LAZY = ("autopipeline.runner", "autopipeline.llm.providers", "autopipeline.bench.aggregate", "jsonschema",
+        "matplotlib", "anthropic")
+
+
+def test_cli_definition_imports_no_pipeline_modules():
+    code = ("import sys, autopipeline.__main__; "
+            "print('\\n'.join(m for m in sys.modules if m.startswith(%r)))" % (LAZY,))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.split() == []
+    assert cli.CONSOLE_LEVELS == CONSOLE_LEVELS and cli.LEDGER_FILE == LEDGER_FILE
+
+
+def test_providers_resolve_by_name():
+    assert providers.get_provider_class("Mock").__name__ == "MockProvider"
+    assert providers.ReplayProvider is providers.get_provider_class("replay")
+    try:
+        providers.get_provider_class("nope")
+    except ValueError as e:
+        assert "Unsupported provider: nope" in str(e)
+    else:
+        raise AssertionError("unknown provider resolved")
@@ -0,0 +1,52 @@
+import os
+
+from autopipeline.agents.codegen import CodeGenAgent
+
+
+def _inputs():
+    ir = {
+        "components": [{"id": "s1", "type": "TemperatureSensor", "capabilities": ["sense"]},
+                       {"id": "c1", "type": "CloudService", "capabilities": ["store"]}],
+        "links": [{"id": "l1", "from": "s1", "to": "c1"}],
+    }
+    bindings = {
+        "placements": [{"component_id": "s1", "layer": "device"}, {"component_id": "c1", "layer": "cloud"}],
+        "endpoints": [{"link_id": "l1", "from_endpoint": "mqtt://b/s1", "to_endpoint": "mqtt://b/c1"}],
+        "transports": [{"link_id": "l1", "protocol": "MQTT"}],
+        "component_bindings": [{"component": "s1"}, {"component": "c1"}],
+    }
+    return ir, bindings
+
+
+def test_unchanged_layers_are_skipped(tmp_path):
+    ir, bindings = _inputs()
+    agent = CodeGenAgent()
+    first = agent.generate_code(bindings, ir, str(tmp_path), "h1", "CASE")
+    assert sorted(first["regenerated_layers"]) == ["cloud", "device"]
+    compile(open(first["generated_files"]["device"], encoding="utf-8").read(), "main.py", "exec")
+    mtime = os.stat(first["generated_files"]["cloud"]).st_mtime_ns
+
+    second = agent.generate_code(bindings, ir, str(tmp_path), "h1", "CASE")
+    assert second["skipped_layers"] == ["cloud", "device"]
+    assert second["layer_hashes"] == first["layer_hashes"]
+    assert os.stat(second["generated_files"]["cloud"]).st_mtime_ns == mtime
+
+    ir["components"][0]["capabilities"] = ["sense", "filter"]
+    third = agent.generate_code(bindings, ir, str(tmp_path), "h1", "CASE")
+    assert third["regenerated_layers"] == ["device"]
+    assert third["skipped_layers"] == ["cloud"]
+
+
+def _tree(root):
+    return {os.path.relpath(os.path.join(d, f), root): open(os.path.join(d, f), encoding="utf-8").read()
+            for d, _, files in os.walk(root) for f in files}
+
+
+def test_concurrent_generation_matches_sequential(tmp_path):
+    ir, bindings = _inputs()
+    bindings["placements"].append({"component_id": "c1", "layer": "edge"})
+    sequential = CodeGenAgent(max_workers=1).generate_code(bindings, ir, str(tmp_path / "seq"), "h1", "CASE")
+    concurrent = CodeGenAgent().generate_code(bindings, ir, str(tmp_path / "par"), "h1", "CASE")
+    assert sorted(concurrent["layer_timings_ms"]) == ["cloud", "device", "edge"]
+    assert concurrent["layer_hashes"] == sequential["layer_hashes"]
+    assert _tree(tmp_path / "par") == _tree(tmp_path / "seq")
@@ -0,0 +1,48 @@
+import shutil
+from pathlib import Path
+
+import yaml
+
+from autopipeline.catalog.profile_loader import ProfileLoader
+from autopipeline.verifier.component_catalog_checker import ComponentCatalogChecker
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def _checker(tmp_path, aliases, strict=False):
+    shutil.copytree(REPO / "catalog", tmp_path / "catalog", ignore=shutil.ignore_patterns(".compiled"))
+    (tmp_path / "catalog" / "type_aliases.yaml").write_text(yaml.safe_dump(aliases), encoding="utf-8")
+    return ComponentCatalogChecker(str(tmp_path), strict=strict)
+
+
+def _ir(*types):
+    return {"components": [{"id": f"c{i}", "type": t} for i, t in enumerate(types)], "links": []}
+
+
+def test_alias_targets_are_resolved_against_catalog_types(tmp_path):
+    checker = _checker(tmp_path, {"processor": "RuleEngine", "tracker": "state_tracker", "ghost": "NoSuchType"})
+    # Exact and spelling-variant targets resolve; unknown targets are kept and reported
+    assert checker.aliases == {"processor": "RuleEngine", "tracker": "StateTracker", "ghost": "NoSuchType"}
+    assert "alias target fixed: state_tracker -> StateTracker" in checker.alias_warnings
+    assert any(w.startswith("alias target not resolved: NoSuchType") for w in checker.alias_warnings)
+
+    ir = _ir("processor", "Tracker")
+    result = checker.check_ir(ir)
+    assert result["pass"] is True
+    assert [c["type"] for c in ir["components"]] == ["RuleEngine", "StateTracker"]
+    assert "normalized component c0 type processor -> RuleEngine" in result["warnings"]
+
+
+def test_alias_to_unknown_type_fails_in_strict_mode(tmp_path):
+    checker = _checker(tmp_path, {"ghost": "NoSuchType"}, strict=True)
+    result = checker.check_ir(_ir("ghost"))
+    assert result["pass"] is False
+    assert result["failures"][0].code == "E_CATALOG_COMPONENT"
+    assert result["metrics"]["unknown_types"] == [{"id": "c0", "type": "NoSuchType"}]
+
+
+def test_interfaces_are_computed_once_per_type():
+    loader = ProfileLoader(str(REPO))
+    first = loader.get_interfaces("Aggregator")
+    assert "aggregated_metrics" in first["provided_events"] and isinstance(first["all_interfaces"], frozenset)
+    assert loader.get_interfaces("Aggregator") is first
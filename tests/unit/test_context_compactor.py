@@ -0,0 +1,34 @@
+import yaml
+
+from autopipeline.llm.context_compactor import compact_context, estimate_tokens, filter_device_endpoints
+
+DEVICE_INFO = {"devices": [
+    {"id": "temp_sensor_01", "type": "sensor", "interfaces": {"endpoints": [
+        {"id": "ep_temp_pub", "type": "mqtt_pub", "topic": "sensors/temperature"},
+        {"id": "ep_debug", "type": "http", "address": "http://dev/diag"},
+    ]}},
+    {"id": "gw", "type": "gateway", "interfaces": {"endpoints": [
+        {"id": "ep_a", "type": "http", "address": "http://gw/a"},
+    ]}},
+]}
+IR = {"components": [{"id": "temperature_collector", "type": "TemperatureSensor"}],
+      "links": [{"id": "l1", "data_type": "reading"}]}
+
+
+def test_filter_keeps_devices_and_drops_unrelated_endpoints():
+    filtered, dropped = filter_device_endpoints(DEVICE_INFO, IR)
+    assert dropped == 1
+    assert [e["id"] for e in filtered["devices"][0]["interfaces"]["endpoints"]] == ["ep_temp_pub"]
+    # no evidence for the gateway: all of its endpoints stay
+    assert filtered["devices"][1] == DEVICE_INFO["devices"][1]
+
+
+def test_compact_context_is_single_encoded_and_smaller():
+    ir_yaml = yaml.safe_dump(IR, sort_keys=False)
+    text, report = compact_context({"IR_YAML": ir_yaml, "DEVICE_INFO": DEVICE_INFO}, "c1", ir_data=IR)
+    assert yaml.safe_load(text) == {"IR_YAML": IR, "DEVICE_INFO": filter_device_endpoints(DEVICE_INFO, IR)[0],
+                                    "case_id": "c1"}
+    legacy = yaml.safe_dump({"IR_YAML": ir_yaml, "DEVICE_INFO": yaml.safe_dump(DEVICE_INFO, sort_keys=False),
+                             "case_id": "c1"}, sort_keys=False)
+    assert estimate_tokens(text) < estimate_tokens(legacy)
+    assert set(report["sections"]) == {"IR_YAML", "DEVICE_INFO"} and report["endpoints_dropped"] == 1
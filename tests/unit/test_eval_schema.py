@@ -0,0 +1,54 @@
+import json
+
+from autopipeline.bench.aggregate import aggregate_runs
+from autopipeline.eval.eval_schema import SUMMARY_FILE, compact_eval, load_eval, write_eval
+
+FAILURE = {"code": "E_SCHEMA_BIND", "stage": "bindings", "checker": "SchemaChecker", "message": "missing 'to'"}
+
+
+def _eval():
+    validators = {
+        "bindings_schema": {"pass": False, "failures": [FAILURE], "warnings": [], "metrics": {}, "status": "FAIL",
+                            "skipped": False},
+        "coverage": {"pass": True, "failures": [], "warnings": [], "metrics": {}, "status": "PASS", "skipped": False},
+    }
+    history = [{"attempt": 1, "strategy": "generate", "error_code": "E_SCHEMA_BIND"},
+               {"attempt": 2, "strategy": "repair", "error_code": "E_SCHEMA_BIND"}]
+    return {
+        "case_id": "C1",
+        "overall_status": "FAIL",
+        "checks": {"bindings_schema": {"status": "FAIL", "message": "missing 'to'"},
+                   "coverage": {"status": "PASS", "message": "OK"},
+                   "runtime_compose": {"status": "PASS", "message": "OK"}},
+        "validators": validators,
+        "failures_flat": [FAILURE],
+        "pipeline": {"stages": {"bindings": {"attempts": 2, "duration_ms": 7, "attempt_history": history}},
+                     "config": {"provider": "mock", "model": None, "prompt_tier": "P1", "run_id": "run=1"}},
+        "llm": {"provider": "mock", "model": None, "calls_total": 2},
+        "error": {"code": "E_SCHEMA_BIND"},
+    }
+
+
+def test_compact_eval_round_trips_and_stores_failures_once(tmp_path):
+    full = _eval()
+    path = write_eval(full, str(tmp_path), compact=True)
+    stored = json.loads(open(path, encoding="utf-8").read())
+    assert stored["schema_version"] == 2 and stored["failures"] == [FAILURE] and stored["failures_flat"] == [0]
+    assert "checks" not in stored and "provider" not in stored["pipeline"]["config"]
+    assert load_eval(path) == full
+    assert compact_eval(full)["validators"]["bindings_schema"]["failures"] == [0]
+
+
+def test_aggregation_reads_summary_records_and_falls_back_to_old_evals(tmp_path):
+    new_run = tmp_path / "C1" / "run=1"
+    write_eval(_eval(), str(new_run), compact=True)
+    old_run = tmp_path / "C1" / "run=2"
+    write_eval(_eval(), str(old_run))
+    (old_run / SUMMARY_FILE).unlink()
+
+    aggregate_runs([new_run / "eval.json", old_run / "eval.json"], tmp_path / "agg")
+    rows = (tmp_path / "agg" / "summary.csv").read_text(encoding="utf-8").splitlines()
+    assert len(rows) == 3 and rows[1].split(",")[1:] == rows[2].split(",")[1:]
+    assert "E_SCHEMA_BIND,4" in (tmp_path / "agg" / "summary_by_error.csv").read_text(encoding="utf-8")
+    ledger = json.loads((tmp_path / "agg" / "attempt_ledger.json").read_text(encoding="utf-8"))
+    assert ledger["runs"] == 2 and "mock-model|P1|bindings|E_SCHEMA_BIND" in ledger["codes"]
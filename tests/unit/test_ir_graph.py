@@ -0,0 +1,36 @@
+import pytest
+
+from autopipeline.verifier.ir_graph import IRGraph, PortRef
+
+
+def _graph():
+    return IRGraph.from_ir({
+        "components": [{"id": "s1", "type": "Sensor"}, {"id": "gw", "type": "Gateway"},
+                       {"id": "db", "type": "Store"}, {"id": "idle", "type": "Store"}],
+        "links": [
+            {"id": "l1", "from": "s1", "to": "gw"},
+            {"id": "l2", "from": {"component": "gw", "port": "out"}, "to": "db", "to_port": "in"},
+            {"id": "l3", "from": "db", "to": "ghost"},
+        ],
+    })
+
+
+def test_indexes_and_normalized_ports():
+    g = _graph()
+    assert g.component_ids == {"s1", "gw", "db", "idle"}
+    assert g.links["l2"].source == PortRef("gw", "out")
+    assert g.links["l2"].target == PortRef("db", "in")
+    assert g.fan_in("gw") == 1 and g.fan_out("gw") == 1
+    assert g.isolated_components() == ("idle",)
+    assert g.dangling_refs == (("l3", "ghost"),)
+
+
+def test_graph_queries_and_immutability():
+    g = _graph()
+    assert g.reachable_from("s1") == {"gw", "db", "ghost"}
+    assert not g.has_cycle()
+    cyclic = IRGraph.from_ir({"components": [{"id": "a"}, {"id": "b"}],
+                              "links": [{"id": "x", "from": "a", "to": "b"}, {"id": "y", "from": "b", "to": "a"}]})
+    assert cyclic.find_cycle() == ("a", "b", "a")
+    with pytest.raises(AttributeError):
+        g.components = {}
@@ -0,0 +1,68 @@
+import pytest
+import yaml
+
+from autopipeline.repair.context_pack import build_bindings_repair_context, build_patch_context
+from autopipeline.repair.json_patch import JsonPatchError, apply_patch, failing_subtrees, schema_slice, to_pointer
+
+SCHEMA = {
+    "type": "object",
+    "required": ["components"],
+    "properties": {"components": {"type": "array", "items": {"$ref": "#/definitions/comp"}}},
+    "definitions": {"comp": {"type": "object", "required": ["id", "type"],
+                             "properties": {"id": {"type": "string"}, "type": {"type": "string"}}}},
+}
+
+
+def test_pointer_normalization():
+    assert to_pointer(["components", 1, "type"]) == "/components/1/type"
+    assert to_pointer("components[1].a/b") == "/components/1/a~1b"
+    assert to_pointer([]) == ""
+
+
+def test_apply_patch_is_atomic_and_rfc6902():
+    doc = {"components": [{"id": "a"}], "links": []}
+    out = apply_patch(doc, [
+        {"op": "add", "path": "/components/0/type", "value": "Sensor"},
+        {"op": "add", "path": "/links/-", "value": {"id": "l1"}},
+        {"op": "copy", "from": "/components/0", "path": "/components/-"},
+        {"op": "replace", "path": "/components/1/id", "value": "b"},
+        {"op": "test", "path": "/components/0/id", "value": "a"},
+    ])
+    assert out == {"components": [{"id": "a", "type": "Sensor"}, {"id": "b", "type": "Sensor"}],
+                   "links": [{"id": "l1"}]}
+    assert doc == {"components": [{"id": "a"}], "links": []}
+    with pytest.raises(JsonPatchError):
+        apply_patch(doc, [{"op": "replace", "path": "/components/0/missing", "value": 1}])
+
+
+def test_patch_context_scales_with_errors_not_artifact_size():
+    doc = {"components": [{"id": f"c{i}", "type": "T"} for i in range(500)]}
+    del doc["components"][7]["type"]
+    failures = [{"code": "E_SCHEMA_IR", "message": "'type' is a required property",
+                 "details": {"path": ["components", 7]}},
+                {"code": "E_CATALOG_COMPONENT", "message": "unknown type", "details": {}}]
+    ctx = build_patch_context(doc, failures, SCHEMA)
+    assert ctx["subtrees"] == {"/components/7": {"value": {"id": "c7"}, "summarized": False}}
+    assert ctx["schema_slice"]["/components/7"]["required"] == ["id", "type"]
+    assert ctx["unaddressed"] == 1
+    # root-level errors get a summarized view, explicitly marked
+    root = failing_subtrees(doc, [""])[""]
+    assert root["summarized"] and root["value"] == {"components": "<list len=500>"}
+    assert schema_slice(SCHEMA, "")["properties"] == {"components": "array"}
+
+
+def test_full_mode_repair_context_bounds_the_previous_bindings(tmp_path):
+    bindings = {"transports": [{"link_id": f"link_{i:05d}", "protocol": "MQTT"} for i in range(2000)]}
+    text = yaml.safe_dump(bindings, sort_keys=False)
+    (tmp_path / "bindings.yaml").write_text(text, encoding="utf-8")
+
+    ctx = build_bindings_repair_context(str(tmp_path), [], max_chars=1000)
+    bounded = ctx["previous_bindings_text"]
+    assert ctx["previous_bindings_chars"] == len(text) and ctx["previous_bindings_truncated"]
+    # Cut at a line boundary: the kept prefix is the draft's own first lines and still parses
+    head = bounded.rsplit("# ... truncated", 1)[0]
+    assert len(head) <= 1000 and text.startswith(head) and head.endswith("\n")
+    assert yaml.safe_load(bounded)["transports"][0] == bindings["transports"][0]
+
+    unbounded = build_bindings_repair_context(str(tmp_path), [], max_chars=None)
+    assert unbounded["previous_bindings_text"] == text and not unbounded["previous_bindings_truncated"]
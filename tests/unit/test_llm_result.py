@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from autopipeline.agents.bindings import BindingsAgent
+from autopipeline.llm.decode import LLMOutputFormatError
+from autopipeline.llm.llm_client import LLMClient
+from autopipeline.llm.providers.mock_provider import MockProvider
+from autopipeline.llm.types import LLMConfig
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def _client(tmp_path, files):
+    mock_dir = tmp_path / "cases" / "X" / "mock"
+    mock_dir.mkdir(parents=True)
+    for name, text in files.items():
+        (mock_dir / name).write_text(text, encoding="utf-8")
+    client = LLMClient(str(REPO), LLMConfig(provider="mock", cache_enabled=False), logger=lambda _: None,
+                       output_root=str(tmp_path / "out"))
+    client._get_provider = lambda: MockProvider(str(tmp_path))
+    return client
+
+
+def test_client_decodes_once_and_agents_reuse_the_parse(tmp_path):
+    client = _client(tmp_path, {"bindings.yaml": "```yaml\nplacements: []\ntransports: []\n```\n"})
+    rules_ctx = {"rules_hash": "r", "case_id": "X"}
+
+    result = client.generate_bindings("X", "app_name: a\n", {"devices": []}, rules_ctx, {})
+    assert result.parse_error is None and result.parsed == {"placements": [], "transports": []}
+    # One raw dump per call, with the text as received
+    raw_dir = tmp_path / "out" / "X" / "llm_raw"
+    assert sorted(p.name for p in raw_dir.iterdir()) == ["generate_bindings_attempt1.json",
+                                                         "generate_bindings_attempt1.txt"]
+    assert Path(result.raw_path).read_text(encoding="utf-8").startswith("```yaml")
+
+    agent = BindingsAgent(client)
+    assert agent.generate_bindings({"app_name": "a"}, {"devices": []}, rules_ctx, {}, attempt=2) == result.parsed
+    assert len(list(raw_dir.iterdir())) == 4
+
+
+def test_parse_failure_is_carried_not_raised_until_used(tmp_path):
+    client = _client(tmp_path, {"bindings.yaml": "placements: [unclosed\n"})
+    result = client.generate_bindings("X", "app_name: a\n", {"devices": []}, {"rules_hash": "r"}, {})
+    assert result.parsed is None and isinstance(result.parse_error, LLMOutputFormatError)
+    assert result.parse_error.raw_path == result.raw_path and Path(result.raw_path).exists()
+    with pytest.raises(LLMOutputFormatError):
+        result.value()
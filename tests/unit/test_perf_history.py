@@ -0,0 +1,31 @@
+from autopipeline.bench.perf.history import append_history, baseline, compare, current_env, load_history
+from autopipeline.bench.perf.suite import import_targets, summarize
+
+
+def _entry(median_ms, env=None):
+    return {"env": env or current_env(), "results": {"init:LLMClient": {"median_ms": median_ms}}}
+
+
+def test_baseline_is_median_of_recent_same_env_entries_and_flags_regressions(tmp_path):
+    path = tmp_path / "perf_history.json"
+    for median_ms in (500.0, 40.0, 50.0, 60.0):
+        append_history(path, _entry(median_ms), keep=3)
+    append_history(path, _entry(1.0, env={"python": "0.0", "platform": "other", "machine": "x"}))
+    history = load_history(path)
+    assert len(history) == 4
+    assert baseline(history, window=5) == {"init:LLMClient": 50.0}
+
+    rows = compare({"init:LLMClient": {"median_ms": 70.0}, "run:NEW": {"median_ms": 1.0}},
+                   {"init:LLMClient": 50.0}, threshold=0.25, min_delta_ms=5.0)
+    assert [(r["name"], r["status"]) for r in rows] == [("init:LLMClient", "regression"), ("run:NEW", "new")]
+    # Within the relative threshold, or under the noise floor: not a regression
+    assert compare({"a": {"median_ms": 60.0}}, {"a": 50.0}, threshold=0.25)[0]["status"] == "ok"
+    assert compare({"a": {"median_ms": 4.0}}, {"a": 1.0}, threshold=0.25, min_delta_ms=5.0)[0]["status"] == "ok"
+    assert compare({"a": {"median_ms": 30.0}}, {"a": 50.0}, threshold=0.25)[0]["status"] == "improved"
+
+
+def test_suite_targets_and_summary():
+    targets = import_targets()
+    assert targets[0] == "autopipeline" and "autopipeline.llm" in targets and targets[-1] == "autopipeline.runner"
+    assert summarize([3.0, 1.0, 2.0]) == {"samples": 3, "first_ms": 3.0, "min_ms": 1.0, "median_ms": 2.0,
+                                          "mean_ms": 2.0, "max_ms": 3.0}
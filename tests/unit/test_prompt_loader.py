@@ -0,0 +1,45 @@
+import yaml
+
+from autopipeline.llm.hash_utils import text_hash
+from autopipeline.llm.prompt_loader import PromptLoader
+
+
+def _legacy_render(template, context, injections):
+    for key, val in injections.items():
+        template = template.replace(f"{{{{{key}}}}}", val)
+    return f"{template}\n\n# Context\n" + yaml.safe_dump(context, sort_keys=False, allow_unicode=True)
+
+
+def test_compiled_render_matches_sequential_replace(tmp_path):
+    (tmp_path / "P0").mkdir()
+    template = "Types: {{CATALOG_TYPES}}\nProblem: {{USER_PROBLEM}}\n{{CATALOG_TYPES}} again {{ not a slot }}"
+    (tmp_path / "P0" / "gen.txt").write_text(template, encoding="utf-8")
+    injections = {"CATALOG_TYPES": "A, B", "RULES_FORBIDDEN": "none"}
+    context = {"USER_PROBLEM": "x: 1\n", "case_id": "c1"}
+
+    loader = PromptLoader(tmp_path, tier="P1", injections=injections)
+    out = loader.render("gen", context)
+    expected = _legacy_render(template, context, injections)
+    assert out["rendered"] == expected
+    assert out["template_hash"] == text_hash(template)
+    assert out["rendered_hash"] == text_hash(expected)
+    assert loader.render("gen", dict(context)) == out
+    assert loader.render("gen", context, injections={"CATALOG_TYPES": "C"})["rendered"] == \
+        _legacy_render(template, context, {"CATALOG_TYPES": "C"})
+
+
+def test_prefix_stable_layout_hoists_injections_into_shared_prefix(tmp_path):
+    (tmp_path / "P1").mkdir()
+    (tmp_path / "P1" / "a.txt").write_text("Agent A\n{{RULES_FORBIDDEN}}\n{{CATALOG_TYPES}}\n{{IR}}", encoding="utf-8")
+    (tmp_path / "P1" / "b.txt").write_text("Agent B\n{{CATALOG_TYPES}}\n{{RULES_FORBIDDEN}}", encoding="utf-8")
+    injections = {"CATALOG_TYPES": "types: X", "RULES_FORBIDDEN": "no secrets", "SCHEMA_REQUIRED_FIELDS": "unused"}
+    loader = PromptLoader(tmp_path, tier="P1", injections=injections, layout="prefix_stable")
+
+    a = loader.render("a", {"case_id": "c1"})
+    b = loader.render("b", {"case_id": "c2"})
+    assert a["segments"][0]["text"] == b["segments"][0]["text"]
+    assert a["segments"][0]["text"].index("types: X") < a["segments"][0]["text"].index("no secrets")
+    assert "unused" not in a["rendered"] and "{{IR}}" in a["rendered"]
+    assert [s["cache"] for s in a["segments"]] == [True, True, False]
+    assert "".join(s["text"] for s in a["segments"]) == a["rendered"]
+    assert a["rendered"].endswith("# Context\n" + yaml.safe_dump({"case_id": "c1"}))
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from autopipeline.llm.providers.replay_provider import ReplayProvider
+from autopipeline.llm.replay import ReplayMiss, build_bundle, load_bundle, warm_cache
+from autopipeline.llm.telemetry import CALLS_FILE
+
+
+def _run(tmp_path, name, calls=None, raw_paths=None):
+    run = tmp_path / name
+    raw = run / "C1" / "llm_raw"
+    raw.mkdir(parents=True)
+    (raw / "generate_ir_attempt1.txt").write_text(f"ir: {name}\n", encoding="utf-8")
+    (raw / "repair_ir_attempt2.txt").write_text(f"ir: {name}-fixed\n", encoding="utf-8")
+    llm = {"provider": "mock", "model": None, "raw_paths": raw_paths or {}}
+    (run / "eval.json").write_text(json.dumps({"case_id": "C1", "llm": llm}), encoding="utf-8")
+    if calls:
+        (run / CALLS_FILE).write_text("".join(json.dumps(c) + "\n" for c in calls), encoding="utf-8")
+    return run
+
+
+def test_bundle_replays_by_key_then_by_position(tmp_path):
+    calls = [{"case_id": "C1", "stage": "generate_ir", "attempt": 1, "candidate": 0, "provider": "mock",
+              "model": "mock-model", "cache_key": "k1", "error": None},
+             {"case_id": "C1", "stage": "repair_ir", "attempt": 2, "candidate": 0, "provider": "mock",
+              "model": "mock-model", "cache_key": "k2", "error": None}]
+    new = _run(tmp_path, "new", calls=calls)
+    # Pre-telemetry run: raw dumps only, replayable by position
+    old = _run(tmp_path, "old", raw_paths={"generate_bindings": [str(tmp_path / "old" / "C1" / "llm_raw" /
+                                                                     "generate_ir_attempt1.txt")]})
+    bundle = tmp_path / "b.jsonl.gz"
+    header = build_bundle([str(new), str(old)], bundle)
+    assert (header["runs"], header["entries"], header["keyed_entries"], header["providers"]) == (2, 3, 2, ["mock"])
+
+    provider = ReplayProvider(str(bundle))
+    assert provider.key_name == "mock"
+    assert provider.call(case_id="C1", stage="repair_ir", cache_key="k2")["text"] == "ir: new-fixed\n"
+    # Prompt drifted (unknown key): first recorded generate_ir call of the case
+    assert provider.call(case_id="C1", stage="generate_ir", cache_key="zz")["text"] == "ir: new\n"
+    assert provider.call(case_id="C1", stage="generate_bindings")["text"] == "ir: old\n"
+    assert provider.stats == {"by_key": 1, "by_position": 2, "misses": 0}
+    with pytest.raises(ReplayMiss):
+        ReplayProvider(str(bundle), strict=True).call(case_id="C1", stage="generate_ir", cache_key="zz")
+
+    assert warm_cache(bundle, str(tmp_path / "cache")) == {"written": 2, "skipped": 1}
+    assert json.loads((tmp_path / "cache" / "k1.json").read_text(encoding="utf-8"))["response_text"] == "ir: new\n"
+    assert len(load_bundle(bundle)[1]) == 3
@@ -0,0 +1,80 @@
+from copy import deepcopy
+
+from autopipeline.repair.deterministic_patch import apply_deterministic_patch
+from autopipeline.repair.rule_engine import RuleEngine
+from autopipeline.repair.strategy_router import choose_strategy
+from autopipeline.verifier.schema_checker import SchemaChecker
+
+IR = {
+    "app_name": "demo",
+    "version": "1.0",
+    "components": [{"id": "sensor"}, {"id": "proc"}],
+    "links": [{"id": "l1", "from": "sensor", "to": "proc"}],
+}
+PLACEMENT = {
+    "nodes": [{"node_id": "dev1", "class": "device"}, {"node_id": "gw1", "class": "edge"}],
+    "component_placements": [{"component_id": "sensor", "target_node_id": "dev1"},
+                             {"component_id": "proc", "target_node_id": "gw1"}],
+    "link_placements": [{"link_id": "l1", "transport_hint": "mqtt"}],
+}
+DEVICE_INFO = {"devices": [
+    {"id": "dev1", "layer": "device", "interfaces": {"endpoints": [
+        {"id": "ep_pub", "direction": "publish", "address": "mqtt://b/pub"}]}},
+    {"id": "gw1", "layer": "edge", "interfaces": {"endpoints": [
+        {"id": "ep_sub", "direction": "subscribe", "address": "mqtt://b/sub"}]}},
+]}
+
+
+def test_all_schema_errors_fixed_in_one_pass():
+    checker = SchemaChecker([], [], [])
+    bindings = {
+        "placements": [{"component": "sensor"}, {"component_id": "proc", "layer": "edge"}],
+        "transports": {"link": "l1"},
+        "endpoints": [{"link_id": "l1", "from_endpoint": 7}],
+        "component_bindings": [{"component": "sensor"}],
+    }
+    res = checker.validate_bindings(bindings, gate_mode="full")
+    assert len(res["failures"]) >= 4
+    assert all(f.details.get("validator") for f in res["failures"])
+
+    engine = RuleEngine(IR, PLACEMENT, DEVICE_INFO)
+    patched, actions, unresolved = engine.apply(bindings, res["failures"], checker.bindings_schema_full)
+    assert not unresolved and actions
+    # a type fix can surface nested errors; a second pass resolves them
+    res = checker.validate_bindings(patched, gate_mode="full")
+    patched, _, unresolved = engine.apply(patched, res["failures"], checker.bindings_schema_full)
+    assert not unresolved
+    assert checker.validate_bindings(patched, gate_mode="full")["pass"]
+    assert patched["placements"][0] == {"component": "sensor", "component_id": "sensor", "layer": "device"}
+    assert patched["transports"][0]["protocol"] == "MQTT"
+    assert patched["endpoints"][0] == {"link_id": "l1", "from_endpoint": "7", "to_endpoint": "mqtt://b/sub"}
+    assert patched["component_bindings"][0]["endpoint_id"] == "ep_pub"
+
+
+def test_router_escalates_only_unresolved_errors():
+    hints = [{"code": "E_SCHEMA_BIND"}] * 3
+    assert choose_strategy(hints, True, 1, rule_fixable=2)["strategy"] == "deterministic"
+    assert choose_strategy(hints, True, 1, rule_fixable=0)["strategy"] == "llm_patch"
+    assert choose_strategy(hints, True, 1, rule_fixable=3, deterministic_rounds=2)["strategy"] == "llm_patch"
+    assert choose_strategy([{"code": "E_SCHEMA_BIND"}] * 30, True, 1, rule_fixable=0)["strategy"] == "regenerate"
+
+
+def test_deterministic_patch_applies_the_plan_it_was_routed_on():
+    checker = SchemaChecker([], [], [])
+    bindings = {"placements": [{"component": "sensor"}], "transports": {"link": "l1"}, "component_bindings": []}
+    before = deepcopy(bindings)
+    failures = checker.validate_bindings(bindings, gate_mode="full")["failures"]
+    engine = RuleEngine(IR, PLACEMENT, DEVICE_INFO)
+    rule_plan = engine.plan(bindings, failures, checker.bindings_schema_full)
+    expected = engine.apply(bindings, failures, checker.bindings_schema_full)[0]
+
+    planned = []
+    engine.plan = lambda *args: planned.append(args)
+    patched, actions = apply_deterministic_patch(bindings, IR, [], failures=failures,
+                                                 schema=checker.bindings_schema_full, engine=engine,
+                                                 rule_plan=rule_plan)
+    assert planned == [] and set(rule_plan[1]) <= set(actions)
+    assert patched["placements"][0] == expected["placements"][0]
+    assert patched["transports"] == expected["transports"] == [{"link": "l1"}]
+    assert patched["endpoints"] == expected["endpoints"]
+    assert bindings == before
@@ -0,0 +1,56 @@
+import csv
+import gzip
+import json
+import zipfile
+
+from autopipeline.bench.aggregate import aggregate_runs
+from autopipeline.bench.dataset import read_dataset
+from autopipeline.llm.telemetry import CALLS_FILE
+from autopipeline.run_archive import INDEX_NAME, iter_runs, open_run, pack_tree, unpack_tree
+
+
+def _run(root, case, run_id, status):
+    run = root / case / run_id
+    (run / "generated_code" / "edge").mkdir(parents=True)
+    (run / "generated_code" / "edge" / "main.py").write_text("print('x')\n", encoding="utf-8")
+    (run / "plan.json").write_text(json.dumps({"app_name": case}), encoding="utf-8")
+    (run / "bindings_raw.yaml.gz").write_bytes(gzip.compress(b"placements: []\n"))
+    eval_data = {"case_id": case, "overall_status": status, "llm": {"provider": "mock", "model": None},
+                 "pipeline": {"config": {"output_dir": str(run)}}}
+    (run / "eval.json").write_text(json.dumps(eval_data), encoding="utf-8")
+    call = {"stage": "generate_ir", "latency_ms": 5.0, "cache_hit": False}
+    (run / CALLS_FILE).write_text(json.dumps(call) + "\n", encoding="utf-8")
+    return run
+
+
+def test_pack_gives_random_access_and_readers_see_both_layouts(tmp_path):
+    root = tmp_path / "outputs"
+    first = _run(root, "C1", "run=1", "PASS")
+    _run(root, "C2", "run=2", "FAIL")
+
+    archives = pack_tree(root / "C1")
+    assert archives == [root / "C1" / "run=1.zip"] and not first.exists()
+    with zipfile.ZipFile(archives[0]) as zf:
+        assert zf.namelist()[0] == INDEX_NAME
+    assert list(iter_runs(root)) == [root / "C1" / "run=1.zip", root / "C2" / "run=2"]
+
+    # eval.json paths recorded before packing still resolve
+    with open_run(first / "eval.json") as run:
+        assert run.packed and (run.case_id, run.run_id) == ("C1", "run=1")
+        assert run.eval_summary()["overall_status"] == "PASS"
+        assert run.read_text("generated_code/edge/main.py") == "print('x')\n"
+        assert run.load_yaml("bindings_raw.yaml") == {"placements": []}
+
+    aggregate_runs([first / "eval.json", root / "C2" / "run=2" / "eval.json"], tmp_path / "agg")
+    with open(tmp_path / "agg" / "summary.csv", newline="", encoding="utf-8") as f:
+        rows = {row["case_id"]: row for row in csv.DictReader(f)}
+    # Packed runs point at their archive, not the removed run directory
+    assert rows["C1"]["output_dir"] == str(archives[0]) and rows["C1"]["eval_path"] == str(first / "eval.json")
+    assert rows["C2"]["output_dir"] == str(root / "C2" / "run=2")
+    dataset_rows = {r["case_id"]: r for r in read_dataset(tmp_path / "agg" / "dataset")}
+    assert dataset_rows["C1"]["output_dir"] == str(archives[0])
+    assert 'autopipeline_llm_calls_total{provider="mock",model="mock-model",cache="miss"} 2' in \
+        (tmp_path / "agg" / "metrics.prom").read_text(encoding="utf-8")
+
+    assert unpack_tree(root) == [first]
+    assert (first / "generated_code" / "edge" / "main.py").exists() and not archives[0].exists()
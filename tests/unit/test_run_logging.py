@@ -0,0 +1,32 @@
+import io
+import json
+
+from autopipeline.run_logging import RunLogger
+
+
+def test_records_stream_to_text_and_jsonl_with_correlation_fields(tmp_path):
+    console = io.StringIO()
+    logger = RunLogger(str(tmp_path / "run"), "run=1", "C1", console_level="WARNING", stream=console)
+    logger.log("starting")
+    logger.bind(stage="ir", attempt=2)
+    logger.log("decode failed", "WARNING", error_code="E_DECODE")
+    logger.close()
+    logger.log("after close is console-only")
+
+    text = (tmp_path / "run" / "run.log").read_text(encoding="utf-8").splitlines()
+    assert [line.split("] ", 2)[1:] for line in text] == [["[INFO", "starting"], ["[WARNING", "decode failed"]]
+    records = [json.loads(line) for line in (tmp_path / "run" / "run_log.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert records[0]["stage"] is None and records[0]["run_id"] == "run=1"
+    assert {k: records[1][k] for k in ("case_id", "stage", "attempt", "error_code")} == \
+        {"case_id": "C1", "stage": "ir", "attempt": 2, "error_code": "E_DECODE"}
+    assert "decode failed" in console.getvalue() and "starting" not in console.getvalue()
+    assert logger.stats() == {"records": 2, "by_level": {"INFO": 1, "WARNING": 1}}
+
+
+def test_late_calls_after_close_go_to_the_console_stream(tmp_path, capsys):
+    console = io.StringIO()
+    logger = RunLogger(str(tmp_path / "run"), "run=1", "C1", console_level="INFO", stream=console)
+    logger.close()
+    logger.log("late warning", "WARNING")
+    assert console.getvalue().rstrip().endswith("[WARNING] late warning")
+    assert capsys.readouterr().out == ""
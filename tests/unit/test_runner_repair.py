@@ -0,0 +1,125 @@
+import shutil
+from pathlib import Path
+
+import yaml
+
+from autopipeline.llm.types import LLMConfig
+from autopipeline.runner import PipelineRunner
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def _base_dir(tmp_path, case_id="DEMO-MONITORING"):
+    """Temp base dir sharing the repo's code, catalog, rules and prompts, with a copy of one case."""
+    base = tmp_path / "base"
+    base.mkdir()
+    for entry in REPO.iterdir():
+        if entry.name not in ("cases", "tests") and not entry.name.startswith("."):
+            (base / entry.name).symlink_to(entry, target_is_directory=entry.is_dir())
+    shutil.copytree(REPO / "cases" / case_id, base / "cases" / case_id)
+    return base
+
+
+def _edit_mock(base, name, edit, case_id="DEMO-MONITORING"):
+    path = base / "cases" / case_id / "mock" / name
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    edit(data)
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+
+
+def _runner(base, tmp_path, **kwargs):
+    config = LLMConfig(provider="mock", cache_enabled=False, cache_dir=str(tmp_path / "cache"))
+    return PipelineRunner("DEMO-MONITORING", base_dir=str(base), llm_config=config,
+                          output_root=str(tmp_path / "out"), console_log_level="OFF", **kwargs)
+
+
+def _run(base, tmp_path, **kwargs):
+    runner = _runner(base, tmp_path, **kwargs)
+    return runner, runner.run()
+
+
+def test_deterministic_bindings_repair_writes_the_patched_artifact(tmp_path):
+    base = _base_dir(tmp_path)
+
+    def bad_qos(bindings):
+        bindings["transports"][0]["qos"] = 5
+    _edit_mock(base, "bindings.yaml", bad_qos)
+
+    runner, result = _run(base, tmp_path, compress_artifacts=True)
+    assert result["overall_status"] == "PASS"
+    deterministic = [t for t in runner.repair_trace if t.get("strategy") == "deterministic_patch"]
+    assert deterministic and deterministic[0]["patch_actions_count"] > 0
+    # The path actually written, .gz included when debug artifacts are compressed
+    written = deterministic[0]["artifact_written"]
+    assert written.endswith(".yaml.gz") and (Path(runner.output_dir) / written).exists()
+
+
+def test_compile_check_reports_path_line_and_duration(tmp_path):
+    path = tmp_path / "main.py"
+    path.write_text("x = 1\ndef broken(:\n", encoding="utf-8")
+    entry = PipelineRunner._compile_check("edge", str(path))
+    assert entry["pass"] is False and entry["path"] == str(path) and entry["line"] == 2
+    assert entry["duration_ms"] >= 0 and "edge main.py compile failed" in entry["error"]
+    assert not list(tmp_path.glob("__pycache__"))
+
+
+def test_unreadable_file_is_a_compile_failure(tmp_path):
+    (tmp_path / "main.py").mkdir()
+    entry = PipelineRunner._compile_check("cloud", str(tmp_path / "main.py"))
+    assert entry["pass"] is False and entry["error"].startswith("cloud main.py compile failed")
+    missing = PipelineRunner._compile_check("cloud", str(tmp_path / "absent.py"))
+    assert missing["error"] == "cloud main.py missing"
+
+
+def test_compile_failures_survive_the_later_code_generated_result(tmp_path, monkeypatch):
+    base = _base_dir(tmp_path)
+    monkeypatch.setattr(PipelineRunner, "_compile_check", staticmethod(
+        lambda layer, path: {"path": path, "pass": False, "line": 1, "error": f"{layer} main.py compile failed",
+                             "duration_ms": 0.1}))
+    runner, result = _run(base, tmp_path)
+    # add_simple_validator("code_generated", True, ...) runs after the compile checks
+    merged = runner.validator_results["code_generated"]
+    assert merged["pass"] is False and result["checks"]["code_generated"]["status"] == "FAIL"
+    assert {f["message"] for f in merged["failures"]} == {f"{layer} main.py compile failed"
+                                                          for layer in ("cloud", "edge", "device")}
+    assert sorted(merged["metrics"]["files"]) == ["cloud", "device", "edge"]
+
+
+def _counting(obj, name, calls):
+    original = getattr(obj, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(kwargs)
+        return original(*args, **kwargs)
+    setattr(obj, name, wrapper)
+
+
+def test_warning_only_checks_run_once_on_the_accepted_artifacts(tmp_path):
+    base = _base_dir(tmp_path)
+
+    def url_in_config(ir):
+        ir["components"][0]["config"] = {"url": "https://example.com"}
+
+    def bad_component_ref(bindings):
+        bindings["component_bindings"][0]["component"] = "nonexistent_component"
+    _edit_mock(base, "ir.yaml", url_in_config)
+    _edit_mock(base, "bindings.yaml", bad_component_ref)
+
+    runner = _runner(base, tmp_path)
+    boundary_calls, matching_calls, semantic_calls = [], [], []
+    _counting(runner.boundary_checker, "check_ir", boundary_calls)
+    _counting(runner.endpoint_matching_checker, "check", matching_calls)
+    _counting(runner.semantic_checker, "check", semantic_calls)
+    result = runner.run()
+
+    assert result["overall_status"] == "PASS"
+    stages = result["pipeline"]["stages"]
+    assert (stages["ir"]["attempts"], stages["bindings"]["attempts"]) == (2, 2)
+    # Deferred on both attempts, run once on the accepted artifact
+    assert [c.get("patterns") for c in boundary_calls].count(False) == 1
+    assert len(matching_calls) == 1 and len(semantic_calls) == 1
+    for stage, name in (("ir", "ir_boundary_keywords"), ("bindings", "endpoint_matching")):
+        validation = stages[stage]["validation"]
+        assert validation["deferred"][name] == 2 and validation["runs"][name] == 1
+    assert stages["bindings"]["validation"]["saved_ms_est"] > 0
+    assert result["metrics"]["checker_ms_saved_est"] >= stages["bindings"]["validation"]["saved_ms_est"]
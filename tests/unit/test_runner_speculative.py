@@ -0,0 +1,83 @@
+import shutil
+
+from test_runner_repair import _base_dir, _edit_mock, _run, _runner
+
+CASE_MOCK = ("cases", "DEMO-MONITORING", "mock")
+
+
+def _candidate_one(base, edit=None, text=None):
+    """ir__c1.yaml, the mock output of speculative candidate 1: ir.yaml (edited) or raw text."""
+    mock = base.joinpath(*CASE_MOCK)
+    if text is not None:
+        (mock / "ir__c1.yaml").write_text(text, encoding="utf-8")
+        return
+    shutil.copyfile(mock / "ir.yaml", mock / "ir__c1.yaml")
+    if edit is not None:
+        _edit_mock(base, "ir__c1.yaml", edit)
+
+
+def _drop_component_types(ir):
+    for comp in ir["components"]:
+        comp.pop("type")
+
+
+def _drop_links(ir):
+    ir.pop("links")
+
+
+def test_first_valid_candidate_wins_and_records_latency_saved(tmp_path):
+    base = _base_dir(tmp_path)
+    _candidate_one(base)
+    _edit_mock(base, "ir.yaml", _drop_links)
+
+    runner, result = _run(base, tmp_path, speculative=2)
+    assert result["overall_status"] == "PASS"
+    ir_stage = result["pipeline"]["stages"]["ir"]
+    assert ir_stage["attempts"] == 1
+    stats = ir_stage["speculative"]
+    assert stats["k"] == 2 and stats["winner"] == 1 and stats["chosen"] == 1
+    assert len(stats["arrivals"]) + stats["cancelled_or_discarded"] == 2
+    winner = next(e for e in stats["arrivals"] if e["candidate"] == 1)
+    assert winner["blocking_failures"] == 0 and winner["failed_check"] is None
+    assert stats["latency_saved_ms_est"] == round(stats["sequential_est_ms"] - winner["latency_ms"], 3)
+    assert stats["latency_saved_ms_est"] >= 0
+
+
+def test_least_broken_candidate_goes_to_the_repair_loop(tmp_path):
+    base = _base_dir(tmp_path)
+    _candidate_one(base, _drop_links)
+    _edit_mock(base, "ir.yaml", _drop_component_types)
+
+    runner = _runner(base, tmp_path, speculative=2)
+    repaired = []
+    repair_ir = runner.repair_agent.repair_ir
+
+    def recording_repair(draft, *args, **kwargs):
+        repaired.append(draft)
+        return repair_ir(draft, *args, **kwargs)
+    runner.repair_agent.repair_ir = recording_repair
+    result = runner.run()
+
+    assert result["overall_status"] == "PASS"
+    ir_stage = result["pipeline"]["stages"]["ir"]
+    assert ir_stage["attempts"] == 2
+    stats = ir_stage["speculative"]
+    assert stats["winner"] is None and stats["chosen"] == 1 and "latency_saved_ms_est" not in stats
+    assert sorted(e["candidate"] for e in stats["arrivals"]) == [0, 1]
+    assert {e["failed_check"] for e in stats["arrivals"]} == {"ir_schema"}
+    # Same failing check, fewer failures: candidate 1 (no links) is the draft handed to repair
+    assert len(repaired) == 1 and "links" not in repaired[0] and repaired[0]["components"][0].get("type")
+
+
+def test_undecodable_candidates_fall_through_to_attempt_two(tmp_path):
+    base = _base_dir(tmp_path)
+    _candidate_one(base, text="components: [unclosed\n")
+    base.joinpath(*CASE_MOCK, "ir.yaml").write_text("links: {oops\n", encoding="utf-8")
+
+    runner, result = _run(base, tmp_path, speculative=2)
+    assert result["overall_status"] == "PASS"
+    ir_stage = result["pipeline"]["stages"]["ir"]
+    assert ir_stage["attempts"] == 2
+    stats = ir_stage["speculative"]
+    assert stats["winner"] is None and stats["chosen"] is None
+    assert len(stats["arrivals"]) == 2 and all("error" in e for e in stats["arrivals"])
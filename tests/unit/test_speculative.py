@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from autopipeline.llm.llm_client import LLMClient
+from autopipeline.llm.providers.mock_provider import MockProvider
+from autopipeline.llm.types import LLMConfig
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def test_candidates_arrive_independently_and_candidate_zero_shares_cache_key(tmp_path):
+    mock_dir = tmp_path / "cases" / "X" / "mock"
+    mock_dir.mkdir(parents=True)
+    (mock_dir / "ir.yaml").write_text("ir: base\n", encoding="utf-8")
+    (mock_dir / "ir__c1.yaml").write_text("ir: variant\n", encoding="utf-8")
+    client = LLMClient(str(REPO), LLMConfig(provider="mock", cache_dir=str(tmp_path / "cache")),
+                       logger=lambda _: None, output_root=str(tmp_path / "out"))
+    client._get_provider = lambda: MockProvider(str(tmp_path))
+    args = ("X", {"problem": "p"}, {"devices": []}, {"rules_hash": "r", "case_id": "X"}, {})
+
+    items = sorted(client.generate_ir_candidates(*args, k=2), key=lambda i: i["candidate"])
+    assert [(i["candidate"], i["text"], i["error"]) for i in items] == [(0, "ir: base\n", None),
+                                                                       (1, "ir: variant\n", None)]
+    assert client.stats["cache_misses"] == 2
+
+    # Sequential generation of the same request is served by candidate 0's cache entry
+    assert client.generate_ir(*args).text == "ir: base\n"
+    assert client.stats["cache_hits"] == 1
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+from autopipeline.llm.llm_client import LLMClient
+from autopipeline.llm.providers.mock_provider import MockProvider
+from autopipeline.llm.telemetry import CALLS_FILE, estimate_cost, percentile, usage_breakdown
+from autopipeline.llm.types import LLMConfig
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def test_usage_normalization_and_cost():
+    anthropic = usage_breakdown({"input_tokens": 100, "cache_read_input_tokens": 1000,
+                                 "cache_creation_input_tokens": 200, "output_tokens": 50})
+    assert anthropic == {"input_cached": 1000, "input_uncached": 300, "cache_write": 200, "output": 50}
+    openai = usage_breakdown({"prompt_tokens": 1000, "completion_tokens": 10,
+                              "prompt_tokens_details": {"cached_tokens": 600}})
+    assert openai == {"input_cached": 600, "input_uncached": 400, "cache_write": 0, "output": 10}
+    # 100 * 3.0 + 200 * 3.75 + 1000 * 0.3 + 50 * 15.0 per 1M tokens
+    assert estimate_cost("claude-3-5-sonnet-20241022", anthropic) == 0.0021
+    assert estimate_cost("some-unpriced-model", anthropic) is None
+    assert percentile([4, 1, 3, 2], 50) == 2.5 and percentile([], 95) is None
+
+
+class _FlakyProvider(MockProvider):
+    def __init__(self, base_dir):
+        super().__init__(base_dir)
+        self.failures = 1
+
+    def call(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("transient")
+        return super().call(**kwargs)
+
+
+def test_call_records_capture_retries_and_cache_hits(tmp_path):
+    mock_dir = tmp_path / "cases" / "X" / "mock"
+    mock_dir.mkdir(parents=True)
+    (mock_dir / "ir.yaml").write_text("ir: base\n", encoding="utf-8")
+    config = LLMConfig(cache_dir=str(tmp_path / "cache"), max_retries=1, retry_backoff_s=0.0)
+    client = LLMClient(str(REPO), config, logger=lambda _: None, output_root=str(tmp_path / "out"))
+    provider = _FlakyProvider(str(tmp_path))
+    client._get_provider = lambda: provider
+    args = ("X", {"problem": "p"}, {"devices": []}, {"rules_hash": "r", "case_id": "X"}, {})
+
+    assert client.generate_ir(*args).text == client.generate_ir(*args).text == "ir: base\n"
+    lines = (tmp_path / "out" / CALLS_FILE).read_text(encoding="utf-8").splitlines()
+    first, second = (json.loads(line) for line in lines)
+    assert (first["cache_hit"], first["retries"], first["error"]) == (False, 1, None)
+    assert (second["cache_hit"], second["cost_usd_est"]) == (True, 0.0)
+    assert first["cache_key"] == second["cache_key"]
+    assert client.stats["retries_total"] == 1
@@ -6,16 +6,18 @@ from pathlib import Path
 from collections import Counter
 from typing import Any, Dict, List, Optional
 
-from autopipeline.utils import ensure_dir, load_json
+from autopipeline.bench.dataset import read_dataset
+from autopipeline.eval.eval_schema import expand_eval
+from autopipeline.run_archive import PACK_SUFFIX, is_packed_run, open_run, run_path
+from autopipeline.utils import ensure_dir
 import yaml
 
 
-def _load_eval(run_dir: Path) -> Optional[Dict[str, Any]]:
-    eval_path = run_dir / "eval.json"
-    if not eval_path.exists():
+def _load_eval(run) -> Optional[Dict[str, Any]]:
+    if not run.exists("eval.json"):
         return None
     try:
-        return load_json(eval_path)
+        return expand_eval(run.load_json("eval.json"))
     except Exception:
         return None
 
@@ -73,17 +75,17 @@ def _attempts(eval_result: Dict[str, Any]) -> Optional[int]:
     return None
 
 
-def _artifacts(run_dir: Path) -> Dict[str, bool]:
+def _artifacts(run) -> Dict[str, bool]:
     bindings_present = False
     for name in ["bindings.yaml", "bindings_raw.yaml", "bindings_raw.txt"]:
-        if (run_dir / name).exists():
+        if run.exists(name):
             bindings_present = True
             break
     return {
-        "plan": (run_dir / "plan.json").exists(),
-        "ir": (run_dir / "ir.yaml").exists(),
+        "plan": run.exists("plan.json"),
+        "ir": run.exists("ir.yaml"),
         "bindings": bindings_present,
-        "eval": (run_dir / "eval.json").exists(),
+        "eval": run.exists("eval.json"),
     }
 
 
@@ -95,16 +97,15 @@ def _exec_status(eval_result: Dict[str, Any]) -> str:
     return eval_result.get("overall_exec_status") or eval_result.get("overall_runtime_status") or "SKIP"
 
 
-def _app_name(run_dir: Path, eval_result: Dict[str, Any]) -> str:
+def _app_name(run, eval_result: Dict[str, Any]) -> str:
     if eval_result.get("case_id"):
         return str(eval_result["case_id"])
-    plan_path = run_dir / "plan.json"
-    if plan_path.exists():
+    if run.exists("plan.json"):
         try:
-            return load_json(plan_path).get("app_name", run_dir.parent.name)
+            return run.load_json("plan.json").get("app_name", run.case_id)
         except Exception:
-            return run_dir.parent.name
-    return run_dir.parent.name
+            return run.case_id
+    return run.case_id
 
 
 def _provider(eval_result: Dict[str, Any], run_dir: Path) -> str:
@@ -119,13 +120,33 @@ def _provider(eval_result: Dict[str, Any], run_dir: Path) -> str:
     return "unknown"
 
 
-def _load_runs(glob_pattern: str) -> List[Dict[str, Any]]:
+def _glob_runs(glob_pattern: str) -> List[Path]:
+    # Run directories, plus the same runs packed as run=<id>.zip
+    paths = glob.glob(glob_pattern, recursive=True)
+    paths += glob.glob(glob_pattern.rstrip("/") + PACK_SUFFIX, recursive=True)
+    return [Path(p) for p in paths]
+
+
+def _dataset_runs(dataset: str, tag: Optional[str], require_real: bool) -> List[Path]:
+    """Candidate runs from the bench dataset; mock runs are filtered while reading."""
+    filters = []
+    if tag:
+        filters.append(("tag", "==", tag))
+    if require_real:
+        filters.append(("provider", "!=", "mock"))
+    rows = read_dataset(dataset, filters=filters, columns=["eval_path"])
+    return [run_path(r["eval_path"]) for r in rows if r.get("eval_path")]
+
+
+def _load_runs(paths: List[Path]) -> List[Dict[str, Any]]:
     runs = []
-    for path_str in glob.glob(glob_pattern, recursive=True):
-        run_dir = Path(path_str)
-        if not run_dir.is_dir():
+    for run_dir in paths:
+        if not (run_dir.is_dir() or is_packed_run(run_dir)):
             continue
-        eval_result = _load_eval(run_dir)
+        with open_run(run_dir) as run:
+            eval_result = _load_eval(run)
+            artifacts = _artifacts(run)
+            app_name = _app_name(run, eval_result) if eval_result else None
         if not eval_result:
             continue
         top_errs = _top_errors(eval_result)
@@ -134,14 +155,13 @@ def _load_runs(glob_pattern: str) -> List[Dict[str, Any]]:
         duration = _duration_ms(eval_result)
         attempts = _attempts(eval_result)
         calls = _calls(eval_result)
-        artifacts = _artifacts(run_dir)
         missing_bindings_flag = not artifacts.get("bindings")
         synthetic_err = []
         if missing_bindings_flag:
             synthetic_err.append("E_ARTIFACT_MISSING_BINDINGS")
         runs.append({
             "run_dir": str(run_dir.as_posix()),
-            "case": _app_name(run_dir, eval_result),
+            "case": app_name,
             "provider": _provider(eval_result, run_dir),
             "core_status": _core_status(eval_result),
             "exec_status": _exec_status(eval_result),
@@ -364,16 +384,12 @@ def _copy_bundle(src_dir: Path, bundle_dir: Path):
         "bindings_norm.yaml", "bindings_patched.yaml", "bindings_repaired.yaml",
         "eval.json", "run.log", "docker-compose.yml"
     ]
-    for name in to_copy:
-        src = src_dir / name
-        if src.exists():
-            shutil.copy2(src, bundle_dir / name)
-    gen_dir = src_dir / "generated_code"
-    if gen_dir.exists() and gen_dir.is_dir():
-        dst_gen = bundle_dir / "generated_code"
-        if dst_gen.exists():
-            shutil.rmtree(dst_gen)
-        shutil.copytree(gen_dir, dst_gen)
+    dst_gen = bundle_dir / "generated_code"
+    if dst_gen.exists():
+        shutil.rmtree(dst_gen)
+    with open_run(src_dir) as run:
+        generated = [name for name in run.names() if name.startswith("generated_code/")]
+        run.extract(bundle_dir, to_copy + generated)
 
 
 def _extract_schema_bind_missing(failure_eval: Dict[str, Any], success_bind_path: Path) -> List[Dict[str, Any]]:
@@ -424,7 +440,10 @@ def _extract_schema_bind_missing(failure_eval: Dict[str, Any], success_bind_path
 
 def main():
     parser = argparse.ArgumentParser(description="Pick one success and one failure run (core gate) and generate reports.")
-    parser.add_argument("--runs_glob", type=str, default="outputs*/**/run=*/", help="Glob to find run dirs")
+    parser.add_argument("--runs_glob", type=str, default="outputs*/**/run=*/", help="Glob to find run dirs (packed runs matched as <glob>.zip)")
+    parser.add_argument("--dataset", type=str, default=None,
+                        help="Bench dataset dir (<out-root>/dataset) to pick runs from instead of --runs_glob")
+    parser.add_argument("--dataset_tag", type=str, default=None, help="With --dataset: only runs of this bench tag")
     parser.add_argument("--out_dir", type=str, default="reports/cases", help="Output directory for reports")
     parser.add_argument("--min_repro", type=int, default=2, help="Min reproducibility count for failure top error")
     parser.add_argument("--require_real_llm", type=str, default="true", help="Require real LLM (non-mock) runs")
@@ -441,7 +460,10 @@ def main():
     require_bindings = to_bool(args.require_bindings_for_failure)
     exclude_codes = [c.strip() for c in args.exclude_error_codes.split(",") if c.strip()]
 
-    runs = _load_runs(args.runs_glob)
+    if args.dataset:
+        runs = _load_runs(_dataset_runs(args.dataset, args.dataset_tag, require_real))
+    else:
+        runs = _load_runs(_glob_runs(args.runs_glob))
     ensure_dir(args.out_dir)
     (Path(args.out_dir) / "runs_index.json").write_text(json.dumps(runs, indent=2), encoding="utf-8")
 
@@ -471,7 +493,7 @@ def main():
         if success:
             success_bind_path = Path(success["bundle_dir"]) / "bindings.yaml"
         else:
-            success_bind_path = Path(failure["run_dir"]) / "bindings.yaml"
+            success_bind_path = Path(failure["bundle_dir"]) / "bindings.yaml"
         missing_table = _extract_schema_bind_missing(failure.get("eval", {}), success_bind_path)
         if failure.get("artifact_missing_bindings"):
             failure["schema_bind_note"] = "bindings file missing; schema_bind not evaluated"
@@ -0,0 +1,117 @@
+"""Import-time benchmark for the CLI.
+
+Runs each probe in a fresh interpreter with ``-X importtime`` and reports the median
+import time (sum of top-level imports) and wall time. Exits 1 when a probe exceeds
+--max-import-ms or imports a module that must stay lazy (LAZY_MODULES), so CI can guard
+startup time:
+
+    python tools/import_time_bench.py --repeat 5 --json import_time.json
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+# Must not be imported until a command needs them (prefix match on dotted names)
+LAZY_MODULES = (
+    "autopipeline.runner",
+    "autopipeline.agents",
+    "autopipeline.llm.llm_client",
+    "autopipeline.llm.providers",
+    "autopipeline.bench.aggregate",
+    "autopipeline.bench.plots",
+    "jsonschema",
+    "yaml",
+    "matplotlib",
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "anthropic",
+)
+PROBES: Dict[str, List[str]] = {
+    "import": ["-c", "import autopipeline.__main__"],
+    "help": ["-m", "autopipeline", "--help"],
+    "run-help": ["-m", "autopipeline", "run", "--help"],
+    "bench-help": ["-m", "autopipeline", "bench", "--help"],
+}
+# "import time: <self us> | <cumulative us> | <indent><module>"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def lazy_violations(modules: Set[str]) -> List[str]:
+    return sorted(m for m in modules if any(m == lazy or m.startswith(lazy + ".") for lazy in LAZY_MODULES))
+
+
+def _run_once(args: List[str]) -> Tuple[float, float, Set[str]]:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"probe {' '.join(args)} failed:\n{proc.stderr[-2000:]}")
+    import_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        if not match.group(3):
+            # Top-level entries only: cumulative times already include nested imports
+            import_us += int(match.group(2))
+    return import_us / 1000, wall_ms, modules
+
+
+def measure(args: List[str], repeat: int) -> Dict[str, Any]:
+    import_ms, wall_ms = [], []
+    modules: Set[str] = set()
+    for _ in range(repeat):
+        imp, wall, mods = _run_once(args)
+        import_ms.append(imp)
+        wall_ms.append(wall)
+        modules |= mods
+    return {
+        "import_ms": round(statistics.median(import_ms), 2),
+        "wall_ms": round(statistics.median(wall_ms), 2),
+        "modules": len(modules),
+        "lazy_violations": lazy_violations(modules),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI import time and check lazy imports.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per probe (median is reported)")
+    parser.add_argument("--probes", default=",".join(PROBES), help="Comma-separated probes to run")
+    parser.add_argument("--max-import-ms", type=float, default=150.0, help="Fail when a probe's median exceeds this")
+    parser.add_argument("--json", default=None, help="Write results to this path")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for name in [p.strip() for p in args.probes.split(",") if p.strip()]:
+        if name not in PROBES:
+            raise SystemExit(f"unknown probe: {name} (choices: {', '.join(PROBES)})")
+        res = measure(PROBES[name], args.repeat)
+        results[name] = res
+        problems = []
+        if res["import_ms"] > args.max_import_ms:
+            problems.append(f"over budget ({args.max_import_ms} ms)")
+        if res["lazy_violations"]:
+            problems.append("eager imports: " + ", ".join(res["lazy_violations"][:8]))
+        failed = failed or bool(problems)
+        print(f"[import-time] {name:<11} import={res['import_ms']:>8.2f} ms  wall={res['wall_ms']:>8.2f} ms  "
+              f"modules={res['modules']:>4}  {'FAIL: ' + '; '.join(problems) if problems else 'OK'}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"max_import_ms": args.max_import_ms, "results": results}, indent=2),
+                                   encoding="utf-8")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,14 @@ from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
 from autopipeline.eval.evaluate_artifacts import evaluate_run_dir
+from autopipeline.run_archive import iter_runs
 from autopipeline.utils import ensure_dir
 
 
 def find_run_dirs(base_dir: Path, case_names: List[str]) -> List[Path]:
-    plan_files = list(base_dir.rglob("plan.json"))
     run_dirs = []
-    for plan in plan_files:
-        run_dir = plan.parent
+    # Run directories holding plan.json, and packed runs
+    for run_dir in iter_runs(base_dir, marker="plan.json"):
         case_id = run_dir.parent.name
         if case_names and case_id not in case_names:
             continue
@@ -3,6 +3,8 @@ import json
 from pathlib import Path
 from typing import List, Dict, Any
 
+from autopipeline.eval.eval_schema import load_eval
+
 
 def _top_error(failures: List[Dict[str, Any]]) -> str:
     if not failures:
@@ -25,7 +27,7 @@ def _schema_missing_table(failures: List[Dict[str, Any]]) -> List[Dict[str, Any]
 
 
 def make_report(run_dir: Path, out_subdir: str, out_md: Path, out_json: Path = None):
-    before_eval = json.loads((run_dir / "eval.json").read_text(encoding="utf-8"))
+    before_eval = load_eval(run_dir / "eval.json")
     after_eval_path = run_dir / out_subdir / "eval_repaired.json"
     after_eval = json.loads(after_eval_path.read_text(encoding="utf-8"))
 
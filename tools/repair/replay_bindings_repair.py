@@ -9,6 +9,7 @@ import yaml
 from autopipeline.normalize.bindings_normalizer import normalize_bindings
 from autopipeline.repair.deterministic_patch import apply_deterministic_patch
 from autopipeline.repair.context_pack import build_bindings_repair_context
+from autopipeline.eval.eval_schema import load_eval
 from autopipeline.eval.evaluate_artifacts import evaluate_run_dir
 from autopipeline.utils import sha256_of_file
 
@@ -18,7 +19,7 @@ def _load_eval_failures(run_dir: Path) -> List[Dict[str, Any]]:
     if not eval_path.exists():
         return []
     try:
-        data = json.loads(eval_path.read_text(encoding="utf-8"))
+        data = load_eval(eval_path)
         return data.get("failures_flat") or []
     except Exception:
         return []